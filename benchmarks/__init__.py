@@ -0,0 +1 @@
+"""Throughput and latency benchmarks for the Thursian orchestrator."""
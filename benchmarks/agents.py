@@ -0,0 +1,96 @@
+"""Simulated human and AI agents for benchmarks."""
+
+from typing import Dict, List, Optional
+import asyncio
+import multiprocessing
+
+from orchestrator.executor import StubBackend, AgentRequest, register_backend
+from orchestrator.state import AgentRole
+from .loadgen import LoadConfig, LoadGenerator, parse_delay
+
+
+class SimulatedBackend(StubBackend):
+    """
+    Stub AI backend whose latency is drawn from a delay distribution.
+
+    Options: ``delay`` (a parse_delay spec, default 0) plus the StubBackend
+    options.
+    """
+
+    def __init__(self, name: str, options: Dict):
+        super().__init__(name, options)
+        self.sample_delay = parse_delay(str(options.get('delay', 0)))
+
+    async def complete(self, connection, request: AgentRequest) -> str:
+        delay = self.sample_delay()
+        if delay:
+            await asyncio.sleep(delay)
+        self._maybe_fail()
+        return self._response(request)
+
+
+register_backend('simulated', SimulatedBackend)
+
+
+class HumanAgents:
+    """
+    Fake human agents that answer task files through the .thursian protocol.
+
+    Runs a LoadGenerator in its own process so its file I/O is not counted
+    against the orchestrator. Every task file for one of ``roles`` is
+    answered after a delay drawn from ``delay``; reviews approve at
+    ``approve_rate``.
+    """
+
+    def __init__(
+        self,
+        thursian_dir: str,
+        delay: str,
+        roles: List[AgentRole],
+        approve_rate: float = 1.0,
+        poll_interval: float = 0.005
+    ):
+        parse_delay(delay)
+        self.thursian_dir = thursian_dir
+        self.config: LoadConfig = {
+            'roles': roles, 'coding_delay': delay, 'review_delay': delay,
+            'approve_rate': approve_rate, 'poll_interval': poll_interval,
+        }
+        context = multiprocessing.get_context('spawn')
+        self._stop = context.Event()
+        self._ready = context.Event()
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+
+    def start(self, timeout: float = 60.0) -> None:
+        """Start the agent process and wait until it is watching for tasks."""
+        context = multiprocessing.get_context('spawn')
+        self._process = context.Process(
+            target=_answer_tasks, args=(self.thursian_dir, self.config, self._stop, self._ready),
+            name='simulated-humans', daemon=True
+        )
+        self._process.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Simulated agents did not start")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._process is not None:
+            self._process.join(timeout=10)
+            if self._process.is_alive():
+                self._process.terminate()
+
+
+def _answer_tasks(thursian_dir: str, config: LoadConfig, stop, ready) -> None:
+    generator = LoadGenerator(thursian_dir, config)
+    ready.set()
+    generator.run(stop.wait)
+
+
+def executor_config(roles: List[AgentRole], delay: str, max_concurrency: int) -> Dict:
+    """executor.json serving ``roles`` with the simulated backend."""
+    return {
+        'roles': {role.value: 'simulated' for role in roles},
+        'providers': {
+            'simulated': {'backend': 'simulated', 'delay': delay, 'max_concurrency': max_concurrency}
+        },
+    }
@@ -0,0 +1,340 @@
+"""
+Synthetic load generator for the .thursian file protocol.
+
+Plays many fake coding and review agents against a running orchestrator:
+watches .thursian/tasks/, picks up each new task file when one of the
+role's agents is free, and writes the _output.md or _validation.md file
+after a delay drawn from the role's distribution. Reviews approve at a
+configured rate and ask for revision otherwise; when the orchestrator
+archives a round, the task is answered again. One process and one loop
+(scandir plus a due-time heap) so it keeps up with thousands of tasks.
+
+    python -m benchmarks.loadgen --coding-delay exp:30 --review-delay exp:10 --approve-rate 0.8
+"""
+
+from typing import TypedDict, Callable, Deque, Dict, List, Optional, Set, Tuple
+from collections import deque
+import argparse
+import heapq
+import os
+import random
+import re
+import sys
+import time
+
+from orchestrator.state import AgentRole
+
+DELAY_DISTRIBUTIONS = ('fixed', 'uniform', 'exp', 'normal')
+
+# Files archived by a revision round (task_1_validation_r1.md) are not tasks
+_ARCHIVED = re.compile(r'_r\d+\.md$')
+
+_FILLER = "Simulated implementation detail line for load testing. "
+
+
+def parse_delay(spec: str) -> Callable[[], float]:
+    """
+    Build a delay sampler (seconds) from a spec.
+
+    ``fixed:0.05``, ``uniform:0.01,0.1``, ``exp:0.05`` (mean) or
+    ``normal:0.05,0.01`` (mean, stddev; clamped at 0). A bare number is fixed.
+    """
+    name, _, args = spec.partition(':')
+    if not args:
+        name, args = 'fixed', spec
+    try:
+        values = [float(v) for v in args.split(',')]
+    except ValueError:
+        raise ValueError(f"Bad delay spec: {spec}")
+
+    if name == 'fixed' and len(values) == 1:
+        return lambda: values[0]
+    if name == 'uniform' and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if name == 'exp' and len(values) == 1:
+        return lambda: random.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if name == 'normal' and len(values) == 2:
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    raise ValueError(f"Bad delay spec: {spec} (expected one of {DELAY_DISTRIBUTIONS})")
+
+
+def task_role(task_name: str) -> AgentRole:
+    """Role that answers a task file, from its name (validation tasks go to reviewers)."""
+    stem = task_name[:-3]
+    head, _, tail = stem.rpartition('_validation')
+    if head and (tail == '' or tail[1:].isdigit()):
+        return AgentRole.REVIEW_AGENT
+    return AgentRole.CODING_AGENT
+
+
+def output_name(task_name: str) -> str:
+    """Output file an agent writes for a task file."""
+    stem = task_name[:-3]
+    if task_role(task_name) == AgentRole.REVIEW_AGENT:
+        return f"{stem}.md"
+    return f"{stem}_output.md"
+
+
+def render_output(task_name: str, approve: bool = True, size: int = 0) -> str:
+    """Agent answer for a task file, padded to about ``size`` bytes."""
+    stem = task_name[:-3]
+    if task_role(task_name) == AgentRole.REVIEW_AGENT:
+        head = f"# Validation: {stem}\n\n## Review Summary\n\nSimulated review.\n\n"
+        if approve:
+            tail = "## Recommendation\n\n**Status: APPROVED**\n"
+        else:
+            tail = "## Required Changes\n\n- Simulated revision request.\n\n**Status: NEEDS_REVISION**\n"
+    else:
+        head = f"# Task Output: {stem}\n\n## Implementation\n\nSimulated work.\n\n"
+        tail = "**Status: COMPLETE**\n"
+
+    padding = size - len(head) - len(tail)
+    if padding > 0:
+        head += (_FILLER * (padding // len(_FILLER) + 1))[:padding - 2] + "\n\n"
+    return head + tail
+
+
+class LoadConfig(TypedDict, total=False):
+    roles: List[AgentRole]            # Roles to play (default: both)
+    coding_delay: str                 # parse_delay spec per coding task
+    review_delay: str                 # parse_delay spec per review
+    coding_agents: Optional[int]      # Concurrent fake coding agents (None: unlimited)
+    review_agents: Optional[int]
+    approve_rate: float               # Probability a review approves
+    output_bytes: int                 # Approximate size of each written file
+    max_writes_per_second: Optional[float]
+    poll_interval: float              # Seconds between scans of tasks/
+    recheck_interval: float           # Seconds between checks for archived answers
+
+
+DEFAULT_CONFIG: LoadConfig = {
+    'roles': list(AgentRole),
+    'coding_delay': '0',
+    'review_delay': '0',
+    'coding_agents': None,
+    'review_agents': None,
+    'approve_rate': 1.0,
+    'output_bytes': 0,
+    'max_writes_per_second': None,
+    'poll_interval': 0.005,
+    'recheck_interval': 0.5,
+}
+
+
+class LoadGenerator:
+    """
+    Fake agents answering task files in one thread.
+
+    Each role has a FIFO of task files waiting for a free agent; a busy
+    agent's answer is written when its delay expires (subject to the
+    global write rate). Answered tasks are rechecked periodically: if the
+    orchestrator archived the answer for a revision round and the task file
+    is (again) present, the task is queued for another answer.
+    """
+
+    def __init__(self, thursian_dir: str, config: Optional[LoadConfig] = None):
+        self.config: LoadConfig = {**DEFAULT_CONFIG, **(config or {})}
+        self.tasks_dir = os.path.join(thursian_dir, 'tasks')
+        self.output_dir = os.path.join(thursian_dir, 'output')
+        self.roles = set(self.config['roles'])
+        self.delays = {
+            AgentRole.CODING_AGENT: parse_delay(self.config['coding_delay']),
+            AgentRole.REVIEW_AGENT: parse_delay(self.config['review_delay']),
+        }
+        self.agents = {
+            AgentRole.CODING_AGENT: self.config['coding_agents'],
+            AgentRole.REVIEW_AGENT: self.config['review_agents'],
+        }
+        self.busy = {role: 0 for role in AgentRole}
+        self.waiting: Dict[AgentRole, Deque[str]] = {role: deque() for role in AgentRole}
+        self.due: List[Tuple[float, str]] = []
+        self.seen: Set[str] = set()
+        self.answered: Dict[str, float] = {}      # Task file -> time.time() of the last answer
+
+        rate = self.config['max_writes_per_second']
+        self._rate = float(rate) if rate else None
+        self._tokens = self._rate or 0.0
+        self._refilled = time.monotonic()
+        self._next_recheck = 0.0
+        self.stats = {'answered': 0, 'approved': 0, 'revisions': 0, 'rounds': 0}
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    @property
+    def in_progress(self) -> int:
+        """Tasks picked up or waiting for an agent."""
+        return len(self.due) + sum(len(queue) for queue in self.waiting.values())
+
+    def step(self, now: float) -> float:
+        """Scan, hand out work and write answers that are due; returns seconds until the next step."""
+        self._scan()
+        if now >= self._next_recheck:
+            self._recheck()
+            self._next_recheck = now + self.config['recheck_interval']
+        self._assign(now)
+        self._write_due(now)
+
+        wait = self.config['poll_interval']
+        if self.due:
+            wait = min(wait, max(0.0, self.due[0][0] - now))
+            if wait == 0.0 and self._rate is not None:
+                wait = min(self.config['poll_interval'], 1 / self._rate)   # Out of write tokens
+        return wait
+
+    def run(self, should_stop: Callable[[float], bool]) -> None:
+        """Step until should_stop(seconds to wait) returns True (it may block that long)."""
+        while not should_stop(self.step(time.monotonic())):
+            pass
+
+    def _scan(self) -> None:
+        if not os.path.isdir(self.tasks_dir):
+            return
+        with os.scandir(self.tasks_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name in self.seen or not name.endswith('.md') or _ARCHIVED.search(name):
+                    continue
+                self.seen.add(name)
+                self._enqueue(name)
+
+    def _enqueue(self, name: str) -> None:
+        role = task_role(name)
+        if role in self.roles:
+            self.waiting[role].append(name)
+
+    def _recheck(self) -> None:
+        """
+        Queue answered tasks again when their answer was archived for a new round.
+
+        A coding task keeps its task file across rounds; a validation task
+        file is archived with the answer and rewritten for the next round,
+        so it must be newer than the previous answer.
+        """
+        for name, answered_at in list(self.answered.items()):
+            if os.path.exists(os.path.join(self.output_dir, output_name(name))):
+                continue
+            try:
+                modified = os.stat(os.path.join(self.tasks_dir, name)).st_mtime
+            except FileNotFoundError:
+                continue
+            if task_role(name) == AgentRole.REVIEW_AGENT and modified <= answered_at:
+                continue
+            del self.answered[name]
+            self.stats['rounds'] += 1
+            self._enqueue(name)
+
+    def _assign(self, now: float) -> None:
+        for role, queue in self.waiting.items():
+            limit = self.agents[role]
+            while queue and (limit is None or self.busy[role] < limit):
+                name = queue.popleft()
+                self.busy[role] += 1
+                heapq.heappush(self.due, (now + self.delays[role](), name))
+
+    def _write_due(self, now: float) -> None:
+        while self.due and self.due[0][0] <= now and self._take_token(now):
+            _, name = heapq.heappop(self.due)
+            role = task_role(name)
+            self.busy[role] -= 1
+
+            approve = role != AgentRole.REVIEW_AGENT or random.random() < self.config['approve_rate']
+            write_atomic(os.path.join(self.output_dir, output_name(name)),
+                         render_output(name, approve, self.config['output_bytes']))
+            self.answered[name] = time.time()
+            self.stats['answered'] += 1
+            if role == AgentRole.REVIEW_AGENT:
+                self.stats['approved' if approve else 'revisions'] += 1
+
+    def _take_token(self, now: float) -> bool:
+        if self._rate is None:
+            return True
+        self._tokens = min(self._rate, self._tokens + (now - self._refilled) * self._rate)
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+def write_atomic(path: str, content: str) -> None:
+    """Write through a temp file so the orchestrator never reads a partial output."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def enqueue_tasks(thursian_dir: str, count: int, tags: str = '') -> None:
+    """Append ``count`` synthetic tasks to the task inbox."""
+    prefix = f"[tags={tags}] " if tags else ''
+    with open(os.path.join(thursian_dir, 'task_queue.txt'), 'a') as f:
+        f.writelines(f"{prefix}Synthetic load task {n}\n" for n in range(1, count + 1))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Play fake coding and review agents against .thursian/')
+    parser.add_argument('--thursian-dir', default='.thursian', help='Path to .thursian directory')
+    parser.add_argument('--roles', default='coding_agent,review_agent',
+                        help='Comma-separated roles to play (default: both)')
+    parser.add_argument('--coding-delay', default='exp:1',
+                        help='Delay per coding task: fixed:S, uniform:A,B, exp:MEAN or normal:MEAN,SD '
+                             '(default: exp:1)')
+    parser.add_argument('--review-delay', default='exp:0.5', help='Delay per review (default: exp:0.5)')
+    parser.add_argument('--coding-agents', type=int, help='Concurrent fake coding agents (default: unlimited)')
+    parser.add_argument('--review-agents', type=int, help='Concurrent fake review agents (default: unlimited)')
+    parser.add_argument('--approve-rate', type=float, default=1.0,
+                        help='Fraction of reviews that approve; the rest ask for revision (default: 1.0)')
+    parser.add_argument('--output-bytes', type=int, default=0, help='Approximate size of written files')
+    parser.add_argument('--max-writes-per-second', type=float, help='Cap on answers written per second')
+    parser.add_argument('--poll-interval', type=float, default=0.05,
+                        help='Seconds between scans of tasks/ (default: 0.05)')
+    parser.add_argument('--enqueue', type=int, default=0, metavar='N', help='Append N synthetic tasks first')
+    parser.add_argument('--tags', default='', help='Tags for enqueued tasks, e.g. split')
+    parser.add_argument('--duration', type=float, help='Stop after this many seconds (default: run until Ctrl+C)')
+    parser.add_argument('--report-interval', type=float, default=10.0,
+                        help='Seconds between progress lines (default: 10)')
+    args = parser.parse_args(argv)
+
+    if args.enqueue:
+        os.makedirs(args.thursian_dir, exist_ok=True)
+        enqueue_tasks(args.thursian_dir, args.enqueue, args.tags)
+        print(f"[OK] Enqueued {args.enqueue} synthetic task(s)")
+
+    generator = LoadGenerator(args.thursian_dir, {
+        'roles': [AgentRole(role) for role in args.roles.split(',') if role],
+        'coding_delay': args.coding_delay,
+        'review_delay': args.review_delay,
+        'coding_agents': args.coding_agents,
+        'review_agents': args.review_agents,
+        'approve_rate': args.approve_rate,
+        'output_bytes': args.output_bytes,
+        'max_writes_per_second': args.max_writes_per_second,
+        'poll_interval': args.poll_interval,
+    })
+
+    start = time.monotonic()
+    next_report = start + args.report_interval
+
+    def should_stop(wait: float) -> bool:
+        nonlocal next_report
+        now = time.monotonic()
+        if now >= next_report:
+            stats = generator.stats
+            print(f"[...] {now - start:.0f}s: {stats['answered']} answered ({stats['approved']} approved, "
+                  f"{stats['revisions']} revisions), {generator.in_progress} in progress")
+            next_report = now + args.report_interval
+        if args.duration is not None and now - start >= args.duration:
+            return True
+        time.sleep(wait)
+        return False
+
+    print(f"[OK] Playing {args.roles} against {args.thursian_dir} (Ctrl+C to stop)")
+    try:
+        generator.run(should_stop)
+    except KeyboardInterrupt:
+        pass
+    print(f"\nLoad generator summary: {generator.stats}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+End-to-end orchestrator benchmark with simulated agents.
+
+Drives the real graph through WorkflowScheduler for a queue of N tasks while
+simulated agents answer them, and reports tasks/sec, per-phase latency
+percentiles, read/write syscalls per task and peak RSS. Each queue size runs
+in a fresh interpreter (with its own scratch .thursian dir and git repo) so
+peak RSS and process-wide caches are not shared between sizes.
+
+    python -m benchmarks.run_benchmarks --sizes 10,100,1000,10000,100000
+"""
+
+from typing import TypedDict, Dict, List, Optional
+from collections import defaultdict
+from contextlib import contextmanager, redirect_stdout
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:             # Windows
+    resource = None
+
+from orchestrator.admission import AdmissionController, _percentile
+from orchestrator.executor import get_executor, wait_for_agents
+from orchestrator.git_manager import CommitQueue
+from orchestrator.scheduler import WorkflowScheduler
+from orchestrator.state import AgentRole, WorkflowPhase
+from orchestrator.storage import STORAGE_BACKENDS, close_storage
+from orchestrator.timing import HistogramSnapshot, enable_timing, reset_timings, snapshot_timings, format_timings
+from .agents import HumanAgents, executor_config
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_DELAY = 'exp:0.02'
+PERCENTILES = (50, 90, 99)
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class PhaseLatency(TypedDict):
+    count: int
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+    max: Optional[float]
+
+
+class BenchmarkResult(TypedDict):
+    size: int
+    completed: int
+    failed: int
+    timed_out: bool
+    wall_seconds: float
+    tasks_per_second: float
+    phases: Dict[str, PhaseLatency]   # Phase name (and 'task', end to end) -> seconds
+    read_syscalls: Optional[int]
+    write_syscalls: Optional[int]
+    syscalls_per_task: Optional[float]
+    peak_rss_mb: Optional[float]
+    timings: Dict[str, HistogramSnapshot]   # Per node / I/O helper
+
+
+class _NoCommits(CommitQueue):
+    """Commit queue that drops phase commits, to benchmark without git."""
+
+    def flush(self) -> bool:
+        self._pending = []
+        return True
+
+
+def read_proc_io() -> Optional[Dict[str, int]]:
+    """Counters from /proc/self/io (Linux only), e.g. syscr and syscw."""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            return {key: int(value) for key, value in (line.split(':') for line in f if ':' in line)}
+    except OSError:
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+class _PhaseClock:
+    """Times how long each workflow stays in each phase, from scheduler passes."""
+
+    def __init__(self):
+        self.entered: Dict[str, tuple] = {}
+        self.started: Dict[str, float] = {}
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def observe(self, states, now: float) -> None:
+        for state in states:
+            workflow_id, phase = state['workflow_id'], state['current_phase']
+            previous = self.entered.get(workflow_id)
+            if previous is None:
+                self.started[workflow_id] = now
+            elif previous[0] != phase:
+                self.samples[previous[0].value].append(now - previous[1])
+
+            if phase in (WorkflowPhase.COMPLETED, WorkflowPhase.CANCELLED):
+                self.samples['task'].append(now - self.started.pop(workflow_id))
+                self.entered.pop(workflow_id, None)
+            else:
+                self.entered[workflow_id] = (phase, now)
+
+    def summary(self) -> Dict[str, PhaseLatency]:
+        return {
+            name: {
+                'count': len(samples),
+                **{f'p{pct}': _percentile(samples, pct) for pct in PERCENTILES},
+                'max': max(samples),
+            }
+            for name, samples in self.samples.items()
+        }
+
+
+@contextmanager
+def _workspace(git: bool):
+    """Scratch directory (the cwd for commit_phase), optionally a git repo."""
+    workdir = tempfile.mkdtemp(prefix='thursian_bench_')
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        if git:
+            for command in (['git', 'init', '-q'],
+                            ['git', 'config', 'user.email', 'bench@thursian.local'],
+                            ['git', 'config', 'user.name', 'Thursian Benchmark'],
+                            ['git', 'config', 'commit.gpgsign', 'false']):
+                subprocess.run(command, check=True, capture_output=True)
+        yield workdir
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_size(
+    size: int,
+    human_delay: str = DEFAULT_DELAY,
+    ai_delay: str = DEFAULT_DELAY,
+    ai_roles: Optional[List[AgentRole]] = None,
+    parallel: int = 32,
+    approve_rate: float = 1.0,
+    poll_interval: float = 0.01,
+    git: bool = True,
+    timeout: float = 600.0,
+    storage: str = 'local'
+) -> BenchmarkResult:
+    """
+    Run ``size`` queued tasks to completion and measure the orchestrator.
+
+    Args:
+        human_delay: Delay distribution for simulated human agents (see parse_delay)
+        ai_delay: Latency distribution for the simulated AI backend
+        ai_roles: Roles served by the AI executor; the rest are simulated humans
+        parallel: Maximum workflows in flight
+        approve_rate: Fraction of simulated human reviews that approve
+        poll_interval: Seconds between polls while every workflow waits on agents
+        git: Commit phase transitions to a scratch git repo (False drops commits)
+        timeout: Give up after this many seconds and report what finished
+        storage: Document storage backend; simulated humans run in another
+            process and read files, so any other backend needs every role
+            in ai_roles
+
+    Raises:
+        ValueError: If a non-file storage backend is combined with human roles
+    """
+    ai_roles = ai_roles or []
+    human_roles = [role for role in AgentRole if role not in ai_roles]
+    if storage != 'local' and human_roles:
+        raise ValueError(f"{storage} storage needs every role served by the AI executor "
+                         f"(human roles: {', '.join(role.value for role in human_roles)})")
+
+    with _workspace(git) as workdir:
+        thursian_dir = os.path.join(workdir, '.thursian')
+        os.makedirs(os.path.join(thursian_dir, 'tasks'))
+        with open(os.path.join(thursian_dir, 'task_queue.txt'), 'w') as f:
+            f.writelines(f"Benchmark task {n}\n" for n in range(1, size + 1))
+        if ai_roles:
+            with open(os.path.join(thursian_dir, 'executor.json'), 'w') as f:
+                json.dump(executor_config(ai_roles, ai_delay, parallel), f)
+        if storage != 'local':
+            with open(os.path.join(thursian_dir, 'storage.json'), 'w') as f:
+                json.dump({'backend': storage}, f)
+
+        humans = HumanAgents(thursian_dir, human_delay, human_roles, approve_rate)
+        humans.start()
+        scheduler = WorkflowScheduler(thursian_dir, admission=AdmissionController(max_in_flight=parallel))
+        if not git:
+            scheduler.commits = _NoCommits()
+        clock = _PhaseClock()
+
+        reset_timings()
+        enable_timing()
+        io_before = read_proc_io()
+        start = time.monotonic()
+        deadline = start + timeout
+        try:
+            while time.monotonic() < deadline:
+                clock.observe(scheduler.dispatch_ready(), time.monotonic())
+                if scheduler.idle():
+                    break
+
+                finished = len(scheduler.completed)
+                scheduler.step_all()
+                clock.observe([*scheduler.in_flight.values(), *scheduler.completed[finished:]],
+                              time.monotonic())
+                scheduler.end_pass()
+
+                if scheduler.in_flight and scheduler.all_waiting():
+                    wait_for_agents(thursian_dir, poll_interval)
+        finally:
+            wall = time.monotonic() - start
+            io_after = read_proc_io()
+            enable_timing(False)
+            scheduler.shutdown()
+            humans.stop()
+            executor = get_executor(thursian_dir)
+            if executor is not None:
+                executor.shutdown()
+            close_storage(thursian_dir)
+
+    completed = len(scheduler.completed)
+    reads = writes = per_task = None
+    if io_before is not None and io_after is not None:
+        reads = io_after['syscr'] - io_before['syscr']
+        writes = io_after['syscw'] - io_before['syscw']
+        per_task = (reads + writes) / completed if completed else None
+
+    return {
+        'size': size,
+        'completed': completed,
+        'failed': len(scheduler.failed),
+        'timed_out': completed + len(scheduler.failed) < size,
+        'wall_seconds': wall,
+        'tasks_per_second': completed / wall if wall else 0.0,
+        'phases': clock.summary(),
+        'read_syscalls': reads,
+        'write_syscalls': writes,
+        'syscalls_per_task': per_task,
+        'peak_rss_mb': peak_rss_mb(),
+        'timings': snapshot_timings(),
+    }
+
+
+def run_isolated(size: int, options: List[str]) -> BenchmarkResult:
+    """Run one size in a fresh interpreter and parse its JSON result."""
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.run_benchmarks', '--child', '--sizes', str(size), *options],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark for {size} tasks failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Plain-text tables of throughput and per-phase latency."""
+    def ms(value):
+        return '-' if value is None else f"{value * 1000:.1f}"
+
+    lines = [f"{'tasks':>8} {'done':>8} {'wall s':>8} {'tasks/s':>9} {'syscalls/task':>14} {'peak RSS MB':>12}"]
+    for r in results:
+        per_task = '-' if r['syscalls_per_task'] is None else f"{r['syscalls_per_task']:.0f}"
+        rss = '-' if r['peak_rss_mb'] is None else f"{r['peak_rss_mb']:.1f}"
+        flag = ' (timed out)' if r['timed_out'] else ''
+        lines.append(f"{r['size']:>8} {r['completed']:>8} {r['wall_seconds']:>8.2f} "
+                     f"{r['tasks_per_second']:>9.1f} {per_task:>14} {rss:>12}{flag}")
+
+    for r in results:
+        lines += ["", f"Phase latency, {r['size']} tasks (ms)",
+                  f"  {'phase':<12} {'count':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+        for name, latency in sorted(r['phases'].items()):
+            lines.append(f"  {name:<12} {latency['count']:>8} {ms(latency['p50']):>9} {ms(latency['p90']):>9} "
+                         f"{ms(latency['p99']):>9} {ms(latency['max']):>9}")
+        if r['timings']:
+            lines += ["", f"Node timings, {r['size']} tasks", format_timings(r['timings'])]
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the Thursian orchestrator with simulated agents')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help=f"Comma-separated queue sizes (default: {','.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--human-delay', default=DEFAULT_DELAY,
+                        help=f'Human agent delay: fixed:S, uniform:A,B, exp:MEAN or normal:MEAN,SD '
+                             f'(default: {DEFAULT_DELAY})')
+    parser.add_argument('--ai-delay', default=DEFAULT_DELAY, help='AI agent latency distribution')
+    parser.add_argument('--ai-roles', default='',
+                        help='Comma-separated roles served by the simulated AI backend, e.g. review_agent')
+    parser.add_argument('--parallel', type=int, default=32, help='Maximum workflows in flight (default: 32)')
+    parser.add_argument('--approve-rate', type=float, default=1.0,
+                        help='Fraction of human reviews that approve; the rest ask for revision (default: 1.0)')
+    parser.add_argument('--poll-interval', type=float, default=0.01,
+                        help='Seconds between polls (default: 0.01)')
+    parser.add_argument('--no-git', action='store_true', help='Drop phase commits instead of running git')
+    parser.add_argument('--timeout', type=float, default=600.0, help='Seconds allowed per size (default: 600)')
+    parser.add_argument('--storage', choices=sorted(STORAGE_BACKENDS), default='local',
+                        help='Document storage backend; non-file backends need --ai-roles to cover every role')
+    parser.add_argument('--json', metavar='PATH', help='Also write the results to PATH as JSON')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    ai_roles = [AgentRole(role) for role in args.ai_roles.split(',') if role]
+    if args.storage != 'local' and set(ai_roles) != set(AgentRole):
+        parser.error(f"--storage {args.storage} needs --ai-roles to cover every role "
+                     f"({','.join(role.value for role in AgentRole)})")
+
+    if args.child:
+        logging.basicConfig(level=logging.WARNING)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            result = run_size(sizes[0], args.human_delay, args.ai_delay, ai_roles, args.parallel,
+                              args.approve_rate, args.poll_interval, not args.no_git, args.timeout,
+                              args.storage)
+        print(json.dumps(result))
+        return 0
+
+    options = [f'--human-delay={args.human_delay}', f'--ai-delay={args.ai_delay}',
+               f'--ai-roles={args.ai_roles}', f'--parallel={args.parallel}', f'--approve-rate={args.approve_rate}',
+               f'--poll-interval={args.poll_interval}', f'--timeout={args.timeout}', f'--storage={args.storage}']
+    if args.no_git:
+        options.append('--no-git')
+
+    results: List[BenchmarkResult] = []
+    for size in sizes:
+        print(f"[...] Benchmarking {size} tasks")
+        results.append(run_isolated(size, options))
+
+    print()
+    print(format_results(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[OK] Results written to {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
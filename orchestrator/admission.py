@@ -0,0 +1,172 @@
+"""Admission control and backpressure for concurrent workflows."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import Counter, deque
+from datetime import datetime
+import json
+import logging
+import os
+
+from .state import ThursianState, WorkflowPhase, AgentRole
+
+logger = logging.getLogger(__name__)
+
+# Role a not-yet-assigned task will occupy once admitted
+DEFAULT_INTAKE_ROLE = AgentRole.CODING_AGENT
+
+# Queue wait samples kept for percentile reporting
+WAIT_SAMPLE_SIZE = 1000
+
+
+def active_role(state: ThursianState) -> AgentRole:
+    """Agent role a workflow is currently occupying."""
+    if state['current_phase'] == WorkflowPhase.VALIDATION and state.get('validator_agent'):
+        return state['validator_agent']
+    return state.get('primary_agent') or DEFAULT_INTAKE_ROLE
+
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class AdmissionController:
+    """
+    Decide how many queued tasks may start on each scheduler pass.
+
+    Intake is capped by total in-flight workflows and by in-flight workflows
+    per agent role, and stops entirely while the validation backlog or the
+    pending git commit backlog is above its threshold. Queue wait time and
+    per-reason rejection counts are kept for export.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 4,
+        role_limits: Optional[Dict[AgentRole, int]] = None,
+        max_validation_backlog: Optional[int] = None,
+        max_commit_backlog: Optional[int] = None
+    ):
+        self.max_in_flight = max_in_flight
+        self.role_limits = role_limits or {}
+        self.max_validation_backlog = max_validation_backlog
+        self.max_commit_backlog = max_commit_backlog
+
+        self.admitted = 0
+        self.rejections: Counter = Counter()
+        self._wait_samples: deque = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._wait_total = 0.0
+        self._wait_count = 0
+        self._last_throttle: Optional[str] = None
+
+    def available_slots(
+        self,
+        in_flight: Iterable[ThursianState],
+        commit_backlog: int = 0
+    ) -> Tuple[int, Optional[str]]:
+        """
+        Compute how many new tasks may be admitted right now.
+
+        Args:
+            in_flight: States of workflows currently running
+            commit_backlog: Pending git commits
+
+        Returns:
+            (slots, reason) where reason names the limit that bounds slots
+        """
+        in_flight = list(in_flight)
+
+        if self.max_commit_backlog is not None and commit_backlog > self.max_commit_backlog:
+            return 0, 'commit_backlog'
+
+        validation_backlog = sum(
+            1 for state in in_flight if state['current_phase'] == WorkflowPhase.VALIDATION
+        )
+        if self.max_validation_backlog is not None and validation_backlog > self.max_validation_backlog:
+            return 0, 'validation_backlog'
+
+        slots = self.max_in_flight - len(in_flight)
+        reason = 'max_in_flight'
+
+        busy = Counter(active_role(state) for state in in_flight)
+        for role, cap in self.role_limits.items():
+            role_slots = cap - busy[role]
+            if role != DEFAULT_INTAKE_ROLE and role_slots <= 0:
+                # Downstream role saturated: new work would only pile up there
+                return 0, f'role_limit:{role.value}'
+            if role == DEFAULT_INTAKE_ROLE and role_slots < slots:
+                slots = role_slots
+                reason = f'role_limit:{role.value}'
+
+        return max(slots, 0), reason
+
+    def record_pass(self, ready: int, admitted: List[ThursianState], reason: Optional[str]) -> None:
+        """Record the outcome of one dispatch pass."""
+        self.admitted += len(admitted)
+        for state in admitted:
+            wait = state.get('queue_wait_seconds')
+            if wait is not None:
+                self._wait_samples.append(wait)
+                self._wait_total += wait
+                self._wait_count += 1
+
+        if reason and ready > len(admitted):
+            self.rejections[reason] += 1
+            if reason != self._last_throttle:
+                logger.info(f"Intake throttled by {reason} ({ready - len(admitted)} ready task(s) held)")
+        self._last_throttle = reason if ready > len(admitted) else None
+
+    def snapshot(self) -> Dict[str, object]:
+        """Metrics suitable for status export."""
+        samples = list(self._wait_samples)
+        return {
+            'admitted': self.admitted,
+            'rejections': dict(self.rejections),
+            'throttled_by': self._last_throttle,
+            'queue_wait_seconds': {
+                'mean': self._wait_total / self._wait_count if self._wait_count else None,
+                'p50': _percentile(samples, 50),
+                'p95': _percentile(samples, 95),
+                'max': max(samples) if samples else None,
+            },
+            'limits': {
+                'max_in_flight': self.max_in_flight,
+                'role_limits': {role.value: cap for role, cap in self.role_limits.items()},
+                'max_validation_backlog': self.max_validation_backlog,
+                'max_commit_backlog': self.max_commit_backlog,
+            },
+        }
+
+    def write_snapshot(self, thursian_dir: str, in_flight: Iterable[ThursianState], commit_backlog: int) -> None:
+        """Write metrics and current load to .thursian/admission.json."""
+        in_flight = list(in_flight)
+        snapshot = {
+            **self.snapshot(),
+            'in_flight': len(in_flight),
+            'in_flight_by_role': dict(Counter(active_role(state).value for state in in_flight)),
+            'validation_backlog': sum(
+                1 for state in in_flight if state['current_phase'] == WorkflowPhase.VALIDATION
+            ),
+            'commit_backlog': commit_backlog,
+            'last_updated': datetime.now().isoformat(),
+        }
+        with open(os.path.join(thursian_dir, 'admission.json'), 'w') as f:
+            json.dump(snapshot, f, indent=2)
+
+
+def parse_role_limits(specs: Iterable[str]) -> Dict[AgentRole, int]:
+    """Parse ``role=N`` CLI specs into per-role caps."""
+    limits: Dict[AgentRole, int] = {}
+    for spec in specs:
+        role, sep, value = spec.partition('=')
+        if not sep:
+            raise ValueError(f"Role limit must look like role=N: {spec}")
+        try:
+            limits[AgentRole(role.strip())] = int(value)
+        except ValueError:
+            roles = ', '.join(r.value for r in AgentRole)
+            raise ValueError(f"Bad role limit {spec} (role is one of {roles}, N an integer)") from None
+    return limits
@@ -0,0 +1,247 @@
+"""Agent pool registry with capacity-aware assignment."""
+
+from typing import TypedDict, Dict, List, Optional, Any
+from datetime import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+from .state import AgentRole, ThursianState
+from .quorum import CANCELLED as REVIEW_CANCELLED
+from .decomposition import PENDING as SUBTASK_PENDING
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ('least_loaded', 'weighted')
+
+
+class AgentInstance(TypedDict):
+    """A named agent (human or AI) serving one role."""
+    name: str
+    role: AgentRole
+    slots: Optional[int]          # Concurrent tasks; None means unlimited
+    weight: float
+    in_use: int
+
+
+class AgentPool:
+    """
+    Registry of agent instances per role with concurrency slots and heartbeats.
+
+    Configured by ``.thursian/agents.json``::
+
+        {
+          "strategy": "least_loaded",
+          "heartbeat_timeout": 600,
+          "agents": [
+            {"name": "alice", "role": "coding_agent", "slots": 2},
+            {"name": "bob", "role": "review_agent", "slots": 1, "weight": 2}
+          ]
+        }
+
+    Without a config file the pool holds one unlimited instance per role,
+    which reproduces the fixed role assignment. When ``heartbeat_timeout``
+    is set, an instance is only eligible if its heartbeat file
+    (``.thursian/heartbeats/<name>``) was touched within that many seconds.
+    """
+
+    def __init__(self, thursian_dir: str):
+        self.thursian_dir = thursian_dir
+        self.config_file = os.path.join(thursian_dir, 'agents.json')
+        self.heartbeat_dir = os.path.join(thursian_dir, 'heartbeats')
+
+        self.strategy = 'least_loaded'
+        self.heartbeat_timeout: Optional[float] = None
+        self._agents: Dict[str, AgentInstance] = {}
+        self._by_role: Dict[AgentRole, List[str]] = {}
+        self._leases: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+        self._load_config()
+
+    def acquire(self, role: AgentRole, task_id: str) -> Optional[str]:
+        """
+        Lease a slot on the best available instance of a role.
+
+        Args:
+            role: Role the task needs
+            task_id: Task holding the lease (released by release())
+
+        Returns:
+            Instance name, or None if every live instance is at capacity
+        """
+        with self._lock:
+            candidates = [
+                self._agents[name] for name in self._by_role.get(role, [])
+                if self._has_capacity(self._agents[name]) and self.is_alive(name)
+            ]
+            if not candidates:
+                return None
+
+            agent = min(candidates, key=self._score)
+            agent['in_use'] += 1
+            self._leases.setdefault(task_id, []).append(agent['name'])
+            logger.info(f"Leased {agent['name']} ({role.value}) for {task_id}")
+            return agent['name']
+
+    def release(self, task_id: str, name: Optional[str] = None) -> None:
+        """Release a task's lease on one instance, or all of its leases."""
+        with self._lock:
+            leased = self._leases.get(task_id, [])
+            for agent_name in [name] if name else list(leased):
+                if agent_name in leased:
+                    leased.remove(agent_name)
+                    self._agents[agent_name]['in_use'] -= 1
+            if not leased:
+                self._leases.pop(task_id, None)
+
+    def restore(self, task_id: str, names: List[str]) -> None:
+        """
+        Re-take leases a task held before a restart (see held_instances).
+
+        Leases are kept in memory only, so a resumed workflow has to claim its
+        instances again. Capacity is not checked: the work is already assigned.
+        Leases the task still holds in this process are not taken twice.
+        """
+        with self._lock:
+            held = list(self._leases.get(task_id, []))
+            for name in names:
+                if name in held:
+                    held.remove(name)
+                    continue
+                if name not in self._agents:
+                    logger.warning(f"Resumed task {task_id} held unknown agent {name}, not restoring its lease")
+                    continue
+                self._agents[name]['in_use'] += 1
+                self._leases.setdefault(task_id, []).append(name)
+
+    def heartbeat(self, name: str) -> None:
+        """Record that an instance is alive."""
+        if name not in self._agents:
+            raise KeyError(f"Unknown agent: {name}")
+        os.makedirs(self.heartbeat_dir, exist_ok=True)
+        path = os.path.join(self.heartbeat_dir, name)
+        with open(path, 'a'):
+            os.utime(path)
+
+    def is_alive(self, name: str) -> bool:
+        """Whether an instance's heartbeat is recent enough for new work."""
+        if self.heartbeat_timeout is None:
+            return True
+        try:
+            age = time.time() - os.path.getmtime(os.path.join(self.heartbeat_dir, name))
+        except OSError:
+            return False
+        return age <= self.heartbeat_timeout
+
+    def free_slots(self, role: AgentRole) -> Optional[int]:
+        """Unleased slots for a role across live instances (None if unlimited)."""
+        total = 0
+        for name in self._by_role.get(role, []):
+            agent = self._agents[name]
+            if not self.is_alive(name):
+                continue
+            if agent['slots'] is None:
+                return None
+            total += max(agent['slots'] - agent['in_use'], 0)
+        return total
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-instance load for status export."""
+        return {
+            'strategy': self.strategy,
+            'agents': [
+                {
+                    'name': agent['name'],
+                    'role': agent['role'].value,
+                    'slots': agent['slots'],
+                    'in_use': agent['in_use'],
+                    'alive': self.is_alive(agent['name']),
+                }
+                for agent in self._agents.values()
+            ],
+            'last_updated': datetime.now().isoformat(),
+        }
+
+    def write_snapshot(self) -> None:
+        """Write per-instance load to .thursian/agent_pool.json."""
+        with open(os.path.join(self.thursian_dir, 'agent_pool.json'), 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def _has_capacity(self, agent: AgentInstance) -> bool:
+        return agent['slots'] is None or agent['in_use'] < agent['slots']
+
+    def _score(self, agent: AgentInstance) -> float:
+        if self.strategy == 'weighted':
+            return agent['in_use'] / agent['weight']
+        if agent['slots'] is None:
+            return float(agent['in_use'])
+        return agent['in_use'] / agent['slots']
+
+    def _register(self, agent: AgentInstance) -> None:
+        if agent['name'] in self._agents:
+            raise ValueError(f"Duplicate agent name: {agent['name']}")
+        self._agents[agent['name']] = agent
+        self._by_role.setdefault(agent['role'], []).append(agent['name'])
+
+    def _load_config(self) -> None:
+        if not os.path.exists(self.config_file):
+            for role in AgentRole:
+                self._register({
+                    'name': role.value, 'role': role, 'slots': None, 'weight': 1.0, 'in_use': 0
+                })
+            return
+
+        with open(self.config_file, 'r') as f:
+            config = json.load(f)
+
+        self.strategy = config.get('strategy', 'least_loaded')
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown assignment strategy: {self.strategy}")
+        self.heartbeat_timeout = config.get('heartbeat_timeout')
+
+        for entry in config.get('agents', []):
+            self._register({
+                'name': entry['name'],
+                'role': AgentRole(entry['role']),
+                'slots': entry.get('slots', 1),
+                'weight': float(entry.get('weight', 1.0)),
+                'in_use': 0,
+            })
+
+        logger.info(f"Loaded agent pool: {len(self._agents)} instance(s), strategy={self.strategy}")
+
+
+_pools: Dict[str, AgentPool] = {}
+
+
+def held_instances(state: ThursianState) -> List[str]:
+    """
+    Instances a workflow state holds pool leases on.
+
+    The primary lease lasts until completion; the validator and reviewer
+    leases until the round is decided (cancelled reviewers are released
+    early); extra subtask leases until the subtasks are merged.
+    """
+    names = []
+    if state.get('primary_agent_instance'):
+        names.append(state['primary_agent_instance'])
+    if state.get('validator_agent_instance'):
+        names.append(state['validator_agent_instance'])
+    for verdict in (state.get('review_verdicts') or {}).values():
+        if verdict and verdict['status'] != REVIEW_CANCELLED:
+            names.append(verdict['instance'])
+    subtasks = [subtask for subtask in (state.get('subtasks') or {}).values() if subtask]
+    if any(subtask['status'] == SUBTASK_PENDING for subtask in subtasks):
+        names += [subtask['instance'] for subtask in subtasks if subtask['leased']]
+    return names
+
+
+def get_agent_pool(thursian_dir: str) -> AgentPool:
+    """Return the process-wide AgentPool for a .thursian directory."""
+    key = os.path.abspath(thursian_dir)
+    if key not in _pools:
+        _pools[key] = AgentPool(thursian_dir)
+    return _pools[key]
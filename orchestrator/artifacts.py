@@ -0,0 +1,253 @@
+"""Content-addressed blob store for archived task artifacts."""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+from collections import Counter
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_CONFIG = 'artifacts.json'
+ARTIFACTS_DIR = 'artifacts'
+OBJECTS_DIR = 'objects'
+PACKS_DIR = 'packs'
+RECORDS_DIR = 'tasks'
+
+DEFAULT_PACK_THRESHOLD = 16 * 1024
+
+
+class CorruptArtifactError(Exception):
+    """A stored blob no longer matches its content address."""
+
+
+def artifact_digest(content: Union[str, bytes]) -> str:
+    """Content address of an artifact (sha256 of its UTF-8 bytes)."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class ArtifactStore:
+    """
+    Deduplicating blob store keyed by content hash.
+
+    Blobs are zlib-compressed. Ones of at least ``pack_threshold`` bytes are
+    stored loose under ``objects/<digest[:2]>/<digest>``; the smaller blobs
+    of one put_many call are written together as a new pack,
+    ``packs/<pack digest>.pack`` (per blob a ``<digest> <length>`` header
+    line followed by the compressed bytes). Packs and objects are written
+    once and never modified, so a git checkout of .thursian stores each of
+    them exactly once. Storing content that is already present only bumps a
+    counter. The in-memory index is rebuilt from a directory scan on
+    startup.
+
+    Every read re-hashes the blob, so a damaged object raises
+    CorruptArtifactError instead of returning the wrong content.
+    """
+
+    def __init__(self, root: str, pack_threshold: int = DEFAULT_PACK_THRESHOLD):
+        self.root = root
+        self.pack_threshold = pack_threshold
+        self.stats: Counter = Counter()
+
+        # digest -> (pack path, offset, length) for packed blobs, None for loose ones
+        self._index: Dict[str, Optional[Tuple[str, int, int]]] = {}
+        self._packs = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def put(self, content: Union[str, bytes]) -> str:
+        """Store content (once) and return its digest."""
+        return self.put_many([content])[0]
+
+    def put_many(self, contents: List[Union[str, bytes]]) -> List[str]:
+        """Store several blobs, packing the small new ones together; returns their digests."""
+        blobs = [content.encode('utf-8') if isinstance(content, str) else content for content in contents]
+        digests = [artifact_digest(content) for content in blobs]
+
+        with self._lock:
+            pack: Dict[str, bytes] = {}
+            for digest, content in zip(digests, blobs):
+                if digest in self._index or digest in pack:
+                    self.stats['deduplicated'] += 1
+                    continue
+                data = zlib.compress(content)
+                if len(content) >= self.pack_threshold:
+                    _write_once(self._object_path(digest), data)
+                    self._index[digest] = None
+                    self._bytes += len(data)
+                else:
+                    pack[digest] = data
+                self.stats['stores'] += 1
+
+            if pack:
+                self._write_pack(pack)
+        return digests
+
+    def get(self, digest: str) -> bytes:
+        """Content stored under digest; KeyError if unknown."""
+        with self._lock:
+            location = self._index[digest]
+
+        if location is None:
+            with open(self._object_path(digest), 'rb') as f:
+                data = f.read()
+        else:
+            pack, offset, length = location
+            with open(pack, 'rb') as f:
+                f.seek(offset)
+                data = f.read(length)
+
+        try:
+            content = zlib.decompress(data)
+        except zlib.error as e:
+            raise CorruptArtifactError(f"Artifact {digest} is unreadable: {e}") from e
+        if artifact_digest(content) != digest:
+            raise CorruptArtifactError(f"Artifact {digest} does not match its content")
+        return content
+
+    def get_text(self, digest: str) -> str:
+        """Content stored under digest, decoded as UTF-8."""
+        return self.get(digest).decode('utf-8')
+
+    def verify(self) -> List[str]:
+        """Digests of blobs that are missing or no longer match their content."""
+        with self._lock:
+            digests = list(self._index)
+
+        corrupt = []
+        for digest in digests:
+            try:
+                self.get(digest)
+            except (OSError, CorruptArtifactError):
+                corrupt.append(digest)
+        return corrupt
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Blob counts, stored bytes and dedup counters."""
+        with self._lock:
+            packed = sum(1 for location in self._index.values() if location is not None)
+            return {
+                'blobs': len(self._index),
+                'loose': len(self._index) - packed,
+                'packed': packed,
+                'packs': self._packs,
+                'bytes': self._bytes,
+                'stores': self.stats['stores'],
+                'deduplicated': self.stats['deduplicated'],
+            }
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, OBJECTS_DIR, digest[:2], digest)
+
+    def _write_pack(self, blobs: Dict[str, bytes]) -> None:
+        chunks = []
+        for digest, data in blobs.items():
+            chunks.append(f"{digest} {len(data)}\n".encode('ascii'))
+            chunks.append(data)
+        content = b''.join(chunks)
+        path = os.path.join(self.root, PACKS_DIR, f"{artifact_digest(content)}.pack")
+        _write_once(path, content)
+        self._packs += 1
+        self._index_pack(path, content)
+
+    def _index_pack(self, path: str, content: bytes) -> None:
+        position = 0
+        while position < len(content):
+            end = content.find(b'\n', position)
+            try:
+                digest, length = content[position:end].decode('ascii').split()
+                length = int(length)
+                if end < 0 or end + 1 + length > len(content):
+                    raise ValueError("record runs past the end of the pack")
+            except ValueError:
+                logger.warning(f"Skipping malformed records in {path} from byte {position}")
+                return
+            self._index[digest] = (path, end + 1, length)
+            self._bytes += length
+            position = end + 1 + length
+
+    def _load_index(self) -> None:
+        packs_dir = os.path.join(self.root, PACKS_DIR)
+        if os.path.isdir(packs_dir):
+            for item in os.scandir(packs_dir):
+                if item.name.endswith('.pack'):
+                    with open(item.path, 'rb') as f:
+                        self._index_pack(item.path, f.read())
+                    self._packs += 1
+
+        objects_dir = os.path.join(self.root, OBJECTS_DIR)
+        if os.path.isdir(objects_dir):
+            for shard in os.scandir(objects_dir):
+                if not shard.is_dir():
+                    continue
+                for item in os.scandir(shard.path):
+                    if not item.name.endswith('.tmp'):
+                        self._index[item.name] = None
+                        self._bytes += item.stat().st_size
+
+        if self._index:
+            logger.info(f"Loaded artifact store: {len(self._index)} blobs in {self._packs} pack(s), "
+                        f"{self._bytes} bytes")
+
+
+_stores: Dict[str, Optional[ArtifactStore]] = {}
+_stores_lock = threading.Lock()
+
+
+def get_artifact_store(thursian_dir: str) -> Optional[ArtifactStore]:
+    """
+    Return the process-wide artifact store for .thursian/artifacts.json.
+
+    The config may set ``pack_threshold`` (bytes) or ``"enabled": false``. Without a config revision rounds are archived as
+    plain ``_rN`` documents and this returns None.
+    """
+    key = os.path.abspath(thursian_dir)
+    if key in _stores:
+        return _stores[key]
+
+    with _stores_lock:
+        if key not in _stores:
+            path = os.path.join(thursian_dir, ARTIFACTS_CONFIG)
+            store = None
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    config = json.load(f)
+                if config.get('enabled', True):
+                    store = ArtifactStore(
+                        os.path.join(thursian_dir, ARTIFACTS_DIR),
+                        pack_threshold=int(config.get('pack_threshold', DEFAULT_PACK_THRESHOLD))
+                    )
+            _stores[key] = store
+        return _stores[key]
+
+
+def forget_artifact_store(thursian_dir: str) -> None:
+    """Drop the cached store for a .thursian dir (the next lookup reloads the config)."""
+    with _stores_lock:
+        _stores.pop(os.path.abspath(thursian_dir), None)
+
+
+def record_path(thursian_dir: str, task_id: str) -> str:
+    """Path of a task's artifact record (archived document path -> blob)."""
+    return os.path.join(thursian_dir, ARTIFACTS_DIR, RECORDS_DIR, f"{task_id}.json")
+
+
+def _write_once(path: str, data: bytes) -> None:
+    """Atomically create an immutable file (its name is derived from its content)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,185 @@
+"""Cancellation and preemption of in-flight workflows."""
+
+from typing import TypedDict, Any, List, Optional
+from datetime import datetime
+import json
+import logging
+import os
+
+from .state import ThursianState, WorkflowPhase
+from .helpers import transition_phase, add_decision_log, write_decision_log_to_file, update_status_file
+from .task_queue import get_task_queue, file_lock, parse_priority, priority_name, QueuedTask, DEFAULT_PRIORITY
+from .agent_pool import get_agent_pool
+from .executor import get_executor
+from .storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+CONTROL_FILE = 'control.jsonl'
+CONTROL_OPS = ('cancel', 'preempt')
+
+
+class ControlCommand(TypedDict):
+    """
+    A request to stop an in-flight workflow.
+
+    ``preempt`` is a cancel that re-queues the task, optionally at a
+    different priority.
+    """
+    op: str
+    task: str                     # Task id, queue key or workflow id
+    priority: Optional[int]       # Re-queue priority (default: the original)
+    reason: Optional[str]
+
+
+def send_command(
+    thursian_dir: str,
+    op: str,
+    task: str,
+    priority: Optional[int] = None,
+    reason: Optional[str] = None
+) -> ControlCommand:
+    """Append a command to .thursian/control.jsonl for the running orchestrator."""
+    if op not in CONTROL_OPS:
+        raise ValueError(f"Unknown control command: {op}")
+    command: ControlCommand = {'op': op, 'task': task, 'priority': priority, 'reason': reason}
+
+    os.makedirs(thursian_dir, exist_ok=True)
+    path = os.path.join(thursian_dir, CONTROL_FILE)
+    with file_lock(f"{path}.lock"):
+        with open(path, 'a') as f:
+            f.write(json.dumps(command) + '\n')
+    return command
+
+
+def drain_commands(thursian_dir: str) -> List[ControlCommand]:
+    """Take every pending command from the control file, leaving it empty."""
+    path = os.path.join(thursian_dir, CONTROL_FILE)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return []
+
+    with file_lock(f"{path}.lock"):
+        with open(path, 'r') as f:
+            lines = f.readlines()
+        with open(path, 'w'):
+            pass
+
+    commands = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            if entry.get('op') not in CONTROL_OPS or not entry.get('task'):
+                raise ValueError(f"expected op in {CONTROL_OPS} and a task")
+            priority = entry.get('priority')
+            if isinstance(priority, str):
+                priority = parse_priority(priority)
+        except ValueError as e:
+            logger.warning(f"Ignoring bad control command {line.strip()!r}: {e}")
+            continue
+        commands.append({
+            'op': entry['op'],
+            'task': str(entry['task']),
+            'priority': priority,
+            'reason': entry.get('reason'),
+        })
+    return commands
+
+
+def matches(state: ThursianState, task: str) -> bool:
+    """Whether a command's task reference names this workflow."""
+    return task in (state.get('current_task_id'), state.get('task_key'), state['workflow_id'])
+
+
+def cancel_workflow(
+    state: ThursianState,
+    reason: Optional[str] = None,
+    requeue: bool = False,
+    priority: Optional[int] = None
+) -> ThursianState:
+    """
+    Move an in-flight workflow to the terminal CANCELLED phase.
+
+    Releases the task's agent pool leases, cancels its outstanding AI
+    requests, stops watching its files and marks its task files so human
+    agents can stop. With ``requeue`` the task goes back on the queue under
+    its original key (so dependents still wait for it), at ``priority`` or
+    its original priority. Other workflows are untouched.
+
+    Returns:
+        The cancelled state
+    """
+    task_id = state.get('current_task_id')
+    thursian_dir = state['thursian_dir']
+    reason = reason or "Cancelled by operator"
+
+    if task_id:
+        get_agent_pool(thursian_dir).release(task_id)
+
+    watched = _workflow_files(state)
+    executor = get_executor(thursian_dir)
+    if executor is not None:
+        for path in watched:
+            executor.cancel(path)
+    storage = get_storage(thursian_dir)
+    storage.forget(watched)
+
+    for path in _task_files(state):
+        if storage.exists(path):
+            storage.append(path, f"\n## Cancelled\n\n{reason} ({datetime.now().isoformat()}). No action needed.\n")
+
+    requeued: Optional[QueuedTask] = None
+    if requeue and state.get('task_description'):
+        if priority is None:
+            priority = state.get('task_priority')
+        requeued = get_task_queue(thursian_dir).push(
+            state['task_description'],
+            priority=DEFAULT_PRIORITY if priority is None else priority,
+            tags=state.get('task_tags') or [],
+            key=state.get('task_key')
+        )
+
+    outcome = f"Workflow cancelled in phase {state['current_phase'].value}"
+    if requeued is not None:
+        outcome += f"; re-queued as {requeued['key']} at priority {priority_name(requeued['priority'])}"
+
+    update = {
+        **transition_phase(state, WorkflowPhase.CANCELLED),
+        **add_decision_log(state, reasoning=reason, outcome=outcome, tool_used="cancellation"),
+        'waiting_for_human': False
+    }
+    cancelled: ThursianState = {
+        **state,
+        **update,
+        'phase_history': state.get('phase_history', []) + update['phase_history'],
+        'decision_logs': state.get('decision_logs', []) + update['decision_logs'],
+    }
+
+    write_decision_log_to_file(cancelled)
+    update_status_file(cancelled)
+    logger.info(f"{outcome} ({task_id or state['workflow_id']}): {reason}")
+    print(f"\n[!] CANCELLED: {task_id or state['workflow_id']} - {reason}")
+    if requeued is not None:
+        print(f"Re-queued at priority {priority_name(requeued['priority'])}")
+    print()
+
+    return cancelled
+
+
+def _workflow_files(state: ThursianState) -> List[str]:
+    """Output files the workflow (or its AI agents) may still be writing."""
+    paths = [state.get('output_file_path'), state.get('validation_file_path')]
+    paths += [verdict['validation_file'] for verdict in (state.get('review_verdicts') or {}).values()]
+    paths += [subtask['output_file'] for subtask in (state.get('subtasks') or {}).values()]
+    return [path for path in paths if path]
+
+
+def _task_files(state: ThursianState) -> List[str]:
+    """Task files handed to agents for the workflow's current round."""
+    paths: List[Any] = [state.get('task_file_path')]
+    if state['current_phase'] == WorkflowPhase.VALIDATION and state.get('current_task_id'):
+        paths.append(os.path.join(state['thursian_dir'], 'tasks', f"{state['current_task_id']}_validation.md"))
+    paths += [verdict['task_file'] for verdict in (state.get('review_verdicts') or {}).values()]
+    paths += [subtask['task_file'] for subtask in (state.get('subtasks') or {}).values()]
+    return [path for path in paths if path]
@@ -0,0 +1,52 @@
+"""Splitting large tasks into subtasks and merging their outputs."""
+
+from typing import Dict, List, Optional
+import re
+
+from .state import Subtask
+
+# Task tag that asks for a task to be split into parallel subtasks
+SPLIT_TAG = 'split'
+SEPARATOR = ';'
+MAX_SUBTASKS = 8
+
+PENDING = 'pending'
+COMPLETE = 'complete'
+
+# "Status: COMPLETE", "**Status: COMPLETE**" and similar marker lines
+_STATUS_LINE = re.compile(r'^\W*Status:.*$\n?', re.MULTILINE)
+
+
+def split_task(description: Optional[str], tags: Optional[List[str]]) -> List[str]:
+    """
+    Subtask descriptions for a task tagged ``split``.
+
+    Parts are separated by semicolons; anything beyond MAX_SUBTASKS is folded
+    into the last subtask. Returns an empty list when the task isn't tagged
+    or has a single part, meaning it runs as one task.
+    """
+    if not description or SPLIT_TAG not in (tags or []):
+        return []
+
+    parts = [part.strip() for part in description.split(SEPARATOR) if part.strip()]
+    if len(parts) < 2:
+        return []
+    if len(parts) > MAX_SUBTASKS:
+        parts[MAX_SUBTASKS - 1:] = [f"{SEPARATOR} ".join(parts[MAX_SUBTASKS - 1:])]
+    return parts
+
+
+def merge_outputs(task_id: str, subtasks: Dict[str, Subtask], outputs: Dict[str, str]) -> str:
+    """
+    Combine subtask outputs into the parent task's output.
+
+    Each part keeps its content under its own heading with the part's status
+    line removed; the merged file carries a single COMPLETE marker so
+    validation reviews the task as a whole.
+    """
+    sections = [f"# Task Output: {task_id}\n\nMerged from {len(subtasks)} subtasks.\n"]
+    for slot in sorted(subtasks, key=int):
+        body = _STATUS_LINE.sub('', outputs[slot]).strip()
+        sections.append(f"## Part {slot}: {subtasks[slot]['description']}\n\n{body}\n")
+    sections.append("**Status: COMPLETE**\n")
+    return "\n".join(sections)
@@ -0,0 +1,495 @@
+"""Pluggable AI agent executor with bounded concurrency and rate limiting."""
+
+from typing import TypedDict, Any, AsyncIterator, Callable, Awaitable, Deque, Dict, Optional, Set, Type
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+from .state import AgentRole
+from .response_cache import ResponseCache, cache_from_config, cache_key
+from .storage import StorageBackend, LocalStorage, get_storage
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 30.0
+
+# First line of an output file while a response is still streaming in
+STREAMING_MARKER = "**Status: IN_PROGRESS**"
+
+
+class AgentRequest(TypedDict):
+    """One agent invocation."""
+    task_id: str
+    role: AgentRole
+    system_prompt: str
+    prompt: str
+    cache_input: str              # Stable task content the response depends on
+    bypass_cache: bool
+
+
+class RetryableError(Exception):
+    """Transient backend failure (rate limited, timeout, overloaded) worth retrying."""
+
+
+class ConnectionPool:
+    """
+    Async pool of reusable backend connections.
+
+    At most ``max_size`` connections exist at once; idle ones are reused.
+    A connection whose request raised is discarded instead of being reused.
+    """
+
+    def __init__(self, factory: Callable[[], Awaitable[Any]], max_size: int):
+        self._factory = factory
+        self._idle: Deque[Any] = deque()
+        self._slots = asyncio.Semaphore(max_size)
+        self.created = 0
+
+    @asynccontextmanager
+    async def connection(self):
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._new()
+            try:
+                yield conn
+            except BaseException:
+                await _close(conn)
+                raise
+            self._idle.append(conn)
+
+    async def close(self) -> None:
+        while self._idle:
+            await _close(self._idle.pop())
+
+    async def _new(self) -> Any:
+        self.created += 1
+        return await self._factory()
+
+
+async def _close(conn: Any) -> None:
+    close = getattr(conn, 'aclose', None)
+    if close is not None:
+        await close()
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Exponential backoff with full jitter for retry ``attempt`` (1-based)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+class AgentBackend:
+    """
+    Base class for agent providers.
+
+    Subclasses implement connect() (open a client/session, pooled per
+    provider) and complete() (run one request on a connection), and may
+    override stream() to yield the response incrementally. Raise
+    RetryableError for transient failures.
+    """
+
+    def __init__(self, name: str, options: Dict[str, Any]):
+        self.name = name
+        self.options = options
+
+    async def connect(self) -> Any:
+        return None
+
+    async def complete(self, connection: Any, request: AgentRequest) -> str:
+        raise NotImplementedError
+
+    async def stream(self, connection: Any, request: AgentRequest) -> AsyncIterator[str]:
+        yield await self.complete(connection, request)
+
+
+class StubBackend(AgentBackend):
+    """
+    Local backend for load testing without network access.
+
+    Options: ``latency`` (seconds per call, default 0), ``failure_rate``
+    (probability of a RetryableError, default 0), ``verdict`` (review
+    status, default APPROVED) and ``chunk_size`` (characters per streamed
+    chunk, default 16; latency is spread over the chunks).
+    """
+
+    async def complete(self, connection: Any, request: AgentRequest) -> str:
+        latency = float(self.options.get('latency', 0))
+        if latency:
+            await asyncio.sleep(latency)
+        self._maybe_fail()
+        return self._response(request)
+
+    async def stream(self, connection: Any, request: AgentRequest) -> AsyncIterator[str]:
+        self._maybe_fail()
+        response = self._response(request)
+        size = int(self.options.get('chunk_size', 16))
+        chunks = [response[i:i + size] for i in range(0, len(response), size)]
+        delay = float(self.options.get('latency', 0)) / len(chunks)
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    def _maybe_fail(self) -> None:
+        if random.random() < float(self.options.get('failure_rate', 0)):
+            raise RetryableError(f"{self.name}: simulated transient failure")
+
+    def _response(self, request: AgentRequest) -> str:
+        if request['role'] == AgentRole.REVIEW_AGENT:
+            return (
+                f"# Validation: {request['task_id']}\n\n"
+                f"## Review Summary\n\nStub review by {self.name}.\n\n"
+                f"## Recommendation\n\n**Status: {self.options.get('verdict', 'APPROVED')}**\n"
+            )
+        return (
+            f"# Task Output: {request['task_id']}\n\n"
+            f"## Implementation\n\nStub output by {self.name}.\n\n"
+            f"**Status: COMPLETE**\n"
+        )
+
+
+BACKENDS: Dict[str, Type[AgentBackend]] = {'stub': StubBackend}
+
+
+def register_backend(name: str, backend: Type[AgentBackend]) -> None:
+    """Make a backend class available to executor.json under ``name``."""
+    BACKENDS[name] = backend
+
+
+class _Provider:
+    def __init__(self, backend: AgentBackend, options: Dict[str, Any]):
+        self.backend = backend
+        max_concurrency = int(options.get('max_concurrency', 4))
+        self.limit = asyncio.Semaphore(max_concurrency)
+        self.pool = ConnectionPool(backend.connect, int(options.get('max_connections', max_concurrency)))
+        rate = options.get('rate_per_second')
+        self.bucket = TokenBucket(float(rate), options.get('burst')) if rate else None
+        self.model = f"{options.get('backend', backend.name)}:{options.get('model', '')}"
+        self.stream = bool(options.get('stream', False))
+        self.stats = {'calls': 0, 'retries': 0, 'failures': 0, 'in_flight': 0}
+
+
+class AgentExecutor:
+    """
+    Run agent requests on an asyncio loop in a background thread.
+
+    Configured by ``.thursian/executor.json``::
+
+        {
+          "roles": {"coding_agent": "stub", "review_agent": "stub"},
+          "providers": {
+            "stub": {"backend": "stub", "max_concurrency": 8, "stream": true,
+                     "rate_per_second": 20, "burst": 40, "latency": 0.05}
+          },
+          "retry": {"max_attempts": 3, "base_delay": 0.5, "max_delay": 30},
+          "cache": {"ttl_seconds": 86400, "max_entries": 10000}
+        }
+
+    Roles without a provider keep the human file hand-off. Each provider has
+    its own concurrency cap, token bucket and connection pool; transient
+    failures are retried with jittered exponential backoff. With a response
+    cache, identical (model, guidelines, task input) requests are answered
+    from the cache unless the request sets bypass_cache. Streaming providers
+    append chunks to the output file as they arrive, under a
+    STREAMING_MARKER first line, and the file is atomically replaced by the
+    final response when the stream ends.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        cache: Optional[ResponseCache] = None,
+        storage: Optional[StorageBackend] = None
+    ):
+        self.cache = cache
+        # Where output documents are written (default: plain files)
+        self.storage = storage if storage is not None else LocalStorage('.')
+        self.roles: Dict[AgentRole, str] = {
+            AgentRole(role): provider for role, provider in config.get('roles', {}).items()
+        }
+        retry = config.get('retry', {})
+        self.max_attempts = int(retry.get('max_attempts', DEFAULT_MAX_ATTEMPTS))
+        self.base_delay = float(retry.get('base_delay', DEFAULT_BASE_DELAY))
+        self.max_delay = float(retry.get('max_delay', DEFAULT_MAX_DELAY))
+
+        self.providers: Dict[str, _Provider] = {}
+        for name, options in config.get('providers', {}).items():
+            backend_name = options.get('backend', name)
+            if backend_name not in BACKENDS:
+                raise ValueError(f"Unknown agent backend: {backend_name}")
+            self.providers[name] = _Provider(BACKENDS[backend_name](name, options), options)
+
+        for role, provider in self.roles.items():
+            if provider not in self.providers:
+                raise ValueError(f"Role {role.value} uses undefined provider {provider}")
+
+        self._submitted: Set[str] = set()
+        self._pending: Dict[str, Future] = {}
+        # Set whenever an output file is finished, so pollers can wake early
+        self.output_ready = threading.Event()
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='agent-executor', daemon=True)
+        self._thread.start()
+
+    def handles(self, role: Optional[AgentRole]) -> bool:
+        """Whether a role is served by an AI provider."""
+        return role in self.roles
+
+    def submit(self, request: AgentRequest, stream_to: Optional[str] = None) -> Future:
+        """
+        Schedule a request; the future resolves to the agent's response.
+
+        Args:
+            stream_to: File to stream partial output into, if the provider streams
+        """
+        return asyncio.run_coroutine_threadsafe(self._run(request, stream_to), self._loop)
+
+    def run(self, request: AgentRequest, timeout: Optional[float] = None) -> str:
+        """Run a request and block for the response."""
+        return self.submit(request).result(timeout)
+
+    def ensure_output(self, request: AgentRequest, output_path: str) -> bool:
+        """
+        Submit a request whose response is written to output_path, once.
+
+        The final response replaces the file atomically; before that the
+        file holds either nothing or a partial, IN_PROGRESS stream. Returns
+        False if this output was already submitted.
+        """
+        with self._lock:
+            if output_path in self._submitted:
+                return False
+            self._submitted.add(output_path)
+
+        future = self.submit(request, stream_to=output_path)
+        with self._lock:
+            self._pending[output_path] = future
+        future.add_done_callback(lambda f: self._write_output(f, request, output_path))
+        return True
+
+    def cancel(self, output_path: str) -> bool:
+        """
+        Cancel the request writing output_path, if it is still running.
+
+        A partial stream is removed once the request stops; the output stays
+        submitted so it is not requested again. Returns False if there was nothing to cancel.
+        """
+        with self._lock:
+            future = self._pending.get(output_path)
+        return future is not None and future.cancel()
+
+    def is_submitted(self, output_path: str) -> bool:
+        """Whether output_path already has a request in this process."""
+        with self._lock:
+            return output_path in self._submitted
+
+    def forget(self, output_path: str) -> None:
+        """Allow output_path to be submitted again (e.g. for a revision)."""
+        with self._lock:
+            self._submitted.discard(output_path)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-provider call counters and response cache metrics."""
+        return {
+            'providers': {name: dict(provider.stats) for name, provider in self.providers.items()},
+            'cache': self.cache.snapshot() if self.cache is not None else None,
+        }
+
+    def shutdown(self) -> None:
+        """Close pooled connections and stop the event loop."""
+        async def close_pools():
+            for provider in self.providers.values():
+                await provider.pool.close()
+
+        asyncio.run_coroutine_threadsafe(close_pools(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _run(self, request: AgentRequest, stream_to: Optional[str] = None) -> str:
+        try:
+            return await self._respond(request, stream_to)
+        except asyncio.CancelledError:
+            # Cleaned up here, on the loop thread, so no append lands after the delete
+            if stream_to:
+                _remove_partial(self.storage, stream_to)
+            raise
+
+    async def _respond(self, request: AgentRequest, stream_to: Optional[str]) -> str:
+        provider = self.providers[self.roles[request['role']]]
+        if self.cache is None:
+            return await self._call(provider, request, stream_to)
+
+        key = cache_key(provider.model, request['system_prompt'], request['cache_input'])
+        if request['bypass_cache']:
+            self.cache.record_bypass()
+        else:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                return cached
+
+        response = await self._call(provider, request, stream_to)
+        await asyncio.to_thread(self.cache.put, key, response, {'model': provider.model})
+        return response
+
+    async def _call(self, provider: _Provider, request: AgentRequest, stream_to: Optional[str]) -> str:
+        attempt = 0
+
+        async with provider.limit:
+            provider.stats['in_flight'] += 1
+            try:
+                while True:
+                    attempt += 1
+                    if provider.bucket is not None:
+                        await provider.bucket.acquire()
+                    provider.stats['calls'] += 1
+                    try:
+                        async with provider.pool.connection() as conn:
+                            if provider.stream and stream_to:
+                                return await self._stream(provider, conn, request, stream_to)
+                            return await provider.backend.complete(conn, request)
+                    except RetryableError as e:
+                        if attempt >= self.max_attempts:
+                            provider.stats['failures'] += 1
+                            raise
+                        provider.stats['retries'] += 1
+                        delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                        logger.warning(f"{provider.backend.name} failed for {request['task_id']} "
+                                       f"({e}), retry {attempt} in {delay:.2f}s")
+                        await asyncio.sleep(delay)
+                    except Exception:
+                        provider.stats['failures'] += 1
+                        raise
+            finally:
+                provider.stats['in_flight'] -= 1
+
+    async def _stream(self, provider: _Provider, conn: Any, request: AgentRequest, path: str) -> str:
+        """Append chunks to path as they arrive; a retry starts the file over."""
+        parts = []
+        with self.storage.appender(path) as append:
+            append(f"{STREAMING_MARKER}\n\n")
+            async for chunk in provider.backend.stream(conn, request):
+                parts.append(chunk)
+                append(chunk)
+        return ''.join(parts)
+
+    def _write_output(self, future: Future, request: AgentRequest, output_path: str) -> None:
+        with self._lock:
+            self._pending.pop(output_path, None)
+
+        if future.cancelled():
+            # Runs on the cancelling thread; _run removes the partial file
+            logger.info(f"Agent {request['role'].value} cancelled for {request['task_id']} ({output_path})")
+            return
+        if future.exception() is not None:
+            logger.error(f"Agent {request['role'].value} failed for {request['task_id']}: "
+                         f"{future.exception()}; task file left for a human agent")
+            _remove_partial(self.storage, output_path)
+            return
+
+        self.storage.write(output_path, future.result())
+        logger.info(f"Agent {request['role'].value} wrote {output_path}")
+        self.output_ready.set()
+
+
+def _remove_partial(storage: StorageBackend, path: str) -> None:
+    """Delete an abandoned streaming file so a human can take the task over."""
+    try:
+        partial = storage.read(path).partition('\n')[0].strip() == STREAMING_MARKER
+    except OSError:
+        return
+    if partial:
+        storage.delete(path)
+
+
+def build_request(
+    task_id: str,
+    role: AgentRole,
+    system_prompt: str,
+    prompt: str,
+    cache_input: Optional[str] = None,
+    bypass_cache: bool = False
+) -> AgentRequest:
+    """
+    Build an agent request.
+
+    Args:
+        system_prompt: Role instructions, normally the guideline doc text
+        cache_input: Content the response depends on, without per-run details
+            such as ids and timestamps (default: the full prompt)
+        bypass_cache: Always call the provider, even on a cache hit
+    """
+    return {
+        'task_id': task_id,
+        'role': role,
+        'system_prompt': system_prompt,
+        'prompt': prompt,
+        'cache_input': prompt if cache_input is None else cache_input,
+        'bypass_cache': bypass_cache,
+    }
+
+
+_executors: Dict[str, Optional[AgentExecutor]] = {}
+
+
+def get_executor(thursian_dir: str) -> Optional[AgentExecutor]:
+    """
+    Return the process-wide AgentExecutor for .thursian/executor.json.
+
+    Returns None when there is no config, i.e. every role is human.
+    """
+    path = os.path.abspath(os.path.join(thursian_dir, 'executor.json'))
+    if path not in _executors:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                config = json.load(f)
+            cache = cache_from_config(thursian_dir, config['cache']) if 'cache' in config else None
+            _executors[path] = AgentExecutor(config, cache, get_storage(thursian_dir))
+            logger.info(f"Loaded agent executor from {path}")
+        else:
+            _executors[path] = None
+    return _executors[path]
+
+
+@timed
+def wait_for_agents(thursian_dir: str, timeout: float) -> None:
+    """
+    Sleep until the next poll, waking early when an AI agent finishes an output.
+    """
+    executor = get_executor(thursian_dir)
+    if executor is None:
+        time.sleep(timeout)
+        return
+    executor.output_ready.wait(timeout)
+    executor.output_ready.clear()
@@ -1,19 +1,52 @@
 """Git commit automation for workflow traceability."""
 
 import subprocess
-from typing import Optional
+from typing import List, Optional, Tuple
+import json
 import logging
+import os
+
+from .storage import STORAGE_CONFIG, DEFAULT_DATABASE
+from .timing import timed
 
 logger = logging.getLogger(__name__)
 
+THURSIAN_DIR = '.thursian'
+
+
+def untracked_pathspecs() -> List[str]:
+    """
+    Pathspecs keeping the SQLite storage database out of phase commits.
 
-def commit_phase(phase_name: str, task_id: Optional[str] = None) -> bool:
+    The database is binary and, in WAL mode, comes with live -wal/-shm
+    files; committing them would store a full copy per phase, possibly
+    mid-transaction. Covers the default storage.db and a relative ``path``
+    set in storage.json.
+    """
+    databases = [DEFAULT_DATABASE]
+    config = os.path.join(THURSIAN_DIR, STORAGE_CONFIG)
+    if os.path.exists(config):
+        with open(config, 'r') as f:
+            options = json.load(f)
+        path = options.get('path')
+        if options.get('backend') == 'sqlite' and path and not os.path.isabs(path):
+            databases.append(path.replace(os.sep, '/'))
+    return [f":(exclude){THURSIAN_DIR}/{database}*" for database in dict.fromkeys(databases)]
+
+
+@timed
+def commit_phase(
+    phase_name: str,
+    task_id: Optional[str] = None,
+    details: Optional[str] = None
+) -> bool:
     """
     Create git commit for completed phase.
 
     Args:
         phase_name: Name of the workflow phase
         task_id: Optional task ID for context
+        details: Optional commit message body
 
     Returns:
         True if commit successful, False otherwise
@@ -22,10 +55,12 @@ def commit_phase(phase_name: str, task_id: Optional[str] = None) -> bool:
         message = f"Workflow: {phase_name}"
         if task_id:
             message += f" (task: {task_id})"
+        if details:
+            message += f"\n\n{details}"
 
         # Add .thursian directory (contains decision logs and status)
         subprocess.run(
-            ["git", "add", ".thursian/"],
+            ["git", "add", f"{THURSIAN_DIR}/", *untracked_pathspecs()],
             check=True,
             capture_output=True,
             text=True
@@ -39,7 +74,7 @@ def commit_phase(phase_name: str, task_id: Optional[str] = None) -> bool:
             text=True
         )
 
-        logger.info(f"Git commit created: {message}")
+        logger.info(f"Git commit created: {message.splitlines()[0]}")
         return True
 
     except subprocess.CalledProcessError as e:
@@ -54,3 +89,55 @@ def commit_phase(phase_name: str, task_id: Optional[str] = None) -> bool:
     except Exception as e:
         logger.error(f"Git commit error: {e}")
         return False
+
+
+class CommitQueue:
+    """
+    Pending phase commits, flushed as one git commit per batch.
+
+    With many workflows in flight, committing every phase transition on its
+    own serializes on git's index lock. Entries are queued instead and
+    flushed together; failed flushes keep their entries, so ``backlog``
+    shows how far git has fallen behind.
+    """
+
+    def __init__(self):
+        self._pending: List[Tuple[str, Optional[str]]] = []
+
+    def enqueue(self, phase_name: str, task_id: Optional[str] = None) -> None:
+        """Queue a commit for a phase transition."""
+        self._pending.append((phase_name, task_id))
+
+    def discard(self, task_id: str) -> int:
+        """Drop a task's pending commits (e.g. when it is cancelled); returns how many."""
+        before = len(self._pending)
+        self._pending = [entry for entry in self._pending if entry[1] != task_id]
+        return before - len(self._pending)
+
+    @property
+    def backlog(self) -> int:
+        """Number of phase transitions not yet committed."""
+        return len(self._pending)
+
+    def flush(self) -> bool:
+        """
+        Commit all pending phase transitions at once.
+
+        Returns:
+            True if the batch was committed (or there was nothing to commit)
+        """
+        if not self._pending:
+            return True
+
+        if len(self._pending) == 1:
+            ok = commit_phase(*self._pending[0])
+        else:
+            summary = ", ".join(
+                f"{phase} ({task_id})" if task_id else phase
+                for phase, task_id in self._pending
+            )
+            ok = commit_phase(f"{len(self._pending)} phase transitions", None, details=summary)
+
+        if ok:
+            self._pending = []
+        return ok
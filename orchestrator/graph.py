@@ -5,51 +5,81 @@ from .state import ThursianState
 from .nodes import (
     task_selection_node,
     assignment_node,
+    decomposition_node,
+    subtask_check_node,
+    merge_subtasks_node,
     execution_node,
+    prevalidation_node,
     validation_node,
+    review_check_node,
+    quorum_node,
     completion_node
 )
-from .routing import route_after_execution, route_after_validation
+from .routing import route_entry
+from .profiling import profiled
+from .storage import transactional
 
 
 def create_thursian_workflow() -> StateGraph:
-    """Create and compile the Thursian orchestrator workflow graph."""
+    """
+    Create and compile the Thursian orchestrator workflow graph.
+
+    Each invoke runs a single step: the entry router picks the node for the
+    current phase (looping back to wait, advancing, or returning to execution
+    on revision) and every node then ends the run. Callers poll between
+    invokes, which lets one process step many workflows concurrently.
+
+    Fan-out steps are the exception: the router sends one subtask_check
+    branch per unfinished subtask of a split task, or one review_check branch
+    per pending reviewer; the branches run in parallel and join at the merge
+    or quorum node, which then ends the run.
+    """
 
     workflow = StateGraph(ThursianState)
 
+    def add_node(name, node):
+        # Each step's writes commit together (a no-op for file storage);
+        # profiled only while --profile is on, otherwise a pass-through
+        workflow.add_node(name, profiled(name, transactional(node)))
+
     # Add all nodes
-    workflow.add_node("task_selection", task_selection_node)
-    workflow.add_node("assignment", assignment_node)
-    workflow.add_node("execution_node", execution_node)
-    workflow.add_node("validation_node", validation_node)
-    workflow.add_node("completion", completion_node)
-
-    # Set entry point
-    workflow.set_entry_point("task_selection")
-
-    # Simple edges (deterministic flow)
-    workflow.add_edge("task_selection", "assignment")
-    workflow.add_edge("assignment", "execution_node")
-    workflow.add_edge("completion", END)
-
-    # Conditional edges (routing based on state)
-    workflow.add_conditional_edges(
-        "execution_node",
-        route_after_execution,
-        {
-            "execution_node": "execution_node",  # Loop back
-            "validation_node": "validation_node"  # Proceed
-        }
-    )
+    add_node("task_selection", task_selection_node)
+    add_node("assignment", assignment_node)
+    add_node("decomposition", decomposition_node)
+    add_node("subtask_check", subtask_check_node)
+    add_node("merge_subtasks", merge_subtasks_node)
+    add_node("execution_node", execution_node)
+    add_node("prevalidation", prevalidation_node)
+    add_node("validation_node", validation_node)
+    add_node("review_check", review_check_node)
+    add_node("quorum", quorum_node)
+    add_node("completion", completion_node)
 
-    workflow.add_conditional_edges(
-        "validation_node",
-        route_after_validation,
+    # Conditional entry (routing based on phase and agent files)
+    workflow.set_conditional_entry_point(
+        route_entry,
         {
-            "validation_node": "validation_node",  # Loop back
-            "completion": "completion",            # Approved
-            "execution_node": "execution_node"     # Needs revision
+            "task_selection": "task_selection",
+            "assignment": "assignment",
+            "decomposition": "decomposition",      # Split tagged tasks
+            "subtask_check": "subtask_check",      # Subtask fan-out (via Send)
+            "execution_node": "execution_node",    # Keep waiting / revise
+            "prevalidation": "prevalidation",      # Automated checks on complete output
+            "validation_node": "validation_node",  # Output complete / waiting
+            "review_check": "review_check",        # Reviewer fan-out (via Send)
+            "completion": "completion"             # Approved
         }
     )
 
+    # Parallel subtask checks (Send fan-out) join at the merge step
+    workflow.add_edge("subtask_check", "merge_subtasks")
+
+    # Parallel reviewer checks (Send fan-out) merge into one quorum decision
+    workflow.add_edge("review_check", "quorum")
+
+    # One step per invoke
+    for node in ("task_selection", "assignment", "decomposition", "merge_subtasks", "execution_node",
+                 "prevalidation", "validation_node", "quorum", "completion"):
+        workflow.add_edge(node, END)
+
     return workflow.compile()
@@ -1,11 +1,55 @@
 """Helper functions for state transitions and logging."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import os
 import json
 
 from .state import WorkflowPhase, DecisionLog, ThursianState
+from .storage import get_storage
+from .artifacts import get_artifact_store, record_path
+from .timing import timed
+
+
+def create_initial_state(
+    thursian_dir: str = ".thursian",
+    workflow_id: Optional[str] = None
+) -> ThursianState:
+    """Build a fresh IDLE workflow state."""
+    return {
+        'workflow_id': workflow_id or f"workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        'created_at': datetime.now(),
+        'current_phase': WorkflowPhase.IDLE,
+        'phase_history': [],
+        'current_task_id': None,
+        'task_description': None,
+        'task_file_path': None,
+        'task_key': None,
+        'task_priority': None,
+        'task_tags': [],
+        'queue_wait_seconds': None,
+        'primary_agent': None,
+        'validator_agent': None,
+        'primary_agent_instance': None,
+        'validator_agent_instance': None,
+        'agent_guidelines': None,
+        'subtasks': {},
+        'prevalidated_digest': None,
+        'review_verdicts': {},
+        'review_quorum': None,
+        'decision_logs': [],
+        'thursian_dir': thursian_dir,
+        'output_file_path': None,
+        'validation_file_path': None,
+        'waiting_for_human': False,
+        'validation_passed': False,
+        'errors': []
+    }
+
+
+def generate_task_id(seq: int) -> str:
+    """Generate a task_id that stays unique when tasks are claimed concurrently."""
+    return f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{seq}"
 
 
 def transition_phase(state: ThursianState, new_phase: WorkflowPhase) -> Dict[str, Any]:
@@ -46,25 +90,30 @@ def add_error(state: ThursianState, error_message: str) -> Dict[str, Any]:
     }
 
 
+@timed
 def write_decision_log_to_file(state: ThursianState) -> None:
     """Write decision logs to .thursian/decisions/ directory."""
     if not state.get('decision_logs'):
         return
 
     decisions_dir = os.path.join(state['thursian_dir'], 'decisions')
-    os.makedirs(decisions_dir, exist_ok=True)
 
     latest_log = state['decision_logs'][-1]
     timestamp = latest_log['timestamp'].replace(':', '-')
     filename = f"{timestamp}_{state['current_phase'].value}.json"
     filepath = os.path.join(decisions_dir, filename)
 
-    with open(filepath, 'w') as f:
-        json.dump(latest_log, f, indent=2)
+    get_storage(state['thursian_dir']).write_decision(filepath, latest_log)
 
 
+@timed
 def update_status_file(state: ThursianState) -> None:
-    """Update .thursian/status.json with current state."""
+    """
+    Update .thursian/status.json with current state.
+
+    Backends that keep records also checkpoint the whole state here, in the
+    same transaction, so an interrupted run can resume the workflow.
+    """
     status = {
         'workflow_id': state['workflow_id'],
         'current_phase': state['current_phase'].value,
@@ -74,5 +123,135 @@ def update_status_file(state: ThursianState) -> None:
     }
 
     status_file = os.path.join(state['thursian_dir'], 'status.json')
-    with open(status_file, 'w') as f:
-        json.dump(status, f, indent=2)
+    storage = get_storage(state['thursian_dir'])
+    with storage.transaction():
+        storage.write_status(status_file, status)
+        storage.save_checkpoint(state)
+
+
+def archive_revision_files(state: ThursianState) -> List[str]:
+    """
+    Move the previous round's output and validation files aside.
+
+    Called when validation or pre-validation requests a revision so the next
+    round starts from a clean slate instead of re-reading a stale COMPLETE or
+    NEEDS_REVISION.
+    Includes every reviewer's files from a multi-reviewer round and the
+    subtask outputs of a decomposed task.
+
+    With an artifact store (.thursian/artifacts.json) the round is stored as
+    deduplicated blobs instead: the files are removed and the task's artifact
+    record maps each archived path to its digest (see read_archived).
+
+    Returns:
+        Paths of the archived copies
+    """
+    task_id = state['current_task_id']
+    revision = state.get('phase_history', []).count(WorkflowPhase.VALIDATION) or 1
+    candidates = [
+        os.path.join(state['thursian_dir'], 'output', f'{task_id}_output.md'),
+        os.path.join(state['thursian_dir'], 'output', f'{task_id}_prevalidation.md'),
+        os.path.join(state['thursian_dir'], 'output', f'{task_id}_validation.md'),
+        os.path.join(state['thursian_dir'], 'tasks', f'{task_id}_validation.md'),
+    ]
+    for verdict in (state.get('review_verdicts') or {}).values():
+        candidates += [verdict['validation_file'], verdict['task_file']]
+    for subtask in (state.get('subtasks') or {}).values():
+        candidates.append(subtask['output_file'])
+
+    storage = get_storage(state['thursian_dir'])
+    store = get_artifact_store(state['thursian_dir'])
+    record = _read_record(state['thursian_dir'], task_id) if store is not None else {'artifacts': {}}
+    existing = [path for path in candidates if storage.exists(path)]
+    # Pre-validation rounds don't pass through VALIDATION; never overwrite an archive
+    while any(storage.exists(_revision_path(path, revision))
+              or _record_key(state['thursian_dir'], _revision_path(path, revision)) in record['artifacts']
+              for path in existing):
+        revision += 1
+
+    archived = [_revision_path(path, revision) for path in existing]
+    if store is None:
+        for path, target in zip(existing, archived):
+            storage.move(path, target)
+        return archived
+
+    # One put_many per round: its small files share a single pack
+    contents = [storage.read(path) for path in existing]
+    for target, content, digest in zip(archived, contents, store.put_many(contents)):
+        record['artifacts'][_record_key(state['thursian_dir'], target)] = {
+            'digest': digest,
+            'size': len(content.encode('utf-8'))
+        }
+    if archived:
+        storage.write(record_path(state['thursian_dir'], task_id), json.dumps(record, indent=2))
+    for path in existing:
+        storage.delete(path)
+    return archived
+
+
+def read_archived(state: ThursianState, path: str) -> str:
+    """
+    Read a document archived by archive_revision_files.
+
+    Archives kept in the artifact store are read from their blob, which
+    re-checks the digest; CorruptArtifactError means the blob was damaged.
+    """
+    store = get_artifact_store(state['thursian_dir'])
+    if store is not None:
+        record = _read_record(state['thursian_dir'], state['current_task_id'])
+        entry = record['artifacts'].get(_record_key(state['thursian_dir'], path))
+        if entry is not None:
+            return store.get_text(entry['digest'])
+    return get_storage(state['thursian_dir']).read(path)
+
+
+def write_revision_notes(state: ThursianState, paths: List[str]) -> List[str]:
+    """
+    Make a revision round's notes readable as plain files.
+
+    Without an artifact store the archived ``_rN`` copies are the notes and
+    are returned as they are. With one those copies only exist as blobs, so
+    the notes are written to ``output/<task_id>_revision_notes.md`` (replaced
+    every round) and that path is returned.
+    """
+    if not paths or get_artifact_store(state['thursian_dir']) is None:
+        return paths
+
+    notes_path = os.path.join(state['thursian_dir'], 'output', f"{state['current_task_id']}_revision_notes.md")
+    content = "\n\n".join(f"## {os.path.basename(path)}\n\n{read_archived(state, path)}" for path in paths)
+    get_storage(state['thursian_dir']).write(notes_path, content)
+    return [notes_path]
+
+
+def render_archived(thursian_dir: str, task_id: str, target_dir: str) -> List[str]:
+    """Write a task's archived rounds from the artifact store to ``target_dir``; returns the paths."""
+    store = get_artifact_store(thursian_dir)
+    if store is None:
+        return []
+
+    written = []
+    for key, entry in _read_record(thursian_dir, task_id)['artifacts'].items():
+        path = os.path.join(target_dir, *key.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(store.get_text(entry['digest']))
+        written.append(path)
+    return written
+
+
+def _read_record(thursian_dir: str, task_id: str) -> Dict[str, Any]:
+    storage = get_storage(thursian_dir)
+    path = record_path(thursian_dir, task_id)
+    if not storage.exists(path):
+        return {'task_id': task_id, 'artifacts': {}}
+    return json.loads(storage.read(path))
+
+
+def _record_key(thursian_dir: str, path: str) -> str:
+    # Keys are relative to the .thursian dir, like storage keys, so a moved checkout still resolves
+    return os.path.relpath(path, thursian_dir).replace(os.sep, '/')
+
+
+def _revision_path(path: str, revision: int) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}_r{revision}{ext}"
@@ -0,0 +1,237 @@
+"""Bulk task ingestion from JSONL/CSV with content-hash deduplication."""
+
+from typing import TypedDict, Dict, Iterator, List, Optional, Any, Tuple, Union
+from datetime import datetime
+import csv
+import hashlib
+import json
+import logging
+import os
+
+from .task_queue import TaskQueue, get_task_queue, parse_priority, DEFAULT_PRIORITY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DUPLICATE_POLICIES = ('drop', 'merge')
+
+
+class IngestStats(TypedDict):
+    """Counters reported by enqueue_file."""
+    read: int
+    enqueued: int
+    dropped: int
+    merged: int
+    invalid: int
+
+
+def content_hash(description: str) -> str:
+    """Hash a task description, ignoring case and whitespace differences."""
+    normalized = ' '.join(description.split()).lower()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _split_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in str(value).split(',') if item.strip()]
+
+
+def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert an imported record into task fields.
+
+    Accepts ``description`` (or ``task``), ``priority``, ``tags``,
+    ``not_before``, ``id`` and ``depends``. List fields may be JSON arrays or
+    comma-separated strings.
+
+    Raises:
+        ValueError: If the record is not an object, has no description or
+            has invalid metadata
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"Record is not an object: {type(record).__name__}")
+
+    description = str(record.get('description') or record.get('task') or '').strip()
+    if not description:
+        raise ValueError("Record has no description")
+
+    priority = record.get('priority')
+    not_before = record.get('not_before')
+
+    return {
+        'description': ' '.join(description.split()),
+        'priority': parse_priority(str(priority)) if priority not in (None, '') else DEFAULT_PRIORITY,
+        'tags': _split_list(record.get('tags')),
+        'not_before': datetime.fromisoformat(str(not_before)).isoformat() if not_before else None,
+        'key': str(record['id']).strip() if record.get('id') else None,
+        'depends_on': _split_list(record.get('depends')),
+    }
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Union[str, Dict[str, Any]]]]:
+    """
+    Stream ``(line number, raw record)`` pairs from a JSONL or CSV file
+    without loading it whole.
+
+    JSONL records are yielded unparsed so one malformed line can be counted
+    as invalid without aborting the import (see parse_record); CSV rows are
+    yielded as dicts.
+
+    Args:
+        path: File to read
+        fmt: "jsonl" or "csv" (default: inferred from the extension)
+    """
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        elif fmt == 'jsonl':
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, line
+        else:
+            raise ValueError(f"Unsupported format: {fmt}")
+
+
+def parse_record(raw: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Turn a raw record from iter_records into a dict.
+
+    Raises:
+        ValueError: If a JSONL line is not valid JSON or not a JSON object
+    """
+    record = json.loads(raw) if isinstance(raw, str) else raw
+    if not isinstance(record, dict):
+        raise ValueError(f"Record is not an object: {type(record).__name__}")
+    return record
+
+
+class ContentHashIndex:
+    """
+    Persistent map from task content hash to queue key.
+
+    Stored as an append-only ``hash<TAB>key`` file in the .thursian directory
+    and loaded once; new entries are appended per batch.
+    """
+
+    def __init__(self, thursian_dir: str):
+        self.index_file = os.path.join(thursian_dir, 'task_hashes.tsv')
+        self._keys: Dict[str, str] = {}
+
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r') as f:
+                for line in f:
+                    digest, _, key = line.rstrip('\n').partition('\t')
+                    if digest:
+                        self._keys[digest] = key
+
+    def get(self, digest: str) -> Optional[str]:
+        """Queue key of the task with this content hash, if seen before."""
+        return self._keys.get(digest)
+
+    def add_many(self, entries: Dict[str, str]) -> None:
+        """Record hash -> key pairs with a single append."""
+        if not entries:
+            return
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        with open(self.index_file, 'a') as f:
+            f.write(''.join(f"{digest}\t{key}\n" for digest, key in entries.items()))
+        self._keys.update(entries)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def _flush(
+    queue: TaskQueue,
+    index: ContentHashIndex,
+    batch: Dict[str, Dict[str, Any]]
+) -> int:
+    if not batch:
+        return 0
+    queued = queue.push_many(list(batch.values()))
+    index.add_many({digest: task['key'] for digest, task in zip(batch, queued)})
+    return len(queued)
+
+
+def enqueue_file(
+    thursian_dir: str,
+    path: str,
+    fmt: Optional[str] = None,
+    on_duplicate: str = 'drop',
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> IngestStats:
+    """
+    Stream a JSONL or CSV file into the task queue in batched writes.
+
+    Args:
+        thursian_dir: Path to .thursian directory
+        path: File to import
+        fmt: "jsonl" or "csv" (default: inferred from the extension)
+        on_duplicate: "drop" to skip duplicates, "merge" to fold their
+            priority and tags into the still-pending original
+        batch_size: Records per queue/index write
+
+    Returns:
+        IngestStats counters
+    """
+    if on_duplicate not in DUPLICATE_POLICIES:
+        raise ValueError(f"on_duplicate must be one of {DUPLICATE_POLICIES}")
+
+    queue = get_task_queue(thursian_dir)
+    queue.sync()
+    index = ContentHashIndex(thursian_dir)
+    stats: IngestStats = {'read': 0, 'enqueued': 0, 'dropped': 0, 'merged': 0, 'invalid': 0}
+    batch: Dict[str, Dict[str, Any]] = {}
+
+    for line_number, raw in iter_records(path, fmt):
+        stats['read'] += 1
+
+        try:
+            fields = normalize_record(parse_record(raw))
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Skipping line {line_number} of {path}: {e}")
+            stats['invalid'] += 1
+            continue
+
+        digest = content_hash(fields['description'])
+
+        if digest in batch:
+            if on_duplicate == 'merge':
+                pending = batch[digest]
+                pending['priority'] = min(pending['priority'], fields['priority'])
+                pending['tags'] += [t for t in fields['tags'] if t not in pending['tags']]
+                stats['merged'] += 1
+            else:
+                stats['dropped'] += 1
+            continue
+
+        existing_key = index.get(digest)
+        if existing_key is not None:
+            if on_duplicate == 'merge' and queue.merge(existing_key, fields['priority'], fields['tags']):
+                stats['merged'] += 1
+            else:
+                stats['dropped'] += 1
+            continue
+
+        batch[digest] = fields
+        if len(batch) >= batch_size:
+            stats['enqueued'] += _flush(queue, index, batch)
+            batch = {}
+
+    stats['enqueued'] += _flush(queue, index, batch)
+
+    logger.info(
+        f"Imported {path}: {stats['enqueued']} enqueued, {stats['dropped']} dropped, "
+        f"{stats['merged']} merged, {stats['invalid']} invalid"
+    )
+    return stats
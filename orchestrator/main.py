@@ -1,14 +1,25 @@
 """CLI entry point for Thursian orchestrator."""
 
-import time
-from datetime import datetime
+import argparse
 import logging
 import sys
 
 from .graph import create_thursian_workflow
-from .state import ThursianState, WorkflowPhase
-from .helpers import update_status_file
+from .state import ThursianState, WorkflowPhase, TERMINAL_PHASES
+from .helpers import update_status_file, create_initial_state, render_archived
 from .git_manager import commit_phase
+from .scheduler import run_scheduler
+from .admission import AdmissionController, parse_role_limits
+from .ingest import enqueue_file, DUPLICATE_POLICIES, DEFAULT_BATCH_SIZE
+from .agent_pool import AgentPool
+from .executor import wait_for_agents
+from .control import send_command, drain_commands, matches, cancel_workflow
+from .task_queue import parse_priority
+from .timing import enable_timing, dump_on_signal, write_timings, snapshot_timings, format_timings
+from .tracing import start_tracing, stop_tracing, task_context, record_phase
+from .storage import get_storage
+from .artifacts import get_artifact_store
+from .profiling import start_profiling, stop_profiling, DEFAULT_INTERVAL as DEFAULT_PROFILE_INTERVAL
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,27 +40,15 @@ def run_workflow(thursian_dir: str = ".thursian", poll_interval: int = 5) -> Non
     print("THURSIAN DEVELOPMENT ORCHESTRATOR - MVP")
     print("="*60 + "\n")
 
-    # Initialize state
-    initial_state: ThursianState = {
-        'workflow_id': f"workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-        'created_at': datetime.now(),
-        'current_phase': WorkflowPhase.IDLE,
-        'phase_history': [],
-        'current_task_id': None,
-        'task_description': None,
-        'task_file_path': None,
-        'primary_agent': None,
-        'validator_agent': None,
-        'decision_logs': [],
-        'thursian_dir': thursian_dir,
-        'output_file_path': None,
-        'validation_file_path': None,
-        'waiting_for_human': False,
-        'validation_passed': False,
-        'errors': []
-    }
-
-    logger.info(f"Starting workflow: {initial_state['workflow_id']}")
+    # Initialize state, or pick up a checkpointed workflow an earlier run left unfinished
+    checkpoints = get_storage(thursian_dir).load_checkpoints()
+    if checkpoints:
+        initial_state: ThursianState = checkpoints[0]
+        logger.info(f"Resuming workflow: {initial_state['workflow_id']} "
+                    f"({initial_state['current_phase'].value})")
+    else:
+        initial_state = create_initial_state(thursian_dir)
+        logger.info(f"Starting workflow: {initial_state['workflow_id']}")
 
     # Create workflow graph
     try:
@@ -65,15 +64,30 @@ def run_workflow(thursian_dir: str = ".thursian", poll_interval: int = 5) -> Non
     iteration_count = 0
     max_iterations = 1000  # Safety limit
 
-    while current_state['current_phase'] != WorkflowPhase.COMPLETED and iteration_count < max_iterations:
+    while current_state['current_phase'] not in TERMINAL_PHASES and iteration_count < max_iterations:
         iteration_count += 1
 
         try:
+            # Cancel/preempt requests from the control file or another CLI
+            for command in drain_commands(thursian_dir):
+                if not matches(current_state, command['task']):
+                    logger.warning(f"No running workflow matches {command['op']} {command['task']}")
+                    continue
+                current_state = cancel_workflow(current_state, command['reason'],
+                                                requeue=command['op'] == 'preempt',
+                                                priority=command['priority'])
+                commit_phase(current_state['current_phase'].value, current_state.get('current_task_id'))
+                break
+            if current_state['current_phase'] == WorkflowPhase.CANCELLED:
+                break
+
             # Invoke workflow (single step) with increased recursion limit for polling loops
-            current_state = workflow.invoke(
-                current_state,
-                config={"recursion_limit": 1000}
-            )
+            with task_context(current_state.get('current_task_id')):
+                current_state = workflow.invoke(
+                    current_state,
+                    config={"recursion_limit": 1000}
+                )
+            record_phase(current_state)
 
             # Update status file
             update_status_file(current_state)
@@ -93,7 +107,7 @@ def run_workflow(thursian_dir: str = ".thursian", poll_interval: int = 5) -> Non
             if current_state.get('waiting_for_human'):
                 phase = current_state['current_phase'].value
                 print(f"[...] Waiting for human to complete {phase}... (checking every {poll_interval}s)")
-                time.sleep(poll_interval)
+                wait_for_agents(thursian_dir, poll_interval)
 
             # Check for errors
             if current_state.get('errors'):
@@ -121,6 +135,9 @@ def run_workflow(thursian_dir: str = ".thursian", poll_interval: int = 5) -> Non
         print(f"Iterations: {iteration_count}")
         print("="*60 + "\n")
         logger.info(f"Workflow completed: {current_state['workflow_id']}")
+    elif current_state['current_phase'] == WorkflowPhase.CANCELLED:
+        print("\n[!] Workflow cancelled")
+        logger.info(f"Workflow cancelled: {current_state['workflow_id']}")
     elif iteration_count >= max_iterations:
         print(f"\n[!] Warning: Workflow exceeded max iterations ({max_iterations})")
         logger.warning(f"Workflow exceeded max iterations: {max_iterations}")
@@ -136,5 +153,219 @@ def run_workflow(thursian_dir: str = ".thursian", poll_interval: int = 5) -> Non
     print()
 
 
+def main(argv=None) -> int:
+    """Parse CLI arguments and run the orchestrator."""
+    parser = argparse.ArgumentParser(description='Run the Thursian orchestrator')
+    parser.add_argument(
+        '--thursian-dir',
+        default='.thursian',
+        help='Path to .thursian directory (default: .thursian)'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=int,
+        default=5,
+        help='Seconds between polling checks (default: 5)'
+    )
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=1,
+        help='Run up to N ready tasks concurrently with the DAG scheduler (default: 1)'
+    )
+
+    parser.add_argument(
+        '--role-limit',
+        action='append',
+        default=[],
+        metavar='ROLE=N',
+        help='Cap in-flight workflows occupying an agent role, e.g. review_agent=2 (repeatable)'
+    )
+    parser.add_argument(
+        '--max-validation-backlog',
+        type=int,
+        help='Stop intake while more than N workflows are waiting on validation'
+    )
+    parser.add_argument(
+        '--max-commit-backlog',
+        type=int,
+        help='Stop intake while more than N phase commits are pending'
+    )
+    parser.add_argument(
+        '--timings',
+        action='store_true',
+        help='Record per-node latency histograms; written to .thursian/timings.json on exit or SIGUSR1'
+    )
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        help='Record per-task trace spans to .thursian/traces/ (Chrome trace event JSON)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='cProfile every graph node and snapshot allocations; dumps go to .thursian/profiles/'
+    )
+    parser.add_argument(
+        '--profile-interval',
+        type=float,
+        default=DEFAULT_PROFILE_INTERVAL,
+        help=f'Seconds between allocation snapshots and profile dumps (default: {DEFAULT_PROFILE_INTERVAL:g})'
+    )
+
+    subparsers = parser.add_subparsers(dest='command')
+    enqueue_parser = subparsers.add_parser(
+        'enqueue',
+        help='Bulk-import tasks from JSONL or CSV files'
+    )
+    enqueue_parser.add_argument('files', nargs='+', help='JSONL or CSV files to import')
+    enqueue_parser.add_argument(
+        '--format',
+        choices=['jsonl', 'csv'],
+        help='Input format (default: inferred from file extension)'
+    )
+    enqueue_parser.add_argument(
+        '--on-duplicate',
+        choices=list(DUPLICATE_POLICIES),
+        default='drop',
+        help='Drop duplicate tasks or merge them into the pending original (default: drop)'
+    )
+    enqueue_parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Records per queue write (default: {DEFAULT_BATCH_SIZE})'
+    )
+
+    heartbeat_parser = subparsers.add_parser(
+        'heartbeat',
+        help='Mark agent pool instances as alive'
+    )
+    heartbeat_parser.add_argument('agents', nargs='+', help='Agent instance names from agents.json')
+
+    render_parser = subparsers.add_parser(
+        'render',
+        help='Write documents, decision logs and status kept in SQLite storage out as files'
+    )
+    render_parser.add_argument(
+        '--task',
+        help='Only the documents and decision logs of this task id, plus its rounds kept in the artifact store'
+    )
+    render_parser.add_argument('--to', help='Directory to write into (default: the .thursian directory)')
+
+    subparsers.add_parser(
+        'verify-artifacts',
+        help='Re-hash every blob in the artifact store and report damaged ones'
+    )
+
+    for op, help_text in (('cancel', 'Cancel an in-flight task'),
+                          ('preempt', 'Cancel an in-flight task and put it back on the queue')):
+        control_parser = subparsers.add_parser(op, help=help_text)
+        control_parser.add_argument('task', help='Task id, queue id or workflow id')
+        control_parser.add_argument('--reason', help='Reason recorded in the decision log')
+        if op == 'preempt':
+            control_parser.add_argument(
+                '--priority',
+                type=parse_priority,
+                help='Priority to re-queue at (default: the original priority)'
+            )
+
+    args = parser.parse_args(argv)
+    # Admission control lives in the scheduler; single-workflow mode has nothing to limit
+    if args.command is None and args.parallel <= 1:
+        ignored = [flag for flag, value in (('--role-limit', args.role_limit),
+                                            ('--max-validation-backlog', args.max_validation_backlog),
+                                            ('--max-commit-backlog', args.max_commit_backlog))
+                   if value not in (None, [])]
+        if ignored:
+            parser.error(f"{', '.join(ignored)}: admission limits need --parallel N (N > 1)")
+    try:
+        role_limits = parse_role_limits(args.role_limit or [])
+    except ValueError as e:
+        parser.error(f"--role-limit: {e}")
+
+    if args.command in ('cancel', 'preempt'):
+        send_command(args.thursian_dir, args.command, args.task,
+                     priority=getattr(args, 'priority', None), reason=args.reason)
+        print(f"[OK] {args.command} requested for {args.task}; the running orchestrator applies it "
+              f"on its next pass")
+        return 0
+
+    if args.command == 'enqueue':
+        for path in args.files:
+            stats = enqueue_file(
+                args.thursian_dir,
+                path,
+                fmt=args.format,
+                on_duplicate=args.on_duplicate,
+                batch_size=args.batch_size
+            )
+            print(f"[OK] {path}: {stats['enqueued']} enqueued, {stats['dropped']} duplicates dropped, "
+                  f"{stats['merged']} merged, {stats['invalid']} invalid")
+        return 0
+
+    if args.command == 'render':
+        target = args.to or args.thursian_dir
+        written = get_storage(args.thursian_dir).render(target, args.task)
+        if args.task:
+            written += render_archived(args.thursian_dir, args.task, target)
+        if written:
+            print(f"[OK] Rendered {len(written)} document(s) to {target}")
+        else:
+            print("[!] Nothing to render")
+        return 0
+
+    if args.command == 'verify-artifacts':
+        store = get_artifact_store(args.thursian_dir)
+        if store is None:
+            print(f"[!] No artifact store configured ({args.thursian_dir}/artifacts.json)")
+            return 1
+        corrupt = store.verify()
+        for digest in corrupt:
+            print(f"[!] Damaged or missing blob: {digest}")
+        stats = store.snapshot()
+        print(f"[{'!' if corrupt else 'OK'}] {stats['blobs'] - len(corrupt)}/{stats['blobs']} blob(s) verified "
+              f"({stats['packed']} packed in {stats['packs']} pack(s), {stats['loose']} loose)")
+        return 1 if corrupt else 0
+
+    if args.command == 'heartbeat':
+        pool = AgentPool(args.thursian_dir)
+        for name in args.agents:
+            pool.heartbeat(name)
+            print(f"[OK] Heartbeat recorded for {name}")
+        return 0
+
+    if args.timings:
+        enable_timing()
+        dump_on_signal(args.thursian_dir)
+    if args.trace:
+        start_tracing(args.thursian_dir)
+    if args.profile:
+        start_profiling(args.thursian_dir, args.profile_interval)
+
+    try:
+        if args.parallel > 1:
+            admission = AdmissionController(
+                max_in_flight=args.parallel,
+                role_limits=role_limits,
+                max_validation_backlog=args.max_validation_backlog,
+                max_commit_backlog=args.max_commit_backlog
+            )
+            run_scheduler(args.thursian_dir, args.poll_interval, args.parallel, admission)
+        else:
+            run_workflow(args.thursian_dir, args.poll_interval)
+    finally:
+        if args.timings:
+            path = write_timings(args.thursian_dir)
+            print("Node Timings:")
+            print(format_timings(snapshot_timings()))
+            print(f"\n[OK] Timings written to {path}\n")
+        if args.trace:
+            print(f"[OK] Trace written to {stop_tracing()} (open in chrome://tracing or ui.perfetto.dev)\n")
+        if args.profile:
+            print(f"[OK] Per-phase profiles and allocations.txt written to {stop_profiling()}\n")
+    return 0
+
+
 if __name__ == "__main__":
-    run_workflow()
+    sys.exit(main())
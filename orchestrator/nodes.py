@@ -1,9 +1,10 @@
 """LangGraph workflow node implementations."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Callable, Union
 from datetime import datetime
 import os
 import logging
+import time
 
 from .state import ThursianState, WorkflowPhase, AgentRole
 from .helpers import (
@@ -11,57 +12,70 @@ from .helpers import (
     add_decision_log,
     add_error,
     write_decision_log_to_file,
-    update_status_file
+    update_status_file,
+    generate_task_id,
+    archive_revision_files,
+    read_archived,
+    write_revision_notes,
+    create_initial_state
 )
+from .task_queue import get_task_queue, explain_selection, QueuedTask, TaskQueue, SQLiteTaskQueue
+from .agent_pool import get_agent_pool
+from .task_router import get_task_router, guideline_doc
+from .executor import get_executor, build_request
+from .response_cache import BYPASS_TAG
+from .template_registry import get_template_registry
+from .routing import ALL_MARKERS, COMPLETE_MARKERS, APPROVED_MARKERS, REVISION_MARKERS
+from .decomposition import split_task, merge_outputs, SPLIT_TAG, PENDING as SUBTASK_PENDING, COMPLETE as SUBTASK_COMPLETE
+from .prevalidation import get_prevalidator, format_report
+from .quorum import (
+    load_validation_config, quorum_decision, required_approvals,
+    APPROVED, NEEDS_REVISION, PENDING, CANCELLED, DEFAULT_QUORUM
+)
+from .storage import get_storage, QUEUE_INBOX
+from .timing import timed
+from . import tracing
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@timed
 def task_selection_node(state: ThursianState) -> Dict[str, Any]:
     """
-    Select next task from task queue.
+    Select next task from the priority task queue.
 
-    Reads from .thursian/task_queue.txt and extracts first line as task.
-    Generates unique task_id based on timestamp.
+    New lines in .thursian/task_queue.txt are ingested into the heap index,
+    then the highest-priority ready task is popped (FIFO within a priority).
+    Tasks with unfinished dependencies are never selected.
+    Generates unique task_id based on timestamp and queue sequence.
     """
     logger.info(f"Task selection for workflow {state['workflow_id']}")
 
     try:
-        task_queue_file = os.path.join(state['thursian_dir'], 'task_queue.txt')
+        task_queue_file = os.path.join(state['thursian_dir'], QUEUE_INBOX)
+        queue = get_task_queue(state['thursian_dir'])
 
-        if not os.path.exists(task_queue_file):
+        if not get_storage(state['thursian_dir']).exists(task_queue_file) and not len(queue):
             return add_error(state, "Task queue file not found")
 
-        with open(task_queue_file, 'r') as f:
-            lines = f.readlines()
-
-        if not lines:
+        task = queue.pop()
+
+        if task is None:
+            if queue.deferred_count():
+                return add_error(
+                    state,
+                    f"No ready tasks ({queue.deferred_count()} deferred until "
+                    f"{queue.next_eligible_at()} or later)"
+                )
+            if queue.blocked_count():
+                return add_error(
+                    state,
+                    f"No ready tasks ({queue.blocked_count()} blocked on dependencies)"
+                )
             return add_error(state, "Task queue is empty")
 
-        # Get first task
-        task_description = lines[0].strip()
-
-        # Generate task ID
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-        # Update task queue (remove first line)
-        with open(task_queue_file, 'w') as f:
-            f.writelines(lines[1:])
-
-        logger.info(f"Selected task: {task_id} - {task_description}")
-
-        result = {
-            **transition_phase(state, WorkflowPhase.ASSIGNMENT),
-            **add_decision_log(
-                state,
-                reasoning="Selected first task from FIFO queue",
-                outcome=f"Task selected: {task_description}",
-                tool_used="file_read"
-            ),
-            'current_task_id': task_id,
-            'task_description': task_description
-        }
+        result = _task_selected(state, task, queue)
 
         # Write decision log to file
         write_decision_log_to_file({**state, **result})
@@ -73,34 +87,111 @@ def task_selection_node(state: ThursianState) -> Dict[str, Any]:
         return add_error(state, f"Task selection failed: {str(e)}")
 
 
+@timed
+def task_selection_batch(thursian_dir: str, max_tasks: int) -> List[ThursianState]:
+    """
+    Claim up to max_tasks tasks in one locked queue pass.
+
+    Each claimed task becomes its own workflow state, already past selection
+    (phase ASSIGNMENT) exactly as if task_selection_node had run for it.
+    """
+    queue = get_task_queue(thursian_dir)
+    states: List[ThursianState] = []
+    # The claim and its decision logs commit together
+    with get_storage(thursian_dir).transaction():
+        claim_start = time.perf_counter_ns()
+        tasks = queue.pop_many(max_tasks)
+        claim_end = time.perf_counter_ns()
+        batch_time = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        for task in tasks:
+            state = create_initial_state(thursian_dir, f"workflow_{batch_time}_{task['seq']}")
+            state = {**state, **_task_selected(state, task, queue)}
+            if tracing.recorder is not None:
+                tracing.recorder.record('queue_claim', claim_start, claim_end, state['current_task_id'],
+                                        {'key': task['key'], 'batch': len(tasks)})
+            write_decision_log_to_file(state)
+            states.append(state)
+
+    if tasks:
+        logger.info(f"Claimed {len(tasks)} task(s) in one queue pass")
+    return states
+
+
+def _task_selected(
+    state: ThursianState,
+    task: QueuedTask,
+    queue: Union[TaskQueue, SQLiteTaskQueue]
+) -> Dict[str, Any]:
+    """State update for a task claimed from the queue."""
+    task_id = generate_task_id(task['seq'])
+    logger.info(f"Selected task: {task_id} - {task['description']}")
+
+    return {
+        **transition_phase(state, WorkflowPhase.ASSIGNMENT),
+        'phase_history': [WorkflowPhase.TASK_SELECTION, WorkflowPhase.ASSIGNMENT],
+        **add_decision_log(
+            {**state, 'current_task_id': task_id},
+            reasoning=explain_selection(task, queue.ready_count(), queue.deferred_count()),
+            outcome=f"Task selected: {task['description']}",
+            tool_used="priority_queue"
+        ),
+        'current_task_id': task_id,
+        'task_description': task['description'],
+        'task_key': task['key'],
+        'task_priority': task['priority'],
+        'task_tags': task['tags'],
+        'queue_wait_seconds': (
+            datetime.now() - datetime.fromisoformat(task['enqueued_at'])
+        ).total_seconds()
+    }
+
+
+@timed
 def assignment_node(state: ThursianState) -> Dict[str, Any]:
     """
     Assign agents to task.
 
-    Assigns primary_agent (CODING_AGENT) and validator_agent (REVIEW_AGENT).
+    Picks primary_agent, validator_agent and the guideline doc with the
+    routing rules (default: CODING_AGENT with REVIEW_AGENT validation), then
+    leases the least-loaded primary agent instance from the agent pool. The
+    reviewer instance is leased later by validation_node. If every primary
+    agent is at capacity, waits in ASSIGNMENT.
     Logs decision with reasoning.
     """
     logger.info(f"Assigning agents for task {state['current_task_id']}")
 
     try:
-        # Simple deterministic assignment
-        primary_agent = AgentRole.CODING_AGENT
-        validator_agent = AgentRole.REVIEW_AGENT
+        route = get_task_router(state['thursian_dir']).route(
+            state['task_description'] or '', state.get('task_tags')
+        )
+        primary_agent = route['primary_agent']
+        validator_agent = route['validator_agent']
 
-        logger.info(f"Assigned: Primary={primary_agent.value}, Validator={validator_agent.value}")
+        pool = get_agent_pool(state['thursian_dir'])
+        instance = pool.acquire(primary_agent, state['current_task_id'])
+        if instance is None:
+            logger.info(f"No {primary_agent.value} capacity for {state['current_task_id']}, waiting")
+            return {'waiting_for_human': True}
+
+        logger.info(f"Assigned: Primary={primary_agent.value} ({instance}), Validator={validator_agent.value}")
 
         result = {
             **transition_phase(state, WorkflowPhase.EXECUTION),
             **add_decision_log(
                 state,
-                reasoning="Task requires code implementation, assigned coding agent with review validation",
-                outcome=f"Primary: {primary_agent.value}, Validator: {validator_agent.value}",
+                reasoning=f"{route['reasoning']} (instance chosen {pool.strategy})",
+                outcome=f"Primary: {primary_agent.value} ({instance}), Validator: {validator_agent.value}"
+                        + (f", rule: {route['rule']}" if route['rule'] else ""),
                 agent_assigned=primary_agent.value,
-                doc_reference="docs/agents/CODING_AGENT.md",
-                tool_used="agent_assignment"
+                doc_reference=route['doc_reference'],
+                tool_used="routing_rules" if route['rule'] else "agent_pool"
             ),
             'primary_agent': primary_agent,
-            'validator_agent': validator_agent
+            'validator_agent': validator_agent,
+            'primary_agent_instance': instance,
+            'agent_guidelines': route['doc_reference'],
+            'waiting_for_human': False
         }
 
         write_decision_log_to_file({**state, **result})
@@ -112,13 +203,19 @@ def assignment_node(state: ThursianState) -> Dict[str, Any]:
         return add_error(state, f"Agent assignment failed: {str(e)}")
 
 
+@timed
 def execution_node(state: ThursianState) -> Dict[str, Any]:
     """
     Create task file for human agent to complete.
 
     Creates task definition in .thursian/tasks/{task_id}.md with full context.
     Sets waiting_for_human=True.
-    Human reads docs/agents/CODING_AGENT.md and completes task.
+    Human reads the routed guideline doc (default docs/agents/CODING_AGENT.md)
+    and completes task.
+    When entered from validation (NEEDS_REVISION), archives the previous
+    round's files and transitions back to EXECUTION.
+    If the primary role is served by the agent executor, the task is also
+    submitted there and the AI response is written to the output file.
     """
     logger.info(f"Execution node for task {state['current_task_id']}")
 
@@ -129,85 +226,216 @@ def execution_node(state: ThursianState) -> Dict[str, Any]:
         # Create task file
         task_file_path = os.path.join(state['thursian_dir'], 'tasks', f'{task_id}.md')
 
-        # If task file already exists (from previous loop iteration), just wait
-        if os.path.exists(task_file_path):
-            output_file_path = os.path.join(state['thursian_dir'], 'output', f'{task_id}_output.md')
-            return {
+        output_file_path = os.path.join(state['thursian_dir'], 'output', f'{task_id}_output.md')
+        guidelines = state.get('agent_guidelines') or guideline_doc(state['primary_agent'])
+
+        # Validation asked for rework: archive the round and wait for a new output
+        if state['current_phase'] == WorkflowPhase.VALIDATION:
+            archived = archive_revision_files(state)
+            pool = get_agent_pool(state['thursian_dir'])
+            if state.get('validator_agent_instance'):
+                pool.release(task_id, state['validator_agent_instance'])
+            verdicts = state.get('review_verdicts') or {}
+            for verdict in verdicts.values():
+                if verdict['status'] != CANCELLED:
+                    pool.release(task_id, verdict['instance'])
+                _forget_executor_output(state, verdict['validation_file'])
+            logger.info(f"Revision requested for {task_id}, archived: {archived}")
+            notes = [path for path in archived if os.path.basename(path).startswith(f'{task_id}_validation')
+                     and os.sep + 'output' + os.sep in path]
+            print(f"\n[!] REVISION REQUESTED: {task_id}")
+            if notes:
+                print(f"Review notes: {', '.join(write_revision_notes(state, notes))}")
+            print(f"Write the revised output to: {output_file_path}\n")
+
+            _submit_to_executor(
+                state, state['primary_agent'], guidelines, output_file_path,
+                lambda: _read(state, task_file_path) + _revision_notes(state, notes),
+                lambda: task_description + _revision_notes(state, notes), resubmit=True
+            )
+            _forget_executor_output(state, os.path.join(
+                state['thursian_dir'], 'output', f'{task_id}_validation.md'
+            ))
+
+            result = {
+                **transition_phase(state, WorkflowPhase.EXECUTION),
+                **add_decision_log(
+                    state,
+                    reasoning="Validation marked output NEEDS_REVISION, returning task to primary agent",
+                    outcome=f"Waiting for revised output at {output_file_path}",
+                    agent_assigned=state['primary_agent'].value,
+                    doc_reference=guidelines,
+                    tool_used="revision_archive"
+                ),
                 'task_file_path': task_file_path,
                 'output_file_path': output_file_path,
+                'validator_agent_instance': None,
+                'review_verdicts': {slot: None for slot in verdicts},
+                'subtasks': {slot: None for slot in state.get('subtasks') or {}},
                 'waiting_for_human': True
             }
 
-        os.makedirs(os.path.dirname(task_file_path), exist_ok=True)
-
-        task_content = f"""# Task: {task_id}
+            write_decision_log_to_file({**state, **result})
+            update_status_file({**state, **result})
 
-## Description
+            return result
 
-{task_description}
-
-## Agent Assignment
-
-**Primary Agent**: {state['primary_agent'].value}
-**Agent Guidelines**: docs/agents/CODING_AGENT.md
+        # If task file already exists (from previous loop iteration), just wait
+        storage = get_storage(state['thursian_dir'])
+        if storage.exists(task_file_path):
+            if not storage.exists(output_file_path):
+                # Re-submit AI work lost to a restart (no-op if already submitted)
+                _submit_to_executor(state, state['primary_agent'], guidelines, output_file_path,
+                                    lambda: _read(state, task_file_path), lambda: task_description)
+            return {
+                'task_file_path': task_file_path,
+                'output_file_path': output_file_path,
+                'waiting_for_human': True
+            }
 
-## Instructions
+        task_content = get_template_registry(state['thursian_dir']).render(
+            'task',
+            task_id=task_id,
+            task_description=task_description,
+            primary_agent=state['primary_agent'].value,
+            assigned_to=state.get('primary_agent_instance') or state['primary_agent'].value,
+            guidelines=guidelines,
+            workflow_id=state['workflow_id'],
+            created=datetime.now().isoformat()
+        )
 
-1. Read the agent guidelines at `docs/agents/CODING_AGENT.md`
-2. Implement the solution as described
-3. Create output file at: `.thursian/output/{task_id}_output.md`
-4. Include "**Status: COMPLETE**" in the output file
+        _write_task_file(state, task_file_path, task_content)
 
-## Expected Output
+        logger.info(f"Created task file: {task_file_path}")
+        print(f"\n{'='*60}")
+        print(f"TASK READY: {task_id}")
+        print(f"Task file: {task_file_path}")
+        print(f"Agent guidelines: {guidelines}")
+        print(f"Output file: {output_file_path}")
+        print(f"{'='*60}\n")
 
-File: `.thursian/output/{task_id}_output.md`
+        provider = _submit_to_executor(state, state['primary_agent'], guidelines, output_file_path,
+                                       lambda: task_content, lambda: task_description)
 
-Format:
-```markdown
-# Task Output: {task_id}
+        result = {
+            **add_decision_log(
+                state,
+                reasoning=f"Created task file and submitted it to AI provider {provider}" if provider
+                          else f"Created task file for human agent to complete",
+                outcome=f"Waiting for {'AI agent' if provider else 'human'} to complete task at {output_file_path}",
+                agent_assigned=state['primary_agent'].value,
+                doc_reference=guidelines,
+                tool_used="agent_executor" if provider else "file_creation"
+            ),
+            'task_file_path': task_file_path,
+            'output_file_path': output_file_path,
+            'waiting_for_human': True
+        }
 
-## Implementation
+        write_decision_log_to_file({**state, **result})
+        update_status_file({**state, **result})
 
-[Your solution here]
+        return result
 
-## Notes
+    except Exception as e:
+        logger.error(f"Error in execution_node: {e}")
+        return add_error(state, f"Execution node failed: {str(e)}")
 
-[Any relevant notes or considerations]
 
-**Status: COMPLETE**
-```
+@timed
+def decomposition_node(state: ThursianState) -> Dict[str, Any]:
+    """
+    Split a task tagged ``split`` into subtasks that run in parallel.
+
+    Writes one task file per part at .thursian/tasks/{task_id}_part_{n}.md
+    (output at .thursian/output/{task_id}_part_{n}_output.md). The first part
+    goes to the task's primary agent instance; the others lease further
+    instances from the agent pool, falling back to the primary instance when
+    the pool is full. Each part is submitted to the agent executor if it
+    serves the primary role. Later steps check the parts in parallel and
+    merge their outputs into the task's output file.
+    """
+    logger.info(f"Decomposition node for task {state['current_task_id']}")
 
-## Workflow Information
+    try:
+        task_id = state['current_task_id']
+        description = state['task_description']
+        parts = split_task(description, state.get('task_tags'))
+        guidelines = state.get('agent_guidelines') or guideline_doc(state['primary_agent'])
+        primary_instance = state.get('primary_agent_instance') or state['primary_agent'].value
 
-- Workflow ID: {state['workflow_id']}
-- Created: {datetime.now().isoformat()}
-"""
+        pool = get_agent_pool(state['thursian_dir'])
+        registry = get_template_registry(state['thursian_dir'])
+        task_file_path = os.path.join(state['thursian_dir'], 'tasks', f'{task_id}.md')
+        output_file_path = os.path.join(state['thursian_dir'], 'output', f'{task_id}_output.md')
 
-        with open(task_file_path, 'w') as f:
-            f.write(task_content)
+        subtasks = {}
+        provider = None
+        for n, part in enumerate(parts, start=1):
+            instance = pool.acquire(state['primary_agent'], task_id) if n > 1 else None
+            subtask_id = f'{task_id}_part_{n}'
+            subtask = {
+                'description': part,
+                'instance': instance or primary_instance,
+                'leased': instance is not None,
+                'task_file': os.path.join(state['thursian_dir'], 'tasks', f'{subtask_id}.md'),
+                'output_file': os.path.join(state['thursian_dir'], 'output', f'{subtask_id}_output.md'),
+                'status': SUBTASK_PENDING
+            }
+            content = registry.render(
+                'task',
+                task_id=subtask_id,
+                task_description=f"{part}\n\nThis is part {n} of {len(parts)} of task {task_id}: {description}",
+                primary_agent=state['primary_agent'].value,
+                assigned_to=subtask['instance'],
+                guidelines=guidelines,
+                workflow_id=state['workflow_id'],
+                created=datetime.now().isoformat()
+            )
+            _write_task_file(state, subtask['task_file'], content)
 
-        # Set expected output file path
-        output_file_path = os.path.join(state['thursian_dir'], 'output', f'{task_id}_output.md')
+            subtasks[str(n)] = subtask
+            provider = _submit_subtask(state, guidelines, subtask, content)
 
-        logger.info(f"Created task file: {task_file_path}")
+        parent_description = (
+            f"{description}\n\nSplit into {len(parts)} subtasks:\n"
+            + "".join(f"\n- {subtask['task_file']}" for subtask in subtasks.values())
+            + "\n\nThe output file below is merged automatically once every subtask is complete."
+        )
+        _write_task_file(state, task_file_path, registry.render(
+            'task',
+            task_id=task_id,
+            task_description=parent_description,
+            primary_agent=state['primary_agent'].value,
+            assigned_to=primary_instance,
+            guidelines=guidelines,
+            workflow_id=state['workflow_id'],
+            created=datetime.now().isoformat()
+        ))
+
+        instances = sorted({subtask['instance'] for subtask in subtasks.values()})
+        logger.info(f"Split {task_id} into {len(parts)} subtasks across {', '.join(instances)}")
         print(f"\n{'='*60}")
-        print(f"TASK READY: {task_id}")
-        print(f"Task file: {task_file_path}")
-        print(f"Agent guidelines: docs/agents/CODING_AGENT.md")
-        print(f"Output file: {output_file_path}")
+        print(f"TASK SPLIT: {task_id} ({len(parts)} subtasks)")
+        for subtask in subtasks.values():
+            print(f"Subtask: {subtask['task_file']} -> {subtask['output_file']} ({subtask['instance']})")
+        print(f"Agent guidelines: {guidelines}")
+        print(f"Merged output: {output_file_path}")
         print(f"{'='*60}\n")
 
         result = {
             **add_decision_log(
                 state,
-                reasoning=f"Created task file for human agent to complete",
-                outcome=f"Waiting for human to complete task at {output_file_path}",
+                reasoning=f"Task tagged '{SPLIT_TAG}' with {len(parts)} parts, running them as parallel subtasks"
+                          + (f" (AI provider {provider})" if provider else ""),
+                outcome=f"Waiting for {len(parts)} subtask outputs from {', '.join(instances)}",
                 agent_assigned=state['primary_agent'].value,
-                doc_reference="docs/agents/CODING_AGENT.md",
-                tool_used="file_creation"
+                doc_reference=guidelines,
+                tool_used="task_decomposition"
             ),
             'task_file_path': task_file_path,
             'output_file_path': output_file_path,
+            'subtasks': subtasks,
             'waiting_for_human': True
         }
 
@@ -217,100 +445,254 @@ Format:
         return result
 
     except Exception as e:
-        logger.error(f"Error in execution_node: {e}")
-        return add_error(state, f"Execution node failed: {str(e)}")
+        logger.error(f"Error in decomposition_node: {e}")
+        return add_error(state, f"Decomposition node failed: {str(e)}")
 
 
-def validation_node(state: ThursianState) -> Dict[str, Any]:
+def _submit_subtask(
+    state: ThursianState,
+    guidelines: str,
+    subtask: Dict[str, Any],
+    content: Optional[str] = None
+) -> Optional[str]:
+    return _submit_to_executor(
+        state, state['primary_agent'], guidelines, subtask['output_file'],
+        lambda: content if content is not None else _read(state, subtask['task_file']),
+        lambda: subtask['description']
+    )
+
+
+@timed
+def subtask_check_node(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Create validation task for review agent.
+    Check one subtask's output file.
 
-    Creates validation task in .thursian/tasks/{task_id}_validation.md.
-    Sets waiting_for_human=True.
-    Human reads docs/agents/REVIEW_AGENT.md and validates output.
+    Runs as one parallel branch per pending subtask, receiving
+    ``{'subtask_slot': slot, 'subtask': Subtask, 'thursian_dir': dir}`` from
+    the fan-out.
     """
-    logger.info(f"Validation node for task {state['current_task_id']}")
+    slot, subtask = payload['subtask_slot'], payload['subtask']
+    storage = get_storage(payload['thursian_dir'])
+    status = SUBTASK_PENDING
+
+    try:
+        if storage.exists(subtask['output_file']) and \
+                storage.find_markers(subtask['output_file'], ALL_MARKERS).intersection(COMPLETE_MARKERS):
+            status = SUBTASK_COMPLETE
+            logger.info(f"Subtask {slot} complete: {subtask['output_file']}")
+    except OSError as e:
+        logger.error(f"Error reading subtask output {subtask['output_file']}: {e}")
+
+    return {'subtasks': {slot: {**subtask, 'status': status}}}
+
+
+@timed
+def merge_subtasks_node(state: ThursianState) -> Dict[str, Any]:
+    """
+    Fan subtasks back in: write the task's merged output once all are complete.
 
+    While parts are outstanding it keeps waiting (re-submitting AI work lost
+    to a restart). The merged file is written atomically with a single
+    COMPLETE marker, so routing then proceeds to validation as for any task,
+    and the extra agent leases taken for the subtasks are released.
+    """
     try:
         task_id = state['current_task_id']
+        subtasks = state['subtasks']
+        storage = get_storage(state['thursian_dir'])
+        pending = [subtask for subtask in subtasks.values() if subtask['status'] == SUBTASK_PENDING]
 
-        # Create validation task file
-        validation_task_file = os.path.join(
-            state['thursian_dir'],
-            'tasks',
-            f'{task_id}_validation.md'
-        )
+        if pending:
+            guidelines = state.get('agent_guidelines') or guideline_doc(state['primary_agent'])
+            for subtask in pending:
+                if not storage.exists(subtask['output_file']):
+                    _submit_subtask(state, guidelines, subtask)
+            return {'waiting_for_human': True}
 
-        # If validation task file already exists (from previous loop iteration), just wait
-        if os.path.exists(validation_task_file):
-            validation_file_path = os.path.join(
-                state['thursian_dir'],
-                'output',
-                f'{task_id}_validation.md'
-            )
-            return {
-                'validation_file_path': validation_file_path,
-                'waiting_for_human': True
-            }
+        outputs = {slot: storage.read(subtask['output_file']) for slot, subtask in subtasks.items()}
+        output_file_path = state['output_file_path']
+        storage.write(output_file_path, merge_outputs(task_id, subtasks, outputs))
 
-        os.makedirs(os.path.dirname(validation_task_file), exist_ok=True)
+        pool = get_agent_pool(state['thursian_dir'])
+        for subtask in subtasks.values():
+            if subtask['leased']:
+                pool.release(task_id, subtask['instance'])
 
-        validation_content = f"""# Validation Task: {task_id}
+        logger.info(f"Merged {len(subtasks)} subtask outputs into {output_file_path}")
+        print(f"\n[OK] SUBTASKS MERGED: {task_id} -> {output_file_path}\n")
 
-## Primary Output to Review
+        result = {
+            **add_decision_log(
+                state,
+                reasoning=f"All {len(subtasks)} subtasks complete, merging outputs for validation",
+                outcome=f"Merged output written to {output_file_path}",
+                agent_assigned=state['primary_agent'].value,
+                tool_used="subtask_merge"
+            ),
+            'waiting_for_human': False
+        }
 
-File: `.thursian/output/{task_id}_output.md`
+        write_decision_log_to_file({**state, **result})
+        update_status_file({**state, **result})
 
-## Validator Assignment
+        return result
 
-**Validator Agent**: {state['validator_agent'].value}
-**Agent Guidelines**: docs/agents/REVIEW_AGENT.md
+    except Exception as e:
+        logger.error(f"Error in merge_subtasks_node: {e}")
+        return add_error(state, f"Subtask merge failed: {str(e)}")
 
-## Instructions
 
-1. Read the agent guidelines at `docs/agents/REVIEW_AGENT.md`
-2. Review the primary output at `.thursian/output/{task_id}_output.md`
-3. Assess quality: correctness, completeness, clarity
-4. Create validation file at: `.thursian/output/{task_id}_validation.md`
-5. Mark status as either "**Status: APPROVED**" or "**Status: NEEDS_REVISION**"
+@timed
+def prevalidation_node(state: ThursianState) -> Dict[str, Any]:
+    """
+    Run automated checks on a completed output before it reaches review.
+
+    Code blocks in the output are syntax checked, linted and their included
+    tests run in sandboxed processes; the report goes to
+    .thursian/output/{task_id}_prevalidation.md. A passing output is recorded
+    by content hash and proceeds to validation. A failing output goes straight
+    back to the primary agent: the round is archived as for a review revision,
+    with the report as the revision notes.
+    """
+    logger.info(f"Pre-validation node for task {state['current_task_id']}")
 
-## Expected Output
+    try:
+        task_id = state['current_task_id']
+        output_file_path = state['output_file_path']
+        report_path = os.path.join(state['thursian_dir'], 'output', f'{task_id}_prevalidation.md')
+
+        storage = get_storage(state['thursian_dir'])
+        digest = storage.digest(output_file_path)
+        blocks, results = get_prevalidator(state['thursian_dir']).check(storage.read(output_file_path))
+        failed = [r for r in results if not r['passed']]
+        storage.write(report_path, format_report(task_id, blocks, results))
+
+        failures = ', '.join(f"block {r['block']} {r['check']}" for r in failed)
+        summary = f"{len(results)} checks on {len(blocks)} code blocks, {len(failed)} failed" \
+                  + (f": {failures}" if failed else "")
+        logger.info(f"Pre-validation for {task_id}: {summary}")
+
+        if not failed:
+            result = {
+                **add_decision_log(
+                    state,
+                    reasoning=f"Automated checks passed ({summary})",
+                    outcome=f"Output proceeds to validation; report at {report_path}",
+                    agent_assigned=state['primary_agent'].value,
+                    tool_used="prevalidation"
+                ),
+                'prevalidated_digest': digest,
+                'waiting_for_human': False
+            }
+        else:
+            guidelines = state.get('agent_guidelines') or guideline_doc(state['primary_agent'])
+            task_file_path = state['task_file_path']
+            archived = archive_revision_files(state)
+            notes = [path for path in archived
+                     if os.path.basename(path).startswith(f'{task_id}_prevalidation')]
+            print(f"\n[!] PRE-VALIDATION FAILED: {task_id}")
+            print(f"Failed checks: {failures}")
+            if notes:
+                print(f"Report: {', '.join(write_revision_notes(state, notes))}")
+            print(f"Write the revised output to: {output_file_path}\n")
+
+            _submit_to_executor(
+                state, state['primary_agent'], guidelines, output_file_path,
+                lambda: _read(state, task_file_path) + _revision_notes(state, notes),
+                lambda: state['task_description'] + _revision_notes(state, notes), resubmit=True
+            )
 
-File: `.thursian/output/{task_id}_validation.md`
+            result = {
+                **add_decision_log(
+                    state,
+                    reasoning=f"Automated checks failed ({summary}), returning task to primary agent "
+                              f"without review",
+                    outcome=f"Waiting for revised output at {output_file_path}",
+                    agent_assigned=state['primary_agent'].value,
+                    doc_reference=guidelines,
+                    tool_used="prevalidation"
+                ),
+                'prevalidated_digest': None,
+                'waiting_for_human': True
+            }
 
-Format:
-```markdown
-# Validation: {task_id}
+        write_decision_log_to_file({**state, **result})
+        update_status_file({**state, **result})
 
-## Review Summary
+        return result
 
-[Overall assessment]
+    except Exception as e:
+        logger.error(f"Error in prevalidation_node: {e}")
+        return add_error(state, f"Pre-validation failed: {str(e)}")
 
-## Findings
 
-- [OK] [What's good]
-- [!] [What needs attention]
+@timed
+def validation_node(state: ThursianState) -> Dict[str, Any]:
+    """
+    Create validation task for review agent.
 
-## Recommendation
+    Creates validation task in .thursian/tasks/{task_id}_validation.md and
+    transitions to VALIDATION. Leases the least-loaded review agent instance
+    first and waits if none has a free slot.
+    Sets waiting_for_human=True.
+    Human reads the validator role's guideline doc (default
+    docs/agents/REVIEW_AGENT.md) and validates output, or the validation is
+    submitted to the agent executor if it serves the validator role.
+    """
+    logger.info(f"Validation node for task {state['current_task_id']}")
 
-**Status: APPROVED**
-(or **Status: NEEDS_REVISION**)
+    try:
+        task_id = state['current_task_id']
+        guidelines = guideline_doc(state['validator_agent'])
 
-## Revision Notes
+        reviewers, policy = load_validation_config(state['thursian_dir'])
+        if reviewers > 1:
+            return _start_review_round(state, guidelines, reviewers, policy)
 
-[If needs revision, specify what to change]
-```
+        # Create validation task file
+        validation_task_file = os.path.join(
+            state['thursian_dir'],
+            'tasks',
+            f'{task_id}_validation.md'
+        )
 
-## Workflow Information
+        # If validation task file already exists (from previous loop iteration), just wait
+        storage = get_storage(state['thursian_dir'])
+        if storage.exists(validation_task_file):
+            validation_file_path = os.path.join(
+                state['thursian_dir'],
+                'output',
+                f'{task_id}_validation.md'
+            )
+            if not storage.exists(validation_file_path):
+                _submit_to_executor(
+                    state, state['validator_agent'], guidelines, validation_file_path,
+                    lambda: _read(state, validation_task_file) + _primary_output(state),
+                    lambda: state['task_description'] + _primary_output(state)
+                )
+            return {
+                'validation_file_path': validation_file_path,
+                'waiting_for_human': True
+            }
 
-- Workflow ID: {state['workflow_id']}
-- Task ID: {task_id}
-- Primary Agent: {state['primary_agent'].value}
-- Validator: {state['validator_agent'].value}
-"""
+        pool = get_agent_pool(state['thursian_dir'])
+        reviewer = pool.acquire(state['validator_agent'], task_id)
+        if reviewer is None:
+            logger.info(f"No {state['validator_agent'].value} capacity for {task_id}, waiting")
+            return {'waiting_for_human': True}
+
+        validation_content = get_template_registry(state['thursian_dir']).render(
+            'validation',
+            task_id=task_id,
+            validator_agent=state['validator_agent'].value,
+            assigned_to=reviewer,
+            guidelines=guidelines,
+            workflow_id=state['workflow_id'],
+            primary_agent=state['primary_agent'].value,
+            validation_file=f".thursian/output/{task_id}_validation.md"
+        )
 
-        with open(validation_task_file, 'w') as f:
-            f.write(validation_content)
+        _write_task_file(state, validation_task_file, validation_content)
 
         # Set expected validation file path
         validation_file_path = os.path.join(
@@ -324,20 +706,29 @@ Format:
         print(f"VALIDATION READY: {task_id}")
         print(f"Validation task: {validation_task_file}")
         print(f"Primary output: {state['output_file_path']}")
-        print(f"Agent guidelines: docs/agents/REVIEW_AGENT.md")
+        print(f"Agent guidelines: {guidelines}")
         print(f"Validation file: {validation_file_path}")
         print(f"{'='*60}\n")
 
+        provider = _submit_to_executor(
+            state, state['validator_agent'], guidelines, validation_file_path,
+            lambda: validation_content + _primary_output(state),
+            lambda: state['task_description'] + _primary_output(state)
+        )
+
         result = {
+            **transition_phase(state, WorkflowPhase.VALIDATION),
             **add_decision_log(
                 state,
-                reasoning="Primary execution complete, assigned to review agent for validation",
-                outcome=f"Waiting for validation at {validation_file_path}",
+                reasoning="Primary execution complete, assigned to review agent for validation"
+                          + (f" (AI provider {provider})" if provider else ""),
+                outcome=f"Waiting for validation by {reviewer} at {validation_file_path}",
                 agent_assigned=state['validator_agent'].value,
-                doc_reference="docs/agents/REVIEW_AGENT.md",
-                tool_used="file_creation"
+                doc_reference=guidelines,
+                tool_used="agent_executor" if provider else "file_creation"
             ),
             'validation_file_path': validation_file_path,
+            'validator_agent_instance': reviewer,
             'waiting_for_human': True
         }
 
@@ -351,6 +742,262 @@ Format:
         return add_error(state, f"Validation node failed: {str(e)}")
 
 
+def _start_review_round(
+    state: ThursianState,
+    guidelines: str,
+    reviewers: int,
+    policy: str
+) -> Dict[str, Any]:
+    """
+    Fan validation out to several reviewer instances at once.
+
+    Leases all reviewers or none (waiting for capacity otherwise), writes one
+    validation task per reviewer at .thursian/tasks/{task_id}_validation_{n}.md
+    and records a pending verdict slot for each. Later steps check the
+    reviewers in parallel until the quorum policy decides the round.
+    """
+    task_id = state['current_task_id']
+    pool = get_agent_pool(state['thursian_dir'])
+
+    instances = []
+    for _ in range(reviewers):
+        instance = pool.acquire(state['validator_agent'], task_id)
+        if instance is None:
+            for leased in instances:
+                pool.release(task_id, leased)
+            logger.info(f"Need {reviewers} {state['validator_agent'].value} slots for {task_id}, waiting")
+            return {'waiting_for_human': True}
+        instances.append(instance)
+
+    registry = get_template_registry(state['thursian_dir'])
+    verdicts = {}
+    provider = None
+    for n, instance in enumerate(instances, start=1):
+        task_file = os.path.join(state['thursian_dir'], 'tasks', f'{task_id}_validation_{n}.md')
+        validation_file = os.path.join(state['thursian_dir'], 'output', f'{task_id}_validation_{n}.md')
+
+        content = registry.render(
+            'validation',
+            task_id=task_id,
+            validator_agent=state['validator_agent'].value,
+            assigned_to=instance,
+            guidelines=guidelines,
+            workflow_id=state['workflow_id'],
+            primary_agent=state['primary_agent'].value,
+            validation_file=f".thursian/output/{task_id}_validation_{n}.md"
+        )
+        _write_task_file(state, task_file, content)
+
+        verdict = {'instance': instance, 'task_file': task_file,
+                   'validation_file': validation_file, 'status': PENDING}
+        verdicts[str(n)] = verdict
+        provider = _submit_review(state, guidelines, str(n), verdict, content)
+
+    needed = required_approvals(policy, reviewers)
+    logger.info(f"Created {reviewers} validation tasks for {task_id} (quorum: {policy})")
+    print(f"\n{'='*60}")
+    print(f"VALIDATION READY: {task_id}")
+    print(f"Reviewers: {', '.join(instances)} (quorum: {policy}, {needed} approval(s) needed)")
+    print(f"Primary output: {state['output_file_path']}")
+    print(f"Agent guidelines: {guidelines}")
+    for verdict in verdicts.values():
+        print(f"Validation task: {verdict['task_file']} -> {verdict['validation_file']}")
+    print(f"{'='*60}\n")
+
+    result = {
+        **transition_phase(state, WorkflowPhase.VALIDATION),
+        **add_decision_log(
+            state,
+            reasoning=f"Primary execution complete, assigned to {reviewers} review agents "
+                      f"with {policy} quorum" + (f" (AI provider {provider})" if provider else ""),
+            outcome=f"Waiting for {needed} of {reviewers} approvals from {', '.join(instances)}",
+            agent_assigned=state['validator_agent'].value,
+            doc_reference=guidelines,
+            tool_used="agent_executor" if provider else "file_creation"
+        ),
+        'validation_file_path': None,
+        'review_verdicts': verdicts,
+        'review_quorum': policy,
+        'waiting_for_human': True
+    }
+
+    write_decision_log_to_file({**state, **result})
+    update_status_file({**state, **result})
+
+    return result
+
+
+def _submit_review(
+    state: ThursianState,
+    guidelines: str,
+    slot: str,
+    verdict: Dict[str, Any],
+    content: Optional[str] = None
+) -> Optional[str]:
+    # The slot is part of the cache input so reviewers don't share one cached verdict
+    return _submit_to_executor(
+        state, state['validator_agent'], guidelines, verdict['validation_file'],
+        lambda: (content if content is not None else _read(state, verdict['task_file'])) + _primary_output(state),
+        lambda: f"reviewer {slot}\n" + state['task_description'] + _primary_output(state)
+    )
+
+
+@timed
+def review_check_node(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check one reviewer's validation file.
+
+    Runs as one parallel branch per pending reviewer, receiving
+    ``{'review_slot': slot, 'verdict': ReviewVerdict, 'thursian_dir': dir}``
+    from the fan-out; the updated verdict is merged into state by the
+    review_verdicts reducer.
+    """
+    slot, verdict = payload['review_slot'], payload['verdict']
+    storage = get_storage(payload['thursian_dir'])
+    status = PENDING
+
+    try:
+        if storage.exists(verdict['validation_file']):
+            found = storage.find_markers(verdict['validation_file'], ALL_MARKERS)
+            if found.intersection(APPROVED_MARKERS):
+                status = APPROVED
+            elif found.intersection(REVISION_MARKERS):
+                status = NEEDS_REVISION
+    except OSError as e:
+        logger.error(f"Error reading review file {verdict['validation_file']}: {e}")
+
+    if status != PENDING:
+        logger.info(f"Reviewer {slot} ({verdict['instance']}): {status}")
+    return {'review_verdicts': {slot: {**verdict, 'status': status}}}
+
+
+@timed
+def quorum_node(state: ThursianState) -> Dict[str, Any]:
+    """
+    Apply the quorum policy to the merged reviewer verdicts.
+
+    Keeps waiting while the round is undecided (re-submitting AI reviews lost
+    to a restart). Once decided, reviewers still pending are cancelled: their
+    agent slots are released, their AI requests cancelled and their task
+    files marked so human reviewers can stop. Routing then moves the
+    workflow to completion or back to execution.
+    """
+    try:
+        task_id = state['current_task_id']
+        verdicts = state['review_verdicts']
+        policy = state.get('review_quorum') or DEFAULT_QUORUM
+        decision = quorum_decision(policy, verdicts)
+        storage = get_storage(state['thursian_dir'])
+
+        if decision is None:
+            guidelines = guideline_doc(state['validator_agent'])
+            for slot, verdict in verdicts.items():
+                if verdict['status'] == PENDING and not storage.exists(verdict['validation_file']):
+                    _submit_review(state, guidelines, slot, verdict)
+            return {'waiting_for_human': True}
+
+        pool = get_agent_pool(state['thursian_dir'])
+        executor = get_executor(state['thursian_dir'])
+        cancelled = {}
+        for slot, verdict in verdicts.items():
+            if verdict['status'] != PENDING:
+                continue
+            pool.release(task_id, verdict['instance'])
+            if executor is not None:
+                executor.cancel(verdict['validation_file'])
+            storage.append(verdict['task_file'], f"\n## Cancelled\n\nReview quorum ({policy}) was reached "
+                                                 f"without this review. No action needed.\n")
+            cancelled[slot] = {**verdict, 'status': CANCELLED}
+
+        approvals = sum(1 for verdict in verdicts.values() if verdict['status'] == APPROVED)
+        logger.info(f"Review quorum reached for {task_id}: {decision} "
+                    f"({approvals}/{len(verdicts)} approved, {len(cancelled)} cancelled)")
+
+        result = {
+            **add_decision_log(
+                state,
+                reasoning=f"Review quorum '{policy}' decided with {approvals} of {len(verdicts)} approvals "
+                          f"({required_approvals(policy, len(verdicts))} needed)",
+                outcome=f"Validation {decision}; cancelled reviewers: "
+                        f"{', '.join(v['instance'] for v in cancelled.values()) or 'none'}",
+                agent_assigned=state['validator_agent'].value,
+                tool_used="review_quorum"
+            ),
+            'review_verdicts': cancelled,
+            'waiting_for_human': False
+        }
+
+        write_decision_log_to_file({**state, **result})
+        update_status_file({**state, **result})
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Error in quorum_node: {e}")
+        return add_error(state, f"Quorum node failed: {str(e)}")
+
+
+def _submit_to_executor(
+    state: ThursianState,
+    role: AgentRole,
+    guidelines: str,
+    output_path: str,
+    prompt: Callable[[], str],
+    cache_input: Callable[[], str],
+    resubmit: bool = False
+) -> Optional[str]:
+    """
+    Hand a task to the AI executor if it serves this role.
+
+    The prompt and the cache input (the task content without ids and
+    timestamps) are built lazily so human-only setups never read agent files.
+    Tasks tagged no-cache always get a fresh response.
+    Returns the provider name, or None for the human hand-off.
+    """
+    executor = get_executor(state['thursian_dir'])
+    if executor is None or not executor.handles(role):
+        return None
+    if resubmit:
+        executor.forget(output_path)
+    elif executor.is_submitted(output_path):
+        return executor.roles[role]
+    system_prompt = (
+        get_template_registry(state['thursian_dir']).guideline(guidelines)
+        or f"You are the {role.value} in the Thursian development orchestrator."
+    )
+    request = build_request(
+        state['current_task_id'], role, system_prompt, prompt(),
+        cache_input=cache_input(),
+        bypass_cache=BYPASS_TAG in (state.get('task_tags') or [])
+    )
+    executor.ensure_output(request, output_path)
+    return executor.roles[role]
+
+
+def _forget_executor_output(state: ThursianState, output_path: str) -> None:
+    executor = get_executor(state['thursian_dir'])
+    if executor is not None:
+        executor.forget(output_path)
+
+
+def _read(state: ThursianState, path: str) -> str:
+    return get_storage(state['thursian_dir']).read(path)
+
+
+@timed
+def _write_task_file(state: ThursianState, path: str, content: str) -> None:
+    get_storage(state['thursian_dir']).write(path, content)
+
+
+def _primary_output(state: ThursianState) -> str:
+    return f"\n\n## Primary Output\n\n{_read(state, state['output_file_path'])}"
+
+
+def _revision_notes(state: ThursianState, paths: List[str]) -> str:
+    return "".join(f"\n\n## Revision Notes\n\n{read_archived(state, path)}" for path in paths)
+
+
+@timed
 def completion_node(state: ThursianState) -> Dict[str, Any]:
     """
     Finalize workflow.
@@ -363,12 +1010,24 @@ def completion_node(state: ThursianState) -> Dict[str, Any]:
     try:
         logger.info(f"Workflow {state['workflow_id']} completed successfully")
 
+        # Completion event: unlock queued tasks that depend on this one
+        unlocked = []
+        if state.get('task_key'):
+            unlocked = get_task_queue(state['thursian_dir']).complete(state['task_key'])
+
+        # Free the agent slots this task was holding
+        get_agent_pool(state['thursian_dir']).release(state['current_task_id'])
+
+        outcome = f"Workflow completed successfully for task {state['current_task_id']}"
+        if unlocked:
+            outcome += f"; unlocked dependents: {', '.join(t['key'] for t in unlocked)}"
+
         result = {
             **transition_phase(state, WorkflowPhase.COMPLETED),
             **add_decision_log(
                 state,
                 reasoning="Task validated and approved",
-                outcome=f"Workflow completed successfully for task {state['current_task_id']}",
+                outcome=outcome,
                 tool_used="workflow_completion"
             ),
             'waiting_for_human': False,
@@ -0,0 +1,241 @@
+"""Automated pre-validation of agent outputs before review."""
+
+from typing import TypedDict, Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+import json
+import logging
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MEMORY_MB = 512
+DEFAULT_LINTERS = ['pyflakes']
+MAX_OUTPUT_CHARS = 2000
+
+PYTHON_LANGUAGES = ('python', 'py', 'python3')
+
+_FENCE = re.compile(r'^```[ \t]*([\w+-]*)[^\n]*\n(.*?)^```[ \t]*$', re.MULTILINE | re.DOTALL)
+_TEST_CODE = re.compile(r'^\s*(def test_\w*\s*\(|class Test\w*\s*[(:])', re.MULTILINE)
+
+# Applies CPU, address-space and file-size limits, then execs the check.
+# Runs as its own interpreter so limits never touch the orchestrator process.
+_SANDBOX = (
+    "import os, resource, sys\n"
+    "cpu, memory = int(sys.argv[1]), int(sys.argv[2])\n"
+    "resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))\n"
+    "if memory: resource.setrlimit(resource.RLIMIT_AS, (memory, memory))\n"
+    "resource.setrlimit(resource.RLIMIT_FSIZE, (16 << 20, 16 << 20))\n"
+    "os.execv(sys.argv[3], sys.argv[3:])\n"
+)
+
+
+class CodeBlock(TypedDict):
+    """A fenced code block from an agent output."""
+    index: int                    # 1-based position in the output
+    language: str
+    code: str
+
+
+class CheckResult(TypedDict):
+    """Outcome of one check on one code block."""
+    block: int
+    language: str
+    check: str                    # syntax, lint:<tool> or tests
+    passed: bool
+    skipped: bool
+    output: str
+    duration: float
+
+
+def extract_code_blocks(text: str) -> List[CodeBlock]:
+    """Fenced code blocks in a markdown document, in order."""
+    return [
+        {'index': i, 'language': match.group(1).lower(), 'code': match.group(2)}
+        for i, match in enumerate(_FENCE.finditer(text), start=1)
+    ]
+
+
+def is_test_code(code: str) -> bool:
+    """Whether a Python block defines tests (test_ functions or Test classes)."""
+    return bool(_TEST_CODE.search(code))
+
+
+class PreValidator:
+    """
+    Run syntax checks, linters and included tests on an output's code blocks.
+
+    Every check runs in its own short-lived interpreter in a scratch
+    directory, under CPU, memory and file-size limits and a wall-clock
+    timeout; at most ``workers`` of these sandboxes run at once. Linters
+    that aren't installed are reported as skipped rather than failing.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.timeout = float(config.get('timeout', DEFAULT_TIMEOUT))
+        self.memory_bytes = int(config.get('memory_mb', DEFAULT_MEMORY_MB)) << 20
+        self.linters: List[str] = list(config.get('linters', DEFAULT_LINTERS))
+        self.run_tests = bool(config.get('run_tests', True))
+        self._pool = ThreadPoolExecutor(
+            max_workers=int(config.get('workers', DEFAULT_WORKERS)), thread_name_prefix='prevalidation'
+        )
+
+    def check(self, text: str) -> Tuple[List[CodeBlock], List[CheckResult]]:
+        """Extract an output's code blocks and run every applicable check in parallel."""
+        blocks = extract_code_blocks(text)
+        # Tests see the output's implementation blocks, as if they were one module
+        implementation = "\n\n".join(
+            block['code'] for block in blocks
+            if block['language'] in PYTHON_LANGUAGES and not is_test_code(block['code'])
+        )
+
+        futures = [
+            self._pool.submit(self._run, block, name, argv, files)
+            for block in blocks
+            for name, argv, files in self._checks(block, implementation)
+        ]
+        return blocks, [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _checks(self, block: CodeBlock, implementation: str) -> List[Tuple[str, Optional[List[str]], Dict[str, str]]]:
+        """(check name, argv or None if unavailable, files) for a block."""
+        language, code = block['language'], block['code']
+
+        if language in PYTHON_LANGUAGES:
+            files = {'block.py': code}
+            checks = [('syntax', [sys.executable, '-m', 'py_compile', 'block.py'], files)]
+            for linter in self.linters:
+                argv = [sys.executable, '-m', linter, 'block.py'] if _installed(linter) else None
+                checks.append((f'lint:{linter}', argv, files))
+            if self.run_tests and is_test_code(code):
+                source = f"{implementation}\n\n{code}"
+                if _installed('pytest'):
+                    argv = [sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider', 'test_block.py']
+                else:
+                    argv = [sys.executable, '-m', 'unittest', 'test_block']
+                checks.append(('tests', argv, {'test_block.py': source}))
+            return checks
+
+        if language == 'json':
+            return [('syntax', [sys.executable, '-c', 'import json; json.load(open("block.json"))'],
+                     {'block.json': code})]
+
+        if language in ('sh', 'bash', 'shell'):
+            bash = shutil.which('bash')
+            return [('syntax', [bash, '-n', 'block.sh'] if bash else None, {'block.sh': code})]
+
+        return []
+
+    def _run(self, block: CodeBlock, name: str, argv: Optional[List[str]], files: Dict[str, str]) -> CheckResult:
+        result: CheckResult = {
+            'block': block['index'], 'language': block['language'], 'check': name,
+            'passed': True, 'skipped': argv is None, 'output': '', 'duration': 0.0
+        }
+        if argv is None:
+            result['output'] = f"{name.split(':')[-1]} is not installed"
+            return result
+
+        start = time.monotonic()
+        with tempfile.TemporaryDirectory(prefix='thursian_check_') as workdir:
+            for filename, content in files.items():
+                with open(os.path.join(workdir, filename), 'w', encoding='utf-8') as f:
+                    f.write(content)
+
+            passed, output = self._sandboxed(argv, workdir)
+
+        result.update(passed=passed, output=output[-MAX_OUTPUT_CHARS:].strip(),
+                      duration=time.monotonic() - start)
+        return result
+
+    def _sandboxed(self, argv: List[str], workdir: str) -> Tuple[bool, str]:
+        if os.name == 'posix':
+            cpu = max(1, int(self.timeout) + 1)
+            command = [sys.executable, '-I', '-c', _SANDBOX, str(cpu), str(self.memory_bytes), *argv]
+        else:
+            command = argv     # No resource limits outside POSIX; the timeout still applies
+
+        env = {'PATH': os.environ.get('PATH', ''), 'HOME': workdir, 'PYTHONDONTWRITEBYTECODE': '1',
+               'PYTEST_DISABLE_PLUGIN_AUTOLOAD': '1'}
+        process = subprocess.Popen(
+            command, cwd=workdir, env=env, stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            start_new_session=os.name == 'posix'
+        )
+        try:
+            output, _ = process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            _kill(process)
+            output, _ = process.communicate()
+            return False, f"{output}\nTimed out after {self.timeout:g}s"
+
+        if process.returncode < 0:
+            output += f"\nKilled by signal {-process.returncode} (CPU or memory limit)"
+        return process.returncode == 0, output
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _kill(process: subprocess.Popen) -> None:
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+def format_report(task_id: str, blocks: List[CodeBlock], results: List[CheckResult]) -> str:
+    """Markdown report of a pre-validation run, used as revision notes on failure."""
+    failed = [r for r in results if not r['passed']]
+    lines = [
+        f"# Pre-validation: {task_id}",
+        "",
+        f"{len(blocks)} code block(s), {len(results)} check(s), {len(failed)} failed.",
+        ""
+    ]
+    for r in results:
+        outcome = 'SKIPPED' if r['skipped'] else ('passed' if r['passed'] else 'FAILED')
+        lines.append(f"- Block {r['block']} ({r['language']}) {r['check']}: {outcome} ({r['duration']:.2f}s)")
+
+    for r in failed:
+        lines += ["", f"## Block {r['block']} {r['check']} failed", "", "```text", r['output'], "```"]
+
+    lines += ["", f"**Status: {'NEEDS_REVISION' if failed else 'PASSED'}**", ""]
+    return "\n".join(lines)
+
+
+_validators: Dict[str, Optional[PreValidator]] = {}
+
+
+def get_prevalidator(thursian_dir: str) -> Optional[PreValidator]:
+    """
+    Return the process-wide PreValidator for .thursian/prevalidation.json.
+
+    Returns None (pre-validation off) when there is no config or it sets
+    ``"enabled": false``.
+    """
+    path = os.path.abspath(os.path.join(thursian_dir, 'prevalidation.json'))
+    if path not in _validators:
+        validator = None
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                config = json.load(f)
+            if config.get('enabled', True):
+                validator = PreValidator(config)
+                logger.info(f"Loaded pre-validation checks from {path}")
+        _validators[path] = validator
+    return _validators[path]
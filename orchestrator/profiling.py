@@ -0,0 +1,181 @@
+"""Profiling mode: cProfile per graph node and scheduled tracemalloc diffs."""
+
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from datetime import datetime
+import cProfile
+import contextlib
+import functools
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = 'profiles'
+DEFAULT_INTERVAL = 60.0
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 5
+
+F = TypeVar('F', bound=Callable)
+
+# cProfile profilers are per thread up to 3.11; from 3.12 cProfile is built on
+# sys.monitoring and only one profiler may be active in the whole process
+EXCLUSIVE_PROFILER = sys.version_info >= (3, 12)
+_exclusive = threading.Lock()
+
+
+class ProfileSession:
+    """
+    Collect per-phase cProfile stats and periodic tracemalloc snapshots.
+
+    Each node call runs under its own cProfile.Profile and the result is
+    merged into the stats for the phase the workflow was in. Up to Python
+    3.11 profilers are per thread, so nodes on the scheduler's thread pool
+    are profiled concurrently; from 3.12 only one profiler can be active per
+    process, so profiled node calls run one at a time. Every
+    ``interval`` seconds a background thread takes a tracemalloc snapshot
+    and rewrites the profile dumps and the allocation report, so a long
+    daemon run can be inspected while it is still going.
+    """
+
+    def __init__(self, output_dir: str, interval: float = DEFAULT_INTERVAL):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.stats: Dict[str, pstats.Stats] = {}
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        os.makedirs(output_dir, exist_ok=True)
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.baseline = tracemalloc.take_snapshot()
+        self.previous = self.baseline
+        self.snapshots = 1
+
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._thread.start()
+
+    def add(self, key: str, profile: cProfile.Profile) -> None:
+        """Merge one call's profile into the stats for ``key``."""
+        with self._lock:
+            if key in self.stats:
+                self.stats[key].add(profile)
+            else:
+                self.stats[key] = pstats.Stats(profile)
+            self.calls[key] = self.calls.get(key, 0) + 1
+
+    def dump(self) -> List[str]:
+        """Write <phase>.prof (pstats) and <phase>.txt (top functions) per phase."""
+        paths = []
+        with self._lock:
+            for key, stats in self.stats.items():
+                prof_path = os.path.join(self.output_dir, f"{key}.prof")
+                stats.dump_stats(prof_path)
+
+                stream = io.StringIO()
+                stats.stream = stream
+                stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+                with open(os.path.join(self.output_dir, f"{key}.txt"), 'w') as f:
+                    f.write(f"# {key}: {self.calls[key]} node call(s), sorted by cumulative time\n")
+                    f.write(stream.getvalue())
+                paths.append(prof_path)
+        return paths
+
+    def snapshot_allocations(self) -> str:
+        """Take a tracemalloc snapshot and rewrite allocations.txt; returns its path."""
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        since_start = snapshot.compare_to(self.baseline, 'lineno')
+        since_previous = snapshot.compare_to(self.previous, 'lineno')
+        self.previous = snapshot
+        self.snapshots += 1
+
+        lines = [
+            f"# Allocation report ({datetime.now().isoformat()})",
+            "",
+            f"Snapshots: {self.snapshots} (every {self.interval:g}s)",
+            f"Traced memory: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak",
+            "",
+            f"## Top {TOP_ALLOCATIONS} growth since profiling started",
+            "",
+            *[str(diff) for diff in since_start[:TOP_ALLOCATIONS]],
+            "",
+            f"## Top {TOP_ALLOCATIONS} growth since the previous snapshot",
+            "",
+            *[str(diff) for diff in since_previous[:TOP_ALLOCATIONS]],
+            "",
+        ]
+        path = os.path.join(self.output_dir, 'allocations.txt')
+        with open(path, 'w') as f:
+            f.write("\n".join(lines))
+        return path
+
+    def close(self) -> None:
+        """Stop the schedule and write the final dumps."""
+        self._stop.set()
+        self._thread.join()
+        self.dump()
+        self.snapshot_allocations()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.snapshot_allocations()
+                self.dump()
+            except Exception as e:
+                logger.error(f"Profiler snapshot failed: {e}")
+
+
+session: Optional[ProfileSession] = None
+
+
+def start_profiling(thursian_dir: str, interval: float = DEFAULT_INTERVAL) -> str:
+    """Profile graph nodes into .thursian/profiles/; returns the directory."""
+    global session
+    stop_profiling()
+    session = ProfileSession(os.path.join(thursian_dir, PROFILES_DIR), interval)
+    logger.info(f"Profiling to {session.output_dir} (allocation snapshots every {interval:g}s)")
+    return session.output_dir
+
+
+def stop_profiling() -> Optional[str]:
+    """Write final dumps and stop profiling; returns the output directory."""
+    global session
+    active, session = session, None
+    if active is None:
+        return None
+    active.close()
+    return active.output_dir
+
+
+def profiled(name: str, func: F) -> F:
+    """
+    Wrap a graph node so each call is profiled while a session is active.
+
+    Stats are grouped by the workflow's phase when the node gets a state,
+    otherwise by ``name``. Where the interpreter allows a single profiler
+    (EXCLUSIVE_PROFILER), calls are serialized.
+    """
+    @functools.wraps(func)
+    def wrapper(state: Any, *args, **kwargs):
+        active = session
+        if active is None:
+            return func(state, *args, **kwargs)
+        phase = state.get('current_phase') if isinstance(state, dict) else None
+        with _exclusive if EXCLUSIVE_PROFILER else contextlib.nullcontext():
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(func, state, *args, **kwargs)
+            finally:
+                active.add(phase.value if phase is not None else name, profile)
+
+    return wrapper
@@ -0,0 +1,70 @@
+"""Quorum policies for multi-reviewer validation."""
+
+from typing import Dict, Optional, Tuple
+import json
+import os
+
+from .state import ReviewVerdict
+
+QUORUM_POLICIES = ('first_approve', 'majority', 'unanimous')
+DEFAULT_QUORUM = 'majority'
+
+APPROVED = 'approved'
+NEEDS_REVISION = 'needs_revision'
+PENDING = 'pending'
+CANCELLED = 'cancelled'
+
+
+def load_validation_config(thursian_dir: str) -> Tuple[int, str]:
+    """
+    Reviewer count and quorum policy from .thursian/validation.json.
+
+    Example: ``{"reviewers": 3, "quorum": "majority"}``. Without the file
+    validation uses a single reviewer.
+
+    Raises:
+        ValueError: On an unknown policy or a reviewer count below 1
+    """
+    path = os.path.join(thursian_dir, 'validation.json')
+    if not os.path.exists(path):
+        return 1, DEFAULT_QUORUM
+
+    with open(path, 'r') as f:
+        config = json.load(f)
+
+    reviewers = int(config.get('reviewers', 1))
+    policy = config.get('quorum', DEFAULT_QUORUM)
+    if reviewers < 1:
+        raise ValueError("validation.json: reviewers must be at least 1")
+    if policy not in QUORUM_POLICIES:
+        raise ValueError(f"validation.json: quorum must be one of {QUORUM_POLICIES}")
+    return reviewers, policy
+
+
+def required_approvals(policy: str, reviewers: int) -> int:
+    """Approvals needed to pass validation under a policy."""
+    if policy == 'first_approve':
+        return 1
+    if policy == 'unanimous':
+        return reviewers
+    return reviewers // 2 + 1
+
+
+def quorum_decision(policy: str, verdicts: Dict[str, ReviewVerdict]) -> Optional[str]:
+    """
+    Decide a review round as soon as the outcome is certain.
+
+    Returns:
+        APPROVED once enough reviewers approved, NEEDS_REVISION once the
+        remaining reviewers can no longer reach the required approvals,
+        otherwise None
+    """
+    needed = required_approvals(policy, len(verdicts))
+    statuses = [verdict['status'] for verdict in verdicts.values()]
+    approvals = statuses.count(APPROVED)
+
+    if approvals >= needed:
+        return APPROVED
+    if approvals + statuses.count(PENDING) < needed:
+        return NEEDS_REVISION
+    return None
@@ -0,0 +1,168 @@
+"""Persistent content-addressed cache for agent responses."""
+
+from typing import Any, Dict, Optional
+from collections import Counter, OrderedDict
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Task tag that forces a fresh agent response
+BYPASS_TAG = 'no-cache'
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(model: str, system_prompt: str, task_input: str) -> str:
+    """Content address of an agent invocation."""
+    payload = json.dumps([model, system_prompt, task_input], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Content-addressed response store with TTL and LRU limits.
+
+    Entries live under ``<cache_dir>/<key[:2]>/<key>.json``. File mtimes
+    record last use, so LRU order survives restarts; the in-memory index is
+    rebuilt from a directory scan on startup. Entries older than
+    ``ttl_seconds`` are treated as misses and removed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_seconds: Optional[float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats: Counter = Counter()
+
+        # key -> size in bytes, least recently used first
+        self._index: 'OrderedDict[str, int]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key, or None (recorded as a miss)."""
+        with self._lock:
+            if key not in self._index:
+                self.stats['misses'] += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self._drop(key)
+                self.stats['misses'] += 1
+                return None
+
+            if self.ttl_seconds is not None and time.time() - entry['created_at'] > self.ttl_seconds:
+                self._drop(key)
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            os.utime(path)
+            self._index.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry['response']
+
+    def put(self, key: str, response: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Store a response and evict least recently used entries over the limits."""
+        data = json.dumps({'created_at': time.time(), 'response': response, **(meta or {})})
+        path = self._path(key)
+
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            if key in self._index:
+                self._bytes -= self._index.pop(key)
+            self._index[key] = len(data)
+            self._bytes += len(data)
+            self.stats['stores'] += 1
+            self._evict()
+
+    def record_bypass(self) -> None:
+        """Count a lookup skipped because the task asked for a fresh response."""
+        with self._lock:
+            self.stats['bypassed'] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **{name: self.stats[name] for name in
+                   ('hits', 'misses', 'expired', 'evictions', 'stores', 'bypassed')},
+                'hit_rate': self.stats['hits'] / lookups if lookups else None,
+                'entries': len(self._index),
+                'bytes': self._bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= self._index.pop(key)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self._index and (len(self._index) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(self._index))
+            self._drop(key)
+            self.stats['evictions'] += 1
+
+    def _load_index(self) -> None:
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries: list = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for item in os.scandir(shard.path):
+                if item.name.endswith('.json'):
+                    stat = item.stat()
+                    entries.append((stat.st_mtime, item.name[:-len('.json')], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+
+        self._evict()
+        logger.info(f"Loaded response cache: {len(self._index)} entries, {self._bytes} bytes")
+
+
+def cache_from_config(thursian_dir: str, config: Dict[str, Any]) -> Optional[ResponseCache]:
+    """Build a ResponseCache from the executor config's ``cache`` section."""
+    if not config.get('enabled', True):
+        return None
+    return ResponseCache(
+        os.path.join(thursian_dir, config.get('dir', os.path.join('cache', 'responses'))),
+        ttl_seconds=config.get('ttl_seconds'),
+        max_entries=int(config.get('max_entries', DEFAULT_MAX_ENTRIES)),
+        max_bytes=int(config.get('max_bytes', DEFAULT_MAX_BYTES))
+    )
@@ -1,36 +1,146 @@
 """Conditional routing functions for workflow transitions."""
 
-from typing import Literal
-import os
+from typing import FrozenSet, List, Literal, Tuple, Union
 import logging
 
-from .state import ThursianState
+from langgraph.constants import Send
+
+from .state import ThursianState, WorkflowPhase
+from .quorum import quorum_decision, DEFAULT_QUORUM, APPROVED, PENDING
+from .decomposition import split_task, PENDING as SUBTASK_PENDING
+from .prevalidation import get_prevalidator
+from .storage import get_storage, forget_scans
+from .timing import timed
+from . import storage
 
 logger = logging.getLogger(__name__)
 
+COMPLETE_MARKERS = ("Status: COMPLETE", "Status:** COMPLETE")
+APPROVED_MARKERS = ("Status: APPROVED", "Status:** APPROVED")
+REVISION_MARKERS = ("Status: NEEDS_REVISION", "Status:** NEEDS_REVISION")
+ALL_MARKERS = COMPLETE_MARKERS + APPROVED_MARKERS + REVISION_MARKERS
+
+
+def scan_markers(path: str, markers: Tuple[str, ...] = ALL_MARKERS) -> FrozenSet[str]:
+    """Status markers in a local file, read incrementally (see storage.scan_markers)."""
+    return storage.scan_markers(path, markers)
+
+
+@timed
+def route_entry(
+    state: ThursianState
+) -> Union[Literal["task_selection", "assignment", "decomposition", "execution_node",
+                  "prevalidation", "validation_node", "completion"], List[Send]]:
+    """
+    Route each invocation to the node for the current phase.
+
+    Every node ends the graph run, so one invoke advances one step and the
+    caller (CLI loop or scheduler) polls between steps instead of the graph
+    spinning on loop-back edges.
+
+    Returns:
+        Name of the node to run for this step
+    """
+    phase = state['current_phase']
+
+    if phase in (WorkflowPhase.IDLE, WorkflowPhase.TASK_SELECTION):
+        return "task_selection"
+    if phase == WorkflowPhase.ASSIGNMENT:
+        return "assignment"
+    if phase == WorkflowPhase.EXECUTION:
+        if state.get('subtasks'):
+            return route_subtasks(state)
+        if not state.get('task_file_path') and split_task(state['task_description'], state.get('task_tags')):
+            return "decomposition"
+        return route_after_execution(state)
+    if phase == WorkflowPhase.VALIDATION:
+        if state.get('review_verdicts'):
+            return route_reviews(state)
+        return route_after_validation(state)
+    if phase == WorkflowPhase.CANCELLED:
+        raise ValueError(f"Workflow {state['workflow_id']} was cancelled")
+    return "completion"
+
+
+def route_subtasks(
+    state: ThursianState
+) -> Union[Literal["execution_node", "prevalidation", "validation_node"], List[Send]]:
+    """
+    Route a task split into subtasks.
+
+    Fans out one subtask_check branch per unfinished subtask; the branches
+    run in parallel and join at the merge node, which writes the combined
+    output once every subtask is complete.
+
+    Returns:
+        A Send per pending subtask, or the normal execution routing once the
+        merged output exists
+    """
+    pending = [
+        Send("subtask_check", {'subtask_slot': slot, 'subtask': subtask, 'thursian_dir': state['thursian_dir']})
+        for slot, subtask in state['subtasks'].items() if subtask['status'] == SUBTASK_PENDING
+    ]
+    return pending or route_after_execution(state)
+
+
+def route_reviews(
+    state: ThursianState
+) -> Union[Literal["completion", "execution_node"], List[Send]]:
+    """
+    Route a multi-reviewer validation round.
+
+    While quorum is undecided, fans out one review_check branch per pending
+    reviewer; the branches run in parallel and their verdicts are merged by
+    the review_verdicts reducer before the quorum node.
+
+    Returns:
+        "completion" or "execution_node" once quorum was reached, otherwise
+        a Send per pending reviewer
+    """
+    verdicts = state['review_verdicts']
+    decision = quorum_decision(state.get('review_quorum') or DEFAULT_QUORUM, verdicts)
+
+    if decision == APPROVED:
+        logger.info("Review quorum approved, proceeding to completion")
+        return "completion"
+    if decision is not None:
+        logger.info("Review quorum requires revision, returning to execution")
+        return "execution_node"
+
+    return [
+        Send("review_check", {'review_slot': slot, 'verdict': verdict, 'thursian_dir': state['thursian_dir']})
+        for slot, verdict in verdicts.items() if verdict['status'] == PENDING
+    ]
+
 
 def route_after_execution(
     state: ThursianState
-) -> Literal["execution_node", "validation_node"]:
+) -> Literal["execution_node", "prevalidation", "validation_node"]:
     """
     Route after execution - check if output file exists and is complete.
 
     Returns:
         "execution_node" - Loop back, keep waiting for completion
+        "prevalidation" - Complete, but this output hasn't passed the
+                          automated checks yet (when enabled)
         "validation_node" - Proceed to validation
     """
     output_file = state.get('output_file_path')
+    backend = get_storage(state['thursian_dir'])
 
-    if not output_file or not os.path.exists(output_file):
+    if not output_file or not backend.exists(output_file):
         logger.debug("Output file not found, looping back to execution")
         return "execution_node"  # Loop back - keep waiting
 
-    # Check if file contains completion marker
+    # Check if the output is marked complete (local files: only newly written bytes are read)
     try:
-        with open(output_file, 'r') as f:
-            content = f.read()
+        found = backend.find_markers(output_file, ALL_MARKERS)
 
-        if "Status: COMPLETE" in content or "Status:** COMPLETE" in content:
+        if found.intersection(COMPLETE_MARKERS):
+            if get_prevalidator(state['thursian_dir']) is not None \
+                    and backend.digest(output_file) != state.get('prevalidated_digest'):
+                logger.info("Execution complete, running pre-validation checks")
+                return "prevalidation"
             logger.info("Execution complete, proceeding to validation")
             return "validation_node"  # Proceed
 
@@ -54,21 +164,21 @@ def route_after_validation(
         "execution_node" - Needs revision, return to execution
     """
     validation_file = state.get('validation_file_path')
+    backend = get_storage(state['thursian_dir'])
 
-    if not validation_file or not os.path.exists(validation_file):
+    if not validation_file or not backend.exists(validation_file):
         logger.debug("Validation file not found, looping back to validation")
         return "validation_node"  # Loop back
 
     # Check validation status
     try:
-        with open(validation_file, 'r') as f:
-            content = f.read()
+        found = backend.find_markers(validation_file, ALL_MARKERS)
 
-        if "Status: APPROVED" in content or "Status:** APPROVED" in content:
+        if found.intersection(APPROVED_MARKERS):
             logger.info("Validation approved, proceeding to completion")
             return "completion"  # Approved
 
-        if "Status: NEEDS_REVISION" in content or "Status:** NEEDS_REVISION" in content:
+        if found.intersection(REVISION_MARKERS):
             logger.info("Validation requires revision, returning to execution")
             return "execution_node"  # Rework needed
 
@@ -0,0 +1,243 @@
+"""DAG scheduler that dispatches ready tasks to concurrent workflows."""
+
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+from .graph import create_thursian_workflow
+from .state import ThursianState, WorkflowPhase
+from .helpers import update_status_file
+from .nodes import task_selection_batch
+from .git_manager import CommitQueue
+from .task_queue import get_task_queue
+from .admission import AdmissionController, DEFAULT_INTAKE_ROLE
+from .agent_pool import get_agent_pool, held_instances
+from .executor import get_executor, wait_for_agents
+from .control import drain_commands, matches, cancel_workflow
+from .tracing import task_context, record_phase
+from .storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowScheduler:
+    """
+    Run one workflow per ready task, up to max_parallel at a time.
+
+    The task queue keeps the ready set incrementally (dependencies are tracked
+    with in-degree counters and released by completion_node), so each pass
+    just claims whatever the admission controller and free coding agent slots
+    let in and steps every in-flight workflow once. Graph steps run on a thread pool; queue claims
+    and batched git commits stay on the scheduler thread.
+    """
+
+    def __init__(
+        self,
+        thursian_dir: str = ".thursian",
+        max_parallel: int = 4,
+        admission: Optional[AdmissionController] = None
+    ):
+        self.thursian_dir = thursian_dir
+        self.admission = admission or AdmissionController(max_in_flight=max_parallel)
+        self.max_parallel = self.admission.max_in_flight
+        self.queue = get_task_queue(thursian_dir)
+        self.commits = CommitQueue()
+        self.agents = get_agent_pool(thursian_dir)
+        self.workflow = create_thursian_workflow()
+        self.in_flight: Dict[str, ThursianState] = {}
+        self.completed: List[ThursianState] = []
+        self.failed: List[ThursianState] = []
+        self.cancelled: List[ThursianState] = []
+        self._executor = ThreadPoolExecutor(max_workers=self.max_parallel)
+
+        # Storage backends that checkpoint workflows hand back unfinished ones
+        self.storage = get_storage(thursian_dir)
+        for state in self.storage.load_checkpoints():
+            self.in_flight[state['workflow_id']] = state
+            # Pool leases are in-memory; take back the ones the workflow held
+            if state.get('current_task_id'):
+                self.agents.restore(state['current_task_id'], held_instances(state))
+        if self.in_flight:
+            logger.info(f"Resumed {len(self.in_flight)} workflow(s) from checkpoints")
+
+    def dispatch_ready(self) -> List[ThursianState]:
+        """Claim as many ready tasks as admission control allows, in one queue pass."""
+        self.queue.sync()
+        ready = self.queue.ready_count()
+        slots, reason = self.admission.available_slots(self.in_flight.values(), self.commits.backlog)
+
+        # Don't claim tasks that would only sit in ASSIGNMENT waiting for an agent
+        free = self.agents.free_slots(DEFAULT_INTAKE_ROLE)
+        if free is not None:
+            free -= sum(1 for state in self.in_flight.values()
+                        if state['current_phase'] == WorkflowPhase.ASSIGNMENT)
+            if free < slots:
+                slots, reason = max(free, 0), 'agent_pool'
+
+        started = task_selection_batch(self.thursian_dir, min(slots, ready)) if slots and ready else []
+        self.admission.record_pass(ready, started, reason)
+
+        with self.storage.transaction():
+            for state in started:
+                self._record_step(None, state)
+                self.in_flight[state['workflow_id']] = state
+
+        if started:
+            logger.info(f"Dispatched {len(started)} ready task(s), {len(self.in_flight)} in flight")
+        return started
+
+    def apply_control(self) -> List[ThursianState]:
+        """Carry out cancel/preempt commands from .thursian/control.jsonl."""
+        cancelled = []
+        for command in drain_commands(self.thursian_dir):
+            state = self.cancel(command['task'], command['reason'],
+                                requeue=command['op'] == 'preempt', priority=command['priority'])
+            if state is None:
+                logger.warning(f"No in-flight workflow matches {command['op']} {command['task']}")
+            else:
+                cancelled.append(state)
+        return cancelled
+
+    def cancel(
+        self,
+        task: str,
+        reason: Optional[str] = None,
+        requeue: bool = False,
+        priority: Optional[int] = None
+    ) -> Optional[ThursianState]:
+        """
+        Cancel one in-flight workflow by task id, queue key or workflow id.
+
+        Its pending phase commits are dropped in favour of a single
+        CANCELLED commit; other workflows keep running. Returns the cancelled
+        state, or None if nothing matched.
+        """
+        workflow_id = next((wid for wid, state in self.in_flight.items() if matches(state, task)), None)
+        if workflow_id is None:
+            return None
+
+        state = self.in_flight.pop(workflow_id)
+        if state.get('current_task_id'):
+            self.commits.discard(state['current_task_id'])
+        state = cancel_workflow(state, reason, requeue=requeue, priority=priority)
+        self._record_step(None, state)
+        self.cancelled.append(state)
+        return state
+
+    def step_all(self) -> None:
+        """Advance every in-flight workflow by one graph step concurrently."""
+        previous = dict(self.in_flight)
+        # Collect every step first: the nodes' own transactions must not wait on this one
+        results = list(self._executor.map(self._invoke, previous.values()))
+
+        # One commit for the whole pass's status rows and checkpoints
+        with self.storage.transaction():
+            for workflow_id, state in zip(previous, results):
+                self._record_step(previous[workflow_id]['current_phase'], state)
+
+                if state.get('errors') and len(state['errors']) > len(previous[workflow_id].get('errors', [])):
+                    logger.error(f"Workflow {workflow_id} failed: {state['errors'][-1]}")
+                    if state.get('current_task_id'):
+                        self.agents.release(state['current_task_id'])
+                    self.failed.append(state)
+                    del self.in_flight[workflow_id]
+                elif state['current_phase'] == WorkflowPhase.COMPLETED:
+                    self.completed.append(state)
+                    del self.in_flight[workflow_id]
+                else:
+                    self.in_flight[workflow_id] = state
+
+    def all_waiting(self) -> bool:
+        """True when every in-flight workflow is blocked on an agent."""
+        return all(state.get('waiting_for_human') for state in self.in_flight.values())
+
+    def idle(self) -> bool:
+        """True when nothing is in flight and nothing can be dispatched."""
+        self.queue.sync()
+        return not self.in_flight and self.queue.ready_count() == 0
+
+    def end_pass(self) -> None:
+        """Flush batched git commits and export admission and agent pool metrics."""
+        self.commits.flush()
+        self.admission.write_snapshot(self.thursian_dir, self.in_flight.values(), self.commits.backlog)
+        self.agents.write_snapshot()
+
+    def shutdown(self) -> None:
+        """Release the worker threads and commit anything still pending."""
+        self._executor.shutdown(wait=True)
+        self.commits.flush()
+
+    def _invoke(self, state: ThursianState) -> ThursianState:
+        with task_context(state.get('current_task_id')):
+            return self.workflow.invoke(state, config={"recursion_limit": 1000})
+
+    def _record_step(self, last_phase: Optional[WorkflowPhase], state: ThursianState) -> None:
+        record_phase(state)
+        update_status_file(state)
+        if state['current_phase'] != last_phase:
+            self.commits.enqueue(state['current_phase'].value, state.get('current_task_id'))
+
+
+def run_scheduler(
+    thursian_dir: str = ".thursian",
+    poll_interval: int = 5,
+    max_parallel: int = 4,
+    admission: Optional[AdmissionController] = None
+) -> None:
+    """
+    Run queued tasks concurrently, respecting declared dependencies.
+
+    Args:
+        thursian_dir: Path to .thursian directory (default: ".thursian")
+        poll_interval: Seconds between polling checks (default: 5)
+        max_parallel: Maximum workflows in flight (default: 4)
+        admission: Admission limits (default: only the max_parallel cap)
+    """
+    print("\n" + "="*60)
+    print(f"THURSIAN DEVELOPMENT ORCHESTRATOR - SCHEDULER (max {max_parallel} parallel)")
+    print("="*60 + "\n")
+
+    scheduler = WorkflowScheduler(thursian_dir, max_parallel, admission)
+
+    try:
+        while True:
+            scheduler.apply_control()
+            scheduler.dispatch_ready()
+
+            if scheduler.idle():
+                break
+
+            scheduler.step_all()
+            scheduler.end_pass()
+
+            if scheduler.in_flight and scheduler.all_waiting():
+                print(f"[...] {len(scheduler.in_flight)} workflow(s) waiting on agents "
+                      f"(checking every {poll_interval}s)")
+                wait_for_agents(thursian_dir, poll_interval)
+
+    except KeyboardInterrupt:
+        print("\n\n[!] Scheduler interrupted by user")
+        logger.info("Scheduler interrupted by user")
+
+    finally:
+        scheduler.shutdown()
+
+    print("\nScheduler Summary:")
+    print(f"  - Completed: {len(scheduler.completed)}")
+    print(f"  - Failed: {len(scheduler.failed)}")
+    print(f"  - Cancelled: {len(scheduler.cancelled)}")
+    print(f"  - In flight: {len(scheduler.in_flight)}")
+    print(f"  - Blocked on dependencies: {scheduler.queue.blocked_count()}")
+    print(f"  - Deferred: {scheduler.queue.deferred_count()}")
+    metrics = scheduler.admission.snapshot()
+    print(f"  - Admitted: {metrics['admitted']}")
+    print(f"  - Intake throttled: {metrics['rejections'] or 'never'}")
+    if metrics['queue_wait_seconds']['mean'] is not None:
+        print(f"  - Queue wait (mean/p95): {metrics['queue_wait_seconds']['mean']:.1f}s / "
+              f"{metrics['queue_wait_seconds']['p95']:.1f}s")
+    executor = get_executor(thursian_dir)
+    if executor is not None and executor.cache is not None:
+        cache = executor.cache.snapshot()
+        print(f"  - Response cache: {cache['hits']} hit(s), {cache['misses']} miss(es), "
+              f"{cache['bypassed']} bypassed")
+    print()
@@ -3,6 +3,7 @@
 from typing import TypedDict, Annotated, List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+import json
 import operator
 
 
@@ -14,6 +15,10 @@ class WorkflowPhase(str, Enum):
     EXECUTION = "execution"
     VALIDATION = "validation"
     COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+TERMINAL_PHASES = (WorkflowPhase.COMPLETED, WorkflowPhase.CANCELLED)
 
 
 class AgentRole(str, Enum):
@@ -34,6 +39,40 @@ class DecisionLog(TypedDict):
     outcome: str
 
 
+class ReviewVerdict(TypedDict):
+    """One reviewer's slot in a multi-reviewer validation round."""
+    instance: str
+    task_file: str
+    validation_file: str
+    status: str                   # pending, approved, needs_revision or cancelled
+
+
+class Subtask(TypedDict):
+    """One part of a task split into parallel subtasks."""
+    description: str
+    instance: str
+    leased: bool                  # Extra pool lease held for this subtask
+    task_file: str
+    output_file: str
+    status: str                   # pending or complete
+
+
+def merge_slots(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reducer for per-slot fan-out results (reviewer verdicts, subtasks).
+
+    Updates slots by key so parallel branches can each report their own
+    slot; a None value removes the slot.
+    """
+    merged = dict(left or {})
+    for slot, value in (right or {}).items():
+        if value is None:
+            merged.pop(slot, None)
+        else:
+            merged[slot] = value
+    return merged
+
+
 class ThursianState(TypedDict):
     """State for Thursian orchestrator workflow."""
 
@@ -49,10 +88,27 @@ class ThursianState(TypedDict):
     current_task_id: Optional[str]
     task_description: Optional[str]
     task_file_path: Optional[str]
+    task_key: Optional[str]
+    task_priority: Optional[int]
+    task_tags: List[str]
+    queue_wait_seconds: Optional[float]
 
     # Agent assignments
     primary_agent: Optional[AgentRole]
     validator_agent: Optional[AgentRole]
+    primary_agent_instance: Optional[str]
+    validator_agent_instance: Optional[str]
+    agent_guidelines: Optional[str]
+
+    # Task decomposition (merged across parallel subtask branches)
+    subtasks: Annotated[Dict[str, Subtask], merge_slots]
+
+    # Hash of the output that last passed pre-validation checks
+    prevalidated_digest: Optional[str]
+
+    # Multi-reviewer validation (merged across parallel review branches)
+    review_verdicts: Annotated[Dict[str, ReviewVerdict], merge_slots]
+    review_quorum: Optional[str]
 
     # Decision logging (accumulates)
     decision_logs: Annotated[List[DecisionLog], operator.add]
@@ -68,3 +124,20 @@ class ThursianState(TypedDict):
 
     # Error tracking (accumulates)
     errors: Annotated[List[str], operator.add]
+
+
+def encode_state(state: ThursianState) -> str:
+    """Serialize a workflow state to JSON (for checkpoints)."""
+    return json.dumps({**state, 'created_at': state['created_at'].isoformat()})
+
+
+def decode_state(text: str) -> ThursianState:
+    """Rebuild a workflow state from encode_state output, restoring enums and datetimes."""
+    state = json.loads(text)
+    state['created_at'] = datetime.fromisoformat(state['created_at'])
+    state['current_phase'] = WorkflowPhase(state['current_phase'])
+    state['phase_history'] = [WorkflowPhase(phase) for phase in state['phase_history']]
+    for field in ('primary_agent', 'validator_agent'):
+        if state.get(field) is not None:
+            state[field] = AgentRole(state[field])
+    return state
@@ -0,0 +1,764 @@
+"""Pluggable storage for the .thursian agent protocol documents."""
+
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple, Type, TypeVar
+from contextlib import contextmanager
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .state import ThursianState, TERMINAL_PHASES, encode_state, decode_state
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+STORAGE_CONFIG = 'storage.json'
+DEFAULT_DATABASE = 'storage.db'
+STATUS_DOCUMENT = 'status.json'
+DECISIONS_PREFIX = 'decisions/'
+TASKS_PREFIX = 'tasks/'
+QUEUE_INBOX = 'task_queue.txt'
+
+# Bytes re-read at the head of the file and before the last scanned offset
+# to detect a file rewritten in place rather than appended to
+_CHECK_BYTES = 64
+_MAX_TRACKED_FILES = 4096
+
+F = TypeVar('F', bound=Callable)
+
+
+class StorageBackend:
+    """
+    Base class for where task, output, decision and status documents live.
+
+    Documents are text addressed by the same paths the workflow state holds
+    (``.thursian/output/<task_id>_output.md`` etc.), so switching backends
+    doesn't change the state or the file names in logs. Writes replace a
+    document atomically and create missing directories.
+
+    Subclasses implement exists/read/write/append/move/delete; find_markers,
+    digest and appender have generic versions built on read and append.
+    Decision logs and status are written as JSON documents, and workflows
+    are not checkpointed, unless a backend keeps them as records.
+
+    The task inbox (``task_queue.txt``) is a file with every backend, since
+    humans append to it; exists() reports the file. The file-based task
+    queue's journal and lock (everything but SQLite storage) stay on disk
+    too.
+    """
+
+    name = 'base'
+
+    def __init__(self, thursian_dir: str):
+        self.thursian_dir = thursian_dir
+        self._root = os.path.abspath(thursian_dir)
+
+    def exists(self, path: str) -> bool:
+        raise NotImplementedError
+
+    def read(self, path: str) -> str:
+        """Document content; raises FileNotFoundError if it doesn't exist."""
+        raise NotImplementedError
+
+    def write(self, path: str, content: str) -> None:
+        raise NotImplementedError
+
+    def append(self, path: str, content: str) -> None:
+        """Append to a document, creating it if needed."""
+        raise NotImplementedError
+
+    def move(self, source: str, target: str) -> None:
+        """Rename a document, replacing ``target``."""
+        raise NotImplementedError
+
+    def delete(self, path: str) -> None:
+        """Remove a document if it exists."""
+        raise NotImplementedError
+
+    def find_markers(self, path: str, markers: Tuple[str, ...]) -> FrozenSet[str]:
+        """Which of ``markers`` occur in a document."""
+        content = self.read(path)
+        return frozenset(marker for marker in markers if marker in content)
+
+    def digest(self, path: str) -> str:
+        """SHA-256 of a document's UTF-8 content."""
+        return hashlib.sha256(self.read(path).encode('utf-8')).hexdigest()
+
+    @contextmanager
+    def appender(self, path: str) -> Iterator[Callable[[str], None]]:
+        """Empty a document and yield a function appending chunks to it (streamed output)."""
+        self.write(path, '')
+        yield lambda chunk: self.append(path, chunk)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Make the writes inside the block (one node step) land together or not at all."""
+        yield
+
+    def write_decision(self, path: str, entry: Dict[str, Any]) -> None:
+        """Store one decision log entry under ``path``."""
+        self.write(path, json.dumps(entry, indent=2))
+
+    def write_status(self, path: str, status: Dict[str, Any]) -> None:
+        """Store a workflow's status under ``path``."""
+        self.write(path, json.dumps(status, indent=2))
+
+    def save_checkpoint(self, state: ThursianState) -> None:
+        """Persist a workflow's state after a step, if this backend can resume workflows."""
+
+    def load_checkpoints(self) -> List[ThursianState]:
+        """Unfinished workflows saved by save_checkpoint, oldest first."""
+        return []
+
+    def render(self, target_dir: str, task_id: Optional[str] = None) -> List[str]:
+        """
+        Write documents kept outside the file system to ``target_dir`` as files.
+
+        Returns the paths written; file backends have nothing to render.
+        """
+        return []
+
+    def forget(self, paths: List[str]) -> None:
+        """Drop any per-document state kept for documents no longer watched."""
+
+    def close(self) -> None:
+        """Release connections and handles."""
+
+    def _key(self, path: str) -> str:
+        """Location-independent name of a document: its path relative to the .thursian dir."""
+        return os.path.relpath(os.path.abspath(path), self._root).replace(os.sep, '/')
+
+
+class LocalStorage(StorageBackend):
+    """
+    Documents as plain files, the protocol human agents work with (default).
+
+    Marker checks read only the bytes appended since the previous check.
+    """
+
+    name = 'local'
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def read(self, path: str) -> str:
+        with open(path, 'r') as f:
+            return f.read()
+
+    def write(self, path: str, content: str) -> None:
+        _write_file(path, content)
+
+    def append(self, path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(content)
+
+    def move(self, source: str, target: str) -> None:
+        os.replace(source, target)
+
+    def delete(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def find_markers(self, path: str, markers: Tuple[str, ...]) -> FrozenSet[str]:
+        return scan_markers(path, markers)
+
+    def digest(self, path: str) -> str:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @contextmanager
+    def appender(self, path: str) -> Iterator[Callable[[str], None]]:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            def write(chunk: str) -> None:
+                f.write(chunk)
+                f.flush()
+            yield write
+
+    def forget(self, paths: List[str]) -> None:
+        forget_scans(paths)
+
+
+class MemoryStorage(StorageBackend):
+    """
+    Documents in a dict, for tests and benchmarks that shouldn't touch disk.
+
+    Only visible inside this process: agents must be AI roles served by the
+    executor, or tests writing outputs through the same backend.
+    """
+
+    name = 'memory'
+
+    def __init__(self, thursian_dir: str):
+        super().__init__(thursian_dir)
+        self._documents: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def exists(self, path: str) -> bool:
+        key = self._key(path)
+        if key == QUEUE_INBOX:
+            return os.path.exists(path)
+        return key in self._documents
+
+    def read(self, path: str) -> str:
+        try:
+            return self._documents[self._key(path)]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+
+    def write(self, path: str, content: str) -> None:
+        self._documents[self._key(path)] = content
+
+    def append(self, path: str, content: str) -> None:
+        key = self._key(path)
+        with self._lock:
+            self._documents[key] = self._documents.get(key, '') + content
+
+    def move(self, source: str, target: str) -> None:
+        with self._lock:
+            if self._key(source) not in self._documents:
+                raise FileNotFoundError(source)
+            self._documents[self._key(target)] = self._documents.pop(self._key(source))
+
+    def delete(self, path: str) -> None:
+        self._documents.pop(self._key(path), None)
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    The whole .thursian state in one SQLite database in WAL mode.
+
+    Replaces thousands of small files (and their inodes, directory entries
+    and fsyncs) with one file. Documents are rows addressed by their usual
+    paths; marker checks run in SQL with instr(), so a poll transfers a few
+    flags rather than the document. Decision logs, per-workflow status and
+    workflow checkpoints are rows of their own tables (the task queue too,
+    see SQLiteTaskQueue), and ``status.json`` / ``decisions/*.json`` read
+    back as views of them. transaction() commits everything one node step
+    wrote at once. Each thread gets its own connection; WAL lets readers
+    proceed while one writer commits.
+
+    Options (storage.json):
+
+    - ``path``: the database relative to the .thursian dir (default storage.db)
+    - ``human_protocol``: also render task documents as files when they are
+      written and accept output/validation files written by human agents;
+      documents found only on disk stay plain files (default false)
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            path TEXT PRIMARY KEY,
+            content TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS decisions (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            task_id TEXT,
+            phase TEXT NOT NULL,
+            entry TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS decisions_task ON decisions (task_id);
+        CREATE TABLE IF NOT EXISTS status (
+            workflow_id TEXT PRIMARY KEY,
+            task_id TEXT,
+            phase TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            entry TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS status_updated ON status (updated_at);
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            workflow_id TEXT PRIMARY KEY,
+            task_id TEXT,
+            phase TEXT NOT NULL,
+            active INTEGER NOT NULL,
+            updated_at REAL NOT NULL,
+            state TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS checkpoints_active ON checkpoints (updated_at) WHERE active = 1;
+    """
+
+    def __init__(self, thursian_dir: str, path: str = DEFAULT_DATABASE, human_protocol: bool = False):
+        super().__init__(thursian_dir)
+        self.path = os.path.join(thursian_dir, path)
+        self.human_protocol = human_protocol
+        self._checkpointed: Dict[str, str] = {}
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._writer = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.connection().executescript(self.SCHEMA)
+
+    def exists(self, path: str) -> bool:
+        key = self._key(path)
+        if key == QUEUE_INBOX:
+            return os.path.exists(path)
+        if _is_view(key):
+            return self._fetch(key) is not None
+        changes = self._changes()
+        if key in changes:
+            return changes[key] is not None
+        return self._has_row(key) or self._on_disk(path)
+
+    def read(self, path: str) -> str:
+        content = self._document(self._key(path))
+        if content is not None:
+            return content
+        if self.human_protocol:
+            with open(path, 'r') as f:
+                return f.read()
+        raise FileNotFoundError(path)
+
+    def write(self, path: str, content: str) -> None:
+        with self.transaction():
+            self._local.changes[self._key(path)] = ('set', content)
+        self._render_task(path)
+
+    def append(self, path: str, content: str) -> None:
+        key = self._key(path)
+        if key not in self._changes() and self._on_disk(path) and not self._has_row(key):
+            # A human agent's file: keep it a file
+            with open(path, 'a') as f:
+                f.write(content)
+            return
+        with self.transaction():
+            changes = self._local.changes
+            if key not in changes:
+                changes[key] = ('append', content)
+            elif changes[key] is None:
+                changes[key] = ('set', content)
+            else:
+                op, staged = changes[key]
+                changes[key] = (op, staged + content)
+        self._render_task(path)
+
+    def move(self, source: str, target: str) -> None:
+        moved = False
+        with self.transaction():
+            content = self._document(self._key(source))
+            if content is not None:
+                self._local.changes[self._key(target)] = ('set', content)
+                self._local.changes[self._key(source)] = None
+                moved = True
+        if self._on_disk(source):
+            os.replace(source, target)
+            moved = True
+        if not moved:
+            raise FileNotFoundError(source)
+
+    def delete(self, path: str) -> None:
+        with self.transaction():
+            self._local.changes[self._key(path)] = None
+        if self._on_disk(path):
+            os.remove(path)
+
+    def find_markers(self, path: str, markers: Tuple[str, ...]) -> FrozenSet[str]:
+        key = self._key(path)
+        if key in self._changes():
+            return super().find_markers(path, markers)
+        columns = ", ".join("instr(content, ?) > 0" for _ in markers)
+        row = self.connection().execute(
+            f"SELECT {columns} FROM documents WHERE path = ?", (*markers, key)
+        ).fetchone()
+        if row is not None:
+            return frozenset(marker for marker, present in zip(markers, row) if present)
+        if self.human_protocol:
+            return scan_markers(path, markers)
+        raise FileNotFoundError(path)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Stage the block's writes and apply them in one SQLite transaction at its end.
+
+        Nested blocks join the outer one, and reads inside see the staged
+        writes. Staging keeps the database write lock to the moment it takes
+        to apply a node's writes, instead of the whole node step; threads of
+        this process queue for it on a lock that wakes them as soon as it is
+        free rather than on SQLite's polling busy handler.
+        """
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if not depth:
+            local.changes, local.statements, local.callbacks = {}, [], []
+        local.depth = depth + 1
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            local.depth = depth
+            if not depth:
+                committed = False
+                try:
+                    committed = self._apply(succeeded)
+                finally:
+                    callbacks = local.callbacks
+                    local.changes, local.statements, local.callbacks = {}, [], []
+                    for callback in callbacks:
+                        callback(committed)
+
+    def on_transaction_end(self, callback: Callable[[bool], None]) -> None:
+        """Call ``callback(committed)`` when this thread's transaction ends (at once if none is open)."""
+        if getattr(self._local, 'depth', 0):
+            self._local.callbacks.append(callback)
+        else:
+            callback(True)
+
+    @contextmanager
+    def writing(self) -> Iterator[sqlite3.Connection]:
+        """
+        transaction() for a block that must write straight away; yields this thread's connection.
+
+        For atomic read-modify-write statements such as queue claims. The
+        write lock is then held until the transaction ends.
+        """
+        with self.transaction():
+            self._lock_writer()
+            yield self.connection()
+
+    def write_decision(self, path: str, entry: Dict[str, Any]) -> None:
+        self.stage(
+            "INSERT OR REPLACE INTO decisions (path, task_id, phase, entry) VALUES (?, ?, ?, ?)",
+            (self._key(path), entry.get('task_id'), entry['phase'], json.dumps(entry, indent=2))
+        )
+
+    def write_status(self, path: str, status: Dict[str, Any]) -> None:
+        self.stage(
+            "INSERT OR REPLACE INTO status (workflow_id, task_id, phase, updated_at, entry) VALUES (?, ?, ?, ?, ?)",
+            (status['workflow_id'], status.get('current_task_id'), status['current_phase'],
+             time.time(), json.dumps(status, indent=2))
+        )
+
+    def save_checkpoint(self, state: ThursianState) -> None:
+        workflow_id = state['workflow_id']
+        # Polls that found nothing new leave the state as it was: skip the rewrite
+        encoded = encode_state(state)
+        if self._checkpointed.get(workflow_id) == encoded:
+            return
+        active = state['current_phase'] not in TERMINAL_PHASES and not state.get('errors')
+
+        def remember(committed: bool) -> None:
+            if committed and active:
+                self._checkpointed[workflow_id] = encoded
+            elif committed:
+                self._checkpointed.pop(workflow_id, None)
+
+        with self.transaction():
+            self.stage(
+                "INSERT OR REPLACE INTO checkpoints (workflow_id, task_id, phase, active, updated_at, state) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (workflow_id, state.get('current_task_id'), state['current_phase'].value,
+                 int(active), time.time(), encoded)
+            )
+            self.on_transaction_end(remember)
+
+    def load_checkpoints(self) -> List[ThursianState]:
+        rows = self.connection().execute(
+            "SELECT state FROM checkpoints WHERE active = 1 ORDER BY updated_at"
+        ).fetchall()
+        return [decode_state(row[0]) for row in rows]
+
+    def render(self, target_dir: str, task_id: Optional[str] = None) -> List[str]:
+        conn = self.connection()
+        if task_id is None:
+            rows = conn.execute("SELECT path, content FROM documents").fetchall()
+            rows += conn.execute("SELECT path, entry FROM decisions").fetchall()
+            status = self._fetch(STATUS_DOCUMENT)
+            if status is not None:
+                rows.append((STATUS_DOCUMENT, status))
+        else:
+            rows = conn.execute(
+                "SELECT path, content FROM documents WHERE instr(path, ?) > 0", (task_id,)
+            ).fetchall()
+            rows += conn.execute("SELECT path, entry FROM decisions WHERE task_id = ?", (task_id,)).fetchall()
+
+        written = []
+        for key, content in rows:
+            path = os.path.join(target_dir, *key.split('/'))
+            _write_file(path, content)
+            written.append(path)
+        return written
+
+    def forget(self, paths: List[str]) -> None:
+        if self.human_protocol:
+            forget_scans(paths)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, for modules keeping their own tables in the database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _fetch(self, key: str) -> Optional[str]:
+        conn = self.connection()
+        if key == STATUS_DOCUMENT:
+            row = conn.execute("SELECT entry FROM status ORDER BY updated_at DESC LIMIT 1").fetchone()
+        elif key.startswith(DECISIONS_PREFIX):
+            row = conn.execute("SELECT entry FROM decisions WHERE path = ?", (key,)).fetchone()
+        else:
+            row = conn.execute("SELECT content FROM documents WHERE path = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _changes(self) -> Dict[str, Optional[Tuple[str, str]]]:
+        """Document changes staged by this thread's open transaction (empty outside one)."""
+        return getattr(self._local, 'changes', {})
+
+    def _document(self, key: str) -> Optional[str]:
+        """A document as this thread's transaction sees it; None if it doesn't exist."""
+        changes = self._changes()
+        if key not in changes:
+            return self._fetch(key)
+        if changes[key] is None:
+            return None
+        op, content = changes[key]
+        return (self._fetch(key) or '') + content if op == 'append' else content
+
+    def stage(self, sql: str, params: Tuple = ()) -> None:
+        """Run a statement when the transaction commits (at once if none is open)."""
+        with self.transaction():
+            self._local.statements.append((sql, params))
+
+    def _lock_writer(self) -> None:
+        if not getattr(self._local, 'writer', False):
+            self._writer.acquire()
+            self._local.writer = True
+
+    def _apply(self, succeeded: bool) -> bool:
+        """End this thread's transaction: write out the staged changes and commit, or roll back."""
+        conn = self.connection()
+        local = self._local
+        try:
+            if not succeeded:
+                conn.rollback()
+                return False
+            if local.changes or local.statements:
+                self._lock_writer()
+                now = time.time()
+                for key, change in local.changes.items():
+                    if change is None:
+                        conn.execute("DELETE FROM documents WHERE path = ?", (key,))
+                    elif change[0] == 'set':
+                        conn.execute("INSERT OR REPLACE INTO documents (path, content, updated_at) VALUES (?, ?, ?)",
+                                     (key, change[1], now))
+                    else:
+                        conn.execute(
+                            "INSERT INTO documents (path, content, updated_at) VALUES (?, ?, ?) "
+                            "ON CONFLICT(path) DO UPDATE SET content = content || excluded.content, "
+                            "updated_at = excluded.updated_at",
+                            (key, change[1], now)
+                        )
+                for sql, params in local.statements:
+                    conn.execute(sql, params)
+            conn.commit()
+            return True
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            if getattr(local, 'writer', False):
+                local.writer = False
+                self._writer.release()
+
+    def _has_row(self, key: str) -> bool:
+        return self.connection().execute("SELECT 1 FROM documents WHERE path = ?", (key,)).fetchone() is not None
+
+    def _on_disk(self, path: str) -> bool:
+        return self.human_protocol and os.path.exists(path)
+
+    def _render_task(self, path: str) -> None:
+        """Human protocol: keep the file copy of a task document current."""
+        if self.human_protocol and self._key(path).startswith(TASKS_PREFIX):
+            _write_file(path, self._document(self._key(path)))
+
+
+STORAGE_BACKENDS: Dict[str, Type[StorageBackend]] = {
+    'local': LocalStorage,
+    'memory': MemoryStorage,
+    'sqlite': SQLiteStorage,
+}
+
+
+def register_storage_backend(name: str, backend: Type[StorageBackend]) -> None:
+    """Make a custom storage backend selectable by name in storage.json."""
+    STORAGE_BACKENDS[name] = backend
+
+
+_storages: Dict[str, StorageBackend] = {}
+_storages_lock = threading.Lock()
+
+
+def get_storage(thursian_dir: str) -> StorageBackend:
+    """
+    Return the process-wide storage backend for .thursian/storage.json.
+
+    The config names a ``backend`` (local, sqlite, memory or a registered
+    one) plus its options. Without a config documents are plain files.
+    """
+    key = os.path.abspath(thursian_dir)
+    storage = _storages.get(key)
+    if storage is not None:
+        return storage
+
+    with _storages_lock:
+        if key not in _storages:
+            path = os.path.join(thursian_dir, STORAGE_CONFIG)
+            options: Dict[str, str] = {}
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    options = json.load(f)
+            backend_name = options.pop('backend', 'local')
+            if backend_name not in STORAGE_BACKENDS:
+                raise ValueError(f"Unknown storage backend: {backend_name}")
+            _storages[key] = STORAGE_BACKENDS[backend_name](thursian_dir, **options)
+            if backend_name != 'local':
+                logger.info(f"Using {backend_name} storage for {thursian_dir}")
+        return _storages[key]
+
+
+def transactional(func: F) -> F:
+    """
+    Wrap a graph node so everything it writes commits as one transaction.
+
+    The node's state (or fan-out payload) names the .thursian dir; nodes
+    called without one run unwrapped.
+    """
+    @functools.wraps(func)
+    def wrapper(state: Any, *args, **kwargs):
+        thursian_dir = state.get('thursian_dir') if isinstance(state, dict) else None
+        if thursian_dir is None:
+            return func(state, *args, **kwargs)
+        with get_storage(thursian_dir).transaction():
+            return func(state, *args, **kwargs)
+
+    return wrapper
+
+
+def close_storage(thursian_dir: str) -> None:
+    """Close and forget the backend for a .thursian dir (the next get_storage reloads the config)."""
+    with _storages_lock:
+        storage = _storages.pop(os.path.abspath(thursian_dir), None)
+    if storage is not None:
+        storage.close()
+
+
+def _write_file(path: str, content: str) -> None:
+    """Atomically replace a file, creating missing directories."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Per-thread temp name: several workflows may rewrite status.json at once
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _is_view(key: str) -> bool:
+    """Documents SQLiteStorage serves from its status and decision tables."""
+    return key == STATUS_DOCUMENT or key.startswith(DECISIONS_PREFIX)
+
+
+class _ScanState:
+    __slots__ = ('ino', 'size', 'mtime', 'offset', 'head', 'tail', 'found')
+
+    def __init__(self, ino: int):
+        self.ino = ino
+        self.size = -1
+        self.mtime = -1
+        self.offset = 0
+        self.head = b''
+        self.tail = b''
+        self.found: FrozenSet[str] = frozenset()
+
+
+_scans: Dict[str, _ScanState] = {}
+_scans_lock = threading.Lock()
+
+
+@timed
+def scan_markers(path: str, markers: Tuple[str, ...]) -> FrozenSet[str]:
+    """
+    Markers present in a local file, reading only bytes appended since the last call.
+
+    Output files grow while an agent streams into them, so each poll scans
+    just the new tail. The bytes around the previous end of file are re-read,
+    which catches markers split across polls and detects in-place rewrites;
+    the file is rescanned from the start if it was replaced (new inode),
+    truncated, or its head or previous tail changed. Once a marker has been
+    seen, any later change (size or mtime) also means a full rescan, so a
+    verdict edited in place (APPROVED to NEEDS_REVISION) is never reported
+    from the earlier scan. An unchanged file is not read at all.
+
+    Raises:
+        OSError: If the file can't be read
+    """
+    encoded = [(marker, marker.encode('utf-8')) for marker in markers]
+    window = max(_CHECK_BYTES, max(len(raw) for _, raw in encoded))
+
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+
+        with _scans_lock:
+            state = _scans.get(path)
+            if state is not None and state.ino == stat.st_ino and state.size == stat.st_size \
+                    and state.mtime == stat.st_mtime_ns:
+                return state.found
+
+        head = f.read(_CHECK_BYTES)
+
+        with _scans_lock:
+            if state is None or state.ino != stat.st_ino or stat.st_size < state.offset \
+                    or head[:len(state.head)] != state.head or state.found:
+                if len(_scans) >= _MAX_TRACKED_FILES:
+                    _scans.clear()
+                state = _scans[path] = _ScanState(stat.st_ino)
+            offset, tail, found = state.offset, state.tail, set(state.found)
+
+        start = offset - len(tail)
+        f.seek(start)
+        chunk = f.read()
+        if not chunk.startswith(tail):
+            # Rewritten in place: forget what was seen and scan everything
+            f.seek(0)
+            start, chunk, found = 0, f.read(), set()
+
+    found.update(marker for marker, raw in encoded if raw in chunk)
+
+    with _scans_lock:
+        state.size = stat.st_size
+        state.mtime = stat.st_mtime_ns
+        state.offset = start + len(chunk)
+        state.head = head
+        state.tail = chunk[-window:]
+        state.found = frozenset(found)
+    return state.found
+
+
+def forget_scans(paths: List[str]) -> None:
+    """Drop incremental scan state for files no longer being watched."""
+    with _scans_lock:
+        for path in paths:
+            _scans.pop(path, None)
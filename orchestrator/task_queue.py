@@ -0,0 +1,890 @@
+"""Priority-aware task queue backed by a persisted heap index.
+
+Humans keep appending one task per line to ``.thursian/task_queue.txt``. That
+file is treated as an inbox: on every selection pass new lines are parsed and
+moved into ``.thursian/queue_index.jsonl``, an append-only journal of ``push``
+and ``pop`` records. The journal is replayed once per process into two heaps:
+
+- a ready heap keyed by ``(priority, seq)`` so urgent tasks jump ahead while
+  equal priorities stay FIFO
+- a deferred heap keyed by ``not_before`` so future tasks are promoted only
+  when they become eligible
+
+Selecting a task is therefore O(log n) plus one journal append, instead of a
+read-sort-rewrite of the whole queue file.
+
+Tasks may declare dependencies on other tasks' ``id``. Blocked tasks are held
+outside the heaps by a DependencyTracker with in-degree counters; a ``done``
+record (written when a workflow completes) unlocks dependents in O(out-degree)
+without rescanning the queue.
+
+With ``"backend": "sqlite"`` storage the queue is a table of the storage
+database instead (SQLiteTaskQueue); the inbox works the same way.
+
+Task line format (metadata block is optional)::
+
+    [priority=high tags=api,auth not_before=2026-10-20T09:00] Fix login bug
+    [id=schema] Design the user table
+    [id=api depends=schema] Build the user API
+    Write a Python function to calculate factorial
+"""
+
+from typing import TypedDict, Dict, Iterator, List, Optional, Set, Tuple, Any, Union
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .storage import QUEUE_INBOX, StorageBackend, SQLiteStorage, get_storage
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LEVELS: Dict[str, int] = {
+    'critical': 0,
+    'high': 1,
+    'normal': 2,
+    'low': 3,
+}
+DEFAULT_PRIORITY = PRIORITY_LEVELS['normal']
+
+# Compact the journal once dead records dominate it (amortized O(1) per pop)
+COMPACTION_MIN_DEAD = 1024
+
+
+class QueuedTask(TypedDict):
+    """A task held in the priority queue."""
+    seq: int
+    key: str
+    description: str
+    priority: int
+    tags: List[str]
+    not_before: Optional[str]
+    depends_on: List[str]
+    enqueued_at: str
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive cross-process lock on ``path`` for the block."""
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def priority_name(priority: int) -> str:
+    """Return the symbolic name for a priority value, or the number itself."""
+    for name, value in PRIORITY_LEVELS.items():
+        if value == priority:
+            return name
+    return str(priority)
+
+
+def parse_priority(value: str) -> int:
+    """Parse a priority given either as a level name or a non-negative integer."""
+    value = value.strip().lower()
+    if value in PRIORITY_LEVELS:
+        return PRIORITY_LEVELS[value]
+    try:
+        priority = int(value)
+    except ValueError:
+        raise ValueError(f"Unknown priority: {value}")
+    if priority < 0:
+        raise ValueError(f"Priority must be non-negative: {value}")
+    return priority
+
+
+def parse_task_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse one task line into task fields.
+
+    Args:
+        line: Raw line from the task queue file
+
+    Returns:
+        Dict with description, priority, tags, not_before, key and
+        depends_on, or None for blank lines and ``#`` comments
+
+    Raises:
+        ValueError: If the metadata block is malformed
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+
+    fields: Dict[str, Any] = {
+        'description': line,
+        'priority': DEFAULT_PRIORITY,
+        'tags': [],
+        'not_before': None,
+        'key': None,
+        'depends_on': [],
+    }
+
+    if not line.startswith('['):
+        return fields
+
+    end = line.find(']')
+    if end == -1:
+        raise ValueError(f"Unterminated metadata block: {line}")
+
+    for token in line[1:end].split():
+        key, sep, value = token.partition('=')
+        if not sep or not value:
+            raise ValueError(f"Malformed metadata token: {token}")
+        if key == 'priority':
+            fields['priority'] = parse_priority(value)
+        elif key == 'tags':
+            fields['tags'] = [tag for tag in value.split(',') if tag]
+        elif key == 'not_before':
+            fields['not_before'] = datetime.fromisoformat(value).isoformat()
+        elif key == 'id':
+            fields['key'] = value
+        elif key == 'depends':
+            fields['depends_on'] = [dep for dep in value.split(',') if dep]
+        else:
+            raise ValueError(f"Unknown metadata key: {key}")
+
+    fields['description'] = line[end + 1:].strip()
+    if not fields['description']:
+        raise ValueError(f"Task line has no description: {line}")
+    if fields['key'] and fields['key'] in fields['depends_on']:
+        raise ValueError(f"Task cannot depend on itself: {fields['key']}")
+
+    return fields
+
+
+def parse_inbox(lines: List[str]) -> List[Dict[str, Any]]:
+    """Parse inbox lines into task fields; lines with bad metadata are queued as plain text."""
+    tasks = []
+    for line in lines:
+        try:
+            fields = parse_task_line(line)
+        except ValueError as e:
+            logger.warning(f"Queuing line as plain text, bad metadata: {e}")
+            fields = {
+                'description': line.strip(),
+                'priority': DEFAULT_PRIORITY,
+                'tags': [],
+                'not_before': None,
+                'key': None,
+                'depends_on': [],
+            }
+        if fields is not None:
+            tasks.append(fields)
+    return tasks
+
+
+def explain_selection(task: QueuedTask, ready_count: int, deferred_count: int) -> str:
+    """Build the decision-log reasoning for why a task was selected."""
+    reason = (
+        f"Selected highest-priority ready task "
+        f"(priority={priority_name(task['priority'])}, seq={task['seq']}"
+    )
+    if task['tags']:
+        reason += f", tags={','.join(task['tags'])}"
+    if task['depends_on']:
+        reason += f", dependencies met: {','.join(task['depends_on'])}"
+    reason += f"); {ready_count} ready task(s) remain"
+    if deferred_count:
+        reason += f", {deferred_count} deferred by not_before"
+    return reason
+
+
+class DependencyTracker:
+    """
+    Incremental ready-set maintenance for the task dependency DAG.
+
+    Each blocked task keeps a counter of unmet dependencies, and each
+    dependency key keeps the list of tasks waiting on it. Completing a key
+    only touches its own dependents.
+    """
+
+    def __init__(self, completed: Optional[Set[str]] = None):
+        self.completed: Set[str] = set(completed or ())
+        self._indegree: Dict[int, int] = {}
+        self._dependents: Dict[str, List[int]] = {}
+
+    def add(self, seq: int, depends_on: List[str]) -> bool:
+        """Register a task; return True if it has no unmet dependencies."""
+        unmet = [dep for dep in depends_on if dep not in self.completed]
+        if not unmet:
+            return True
+        self._indegree[seq] = len(unmet)
+        for dep in unmet:
+            self._dependents.setdefault(dep, []).append(seq)
+        return False
+
+    def complete(self, key: str) -> List[int]:
+        """Mark a key completed and return the seqs that became unblocked."""
+        if key in self.completed:
+            return []
+        self.completed.add(key)
+
+        unlocked = []
+        for seq in self._dependents.pop(key, []):
+            self._indegree[seq] -= 1
+            if self._indegree[seq] == 0:
+                del self._indegree[seq]
+                unlocked.append(seq)
+        return unlocked
+
+    def is_blocked(self, seq: int) -> bool:
+        """Whether a task is still waiting on dependencies."""
+        return seq in self._indegree
+
+    def blocked_count(self) -> int:
+        """Number of tasks waiting on dependencies."""
+        return len(self._indegree)
+
+
+class TaskQueue:
+    """Priority queue over the .thursian task inbox and heap index journal."""
+
+    def __init__(self, thursian_dir: str):
+        self.thursian_dir = thursian_dir
+        self.queue_file = os.path.join(thursian_dir, QUEUE_INBOX)
+        self.index_file = os.path.join(thursian_dir, 'queue_index.jsonl')
+        self.lock_file = os.path.join(thursian_dir, 'queue.lock')
+
+        self._tasks: Dict[int, QueuedTask] = {}
+        self._keys: Dict[str, int] = {}
+        self._ready: List[Tuple[int, int]] = []
+        self._deferred: List[Tuple[float, int]] = []
+        self._deferred_seqs: Set[int] = set()
+        self._deps = DependencyTracker()
+        self._next_seq = 1
+        self._dead_records = 0
+        self._index_size = 0
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+
+        self._load_index()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def push(
+        self,
+        description: str,
+        priority: int = DEFAULT_PRIORITY,
+        tags: Optional[List[str]] = None,
+        not_before: Optional[str] = None,
+        key: Optional[str] = None,
+        depends_on: Optional[List[str]] = None
+    ) -> QueuedTask:
+        """Add a task to the queue and persist it to the index."""
+        with self._locked():
+            task = self._new_task(
+                description, priority, tags or [], not_before, key, depends_on or []
+            )
+            self._append_records([{'op': 'push', 'task': task}])
+            self._schedule(task)
+            return task
+
+    def push_many(self, tasks: List[Dict[str, Any]]) -> List[QueuedTask]:
+        """
+        Add a batch of tasks with a single index write.
+
+        Args:
+            tasks: Task fields as returned by parse_task_line
+
+        Returns:
+            The queued tasks, in order
+        """
+        with self._locked():
+            queued = [
+                self._new_task(
+                    fields['description'],
+                    fields.get('priority', DEFAULT_PRIORITY),
+                    fields.get('tags') or [],
+                    fields.get('not_before'),
+                    fields.get('key'),
+                    fields.get('depends_on') or []
+                )
+                for fields in tasks
+            ]
+            self._append_records([{'op': 'push', 'task': task} for task in queued])
+            for task in queued:
+                self._schedule(task)
+            return queued
+
+    def merge(self, key: str, priority: int, tags: List[str]) -> bool:
+        """
+        Fold a duplicate into a pending task.
+
+        The pending task keeps the more urgent priority and the union of tags.
+
+        Returns:
+            True if the task was still pending and has been updated
+        """
+        with self._locked():
+            seq = self._keys.get(key)
+            if seq is None or seq not in self._tasks:
+                return False
+
+            task = self._tasks[seq]
+            merged_tags = task['tags'] + [tag for tag in tags if tag not in task['tags']]
+            merged_priority = min(task['priority'], priority)
+            if merged_priority == task['priority'] and merged_tags == task['tags']:
+                return True
+
+            self._append_records([{
+                'op': 'update', 'seq': seq, 'priority': merged_priority, 'tags': merged_tags
+            }])
+            self._dead_records += 1
+            self._update(task, merged_priority, merged_tags)
+            return True
+
+    def pop(self, now: Optional[datetime] = None) -> Optional[QueuedTask]:
+        """
+        Remove and return the highest-priority task that is ready to run.
+
+        Args:
+            now: Reference time for not_before checks (default: datetime.now())
+
+        Returns:
+            The selected task, or None if no task is ready
+        """
+        tasks = self.pop_many(1, now)
+        return tasks[0] if tasks else None
+
+    def pop_many(self, max_tasks: int, now: Optional[datetime] = None) -> List[QueuedTask]:
+        """
+        Claim up to max_tasks ready tasks in one locked pass.
+
+        The inbox is ingested once and all pop records are written with a
+        single journal append, so lock and I/O cost is shared by the batch.
+
+        Args:
+            max_tasks: Maximum number of tasks to claim
+            now: Reference time for not_before checks (default: datetime.now())
+
+        Returns:
+            Claimed tasks in selection order (may be empty)
+        """
+        now = now or datetime.now()
+        with self._locked():
+            self.sync()
+            self._promote_deferred(now)
+
+            claimed: List[QueuedTask] = []
+            while self._ready and len(claimed) < max_tasks:
+                priority, seq = heapq.heappop(self._ready)
+                task = self._tasks.get(seq)
+                if task is None or task['priority'] != priority:
+                    continue  # Stale heap entry
+                if task['not_before'] and datetime.fromisoformat(task['not_before']) > now:
+                    # Promoted by an earlier pass with a later clock; wait again
+                    self._enqueue_eligible(task)
+                    continue
+                del self._tasks[seq]
+                self._keys.pop(task['key'], None)
+                claimed.append(task)
+
+            if claimed:
+                self._append_records([{'op': 'pop', 'seq': task['seq']} for task in claimed])
+                self._dead_records += 2 * len(claimed)
+                self._maybe_compact()
+            return claimed
+
+    def complete(self, key: str) -> List[QueuedTask]:
+        """
+        Record that the task with this key finished and unlock its dependents.
+
+        Args:
+            key: Task key (its ``id`` metadata, or its seq as a string)
+
+        Returns:
+            Tasks that became schedulable because of this completion
+        """
+        with self._locked():
+            if key in self._deps.completed:
+                return []
+            self._append_records([{'op': 'done', 'key': key}])
+
+            unlocked = []
+            for seq in self._deps.complete(key):
+                task = self._tasks.get(seq)
+                if task is not None:
+                    self._enqueue_eligible(task)
+                    unlocked.append(task)
+            return unlocked
+
+    def sync(self) -> None:
+        """
+        Pick up index changes from other processes and ingest the inbox.
+
+        Deferred tasks are only promoted by pop_many, against its ``now``.
+        """
+        with self._locked():
+            self._ingest_inbox()
+
+    def ready_count(self) -> int:
+        """Number of tasks currently eligible for selection."""
+        return len(self._tasks) - self.deferred_count() - self._deps.blocked_count()
+
+    def blocked_count(self) -> int:
+        """Number of tasks waiting on unfinished dependencies."""
+        return self._deps.blocked_count()
+
+    def deferred_count(self) -> int:
+        """Number of tasks waiting on a not_before time."""
+        return len(self._waiting())
+
+    def next_eligible_at(self) -> Optional[str]:
+        """Earliest not_before among deferred tasks, if any."""
+        waiting = self._waiting()
+        if not waiting:
+            return None
+        return self._tasks[min(waiting)[1]]['not_before']
+
+    def pending(self) -> List[QueuedTask]:
+        """All pending tasks in selection order (ignoring not_before)."""
+        return sorted(self._tasks.values(), key=lambda t: (t['priority'], t['seq']))
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Thread and process exclusion; reloads the index if another writer moved it."""
+        with self._lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+
+            os.makedirs(self.thursian_dir, exist_ok=True)
+            with file_lock(self.lock_file):
+                self._lock_depth = 1
+                try:
+                    if self._journal_size() != self._index_size:
+                        self._load_index()
+                    yield
+                finally:
+                    self._lock_depth = 0
+
+    def _new_task(
+        self,
+        description: str,
+        priority: int,
+        tags: List[str],
+        not_before: Optional[str],
+        key: Optional[str] = None,
+        depends_on: Optional[List[str]] = None
+    ) -> QueuedTask:
+        seq = self._next_seq
+        task: QueuedTask = {
+            'seq': seq,
+            'key': key or str(seq),
+            'description': description,
+            'priority': priority,
+            'tags': tags,
+            'not_before': not_before,
+            'depends_on': depends_on or [],
+            'enqueued_at': datetime.now().isoformat(),
+        }
+        self._next_seq += 1
+        return task
+
+    def _schedule(self, task: QueuedTask) -> None:
+        self._tasks[task['seq']] = task
+        self._keys[task['key']] = task['seq']
+        if self._deps.add(task['seq'], task['depends_on']):
+            self._enqueue_eligible(task)
+
+    def _update(self, task: QueuedTask, priority: int, tags: List[str]) -> None:
+        """Change a pending task; superseded ready-heap entries go stale."""
+        reprioritized = priority != task['priority']
+        task['priority'] = priority
+        task['tags'] = tags
+        seq = task['seq']
+        is_ready = not self._deps.is_blocked(seq) and seq not in self._deferred_seqs
+        if reprioritized and is_ready:
+            heapq.heappush(self._ready, (priority, task['seq']))
+
+    def _enqueue_eligible(self, task: QueuedTask) -> None:
+        if task['not_before']:
+            eligible_at = datetime.fromisoformat(task['not_before']).timestamp()
+            heapq.heappush(self._deferred, (eligible_at, task['seq']))
+            self._deferred_seqs.add(task['seq'])
+        else:
+            heapq.heappush(self._ready, (task['priority'], task['seq']))
+
+    def _waiting(self) -> List[Tuple[float, int]]:
+        # Deferred entries not yet due; due ones are promoted on the next pop
+        cutoff = time.time()
+        return [entry for entry in self._deferred if entry[0] > cutoff]
+
+    def _promote_deferred(self, now: datetime) -> None:
+        cutoff = now.timestamp()
+        while self._deferred and self._deferred[0][0] <= cutoff:
+            _, seq = heapq.heappop(self._deferred)
+            self._deferred_seqs.discard(seq)
+            task = self._tasks.get(seq)
+            if task is not None:
+                heapq.heappush(self._ready, (task['priority'], seq))
+
+    def _ingest_inbox(self) -> None:
+        """Move newly appended task lines from task_queue.txt into the index."""
+        if not os.path.exists(self.queue_file) or os.path.getsize(self.queue_file) == 0:
+            return
+
+        with open(self.queue_file, 'r') as f:
+            new_tasks = [self._new_task(**fields) for fields in parse_inbox(f.readlines())]
+
+        # Persist to the index before truncating so a crash cannot lose tasks
+        self._append_records([{'op': 'push', 'task': task} for task in new_tasks])
+        for task in new_tasks:
+            self._schedule(task)
+
+        with open(self.queue_file, 'w'):
+            pass
+
+        if new_tasks:
+            logger.info(f"Ingested {len(new_tasks)} task(s) from {self.queue_file}")
+
+    def _journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.index_file)
+        except OSError:
+            return 0
+
+    def _load_index(self) -> None:
+        """Replay the journal and rebuild both heaps and the dependency DAG."""
+        self._tasks = {}
+        self._dead_records = 0
+        self._next_seq = 1
+        completed: Set[str] = set()
+
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record['op'] == 'push':
+                        task = record['task']
+                        self._tasks[task['seq']] = task
+                        self._next_seq = max(self._next_seq, task['seq'] + 1)
+                    elif record['op'] == 'pop':
+                        if self._tasks.pop(record['seq'], None) is not None:
+                            self._dead_records += 2
+                    elif record['op'] == 'update':
+                        task = self._tasks.get(record['seq'])
+                        if task is not None:
+                            task['priority'] = record['priority']
+                            task['tags'] = record['tags']
+                        self._dead_records += 1
+                    elif record['op'] == 'done':
+                        completed.add(record['key'])
+                    elif record['op'] == 'meta':
+                        self._next_seq = max(self._next_seq, record['next_seq'])
+
+        tasks = sorted(self._tasks.values(), key=lambda t: t['seq'])
+        self._tasks = {}
+        self._keys = {}
+        self._ready = []
+        self._deferred = []
+        self._deferred_seqs = set()
+        self._deps = DependencyTracker(completed)
+        for task in tasks:
+            self._schedule(task)
+        self._index_size = self._journal_size()
+
+    def _append_records(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        os.makedirs(self.thursian_dir, exist_ok=True)
+        with open(self.index_file, 'a') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in records))
+        self._index_size = self._journal_size()
+
+    def _maybe_compact(self) -> None:
+        if self._dead_records < COMPACTION_MIN_DEAD or self._dead_records < len(self._tasks):
+            return
+
+        tmp_file = self.index_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            # Keep sequence numbers monotonic even when every task was popped
+            f.write(json.dumps({'op': 'meta', 'next_seq': self._next_seq}) + '\n')
+            # Completed keys must survive so later dependents are not blocked
+            for key in sorted(self._deps.completed):
+                f.write(json.dumps({'op': 'done', 'key': key}) + '\n')
+            for task in sorted(self._tasks.values(), key=lambda t: t['seq']):
+                f.write(json.dumps({'op': 'push', 'task': task}) + '\n')
+        os.replace(tmp_file, self.index_file)
+
+        self._dead_records = 0
+        self._index_size = self._journal_size()
+        logger.debug(f"Compacted queue index to {len(self._tasks)} task(s)")
+
+
+class SQLiteTaskQueue:
+    """
+    The task queue as rows of the SQLite storage database.
+
+    Same interface as TaskQueue, for ``"backend": "sqlite"`` storage. There
+    is no journal to replay: pending tasks are rows, and a claim is one
+    UPDATE ... RETURNING over a partial index on (priority, seq) of ready
+    rows, so it costs O(log n + k) whatever the queue length and is atomic
+    across processes. Unmet dependency counts live on the task rows and
+    completed keys in their own table. Claims run inside the storage
+    transaction, so a node's queue claim and its decision log commit
+    together. task_queue.txt is still read as the human inbox.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT NOT NULL,
+            description TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            tags TEXT NOT NULL,
+            not_before TEXT,
+            eligible_at REAL,
+            depends_on TEXT NOT NULL,
+            unmet INTEGER NOT NULL,
+            enqueued_at TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            claimed_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (priority, seq)
+            WHERE state = 'pending' AND unmet = 0;
+        CREATE INDEX IF NOT EXISTS tasks_pending_key ON tasks (key) WHERE state = 'pending';
+        CREATE TABLE IF NOT EXISTS task_dependencies (
+            key TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            PRIMARY KEY (key, seq)
+        );
+        CREATE TABLE IF NOT EXISTS completed_keys (
+            key TEXT PRIMARY KEY
+        );
+    """
+
+    _COLUMNS = "seq, key, description, priority, tags, not_before, depends_on, enqueued_at"
+
+    def __init__(self, storage: SQLiteStorage):
+        self.storage = storage
+        self.thursian_dir = storage.thursian_dir
+        self.queue_file = os.path.join(storage.thursian_dir, QUEUE_INBOX)
+        self.lock_file = os.path.join(storage.thursian_dir, 'queue.lock')
+        self._conn().executescript(self.SCHEMA)
+
+    def push(
+        self,
+        description: str,
+        priority: int = DEFAULT_PRIORITY,
+        tags: Optional[List[str]] = None,
+        not_before: Optional[str] = None,
+        key: Optional[str] = None,
+        depends_on: Optional[List[str]] = None
+    ) -> QueuedTask:
+        """Add a task to the queue."""
+        return self.push_many([{
+            'description': description, 'priority': priority, 'tags': tags,
+            'not_before': not_before, 'key': key, 'depends_on': depends_on,
+        }])[0]
+
+    def push_many(self, tasks: List[Dict[str, Any]]) -> List[QueuedTask]:
+        """Add a batch of tasks in one transaction; returns them in order."""
+        with self.storage.writing() as conn:
+            return [self._insert(conn, fields) for fields in tasks]
+
+    def merge(self, key: str, priority: int, tags: List[str]) -> bool:
+        """Fold a duplicate into a pending task (more urgent priority, union of tags)."""
+        with self.storage.writing() as conn:
+            row = conn.execute(
+                "SELECT seq, priority, tags FROM tasks WHERE key = ? AND state = 'pending'", (key,)
+            ).fetchone()
+            if row is None:
+                return False
+            seq, current_priority, current_tags = row[0], row[1], json.loads(row[2])
+            merged_tags = current_tags + [tag for tag in tags if tag not in current_tags]
+            conn.execute(
+                "UPDATE tasks SET priority = ?, tags = ? WHERE seq = ?",
+                (min(current_priority, priority), json.dumps(merged_tags), seq)
+            )
+            return True
+
+    def pop(self, now: Optional[datetime] = None) -> Optional[QueuedTask]:
+        """Remove and return the highest-priority ready task, or None."""
+        tasks = self.pop_many(1, now)
+        return tasks[0] if tasks else None
+
+    def pop_many(self, max_tasks: int, now: Optional[datetime] = None) -> List[QueuedTask]:
+        """Claim up to max_tasks ready tasks with a single indexed UPDATE."""
+        self.sync()
+        with self.storage.writing() as conn:
+            rows = conn.execute(
+                f"UPDATE tasks SET state = 'claimed', claimed_at = ? WHERE seq IN ("
+                f"SELECT seq FROM tasks WHERE state = 'pending' AND unmet = 0 "
+                f"AND (eligible_at IS NULL OR eligible_at <= ?) ORDER BY priority, seq LIMIT ?"
+                f") RETURNING {self._COLUMNS}",
+                (time.time(), (now or datetime.now()).timestamp(), max_tasks)
+            ).fetchall()
+        # RETURNING order is unspecified
+        return sorted((_row_task(row) for row in rows), key=lambda t: (t['priority'], t['seq']))
+
+    def complete(self, key: str) -> List[QueuedTask]:
+        """Record that the task with this key finished; returns tasks it unblocked."""
+        with self.storage.transaction():
+            conn = self._conn()
+            if conn.execute("SELECT 1 FROM completed_keys WHERE key = ?", (key,)).fetchone() is not None:
+                return []
+            rows = conn.execute(
+                f"SELECT unmet, state, {self._COLUMNS} FROM tasks WHERE seq IN "
+                f"(SELECT seq FROM task_dependencies WHERE key = ?)", (key,)
+            ).fetchall()
+            # Staged: the dependency rows go with the decrement, so it can't happen twice
+            self.storage.stage("INSERT OR IGNORE INTO completed_keys (key) VALUES (?)", (key,))
+            self.storage.stage("UPDATE tasks SET unmet = unmet - 1 WHERE seq IN "
+                               "(SELECT seq FROM task_dependencies WHERE key = ?)", (key,))
+            self.storage.stage("DELETE FROM task_dependencies WHERE key = ?", (key,))
+        unlocked = [_row_task(row[2:]) for row in rows if row[0] == 1 and row[1] == 'pending']
+        return sorted(unlocked, key=lambda t: t['seq'])
+
+    def sync(self) -> None:
+        """Move newly appended task lines from task_queue.txt into the database."""
+        if not os.path.exists(self.queue_file) or os.path.getsize(self.queue_file) == 0:
+            return
+        # The inbox stays locked until the transaction ends and is truncated
+        # only once its tasks are committed, so a crash cannot lose them
+        inbox = ExitStack()
+
+        def release(committed: bool) -> None:
+            try:
+                if committed:
+                    with open(self.queue_file, 'w'):
+                        pass
+            finally:
+                inbox.close()
+
+        with self.storage.writing():
+            inbox.enter_context(file_lock(self.lock_file))
+            self.storage.on_transaction_end(release)
+            with open(self.queue_file, 'r') as f:
+                tasks = parse_inbox(f.readlines())
+            self.push_many(tasks)
+        if tasks:
+            logger.info(f"Ingested {len(tasks)} task(s) from {self.queue_file}")
+
+    def ready_count(self) -> int:
+        """Number of tasks currently eligible for selection."""
+        return self._count("unmet = 0 AND (eligible_at IS NULL OR eligible_at <= ?)", time.time())
+
+    def blocked_count(self) -> int:
+        """Number of tasks waiting on unfinished dependencies."""
+        return self._count("unmet > 0")
+
+    def deferred_count(self) -> int:
+        """Number of tasks waiting on a not_before time."""
+        return self._count("unmet = 0 AND eligible_at > ?", time.time())
+
+    def next_eligible_at(self) -> Optional[str]:
+        """Earliest not_before among deferred tasks, if any."""
+        row = self._conn().execute(
+            "SELECT not_before FROM tasks WHERE state = 'pending' AND unmet = 0 AND eligible_at > ? "
+            "ORDER BY eligible_at LIMIT 1", (time.time(),)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def pending(self) -> List[QueuedTask]:
+        """All pending tasks in selection order (ignoring not_before)."""
+        rows = self._conn().execute(
+            f"SELECT {self._COLUMNS} FROM tasks WHERE state = 'pending' ORDER BY priority, seq"
+        ).fetchall()
+        return [_row_task(row) for row in rows]
+
+    def __len__(self) -> int:
+        return self._count("1")
+
+    def _conn(self) -> sqlite3.Connection:
+        return self.storage.connection()
+
+    def _count(self, where: str, *params: Any) -> int:
+        return self._conn().execute(
+            f"SELECT COUNT(*) FROM tasks WHERE state = 'pending' AND {where}", params
+        ).fetchone()[0]
+
+    def _insert(self, conn: sqlite3.Connection, fields: Dict[str, Any]) -> QueuedTask:
+        depends_on = fields.get('depends_on') or []
+        unmet = [dep for dep in dict.fromkeys(depends_on)
+                 if conn.execute("SELECT 1 FROM completed_keys WHERE key = ?", (dep,)).fetchone() is None]
+        not_before = fields.get('not_before')
+        seq = conn.execute(
+            "INSERT INTO tasks (key, description, priority, tags, not_before, eligible_at, depends_on, "
+            "unmet, enqueued_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) RETURNING seq",
+            (fields.get('key') or '', fields['description'], fields.get('priority', DEFAULT_PRIORITY),
+             json.dumps(fields.get('tags') or []), not_before,
+             datetime.fromisoformat(not_before).timestamp() if not_before else None,
+             json.dumps(depends_on), len(unmet), datetime.now().isoformat())
+        ).fetchone()[0]
+        if not fields.get('key'):
+            conn.execute("UPDATE tasks SET key = ? WHERE seq = ?", (str(seq), seq))
+        conn.executemany("INSERT INTO task_dependencies (key, seq) VALUES (?, ?)", [(dep, seq) for dep in unmet])
+        row = conn.execute(f"SELECT {self._COLUMNS} FROM tasks WHERE seq = ?", (seq,)).fetchone()
+        return _row_task(row)
+
+
+def _row_task(row: Tuple) -> QueuedTask:
+    seq, key, description, priority, tags, not_before, depends_on, enqueued_at = row
+    return {
+        'seq': seq,
+        'key': key,
+        'description': description,
+        'priority': priority,
+        'tags': json.loads(tags),
+        'not_before': not_before,
+        'depends_on': json.loads(depends_on),
+        'enqueued_at': enqueued_at,
+    }
+
+
+_queues: Dict[str, Tuple[StorageBackend, Union[TaskQueue, SQLiteTaskQueue]]] = {}
+
+
+def get_task_queue(thursian_dir: str) -> Union[TaskQueue, SQLiteTaskQueue]:
+    """
+    Return the process-wide task queue for a .thursian directory.
+
+    With SQLite storage the queue lives in the storage database; otherwise
+    it is the heap index journal.
+    """
+    key = os.path.abspath(thursian_dir)
+    storage = get_storage(thursian_dir)
+    cached = _queues.get(key)
+    if cached is None or cached[0] is not storage:
+        queue = SQLiteTaskQueue(storage) if isinstance(storage, SQLiteStorage) else TaskQueue(thursian_dir)
+        cached = _queues[key] = (storage, queue)
+    return cached[1]
@@ -0,0 +1,276 @@
+"""Rule-based routing of tasks to agent roles and guideline docs."""
+
+from typing import TypedDict, Dict, Iterable, List, Optional, Any, Tuple
+from collections import deque
+import json
+import logging
+import os
+import re
+
+from .state import AgentRole
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REASONING = "Task requires code implementation, assigned coding agent with review validation"
+
+_NAMED_GROUP = re.compile(r'\(\?P<\w+>')
+# Backreferences and global inline flags only mean the same thing in a
+# pattern of their own, not inside the combined alternation
+_STANDALONE_ONLY = re.compile(r'\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)')
+
+
+def guideline_doc(role: AgentRole) -> str:
+    """Guideline document for an agent role (docs/agents/<ROLE>.md)."""
+    return f"docs/agents/{role.value.upper()}.md"
+
+
+class RoutingRule(TypedDict):
+    """
+    One routing rule. A rule matches when any keyword, the regex or any tag
+    matches; the first matching rule in file order wins.
+    """
+    name: str
+    keywords: List[str]
+    regex: Optional[str]
+    tags: List[str]
+    primary_agent: AgentRole
+    validator_agent: AgentRole
+    doc_reference: str
+    reasoning: str
+
+
+class RouteDecision(TypedDict):
+    """Result of routing one task."""
+    rule: Optional[str]             # None when the default route applied
+    primary_agent: AgentRole
+    validator_agent: AgentRole
+    doc_reference: str
+    reasoning: str
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over lowercase keywords and phrases.
+
+    Scanning is linear in the text length regardless of how many keywords
+    are registered. Matches must start and end on word boundaries.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, int]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]   # (keyword length, rule index)
+
+        for keyword, rule_index in keywords:
+            self._insert(keyword.lower(), rule_index)
+        self._build_failure_links()
+
+    def best_match(self, text: str) -> Optional[int]:
+        """Lowest rule index with a keyword in text, or None."""
+        text = text.lower()
+        best: Optional[int] = None
+        state = 0
+
+        for end, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for length, rule_index in self._out[state]:
+                if best is not None and rule_index >= best:
+                    continue
+                start = end - length + 1
+                if _at_boundary(text, start - 1) and _at_boundary(text, end + 1):
+                    best = rule_index
+
+        return best
+
+    def _insert(self, keyword: str, rule_index: int) -> None:
+        state = 0
+        for char in keyword:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._out[state].append((len(keyword), rule_index))
+
+    def _build_failure_links(self) -> None:
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self._goto[state].items():
+                pending.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+
+def _at_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not (text[index].isalnum() or text[index] == '_')
+
+
+class TaskRouter:
+    """
+    Route tasks to agent roles using rules compiled once into combined matchers.
+
+    Keywords go into a single Aho-Corasick automaton, tags into a hash map,
+    and regexes into one alternation of zero-width lookaheads ordered by rule
+    priority, so routing a task is one scan per matcher rather than one test
+    per rule. Regexes that can't be embedded in the alternation (numbered or
+    named backreferences, global inline flags like ``(?i)``) are compiled and
+    tested on their own.
+    """
+
+    def __init__(self, rules: List[RoutingRule]):
+        self.rules = rules
+
+        self._keywords = KeywordMatcher(
+            (keyword, index) for index, rule in enumerate(rules) for keyword in rule['keywords']
+        )
+
+        self._tags: Dict[str, int] = {}
+        for index, rule in enumerate(rules):
+            for tag in rule['tags']:
+                self._tags.setdefault(tag.lower(), index)
+
+        # Group number of each rule's lookahead -> rule index. Lookaheads are
+        # zero-width, so finditer tries every position and reports the
+        # highest-priority rule matching there.
+        self._regex: Optional[re.Pattern] = None
+        self._regex_groups: Dict[int, int] = {}
+        self._standalone: List[Tuple[int, re.Pattern]] = []
+        alternatives = []
+        for index, rule in enumerate(rules):
+            if not rule['regex']:
+                continue
+            if _STANDALONE_ONLY.search(rule['regex']):
+                self._standalone.append((index, re.compile(rule['regex'], re.IGNORECASE)))
+            else:
+                alternatives.append((index, f"(?=(?P<rule{index}>{_NAMED_GROUP.sub('(?:', rule['regex'])}))"))
+        if alternatives:
+            try:
+                self._regex = re.compile('|'.join(pattern for _, pattern in alternatives), re.IGNORECASE)
+            except re.error as e:
+                logger.warning(f"Routing regexes can't be combined ({e}), testing each rule on its own")
+                self._standalone = sorted(self._standalone + [
+                    (index, re.compile(rules[index]['regex'], re.IGNORECASE)) for index, _ in alternatives
+                ])
+            else:
+                self._regex_groups = {
+                    group: int(name[len('rule'):]) for name, group in self._regex.groupindex.items()
+                    if name.startswith('rule')
+                }
+
+    def route(self, description: str, tags: Optional[List[str]] = None) -> RouteDecision:
+        """
+        Pick the agent roles and guideline doc for a task.
+
+        Args:
+            description: Task description
+            tags: Task tags from the queue
+
+        Returns:
+            RouteDecision from the highest-priority matching rule, or the
+            default coding/review route
+        """
+        candidates = [self._keywords.best_match(description)]
+        candidates.extend(self._tags.get(tag.lower()) for tag in tags or [])
+        if self._regex is not None:
+            for match in self._regex.finditer(description):
+                candidates.append(self._regex_groups[match.lastindex])
+        candidates.extend(index for index, pattern in self._standalone if pattern.search(description))
+
+        matched = [index for index in candidates if index is not None]
+        if not matched:
+            return default_route()
+
+        rule = self.rules[min(matched)]
+        return {
+            'rule': rule['name'],
+            'primary_agent': rule['primary_agent'],
+            'validator_agent': rule['validator_agent'],
+            'doc_reference': rule['doc_reference'],
+            'reasoning': rule['reasoning'],
+        }
+
+
+def default_route() -> RouteDecision:
+    """The route used when no rule matches."""
+    return {
+        'rule': None,
+        'primary_agent': AgentRole.CODING_AGENT,
+        'validator_agent': AgentRole.REVIEW_AGENT,
+        'doc_reference': guideline_doc(AgentRole.CODING_AGENT),
+        'reasoning': DEFAULT_REASONING,
+    }
+
+
+def parse_rule(entry: Dict[str, Any], position: int) -> RoutingRule:
+    """
+    Build a RoutingRule from a config entry.
+
+    Raises:
+        ValueError: If the rule has no matcher, an unknown role or a bad regex
+    """
+    name = entry.get('name') or f"rule_{position}"
+    keywords = [k.strip() for k in entry.get('keywords', []) if k.strip()]
+    tags = [t.strip() for t in entry.get('tags', []) if t.strip()]
+    regex = entry.get('regex')
+
+    if not (keywords or tags or regex):
+        raise ValueError(f"Routing rule {name} needs keywords, tags or a regex")
+    if regex:
+        try:
+            re.compile(regex, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Routing rule {name} has an invalid regex: {e}")
+
+    primary = AgentRole(entry.get('primary_agent', AgentRole.CODING_AGENT.value))
+    validator = AgentRole(entry.get('validator_agent', AgentRole.REVIEW_AGENT.value))
+
+    return {
+        'name': name,
+        'keywords': keywords,
+        'regex': regex,
+        'tags': tags,
+        'primary_agent': primary,
+        'validator_agent': validator,
+        'doc_reference': entry.get('doc_reference') or guideline_doc(primary),
+        'reasoning': entry.get('reasoning') or f"Matched routing rule {name}",
+    }
+
+
+def load_rules(path: str) -> List[RoutingRule]:
+    """Load routing rules from a JSON file (``{"rules": [...]}``)."""
+    with open(path, 'r') as f:
+        config = json.load(f)
+    return [parse_rule(entry, i) for i, entry in enumerate(config.get('rules', []))]
+
+
+_routers: Dict[str, Tuple[float, TaskRouter]] = {}
+
+
+def get_task_router(thursian_dir: str) -> TaskRouter:
+    """
+    Return the TaskRouter for .thursian/routing_rules.json.
+
+    Rules are recompiled only when the file's mtime changes; without a rules
+    file every task takes the default route.
+    """
+    path = os.path.abspath(os.path.join(thursian_dir, 'routing_rules.json'))
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = -1.0
+
+    cached = _routers.get(path)
+    if cached is None or cached[0] != mtime:
+        rules = load_rules(path) if mtime >= 0 else []
+        if rules:
+            logger.info(f"Compiled {len(rules)} routing rule(s) from {path}")
+        cached = _routers[path] = (mtime, TaskRouter(rules))
+    return cached[1]
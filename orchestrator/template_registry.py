@@ -0,0 +1,153 @@
+"""Registry of task templates and agent guideline docs with hot reload."""
+
+from typing import Any, Dict, List, Optional, Tuple
+from string import Formatter
+import logging
+import os
+import threading
+import time
+
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+BUILTIN_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+
+# Seconds between mtime checks of a cached file
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+class CompiledTemplate:
+    """
+    A ``{field}`` template parsed once into literal and field segments.
+
+    Rendering is a single join; ``{{`` and ``}}`` are literal braces.
+    Substituted values are inserted verbatim, so braces in task
+    descriptions are safe.
+    """
+
+    def __init__(self, source: str, name: str = '<template>'):
+        self.name = name
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                raise ValueError(f"Template {name}: only plain {{field}} placeholders are supported")
+            self._segments.append((literal, field))
+        self.fields = {field for _, field in self._segments if field}
+
+    def render(self, **values: Any) -> str:
+        """Fill in every placeholder; raises KeyError if one is missing."""
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Template {self.name} missing fields: {', '.join(sorted(missing))}")
+        return ''.join(
+            literal + (str(values[field]) if field else '')
+            for literal, field in self._segments
+        )
+
+
+class _Entry:
+    __slots__ = ('path', 'mtime', 'checked', 'value')
+
+    def __init__(self, path: str, mtime: float, value: Any):
+        self.path = path
+        self.mtime = mtime
+        self.checked = time.monotonic()
+        self.value = value
+
+
+class TemplateRegistry:
+    """
+    Load task templates and guideline docs once and reload them on change.
+
+    Templates are looked up as ``<thursian_dir>/templates/<name>.md`` first
+    (project overrides), then in the built-in ``orchestrator/templates``.
+    Cached files are re-checked by mtime at most every ``check_interval``
+    seconds, so repeated renders do no file I/O.
+    """
+
+    def __init__(self, thursian_dir: Optional[str] = None, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.search_dirs = [BUILTIN_TEMPLATE_DIR]
+        if thursian_dir is not None:
+            self.search_dirs.insert(0, os.path.join(thursian_dir, 'templates'))
+        self.check_interval = check_interval
+        self.loads = 0
+        self._templates: Dict[str, _Entry] = {}
+        self._guidelines: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def template(self, name: str) -> CompiledTemplate:
+        """Compiled template by name (e.g. "task", "validation")."""
+        with self._lock:
+            entry = self._templates.get(name)
+            if entry is not None and self._fresh(entry, self._resolve(name) if self._due(entry) else entry.path):
+                return entry.value
+
+            path = self._resolve(name)
+            if path is None:
+                raise FileNotFoundError(f"No template named {name} in {self.search_dirs}")
+            source, mtime = self._read(path)
+            self._templates[name] = _Entry(path, mtime, CompiledTemplate(source, name))
+            return self._templates[name].value
+
+    @timed
+    def render(self, name: str, **values: Any) -> str:
+        """Render a named template."""
+        return self.template(name).render(**values)
+
+    def guideline(self, path: str) -> Optional[str]:
+        """Contents of a guideline doc, or None if it doesn't exist."""
+        with self._lock:
+            entry = self._guidelines.get(path)
+            if entry is not None and self._fresh(entry, path):
+                return entry.value
+            try:
+                text, mtime = self._read(path)
+            except OSError:
+                self._guidelines.pop(path, None)
+                return None
+            self._guidelines[path] = _Entry(path, mtime, text)
+            return text
+
+    def _due(self, entry: _Entry) -> bool:
+        return time.monotonic() - entry.checked >= self.check_interval
+
+    def _fresh(self, entry: _Entry, path: Optional[str]) -> bool:
+        """Whether a cached entry may be served without reloading."""
+        if not self._due(entry):
+            return True
+        if path != entry.path:
+            return False    # A project override appeared or disappeared
+        try:
+            if os.path.getmtime(path) != entry.mtime:
+                return False
+        except OSError:
+            return False
+        entry.checked = time.monotonic()
+        return True
+
+    def _resolve(self, name: str) -> Optional[str]:
+        for directory in self.search_dirs:
+            path = os.path.join(directory, f"{name}.md")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _read(self, path: str) -> Tuple[str, float]:
+        mtime = os.path.getmtime(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        self.loads += 1
+        logger.debug(f"Loaded {path}")
+        return text, mtime
+
+
+_registries: Dict[str, TemplateRegistry] = {}
+
+
+def get_template_registry(thursian_dir: str) -> TemplateRegistry:
+    """Return the process-wide TemplateRegistry for a .thursian directory."""
+    key = os.path.abspath(thursian_dir)
+    if key not in _registries:
+        _registries[key] = TemplateRegistry(thursian_dir)
+    return _registries[key]
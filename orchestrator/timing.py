@@ -0,0 +1,217 @@
+"""Latency histograms for graph nodes and I/O helpers."""
+
+from typing import TypedDict, Callable, Dict, List, Optional, TypeVar
+import functools
+import json
+import logging
+import os
+import signal
+import threading
+import time
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+TIMINGS_FILE = 'timings.json'
+
+# Each power of two is split into 2**SUB_BUCKET_BITS buckets, so a recorded
+# latency is reported to within 1/8 (12.5%) of its true value.
+SUB_BUCKET_BITS = 3
+
+F = TypeVar('F', bound=Callable)
+
+
+class HistogramSnapshot(TypedDict):
+    """Exported summary of one histogram; times in seconds."""
+    count: int
+    total: float
+    mean: Optional[float]
+    min: Optional[float]
+    max: Optional[float]
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+    buckets: List[List[float]]    # [upper bound, count] for each non-empty bucket
+
+
+def bucket_index(ns: int) -> int:
+    """Log-linear bucket for a latency in nanoseconds (HDR-style, no floats)."""
+    if ns < (2 << SUB_BUCKET_BITS):
+        return ns
+    shift = ns.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1 << SUB_BUCKET_BITS) + (ns >> shift) - (1 << SUB_BUCKET_BITS)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Largest latency (ns) that falls in a bucket."""
+    if index < (2 << SUB_BUCKET_BITS):
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = (index & ((1 << SUB_BUCKET_BITS) - 1)) + (1 << SUB_BUCKET_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram.
+
+    Recording is a bit_length, a shift and a dict increment under an
+    uncontended lock; memory is bounded by the number of distinct buckets
+    (a few hundred from nanoseconds to hours).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts: Dict[int, int] = {}
+            self.count = 0
+            self.total_ns = 0
+            self.min_ns: Optional[int] = None
+            self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        index = bucket_index(ns)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total_ns += ns
+            if self.min_ns is None or ns < self.min_ns:
+                self.min_ns = ns
+            if ns > self.max_ns:
+                self.max_ns = ns
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound (seconds) of the bucket holding the pct-th percentile."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, int(round(pct / 100 * self.count)))
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= rank:
+                    return min(bucket_upper_bound(index), self.max_ns) / 1e9
+            return self.max_ns / 1e9
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            count, total, low, high = self.count, self.total_ns, self.min_ns, self.max_ns
+            buckets = [[bucket_upper_bound(i) / 1e9, n] for i, n in sorted(self.counts.items())]
+        return {
+            'count': count,
+            'total': total / 1e9,
+            'mean': total / count / 1e9 if count else None,
+            'min': low / 1e9 if low is not None else None,
+            'max': high / 1e9 if count else None,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'buckets': buckets,
+        }
+
+
+_enabled = False
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def enable_timing(enabled: bool = True) -> None:
+    """Turn recording on or off process-wide (off by default)."""
+    global _enabled
+    _enabled = enabled
+
+
+def timing_enabled() -> bool:
+    return _enabled
+
+
+def get_histogram(name: str) -> LatencyHistogram:
+    """Process-wide histogram for ``name``, created on first use."""
+    histogram = _histograms.get(name)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(name, LatencyHistogram())
+    return histogram
+
+
+def timed(func: F) -> F:
+    """
+    Record each call's wall-clock time under the function's qualified name.
+
+    Calls also become trace spans while tracing is on. With both off the
+    wrapper costs two global checks per call.
+    """
+    name = func.__qualname__
+    histogram = get_histogram(name)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled and tracing.recorder is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end = time.perf_counter_ns()
+            if _enabled:
+                histogram.record(end - start)
+            recorder = tracing.recorder
+            if recorder is not None:
+                recorder.record(name, start, end, tracing.task_for(args))
+
+    return wrapper
+
+
+def snapshot_timings() -> Dict[str, HistogramSnapshot]:
+    """Snapshots of every histogram that has recorded at least one call."""
+    return {name: h.snapshot() for name, h in sorted(_histograms.items()) if h.count}
+
+
+def reset_timings() -> None:
+    """Drop all recorded samples (histograms stay registered)."""
+    with _histograms_lock:
+        for histogram in _histograms.values():
+            histogram.reset()
+
+
+def write_timings(thursian_dir: str) -> str:
+    """Write .thursian/timings.json; returns its path."""
+    path = os.path.join(thursian_dir, TIMINGS_FILE)
+    os.makedirs(thursian_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot_timings(), f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def dump_on_signal(thursian_dir: str) -> bool:
+    """
+    Write timings.json whenever the process gets SIGUSR1.
+
+    Returns False where SIGUSR1 doesn't exist (Windows) or off the main thread.
+    """
+    if not hasattr(signal, 'SIGUSR1') or threading.current_thread() is not threading.main_thread():
+        return False
+
+    def handler(signum, frame):
+        logger.info(f"Wrote node timings to {write_timings(thursian_dir)}")
+
+    signal.signal(signal.SIGUSR1, handler)
+    return True
+
+
+def format_timings(timings: Dict[str, HistogramSnapshot]) -> str:
+    """Table of per-node latency, sorted by total time spent."""
+    def ms(value):
+        return '-' if value is None else f"{value * 1000:.2f}"
+
+    lines = [f"  {'name':<28} {'calls':>8} {'total s':>9} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for name, t in sorted(timings.items(), key=lambda item: -item[1]['total']):
+        lines.append(f"  {name:<28} {t['count']:>8} {t['total']:>9.3f} {ms(t['mean']):>9} {ms(t['p50']):>9} "
+                     f"{ms(t['p99']):>9} {ms(t['max']):>9}")
+    return "\n".join(lines)
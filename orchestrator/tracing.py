@@ -0,0 +1,214 @@
+"""Per-task trace spans exported as Chrome trace event JSON."""
+
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+from .state import ThursianState, TERMINAL_PHASES
+
+logger = logging.getLogger(__name__)
+
+TRACES_DIR = 'traces'
+FLUSH_INTERVAL = 1.0
+# Wake the writer early once this many spans are buffered
+FLUSH_EVENTS = 4096
+
+_current_task: ContextVar[Optional[str]] = ContextVar('thursian_task', default=None)
+
+# (name, start ns, end ns, task id, thread id, args)
+_Span = Tuple[str, int, int, Optional[str], int, Optional[Dict[str, Any]]]
+
+
+class TraceRecorder:
+    """
+    Buffered span recorder writing the Chrome trace event format.
+
+    record() only appends a tuple to a deque; a background thread formats
+    and writes spans every FLUSH_INTERVAL seconds, so tracing adds no file
+    I/O to the hot path. Each task is its own trace, shown as a process
+    named after the task id in chrome://tracing or Perfetto; spans outside
+    any task (batched queue claims, git commits, waits) belong to the
+    ``orchestrator`` process. The file is a JSON array that viewers accept
+    even before close() writes the closing bracket.
+    """
+
+    def __init__(self, path: str, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.recorded = 0
+        self._buffer: Deque[_Span] = deque()
+        self._origin = time.perf_counter_ns()
+        self._pids: Dict[Optional[str], int] = {}
+        self._phases: Dict[str, Tuple[str, int]] = {}
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, 'w')
+        self._file.write('[')
+        self._first = True
+        self._write_events(self._process_events(None))
+        self._thread = threading.Thread(target=self._run, name='trace-writer', daemon=True)
+        self._thread.start()
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        task: Optional[str] = None,
+        args: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Buffer one span (perf_counter_ns timestamps)."""
+        self._buffer.append((name, start_ns, end_ns, task, threading.get_native_id(), args))
+        if len(self._buffer) >= FLUSH_EVENTS:
+            self._wake.set()
+
+    def record_phase(self, state: ThursianState) -> None:
+        """
+        Close the span for a workflow's previous phase when its phase changes.
+
+        Phase spans cover the whole time spent in a phase, waits included.
+        """
+        now = time.perf_counter_ns()
+        workflow_id, phase = state['workflow_id'], state['current_phase']
+        previous = self._phases.get(workflow_id)
+        if previous is not None and previous[0] == phase.value:
+            return
+
+        task = state.get('current_task_id')
+        if previous is not None:
+            self.record(f"phase:{previous[0]}", previous[1], now, task, {'workflow_id': workflow_id})
+        if phase in TERMINAL_PHASES:
+            self._phases.pop(workflow_id, None)
+            self.record(f"phase:{phase.value}", now, now, task, {'workflow_id': workflow_id})
+        else:
+            self._phases[workflow_id] = (phase.value, now)
+
+    def flush(self) -> None:
+        """Write every buffered span to the trace file."""
+        with self._write_lock:
+            events: List[Dict[str, Any]] = []
+            spans = 0
+            while self._buffer:
+                name, start, end, task, tid, args = self._buffer.popleft()
+                if task not in self._pids:
+                    events += self._process_events(task)
+                event = {
+                    'name': name, 'cat': 'thursian', 'ph': 'X',
+                    'ts': (start - self._origin) / 1000, 'dur': (end - start) / 1000,
+                    'pid': self._pids[task], 'tid': tid,
+                }
+                if args:
+                    event['args'] = args
+                events.append(event)
+                spans += 1
+            self.recorded += spans
+            self._write_events(events)
+
+    def close(self) -> None:
+        """Stop the writer thread, flush and terminate the JSON array."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        with self._write_lock:
+            self._file.write('\n]\n')
+            self._file.close()
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Trace writer failed: {e}")
+
+    def _process_events(self, task: Optional[str]) -> List[Dict[str, Any]]:
+        pid = len(self._pids)
+        self._pids[task] = pid
+        return [{'name': 'process_name', 'ph': 'M', 'pid': pid,
+                 'args': {'name': task or 'orchestrator'}}]
+
+    def _write_events(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        lines = []
+        for event in events:
+            lines.append(('\n' if self._first else ',\n') + json.dumps(event))
+            self._first = False
+        self._file.write(''.join(lines))
+        self._file.flush()
+
+
+recorder: Optional[TraceRecorder] = None
+
+
+def start_tracing(thursian_dir: str) -> str:
+    """Record spans to .thursian/traces/trace_<timestamp>.json; returns the path."""
+    global recorder
+    stop_tracing()
+    name = f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.json"
+    recorder = TraceRecorder(os.path.join(thursian_dir, TRACES_DIR, name))
+    logger.info(f"Tracing to {recorder.path}")
+    return recorder.path
+
+
+def stop_tracing() -> Optional[str]:
+    """Flush and close the active trace; returns its path."""
+    global recorder
+    active, recorder = recorder, None
+    if active is None:
+        return None
+    active.close()
+    return active.path
+
+
+@contextmanager
+def task_context(task_id: Optional[str]) -> Iterator[None]:
+    """Attribute spans recorded inside the block to ``task_id``."""
+    token = _current_task.set(task_id)
+    try:
+        yield
+    finally:
+        _current_task.reset(token)
+
+
+def task_for(args: tuple) -> Optional[str]:
+    """Task a call belongs to: the task context, else a state argument's task."""
+    task = _current_task.get()
+    if task is None and args and isinstance(args[0], dict):
+        task = args[0].get('current_task_id')
+    return task
+
+
+@contextmanager
+def span(name: str, task: Optional[str] = None, **args: Any) -> Iterator[None]:
+    """Record the block as a span when tracing is on."""
+    active = recorder
+    if active is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        active.record(name, start, time.perf_counter_ns(), task or _current_task.get(), args or None)
+
+
+def record_phase(state: ThursianState) -> None:
+    """Phase span bookkeeping for a workflow step, when tracing is on."""
+    active = recorder
+    if active is not None:
+        active.record_phase(state)
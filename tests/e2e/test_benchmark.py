@@ -0,0 +1,111 @@
+"""End-to-end test for the benchmark harness and its simulated agents."""
+
+import unittest
+import tempfile
+import os
+import time
+from benchmarks.loadgen import LoadGenerator, parse_delay, task_role, output_name
+from benchmarks.run_benchmarks import run_size
+from orchestrator.state import AgentRole
+
+
+class TestSimulatedAgents(unittest.TestCase):
+    """Test delay specs and task file naming."""
+
+    def test_delay_specs_and_task_names(self):
+        """Test delay distributions parse and task files map to the right outputs."""
+        self.assertEqual(parse_delay('0.5')(), 0.5)
+        self.assertTrue(0.1 <= parse_delay('uniform:0.1,0.2')() <= 0.2)
+        self.assertGreaterEqual(parse_delay('normal:0,1')(), 0.0)
+        with self.assertRaises(ValueError):
+            parse_delay('poisson:1')
+
+        self.assertEqual(task_role('task_1.md'), AgentRole.CODING_AGENT)
+        self.assertEqual(task_role('task_1_validation_2.md'), AgentRole.REVIEW_AGENT)
+        self.assertEqual(output_name('task_1_part_2.md'), 'task_1_part_2_output.md')
+        self.assertEqual(output_name('task_1_validation.md'), 'task_1_validation.md')
+
+
+class TestLoadGenerator(unittest.TestCase):
+    """Test the synthetic load generator against a .thursian directory."""
+
+    def _task(self, tmpdir, name):
+        with open(os.path.join(tmpdir, 'tasks', name), 'w') as f:
+            f.write('# Task\n')
+
+    def _read(self, tmpdir, name):
+        with open(os.path.join(tmpdir, 'output', name)) as f:
+            return f.read()
+
+    def test_agents_rates_and_revision_rounds(self):
+        """Test agent caps, review ratios, file sizes and re-answering archived rounds."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, 'tasks'))
+            for n in range(3):
+                self._task(tmpdir, f'task_{n}.md')
+            self._task(tmpdir, 'task_9_validation.md')
+            self._task(tmpdir, 'task_8_validation_r1.md')   # Archived round, not a task
+
+            generator = LoadGenerator(tmpdir, {'coding_agents': 2, 'approve_rate': 0.0,
+                                               'output_bytes': 2000, 'recheck_interval': 0})
+            now = time.monotonic()
+            generator.step(now)
+            self.assertEqual(generator.stats['answered'], 3)     # 2 coding agents + 1 reviewer
+            generator.step(now)
+            self.assertEqual(sorted(os.listdir(os.path.join(tmpdir, 'output'))),
+                             ['task_0_output.md', 'task_1_output.md', 'task_2_output.md', 'task_9_validation.md'])
+            self.assertIn('**Status: NEEDS_REVISION**', self._read(tmpdir, 'task_9_validation.md'))
+            self.assertAlmostEqual(len(self._read(tmpdir, 'task_0_output.md')), 2000, delta=10)
+
+            # The orchestrator archives the round: the coding task is answered again,
+            # the review only once its task file is rewritten
+            os.remove(os.path.join(tmpdir, 'output', 'task_0_output.md'))
+            os.remove(os.path.join(tmpdir, 'output', 'task_9_validation.md'))
+            generator.step(now)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, 'output', 'task_0_output.md')))
+            self.assertFalse(os.path.exists(os.path.join(tmpdir, 'output', 'task_9_validation.md')))
+
+            path = os.path.join(tmpdir, 'tasks', 'task_9_validation.md')
+            os.utime(path, (time.time() + 5, time.time() + 5))
+            generator.step(now)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, 'output', 'task_9_validation.md')))
+            self.assertEqual(generator.stats['rounds'], 2)
+
+    def test_write_rate_cap(self):
+        """Test answers beyond the write rate wait for tokens."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, 'tasks'))
+            for n in range(5):
+                self._task(tmpdir, f'task_{n}.md')
+
+            generator = LoadGenerator(tmpdir, {'max_writes_per_second': 2})
+            generator.step(time.monotonic())
+            self.assertEqual(generator.stats['answered'], 2)
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test a small benchmark run against the real graph."""
+
+    def test_small_run_reports_metrics(self):
+        """Test every task completes and each phase gets latency samples."""
+        result = run_size(5, human_delay='0', ai_delay='0', ai_roles=[AgentRole.REVIEW_AGENT],
+                          parallel=4, git=False, timeout=60)
+
+        self.assertEqual(result['completed'], 5)
+        self.assertFalse(result['timed_out'])
+        self.assertGreater(result['tasks_per_second'], 0)
+        for phase in ('assignment', 'execution', 'validation', 'task'):
+            self.assertEqual(result['phases'][phase]['count'], 5)
+
+    def test_memory_storage_run(self):
+        """Test an all-AI run completes with documents kept in memory."""
+        result = run_size(5, ai_delay='0', ai_roles=list(AgentRole), parallel=4, git=False,
+                          timeout=60, storage='memory')
+        self.assertEqual(result['completed'], 5)
+
+        with self.assertRaises(ValueError):
+            run_size(1, ai_roles=[AgentRole.REVIEW_AGENT], git=False, storage='memory')
+
+
+if __name__ == '__main__':
+    unittest.main()
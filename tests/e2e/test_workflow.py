@@ -3,9 +3,18 @@
 import unittest
 import tempfile
 import os
+import json
+import io
+import shutil
+import subprocess
+from contextlib import redirect_stdout
 from datetime import datetime
 from orchestrator.state import WorkflowPhase, AgentRole, ThursianState
 from orchestrator.graph import create_thursian_workflow
+from orchestrator.helpers import create_initial_state
+from orchestrator.storage import get_storage, close_storage
+from orchestrator.git_manager import commit_phase
+from orchestrator.artifacts import get_artifact_store, forget_artifact_store, record_path
 
 
 class TestCompleteWorkflow(unittest.TestCase):
@@ -262,3 +271,300 @@ Now correct with proper base case.
 
 if __name__ == '__main__':
     unittest.main()
+
+    def test_multi_reviewer_quorum(self):
+        """Test parallel reviewers settle validation by majority and cancel the rest."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'task_queue.txt'), 'w') as f:
+                f.write("Implement fibonacci function\n")
+            with open(os.path.join(tmpdir, 'validation.json'), 'w') as f:
+                json.dump({'reviewers': 3, 'quorum': 'majority'}, f)
+
+            workflow = create_thursian_workflow()
+
+            state = workflow.invoke(create_initial_state(tmpdir))  # Task selection
+            state = workflow.invoke(state)  # Assignment
+            state = workflow.invoke(state)  # Execution (create task)
+            task_id = state['current_task_id']
+
+            with open(state['output_file_path'], 'w') as f:
+                f.write("# Output\n\n**Status: COMPLETE**\n")
+
+            state = workflow.invoke(state)  # Detect completion
+            state = workflow.invoke(state)  # Fan out to reviewers
+            self.assertEqual(state['current_phase'], WorkflowPhase.VALIDATION)
+            self.assertEqual(sorted(state['review_verdicts']), ['1', '2', '3'])
+            for n in ('1', '2', '3'):
+                self.assertTrue(os.path.exists(
+                    os.path.join(tmpdir, 'tasks', f'{task_id}_validation_{n}.md')))
+
+            # One approval: majority still open
+            verdicts = state['review_verdicts']
+            with open(verdicts['1']['validation_file'], 'w') as f:
+                f.write("**Status: APPROVED**\n")
+            state = workflow.invoke(state)
+            self.assertEqual(state['review_verdicts']['1']['status'], 'approved')
+            self.assertEqual(state['review_verdicts']['2']['status'], 'pending')
+            self.assertTrue(state['waiting_for_human'])
+
+            # Second approval reaches quorum; the third reviewer is cancelled
+            with open(verdicts['3']['validation_file'], 'w') as f:
+                f.write("**Status: APPROVED**\n")
+            state = workflow.invoke(state)
+            self.assertEqual(state['review_verdicts']['2']['status'], 'cancelled')
+            self.assertEqual(state['decision_logs'][-1]['tool_used'], 'review_quorum')
+            with open(verdicts['2']['task_file'], 'r') as f:
+                self.assertIn('Cancelled', f.read())
+
+            state = workflow.invoke(state)
+            self.assertEqual(state['current_phase'], WorkflowPhase.COMPLETED)
+
+    def test_split_task_runs_subtasks_and_merges(self):
+        """Test a split task fans out to subtasks and merges them before validation."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'task_queue.txt'), 'w') as f:
+                f.write("[tags=split] Add the user model; Add the user API; Document the API\n")
+
+            workflow = create_thursian_workflow()
+
+            state = workflow.invoke(create_initial_state(tmpdir))  # Task selection
+            state = workflow.invoke(state)  # Assignment
+            state = workflow.invoke(state)  # Decomposition
+            task_id = state['current_task_id']
+            self.assertEqual(state['decision_logs'][-1]['tool_used'], 'task_decomposition')
+            self.assertEqual(sorted(state['subtasks']), ['1', '2', '3'])
+            self.assertEqual(state['subtasks']['2']['description'], 'Add the user API')
+
+            subtasks = state['subtasks']
+            os.makedirs(os.path.join(tmpdir, 'output'), exist_ok=True)
+            for slot in ('1', '3'):
+                with open(subtasks[slot]['output_file'], 'w') as f:
+                    f.write(f"# Part {slot} done\n\n**Status: COMPLETE**\n")
+
+            # Two of three parts done: still waiting, nothing merged
+            state = workflow.invoke(state)
+            self.assertEqual(state['subtasks']['1']['status'], 'complete')
+            self.assertEqual(state['subtasks']['2']['status'], 'pending')
+            self.assertFalse(os.path.exists(state['output_file_path']))
+
+            with open(subtasks['2']['output_file'], 'w') as f:
+                f.write("# Part 2 done\n\n**Status: COMPLETE**\n")
+            state = workflow.invoke(state)  # Last part complete -> merge
+            with open(state['output_file_path'], 'r') as f:
+                merged = f.read()
+            self.assertIn('## Part 2: Add the user API', merged)
+            self.assertEqual(merged.count('Status: COMPLETE'), 1)
+
+            state = workflow.invoke(state)  # Merged output complete -> validation
+            state = workflow.invoke(state)
+            self.assertEqual(state['current_phase'], WorkflowPhase.VALIDATION)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, 'tasks', f'{task_id}_validation.md')))
+
+    def test_prevalidation_returns_broken_output(self):
+        """Test outputs failing automated checks skip review and go back to revision."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'task_queue.txt'), 'w') as f:
+                f.write("Implement is_even\n")
+            with open(os.path.join(tmpdir, 'prevalidation.json'), 'w') as f:
+                json.dump({'linters': [], 'timeout': 5}, f)
+
+            workflow = create_thursian_workflow()
+
+            state = workflow.invoke(create_initial_state(tmpdir))  # Task selection
+            state = workflow.invoke(state)  # Assignment
+            state = workflow.invoke(state)  # Execution (create task)
+            task_id = state['current_task_id']
+            output_file = state['output_file_path']
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+            with open(output_file, 'w') as f:
+                f.write("```python\ndef is_even(n)\n    return n % 2 == 0\n```\n\n**Status: COMPLETE**\n")
+            state = workflow.invoke(state)  # Pre-validation fails
+            self.assertEqual(state['current_phase'], WorkflowPhase.EXECUTION)
+            self.assertEqual(state['decision_logs'][-1]['tool_used'], 'prevalidation')
+            self.assertFalse(os.path.exists(output_file))
+            with open(os.path.join(tmpdir, 'output', f'{task_id}_prevalidation_r1.md')) as f:
+                self.assertIn('Block 1 syntax failed', f.read())
+            self.assertFalse(os.path.exists(os.path.join(tmpdir, 'tasks', f'{task_id}_validation.md')))
+
+            with open(output_file, 'w') as f:
+                f.write("```python\ndef is_even(n):\n    return n % 2 == 0\n\n"
+                        "def test_is_even():\n    assert is_even(4)\n```\n\n**Status: COMPLETE**\n")
+            state = workflow.invoke(state)  # Pre-validation passes
+            self.assertIsNotNone(state['prevalidated_digest'])
+            state = workflow.invoke(state)  # Proceed to validation
+            self.assertEqual(state['current_phase'], WorkflowPhase.VALIDATION)
+
+
+class TestStorageBackends(unittest.TestCase):
+    """Test the workflow runs unchanged on the non-file storage backends."""
+
+    def _run_cycle(self, backend):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'task_queue.txt'), 'w') as f:
+                f.write("Write a Python function to reverse a string\n")
+            with open(os.path.join(tmpdir, 'storage.json'), 'w') as f:
+                json.dump({'backend': backend}, f)
+            storage = get_storage(tmpdir)
+
+            try:
+                workflow = create_thursian_workflow()
+                state = workflow.invoke(create_initial_state(tmpdir))  # Task selection
+                state = workflow.invoke(state)  # Assignment
+                state = workflow.invoke(state)  # Execution (create task)
+                task_id = state['current_task_id']
+                self.assertIn(task_id, storage.read(state['task_file_path']))
+
+                storage.write(state['output_file_path'], "def reverse(s):\n    return s[::-1]\n")
+                state = workflow.invoke(state)  # Still waiting
+                self.assertEqual(state['current_phase'], WorkflowPhase.EXECUTION)
+                storage.append(state['output_file_path'], "\n**Status: COMPLETE**\n")
+                state = workflow.invoke(state)  # Output complete
+                state = workflow.invoke(state)  # Validation (create task)
+                self.assertEqual(state['current_phase'], WorkflowPhase.VALIDATION)
+
+                storage.write(state['validation_file_path'], "**Status: NEEDS_REVISION**\n")
+                state = workflow.invoke(state)  # Revision requested: round archived
+                self.assertEqual(state['current_phase'], WorkflowPhase.EXECUTION)
+                self.assertTrue(storage.exists(os.path.join(tmpdir, 'output', f'{task_id}_output_r1.md')))
+                self.assertFalse(storage.exists(state['output_file_path']))
+
+                storage.write(state['output_file_path'], "def reverse(s):\n    return ''.join(reversed(s))\n"
+                                                         "\n**Status: COMPLETE**\n")
+                state = workflow.invoke(state)  # Output complete
+                state = workflow.invoke(state)  # Validation (new task)
+                storage.write(state['validation_file_path'], "**Status: APPROVED**\n")
+                state = workflow.invoke(state)  # Approved
+                self.assertEqual(state['current_phase'], WorkflowPhase.COMPLETED)
+
+                status = json.loads(storage.read(os.path.join(tmpdir, 'status.json')))
+                self.assertEqual(status['current_phase'], WorkflowPhase.COMPLETED.value)
+                for name in ('tasks', 'output', 'decisions'):
+                    self.assertFalse(os.path.exists(os.path.join(tmpdir, name)))
+            finally:
+                close_storage(tmpdir)
+
+    def test_memory_backend(self):
+        """Test a full cycle with revision keeps every document in memory."""
+        self._run_cycle('memory')
+
+    def test_sqlite_backend(self):
+        """Test a full cycle with revision keeps every document in the SQLite file."""
+        self._run_cycle('sqlite')
+
+    def test_sqlite_database_not_committed(self):
+        """Test a phase commit on the sqlite backend leaves the database and its WAL files untracked."""
+        if shutil.which('git') is None:
+            self.skipTest("git not available")
+
+        repo = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            os.chdir(repo)
+            subprocess.run(['git', 'init', '-q'], check=True)
+            subprocess.run(['git', 'config', 'user.email', 'test@example.com'], check=True)
+            subprocess.run(['git', 'config', 'user.name', 'test'], check=True)
+            subprocess.run(['git', 'config', 'commit.gpgsign', 'false'], check=True)
+            os.makedirs('.thursian')
+            with open(os.path.join('.thursian', 'task_queue.txt'), 'w') as f:
+                f.write("Write a Python function to reverse a string\n")
+            with open(os.path.join('.thursian', 'storage.json'), 'w') as f:
+                json.dump({'backend': 'sqlite'}, f)
+
+            try:
+                workflow = create_thursian_workflow()
+                state = workflow.invoke(create_initial_state('.thursian'))  # Task selection
+                self.assertTrue(os.path.exists(os.path.join('.thursian', 'storage.db')))
+                self.assertTrue(commit_phase(state['current_phase'].value, state['current_task_id']))
+            finally:
+                close_storage('.thursian')
+
+            tracked = subprocess.run(['git', 'ls-files'], check=True, capture_output=True, text=True).stdout.split()
+            self.assertIn('.thursian/storage.json', tracked)
+            self.assertFalse([path for path in tracked if path.startswith('.thursian/storage.db')])
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(repo, ignore_errors=True)
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Test revision rounds land in the artifact store instead of _rN files."""
+
+    def test_revision_rounds_stored_as_blobs(self):
+        """Test two identical rejected rounds leave one output blob and a task record."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'task_queue.txt'), 'w') as f:
+                f.write("Write a Python function to reverse a string\n")
+            with open(os.path.join(tmpdir, 'artifacts.json'), 'w') as f:
+                json.dump({}, f)
+
+            try:
+                workflow = create_thursian_workflow()
+                state = workflow.invoke(create_initial_state(tmpdir))  # Task selection
+                state = workflow.invoke(state)  # Assignment
+                state = workflow.invoke(state)  # Execution (create task)
+                task_id = state['current_task_id']
+                os.makedirs(os.path.dirname(state['output_file_path']), exist_ok=True)
+
+                for notes in ("Handle None\n", "Still no None handling\n"):
+                    with open(state['output_file_path'], 'w') as f:
+                        f.write("def reverse(s):\n    return s[::-1]\n\n**Status: COMPLETE**\n")
+                    state = workflow.invoke(state)  # Output complete
+                    state = workflow.invoke(state)  # Validation (create task)
+                    with open(state['validation_file_path'], 'w') as f:
+                        f.write(f"**Status: NEEDS_REVISION**\n{notes}")
+                    state = workflow.invoke(state)  # Revision requested: round archived
+                    self.assertEqual(state['current_phase'], WorkflowPhase.EXECUTION)
+
+                self.assertFalse(os.path.exists(os.path.join(tmpdir, 'output', f'{task_id}_output_r1.md')))
+                with open(record_path(tmpdir, task_id)) as f:
+                    record = json.load(f)['artifacts']
+                self.assertEqual(record[f'output/{task_id}_output_r1.md']['digest'],
+                                 record[f'output/{task_id}_output_r2.md']['digest'])
+                self.assertEqual(get_artifact_store(tmpdir).verify(), [])
+
+                with open(state['output_file_path'], 'w') as f:
+                    f.write("def reverse(s):\n    return s[::-1] if s else s\n\n**Status: COMPLETE**\n")
+                state = workflow.invoke(state)  # Output complete
+                state = workflow.invoke(state)  # Validation (new task)
+                with open(state['validation_file_path'], 'w') as f:
+                    f.write("**Status: APPROVED**\n")
+                state = workflow.invoke(state)  # Approved
+                self.assertEqual(state['current_phase'], WorkflowPhase.COMPLETED)
+            finally:
+                forget_artifact_store(tmpdir)
+
+    def test_human_reads_revision_notes(self):
+        """Test the review notes a human is pointed to exist as a file with the store enabled."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'task_queue.txt'), 'w') as f:
+                f.write("Write a Python function to reverse a string\n")
+            with open(os.path.join(tmpdir, 'artifacts.json'), 'w') as f:
+                json.dump({}, f)
+
+            try:
+                workflow = create_thursian_workflow()
+                state = workflow.invoke(create_initial_state(tmpdir))  # Task selection
+                state = workflow.invoke(state)  # Assignment
+                state = workflow.invoke(state)  # Execution (create task)
+                os.makedirs(os.path.dirname(state['output_file_path']), exist_ok=True)
+                with open(state['output_file_path'], 'w') as f:
+                    f.write("def reverse(s):\n    return s[::-1]\n\n**Status: COMPLETE**\n")
+                state = workflow.invoke(state)  # Output complete
+                state = workflow.invoke(state)  # Validation (create task)
+                with open(state['validation_file_path'], 'w') as f:
+                    f.write("**Status: NEEDS_REVISION**\nHandle None\n")
+
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    state = workflow.invoke(state)  # Revision requested: round archived
+                self.assertEqual(state['current_phase'], WorkflowPhase.EXECUTION)
+
+                lines = [line for line in out.getvalue().splitlines() if line.startswith("Review notes: ")]
+                self.assertEqual(len(lines), 1)
+                notes_path = lines[0][len("Review notes: "):]
+                self.assertTrue(os.path.exists(notes_path))
+                with open(notes_path) as f:
+                    self.assertIn("Handle None", f.read())
+            finally:
+                forget_artifact_store(tmpdir)
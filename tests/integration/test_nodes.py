@@ -3,15 +3,19 @@
 import unittest
 import tempfile
 import os
+import json
 from datetime import datetime
 from orchestrator.state import WorkflowPhase, AgentRole, ThursianState
 from orchestrator.nodes import (
     task_selection_node,
+    task_selection_batch,
     assignment_node,
     execution_node,
     validation_node,
     completion_node
 )
+from orchestrator.task_queue import get_task_queue
+from orchestrator.helpers import create_initial_state
 
 
 class TestTaskSelectionNode(unittest.TestCase):
@@ -57,11 +61,45 @@ class TestTaskSelectionNode(unittest.TestCase):
             # Check decision log
             self.assertEqual(len(result['decision_logs']), 1)
 
-            # Check task queue updated
-            with open(task_queue, 'r') as f:
-                remaining = f.readlines()
-                self.assertEqual(len(remaining), 1)
-                self.assertEqual(remaining[0].strip(), 'Test task 2')
+            # Check inbox drained into the queue index, remaining task pending
+            self.assertEqual(os.path.getsize(task_queue), 0)
+            remaining = get_task_queue(tmpdir).pending()
+            self.assertEqual(len(remaining), 1)
+            self.assertEqual(remaining[0]['description'], 'Test task 2')
+
+    def test_task_selection_priority(self):
+        """Test higher-priority task is selected ahead of earlier ones."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            task_queue = os.path.join(tmpdir, 'task_queue.txt')
+            with open(task_queue, 'w') as f:
+                f.write("Routine cleanup\n")
+                f.write("[priority=critical tags=prod] Fix outage\n")
+
+            state: ThursianState = {
+                'workflow_id': 'test',
+                'created_at': datetime.now(),
+                'current_phase': WorkflowPhase.IDLE,
+                'phase_history': [],
+                'current_task_id': None,
+                'task_description': None,
+                'task_file_path': None,
+                'primary_agent': None,
+                'validator_agent': None,
+                'decision_logs': [],
+                'thursian_dir': tmpdir,
+                'output_file_path': None,
+                'validation_file_path': None,
+                'waiting_for_human': False,
+                'validation_passed': False,
+                'errors': []
+            }
+
+            result = task_selection_node(state)
+
+            self.assertEqual(result['task_description'], 'Fix outage')
+            self.assertEqual(result['task_priority'], 0)
+            self.assertEqual(result['task_tags'], ['prod'])
+            self.assertIn('priority=critical', result['decision_logs'][0]['reasoning'])
 
     def test_task_selection_empty_queue(self):
         """Test task selection with empty queue."""
@@ -97,6 +135,29 @@ class TestTaskSelectionNode(unittest.TestCase):
             self.assertTrue(len(result['errors']) > 0)
 
 
+class TestTaskSelectionBatch(unittest.TestCase):
+    """Test task_selection_batch."""
+
+    def test_claims_batch_as_workflow_states(self):
+        """Test each claimed task becomes its own workflow state."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            task_queue = os.path.join(tmpdir, 'task_queue.txt')
+            with open(task_queue, 'w') as f:
+                f.write("Task A\n[priority=high] Task B\nTask C\n")
+
+            states = task_selection_batch(tmpdir, 2)
+
+            self.assertEqual([s['task_description'] for s in states], ['Task B', 'Task A'])
+            self.assertEqual(len({s['workflow_id'] for s in states}), 2)
+            self.assertEqual(len({s['current_task_id'] for s in states}), 2)
+            for state in states:
+                self.assertEqual(state['current_phase'], WorkflowPhase.ASSIGNMENT)
+                self.assertEqual(len(state['decision_logs']), 1)
+                self.assertEqual(state['decision_logs'][0]['task_id'], state['current_task_id'])
+
+            self.assertEqual(len(get_task_queue(tmpdir)), 1)
+
+
 class TestAssignmentNode(unittest.TestCase):
     """Test assignment_node."""
 
@@ -135,6 +196,33 @@ class TestAssignmentNode(unittest.TestCase):
             self.assertEqual(len(result['decision_logs']), 1)
             self.assertEqual(result['decision_logs'][0]['agent_assigned'], 'coding_agent')
 
+    def test_routing_rule_assignment(self):
+        """Test routing rules choose the roles and guideline doc."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'routing_rules.json'), 'w') as f:
+                json.dump({'rules': [{
+                    'name': 'audit',
+                    'keywords': ['audit'],
+                    'primary_agent': 'review_agent',
+                    'validator_agent': 'coding_agent',
+                    'reasoning': 'Audits are review work'
+                }]}, f)
+
+            state = create_initial_state(tmpdir)
+            state.update({
+                'current_phase': WorkflowPhase.ASSIGNMENT,
+                'current_task_id': 'task_audit',
+                'task_description': 'Audit the login flow'
+            })
+
+            result = assignment_node(state)
+
+            self.assertEqual(result['primary_agent'], AgentRole.REVIEW_AGENT)
+            self.assertEqual(result['validator_agent'], AgentRole.CODING_AGENT)
+            self.assertEqual(result['agent_guidelines'], 'docs/agents/REVIEW_AGENT.md')
+            self.assertEqual(result['decision_logs'][0]['tool_used'], 'routing_rules')
+            self.assertIn('Audits are review work', result['decision_logs'][0]['reasoning'])
+
 
 class TestExecutionNode(unittest.TestCase):
     """Test execution_node."""
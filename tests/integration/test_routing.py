@@ -5,7 +5,7 @@ import tempfile
 import os
 from datetime import datetime
 from orchestrator.state import WorkflowPhase, ThursianState
-from orchestrator.routing import route_after_execution, route_after_validation
+from orchestrator.routing import route_after_execution, route_after_validation, scan_markers
 
 
 class TestRouteAfterExecution(unittest.TestCase):
@@ -190,5 +190,57 @@ class TestRouteAfterValidation(unittest.TestCase):
             self.assertEqual(result, "execution_node")  # Return to execution
 
 
+class TestScanMarkers(unittest.TestCase):
+    """Test incremental status marker scanning."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'task_output.md')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _append(self, text, mode='a'):
+        with open(self.path, mode) as f:
+            f.write(text)
+
+    def test_marker_split_across_appends(self):
+        """Test a marker streamed in two pieces is detected once complete."""
+        self._append("**Status: IN_PROGRESS**\n\n" + "x" * 200 + "\n**Status: COM", mode='w')
+        self.assertEqual(scan_markers(self.path), frozenset())
+
+        self._append("PLETE**\n")
+        self.assertIn("Status: COMPLETE", scan_markers(self.path))
+
+    def test_rewrite_forgets_old_markers(self):
+        """Test rewriting a file (in place or by replace) triggers a full rescan."""
+        self._append("# Validation\n\n**Status: APPROVED**\n", mode='w')
+        self.assertIn("Status: APPROVED", scan_markers(self.path))
+
+        self._append("# Validation\n\n**Status: NEEDS_REVISION** and more notes\n", mode='w')
+        self.assertEqual(scan_markers(self.path), frozenset({"Status: NEEDS_REVISION"}))
+
+        replacement = self.path + '.tmp'
+        with open(replacement, 'w') as f:
+            f.write("# Validation\n\n**Status: APPROVED**\n")
+        os.replace(replacement, self.path)
+        self.assertEqual(scan_markers(self.path), frozenset({"Status: APPROVED"}))
+
+    def test_verdict_edited_in_place(self):
+        """Test a verdict changed in place is rescanned even when head and tail look the same."""
+        body = "# Validation\n" + "x" * 300 + "\n"
+        notes = "y" * 1000  # Same bytes around the old end of file
+        self._append(body + "**Status: APPROVED**\n" + notes, mode='w')
+        inode = os.stat(self.path).st_ino
+        self.assertEqual(scan_markers(self.path), frozenset({"Status: APPROVED"}))
+
+        with open(self.path, 'r+') as f:
+            f.write(body + "**Status: NEEDS_REVISION**\n" + notes)
+
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+        self.assertEqual(scan_markers(self.path), frozenset({"Status: NEEDS_REVISION"}))
+        self.assertEqual(scan_markers(self.path), frozenset({"Status: NEEDS_REVISION"}))  # Unchanged: cached
+
+
 if __name__ == '__main__':
     unittest.main()
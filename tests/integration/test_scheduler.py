@@ -0,0 +1,321 @@
+"""Integration tests for the DAG workflow scheduler."""
+
+import unittest
+import tempfile
+import os
+import json
+import time
+from unittest.mock import patch
+from orchestrator.state import WorkflowPhase, AgentRole
+from orchestrator.scheduler import WorkflowScheduler
+from orchestrator.admission import AdmissionController
+from orchestrator.control import send_command
+from orchestrator.storage import close_storage
+from orchestrator.main import main
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+class TestWorkflowScheduler(unittest.TestCase):
+    """Test WorkflowScheduler dispatch and dependency unlocking."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmp.name
+        patcher = patch('orchestrator.git_manager.commit_phase', return_value=True)
+        self.commit_phase = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _complete(self, state):
+        """Simulate the coding and review agents approving a workflow."""
+        _write(state['output_file_path'], "Done\n\n**Status: COMPLETE**\n")
+
+    def _approve(self, state):
+        _write(state['validation_file_path'], "Fine\n\n**Status: APPROVED**\n")
+
+    def test_dispatches_ready_tasks_and_unlocks_dependents(self):
+        """Test independent tasks run concurrently and dependents wait."""
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'),
+               "[id=schema] Design schema\n"
+               "[id=api depends=schema] Build API\n"
+               "Write docs\n")
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=4)
+        try:
+            started = scheduler.dispatch_ready()
+            self.assertEqual(sorted(s['task_description'] for s in started),
+                             ['Design schema', 'Write docs'])
+            self.assertEqual(scheduler.queue.blocked_count(), 1)
+
+            scheduler.step_all()  # Assignment
+            scheduler.step_all()  # Execution task files
+            self.assertTrue(scheduler.all_waiting())
+
+            schema = next(s for s in scheduler.in_flight.values()
+                          if s['task_key'] == 'schema')
+            self._complete(schema)
+            scheduler.step_all()  # Validation task file
+            schema = scheduler.in_flight[schema['workflow_id']]
+            self.assertEqual(schema['current_phase'], WorkflowPhase.VALIDATION)
+
+            self._approve(schema)
+            scheduler.step_all()  # Completion unlocks 'api'
+
+            self.assertEqual(len(scheduler.completed), 1)
+            self.assertEqual(scheduler.queue.blocked_count(), 0)
+
+            started = scheduler.dispatch_ready()
+            self.assertEqual([s['task_description'] for s in started], ['Build API'])
+            self.assertEqual(len(scheduler.in_flight), 2)
+        finally:
+            scheduler.shutdown()
+
+    def test_sqlite_storage_resumes_after_restart(self):
+        """Test a SQLite-backed run picks its workflows back up from checkpoints after a restart."""
+        _write(os.path.join(self.tmpdir, 'storage.json'),
+               json.dumps({'backend': 'sqlite', 'human_protocol': True}))
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'),
+               "[id=schema] Design schema\n"
+               "[id=api depends=schema] Build API\n")
+        self.addCleanup(close_storage, self.tmpdir)
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=2)
+        try:
+            scheduler.dispatch_ready()
+            scheduler.step_all()  # Assignment
+            scheduler.step_all()  # Execution task file
+        finally:
+            scheduler.shutdown()
+        [state] = scheduler.in_flight.values()
+        self.assertTrue(os.path.exists(state['task_file_path']))  # Rendered for the human agent
+        close_storage(self.tmpdir)
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=2)
+        try:
+            self.assertEqual(list(scheduler.in_flight), [state['workflow_id']])
+            self.assertEqual(scheduler.in_flight[state['workflow_id']]['current_phase'], WorkflowPhase.EXECUTION)
+
+            self._complete(state)
+            scheduler.step_all()  # Validation task file
+            self._approve(scheduler.in_flight[state['workflow_id']])
+            scheduler.step_all()  # Completion unlocks 'api'
+            self.assertEqual(len(scheduler.completed), 1)
+
+            started = scheduler.dispatch_ready()
+            self.assertEqual([s['task_description'] for s in started], ['Build API'])
+        finally:
+            scheduler.shutdown()
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, 'decisions')))
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, 'queue_index.jsonl')))
+
+    def test_respects_max_parallel(self):
+        """Test no more than max_parallel workflows are in flight."""
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'),
+               "".join(f"Task {i}\n" for i in range(5)))
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=2)
+        try:
+            scheduler.dispatch_ready()
+            self.assertEqual(len(scheduler.in_flight), 2)
+            self.assertEqual(scheduler.queue.ready_count(), 3)
+            self.assertEqual(len({s['current_task_id'] for s in scheduler.in_flight.values()}), 2)
+        finally:
+            scheduler.shutdown()
+
+    def test_admission_control_limits_intake(self):
+        """Test role caps hold tasks in the queue and are counted as rejections."""
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'),
+               "".join(f"Task {i}\n" for i in range(3)))
+        admission = AdmissionController(
+            max_in_flight=4,
+            role_limits={AgentRole.CODING_AGENT: 1}
+        )
+
+        scheduler = WorkflowScheduler(self.tmpdir, admission=admission)
+        try:
+            scheduler.dispatch_ready()
+            scheduler.dispatch_ready()
+            self.assertEqual(len(scheduler.in_flight), 1)
+            self.assertEqual(scheduler.queue.ready_count(), 2)
+            self.assertEqual(admission.snapshot()['rejections'], {'role_limit:coding_agent': 2})
+
+            scheduler.end_pass()
+            self.assertTrue(os.path.exists(os.path.join(self.tmpdir, 'admission.json')))
+        finally:
+            scheduler.shutdown()
+
+    def test_admission_flags_need_parallel(self):
+        """Test admission limits are rejected instead of ignored in single-workflow mode."""
+        with patch('orchestrator.main.run_workflow') as run_workflow, \
+                patch('sys.stderr'), self.assertRaises(SystemExit):
+            main(['--thursian-dir', self.tmpdir, '--role-limit', 'review_agent=2'])
+        run_workflow.assert_not_called()
+
+    def test_bad_role_limit_is_a_usage_error(self):
+        """Test a malformed --role-limit exits with a usage error before anything runs."""
+        with patch('orchestrator.main.run_scheduler') as run_scheduler, \
+                patch('sys.stderr'), self.assertRaises(SystemExit) as exit:
+            main(['--thursian-dir', self.tmpdir, '--parallel', '2', '--role-limit', 'review_agent=two'])
+        self.assertEqual(exit.exception.code, 2)
+        run_scheduler.assert_not_called()
+
+    def test_agent_pool_spreads_and_caps_work(self):
+        """Test tasks are spread over coding agents and intake stops at pool capacity."""
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'),
+               "".join(f"Task {i}\n" for i in range(4)))
+        _write(os.path.join(self.tmpdir, 'agents.json'), json.dumps({'agents': [
+            {'name': 'alice', 'role': 'coding_agent', 'slots': 1},
+            {'name': 'bob', 'role': 'coding_agent', 'slots': 1},
+            {'name': 'rita', 'role': 'review_agent', 'slots': 2},
+        ]}))
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=4)
+        try:
+            scheduler.dispatch_ready()
+            scheduler.step_all()  # Assignment leases agents
+            scheduler.dispatch_ready()
+
+            self.assertEqual(len(scheduler.in_flight), 2)
+            self.assertEqual(
+                sorted(s['primary_agent_instance'] for s in scheduler.in_flight.values()),
+                ['alice', 'bob']
+            )
+            self.assertEqual(scheduler.admission.snapshot()['rejections'], {'agent_pool': 2})
+
+            scheduler.step_all()  # Execution task files
+            state = next(iter(scheduler.in_flight.values()))
+            self._complete(state)
+            scheduler.step_all()  # Validation leases the reviewer
+            state = scheduler.in_flight[state['workflow_id']]
+            self.assertEqual(state['validator_agent_instance'], 'rita')
+
+            self._approve(state)
+            scheduler.step_all()  # Completion frees both slots
+            self.assertEqual(scheduler.agents.free_slots(AgentRole.CODING_AGENT), 1)
+            self.assertEqual(len(scheduler.dispatch_ready()), 1)
+        finally:
+            scheduler.shutdown()
+
+    def test_failed_workflow_frees_its_leases(self):
+        """Test a workflow whose node errors gives its agent slot back to the pool."""
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'), "Task 1\nTask 2\n")
+        _write(os.path.join(self.tmpdir, 'agents.json'), json.dumps({'agents': [
+            {'name': 'alice', 'role': 'coding_agent', 'slots': 1},
+            {'name': 'rita', 'role': 'review_agent', 'slots': 1},
+        ]}))
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=2)
+        try:
+            scheduler.dispatch_ready()
+            scheduler.step_all()  # Assignment leases alice
+            self.assertEqual(scheduler.agents.free_slots(AgentRole.CODING_AGENT), 0)
+
+            with patch('orchestrator.nodes._write_task_file', side_effect=OSError("disk full")):
+                scheduler.step_all()  # Execution fails
+
+            self.assertEqual(len(scheduler.failed), 1)
+            self.assertEqual(scheduler.agents.free_slots(AgentRole.CODING_AGENT), 1)
+            self.assertEqual(len(scheduler.dispatch_ready()), 1)
+        finally:
+            scheduler.shutdown()
+
+    def test_resumed_workflows_retake_their_leases(self):
+        """Test workflows resumed from checkpoints hold their agent slots again."""
+        _write(os.path.join(self.tmpdir, 'storage.json'), json.dumps({'backend': 'sqlite'}))
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'), "Task 1\nTask 2\n")
+        _write(os.path.join(self.tmpdir, 'agents.json'), json.dumps({'agents': [
+            {'name': 'alice', 'role': 'coding_agent', 'slots': 1},
+            {'name': 'rita', 'role': 'review_agent', 'slots': 1},
+        ]}))
+        self.addCleanup(close_storage, self.tmpdir)
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=2)
+        try:
+            scheduler.dispatch_ready()
+            scheduler.step_all()  # Assignment leases alice
+        finally:
+            scheduler.shutdown()
+        close_storage(self.tmpdir)
+
+        # A fresh process: the pool starts without leases
+        with patch.dict('orchestrator.agent_pool._pools', clear=True):
+            scheduler = WorkflowScheduler(self.tmpdir, max_parallel=2)
+            try:
+                self.assertEqual(len(scheduler.in_flight), 1)
+                self.assertEqual(scheduler.agents.free_slots(AgentRole.CODING_AGENT), 0)
+                self.assertEqual(scheduler.dispatch_ready(), [])
+            finally:
+                scheduler.shutdown()
+
+    def test_preempt_frees_slot_and_requeues(self):
+        """Test a preempted workflow is cancelled alone and re-queued at the new priority."""
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'),
+               "[id=big] Big refactor\n[id=fix] Small fix\n[id=later] Later task\n")
+        _write(os.path.join(self.tmpdir, 'agents.json'), json.dumps({'agents': [
+            {'name': 'alice', 'role': 'coding_agent', 'slots': 1},
+            {'name': 'bob', 'role': 'coding_agent', 'slots': 1},
+        ]}))
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=4)
+        try:
+            scheduler.dispatch_ready()
+            scheduler.step_all()  # Assignment leases both agents
+            scheduler.step_all()  # Execution task files
+            big = next(s for s in scheduler.in_flight.values() if s['task_key'] == 'big')
+            fix = next(s for s in scheduler.in_flight.values() if s['task_key'] == 'fix')
+            scheduler.commits.enqueue('execution', big['current_task_id'])
+
+            send_command(self.tmpdir, 'preempt', 'big', priority='critical', reason='Urgent work first')
+            send_command(self.tmpdir, 'cancel', 'no_such_task')
+            cancelled = scheduler.apply_control()
+
+            self.assertEqual(len(cancelled), 1)
+            self.assertEqual(cancelled[0]['current_phase'], WorkflowPhase.CANCELLED)
+            self.assertEqual(cancelled[0]['decision_logs'][-1]['reasoning'], 'Urgent work first')
+            self.assertEqual(list(scheduler.in_flight), [fix['workflow_id']])
+            self.assertEqual(scheduler.in_flight[fix['workflow_id']], fix)
+            self.assertEqual(scheduler.agents.free_slots(AgentRole.CODING_AGENT), 1)
+            self.assertEqual([phase for phase, task_id in scheduler.commits._pending
+                              if task_id == big['current_task_id']], ['cancelled'])
+            with open(big['task_file_path']) as f:
+                self.assertIn('Cancelled', f.read())
+
+            # Re-queued at critical priority, so it is claimed before the older task
+            started = scheduler.dispatch_ready()
+            self.assertEqual([s['task_key'] for s in started], ['big'])
+            self.assertEqual(started[0]['task_priority'], 0)
+        finally:
+            scheduler.shutdown()
+
+    def test_ai_executor_completes_workflows(self):
+        """Test the stub executor replaces the human hand-off end to end."""
+        _write(os.path.join(self.tmpdir, 'task_queue.txt'),
+               "".join(f"Task {i}\n" for i in range(3)))
+        _write(os.path.join(self.tmpdir, 'executor.json'), json.dumps({
+            'roles': {'coding_agent': 'stub', 'review_agent': 'stub'},
+            'providers': {'stub': {'backend': 'stub', 'max_concurrency': 2}}
+        }))
+
+        scheduler = WorkflowScheduler(self.tmpdir, max_parallel=4)
+        try:
+            deadline = time.time() + 10
+            while not scheduler.idle() and time.time() < deadline:
+                scheduler.dispatch_ready()
+                scheduler.step_all()
+                time.sleep(0.01)
+
+            self.assertEqual(len(scheduler.completed), 3)
+            self.assertEqual(scheduler.failed, [])
+        finally:
+            scheduler.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
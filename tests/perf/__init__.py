@@ -0,0 +1 @@
+"""Performance regression tests for the orchestrator hot paths."""
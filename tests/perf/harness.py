@@ -0,0 +1,128 @@
+"""
+Measurement helpers and baseline checks for the performance tier.
+
+Each benchmark reports a few metrics that should stay flat as the tree
+changes. Every metric is "lower is better" and is compared against the
+value stored in baselines.json::
+
+    limit = baseline * (1 + tolerance) + slack
+
+Wall-clock metrics get wide tolerances, since they depend on the machine.
+Scaling ratios (the per-operation cost at a large size divided by the cost
+at a small size) and I/O bytes per operation are what catch regressions:
+they hardly move between machines, but jump by an order of magnitude when an
+O(log n) path turns O(n) or a poll starts re-reading whole files.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+import time
+import unittest
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), 'baselines.json')
+DEFAULT_TOLERANCE = 1.0
+DEFAULT_REPEAT = 5
+
+# Set by ``run_tests --update-baselines``: record measurements instead of checking
+update_baselines = False
+
+# (benchmark, metric, measured value, limit or None)
+results: List[Tuple[str, str, float, Optional[float]]] = []
+
+_baselines: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None
+
+
+def load_baselines() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Stored baselines, read once per process."""
+    global _baselines
+    if _baselines is None:
+        try:
+            with open(BASELINES_FILE, 'r') as f:
+                _baselines = json.load(f)
+        except FileNotFoundError:
+            _baselines = {}
+    return _baselines
+
+
+def save_baselines() -> str:
+    """Write the values measured in this run, keeping each metric's tolerance and slack."""
+    baselines = load_baselines()
+    for benchmark, metric, value, _ in results:
+        entry = baselines.setdefault(benchmark, {}).setdefault(metric, {'tolerance': DEFAULT_TOLERANCE})
+        entry['baseline'] = float(f"{value:.4g}")
+    ordered = {
+        name: {metric: {'baseline': entry['baseline'], **entry} for metric, entry in sorted(metrics.items())}
+        for name, metrics in sorted(baselines.items())
+    }
+    with open(BASELINES_FILE, 'w') as f:
+        json.dump(ordered, f, indent=2)
+        f.write('\n')
+    return BASELINES_FILE
+
+
+def check(test: unittest.TestCase, benchmark: str, metric: str, value: float) -> None:
+    """Fail ``test`` if ``value`` exceeds the stored baseline plus its tolerance."""
+    if update_baselines:
+        results.append((benchmark, metric, value, None))
+        return
+
+    entry = load_baselines().get(benchmark, {}).get(metric)
+    if entry is None:
+        test.fail(f"No baseline for {benchmark}.{metric}; run with --update-baselines")
+    limit = entry['baseline'] * (1 + entry['tolerance']) + entry.get('slack', 0)
+    results.append((benchmark, metric, value, limit))
+    test.assertLessEqual(
+        value, limit,
+        f"{benchmark}.{metric} regressed: {value:.4g} (baseline {entry['baseline']:.4g}, limit {limit:.4g})"
+    )
+
+
+def best_of(func: Callable[[], None], number: int, repeat: int = DEFAULT_REPEAT,
+            setup: Optional[Callable[[], None]] = None) -> float:
+    """
+    Seconds per call of ``func``: the fastest of ``repeat`` runs of ``number`` calls.
+
+    The minimum is the run least disturbed by the rest of the machine, which
+    makes ratios between two sizes stable. ``setup`` runs untimed before each run.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def read_io() -> Optional[Dict[str, int]]:
+    """Byte counters from /proc/self/io (Linux only)."""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            return {key: int(value) for key, value in (line.split(':') for line in f if ':' in line)}
+    except OSError:
+        return None
+
+
+def io_per_call(func: Callable[[], None], number: int) -> Optional[Tuple[float, float]]:
+    """Bytes (read, written) per call of ``func``, or None without /proc/self/io."""
+    before = read_io()
+    if before is None:
+        return None
+    for _ in range(number):
+        func()
+    after = read_io()
+    return ((after['rchar'] - before['rchar']) / number,
+            (after['wchar'] - before['wchar']) / number)
+
+
+def format_results() -> str:
+    """Table of every metric measured in this run."""
+    lines = [f"  {'benchmark':<22} {'metric':<24} {'value':>12} {'limit':>12}"]
+    for benchmark, metric, value, limit in results:
+        shown = '-' if limit is None else f"{limit:.4g}"
+        flag = '' if limit is None or value <= limit else '  REGRESSED'
+        lines.append(f"  {benchmark:<22} {metric:<24} {value:>12.4g} {shown:>12}{flag}")
+    return "\n".join(lines)
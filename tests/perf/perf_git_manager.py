@@ -0,0 +1,73 @@
+"""Performance regression tests for batched phase commits."""
+
+import unittest
+import tempfile
+import shutil
+import subprocess
+import os
+from unittest.mock import patch
+from orchestrator.git_manager import CommitQueue
+from tests.perf.harness import best_of, check
+
+SMALL_BATCH = 1
+LARGE_BATCH = 200
+ENQUEUES = 1000
+
+
+def _filled(size):
+    queue = CommitQueue()
+    for i in range(size):
+        queue.enqueue('EXECUTION', f'task_{i}')
+    return queue
+
+
+class TestCommitBatching(unittest.TestCase):
+    """A flush must be one git commit whatever the backlog."""
+
+    def test_one_commit_per_flush(self):
+        """Test a backlog of transitions becomes a single commit."""
+        with patch('orchestrator.git_manager.commit_phase', return_value=True) as mock_commit:
+            queue = _filled(LARGE_BATCH)
+            self.assertTrue(queue.flush())
+        check(self, 'commit_batching', 'commits_per_flush', mock_commit.call_count)
+
+    def test_enqueue_latency(self):
+        """Test queueing a transition stays O(1) and near baseline."""
+        queue = CommitQueue()
+        check(self, 'commit_batching', 'enqueue_seconds_per_op',
+              best_of(lambda: queue.enqueue('EXECUTION', 'task_1'), ENQUEUES))
+
+    def test_flush_amortizes_git(self):
+        """Test flushing 200 transitions takes about as long as flushing one."""
+        if shutil.which('git') is None:
+            self.skipTest("git not available")
+
+        repo = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            os.chdir(repo)
+            subprocess.run(['git', 'init', '-q'], check=True)
+            subprocess.run(['git', 'config', 'user.email', 'perf@example.com'], check=True)
+            subprocess.run(['git', 'config', 'user.name', 'perf'], check=True)
+            subprocess.run(['git', 'config', 'commit.gpgsign', 'false'], check=True)
+            os.makedirs('.thursian')
+            counter = [0]
+
+            def flush(size):
+                queue = _filled(size)
+                # A change to commit, as a real phase transition would leave
+                counter[0] += 1
+                with open(os.path.join('.thursian', 'status.json'), 'w') as f:
+                    f.write(str(counter[0]))
+                self.assertTrue(queue.flush())
+
+            single = best_of(lambda: flush(SMALL_BATCH), 1, repeat=3)
+            batched = best_of(lambda: flush(LARGE_BATCH), 1, repeat=3)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(repo, ignore_errors=True)
+        check(self, 'commit_batching', 'flush_scaling_200x', batched / single)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Performance regression tests for decision-log and status writes."""
+
+import unittest
+import tempfile
+import shutil
+from orchestrator.helpers import (
+    add_decision_log,
+    create_initial_state,
+    update_status_file,
+    write_decision_log_to_file
+)
+from orchestrator.state import WorkflowPhase
+from tests.perf.harness import best_of, check, io_per_call
+
+SMALL_HISTORY = 10
+LARGE_HISTORY = 10000
+CALLS = 200
+
+
+def _state_with_history(thursian_dir, entries):
+    state = create_initial_state(thursian_dir, 'workflow_perf')
+    state['current_phase'] = WorkflowPhase.EXECUTION
+    state['current_task_id'] = 'task_perf'
+    for i in range(entries):
+        state['decision_logs'] += add_decision_log(
+            state, f"Reasoning {i}", "Waiting for output", tool_used='file_check'
+        )['decision_logs']
+    return state
+
+
+class TestDecisionLogWrite(unittest.TestCase):
+    """Writing a decision must cost the same however long the workflow's history is."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.small = _state_with_history(self.test_dir, SMALL_HISTORY)
+        self.large = _state_with_history(self.test_dir, LARGE_HISTORY)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_write_latency(self):
+        """Test one decision-log write stays near baseline."""
+        check(self, 'decision_log_write', 'seconds_per_op',
+              best_of(lambda: write_decision_log_to_file(self.small), CALLS))
+
+    def test_write_does_not_scale_with_history(self):
+        """Test a 1000x longer history doesn't slow the write (only the latest entry is written)."""
+        small = best_of(lambda: write_decision_log_to_file(self.small), CALLS)
+        large = best_of(lambda: write_decision_log_to_file(self.large), CALLS)
+        check(self, 'decision_log_write', 'scaling_1000x', large / small)
+
+    def test_write_io(self):
+        """Test a write reads nothing and writes one entry."""
+        io = io_per_call(lambda: write_decision_log_to_file(self.large), CALLS)
+        if io is None:
+            self.skipTest("/proc/self/io not available")
+        check(self, 'decision_log_write', 'bytes_read_per_op', io[0])
+        check(self, 'decision_log_write', 'bytes_written_per_op', io[1])
+
+
+class TestStatusUpdate(unittest.TestCase):
+    """Status updates must be a small blind write, not a read-modify-write."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.state = _state_with_history(self.test_dir, LARGE_HISTORY)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_update_latency(self):
+        """Test one status update stays near baseline."""
+        check(self, 'status_update', 'seconds_per_op',
+              best_of(lambda: update_status_file(self.state), CALLS))
+
+    def test_update_io(self):
+        """Test an update reads nothing and writes a few hundred bytes."""
+        io = io_per_call(lambda: update_status_file(self.state), CALLS)
+        if io is None:
+            self.skipTest("/proc/self/io not available")
+        check(self, 'status_update', 'bytes_read_per_op', io[0])
+        check(self, 'status_update', 'bytes_written_per_op', io[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Performance regression tests for entry routing."""
+
+import unittest
+import tempfile
+import shutil
+import os
+from orchestrator.helpers import create_initial_state
+from orchestrator.routing import forget_scans, route_entry
+from orchestrator.state import WorkflowPhase
+from tests.perf.harness import best_of, check, io_per_call
+
+SMALL_BYTES = 64 * 1024
+LARGE_BYTES = 4 * 1024 * 1024
+POLLS = 500
+
+
+class TestRoutingCheck(unittest.TestCase):
+    """Polling a waiting workflow must read only what was appended since the last poll."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.states = {size: self._waiting_state(size) for size in (SMALL_BYTES, LARGE_BYTES)}
+
+    def tearDown(self):
+        forget_scans([state['output_file_path'] for state in self.states.values()])
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _waiting_state(self, size):
+        output_file = os.path.join(self.test_dir, f'task_{size}_output.md')
+        with open(output_file, 'w') as f:
+            f.write(('Work in progress.\n' * (size // 18 + 1))[:size])
+
+        state = create_initial_state(self.test_dir)
+        state['current_phase'] = WorkflowPhase.EXECUTION
+        state['current_task_id'] = f'task_{size}'
+        state['task_description'] = 'Write a function'
+        state['task_file_path'] = os.path.join(self.test_dir, f'task_{size}.md')
+        state['output_file_path'] = output_file
+        self.assertEqual(route_entry(state), 'execution_node')
+        return state
+
+    def test_poll_latency(self):
+        """Test one routing check on an unchanged output stays near baseline."""
+        state = self.states[SMALL_BYTES]
+        check(self, 'routing_check', 'seconds_per_op', best_of(lambda: route_entry(state), POLLS))
+
+    def test_poll_does_not_scale_with_output_size(self):
+        """Test polling a 64x larger output costs the same (no full-file reads)."""
+        small, large = self.states[SMALL_BYTES], self.states[LARGE_BYTES]
+        small_time = best_of(lambda: route_entry(small), POLLS)
+        large_time = best_of(lambda: route_entry(large), POLLS)
+        check(self, 'routing_check', 'scaling_64x', large_time / small_time)
+
+    def test_poll_io(self):
+        """Test an unchanged 4 MiB output costs a few hundred bytes per poll."""
+        state = self.states[LARGE_BYTES]
+        io = io_per_call(lambda: route_entry(state), POLLS)
+        if io is None:
+            self.skipTest("/proc/self/io not available")
+        check(self, 'routing_check', 'bytes_read_per_op', io[0])
+
+    def test_growing_output_io(self):
+        """Test polls of a growing output read the appended bytes plus a small window."""
+        state = self.states[LARGE_BYTES]
+        line = 'x' * 99 + '\n'
+
+        def append_and_poll():
+            with open(state['output_file_path'], 'a') as f:
+                f.write(line)
+            route_entry(state)
+
+        io = io_per_call(append_and_poll, POLLS)
+        if io is None:
+            self.skipTest("/proc/self/io not available")
+        check(self, 'routing_check', 'bytes_read_per_append', io[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Performance regression tests for the task queue."""
+
+import unittest
+import tempfile
+import shutil
+from orchestrator.task_queue import TaskQueue
+from tests.perf.harness import best_of, check, io_per_call
+
+SMALL = 4000
+LARGE = 64000
+POPS = 200
+
+
+def _filled_queue(size):
+    thursian_dir = tempfile.mkdtemp()
+    queue = TaskQueue(thursian_dir)
+    queue.push_many([{'description': f"Task {i}"} for i in range(size)])
+    return thursian_dir, queue
+
+
+class TestQueuePop(unittest.TestCase):
+    """Selecting a task must stay O(log n) plus one journal append."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.small_dir, cls.small = _filled_queue(SMALL)
+        cls.large_dir, cls.large = _filled_queue(LARGE)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.small_dir, ignore_errors=True)
+        shutil.rmtree(cls.large_dir, ignore_errors=True)
+
+    def test_pop_latency(self):
+        """Test per-pop time stays near baseline."""
+        check(self, 'queue_pop', 'seconds_per_op', best_of(self.small.pop, POPS))
+
+    def test_pop_does_not_scale_with_queue_length(self):
+        """Test a 16x longer queue doesn't make each pop slower (no rewrite or rescan)."""
+        small = best_of(self.small.pop, POPS)
+        large = best_of(self.large.pop, POPS)
+        check(self, 'queue_pop', 'scaling_16x', large / small)
+
+    def test_pop_io(self):
+        """Test a pop reads nothing and appends a single journal record."""
+        io = io_per_call(self.large.pop, POPS)
+        if io is None:
+            self.skipTest("/proc/self/io not available")
+        read, written = io
+        check(self, 'queue_pop', 'bytes_read_per_op', read)
+        check(self, 'queue_pop', 'bytes_written_per_op', written)
+
+    def test_push_does_not_scale_with_queue_length(self):
+        """Test adding a task to a long queue costs the same as to a short one."""
+        small = best_of(lambda: self.small.push("Extra task"), POPS)
+        large = best_of(lambda: self.large.push("Extra task"), POPS)
+        check(self, 'queue_push', 'scaling_16x', large / small)
+
+
+if __name__ == '__main__':
+    unittest.main()
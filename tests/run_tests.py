@@ -1,11 +1,27 @@
 """Test runner for Thursian orchestrator test suite."""
 
+from typing import Any, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
 import unittest
+import subprocess
+import tempfile
+import shutil
+import time
 import sys
+import io
 import os
 
 # Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+SUITE_DIRS = {
+    'all': '',
+    'unit': 'unit',
+    'integration': 'integration',
+    'e2e': 'e2e',
+}
 
 
 def run_test_suite(verbosity=2):
@@ -57,6 +73,167 @@ def run_e2e_tests(verbosity=2):
     return runner.run(suite)
 
 
+def run_perf_tests(verbosity=2, update_baselines=False):
+    """
+    Run the performance regression tier against tests/perf/baselines.json.
+
+    Perf modules are named perf_*.py so the other suites never pick them up.
+
+    Args:
+        verbosity: Test output verbosity
+        update_baselines: Record this run's measurements as the new baselines
+            instead of checking them
+    """
+    from tests.perf import harness
+
+    harness.update_baselines = update_baselines
+    loader = unittest.TestLoader()
+    start_dir = os.path.join(os.path.dirname(__file__), 'perf')
+    suite = loader.discover(start_dir, pattern='perf_*.py', top_level_dir=os.path.dirname(start_dir))
+    runner = unittest.TextTestRunner(verbosity=verbosity)
+    result = runner.run(suite)
+
+    print()
+    print(harness.format_results())
+    if update_baselines and result.wasSuccessful():
+        print(f"\nBaselines written to {harness.save_baselines()}")
+    return result
+
+
+class ParallelResult:
+    """Results of every shard, aggregated to look like a unittest TestResult."""
+
+    def __init__(self):
+        self.testsRun = 0
+        self.failures: List[Tuple[str, str]] = []
+        self.errors: List[Tuple[str, str]] = []
+        self.skipped: List[Tuple[str, str]] = []
+
+    def add(self, shard: Dict[str, Any]) -> None:
+        self.testsRun += shard['tests_run']
+        self.failures += shard['failures']
+        self.errors += shard['errors']
+        self.skipped += shard['skipped']
+
+    def wasSuccessful(self) -> bool:
+        return not self.failures and not self.errors
+
+
+def discover_modules(suite='all'):
+    """Dotted names of the test modules in a suite, largest file first."""
+    tests_dir = os.path.dirname(os.path.abspath(__file__))
+    start_dir = os.path.join(tests_dir, SUITE_DIRS[suite])
+    modules = []
+    for dirpath, dirnames, filenames in os.walk(start_dir):
+        dirnames[:] = sorted(d for d in dirnames if d in SUITE_DIRS.values() or dirpath != tests_dir)
+        for filename in filenames:
+            if filename.startswith('test_') and filename.endswith('.py'):
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path[:-3], ROOT_DIR).replace(os.sep, '.')
+                modules.append((os.path.getsize(path), name))
+    # Biggest modules start first so one slow shard doesn't finish last
+    return [name for _, name in sorted(modules, key=lambda m: (-m[0], m[1]))]
+
+
+def _make_sandbox():
+    """Scratch working dir with its own .thursian, git repo and TMPDIR."""
+    sandbox = tempfile.mkdtemp(prefix='thursian-tests-')
+    os.makedirs(os.path.join(sandbox, '.thursian'))
+    os.makedirs(os.path.join(sandbox, 'tmp'))
+    if shutil.which('git'):
+        for command in (['git', 'init', '-q'],
+                        ['git', 'config', 'user.email', 'tests@thursian.local'],
+                        ['git', 'config', 'user.name', 'Thursian Tests'],
+                        ['git', 'config', 'commit.gpgsign', 'false']):
+            subprocess.run(command, cwd=sandbox, check=True, capture_output=True)
+    return sandbox
+
+
+def run_module_isolated(name, verbosity=2):
+    """
+    Run one test module inside a fresh sandbox (in a worker process).
+
+    The worker's cwd, ``tempfile`` directory and TMPDIR all point into the
+    sandbox, so relative ``.thursian`` paths, temp dirs and git commits from
+    one module can't collide with another module running in parallel.
+
+    Returns:
+        Picklable summary: counts, failure tracebacks and captured output
+    """
+    sandbox = _make_sandbox()
+    cwd, saved_tempdir, saved_env = os.getcwd(), tempfile.tempdir, os.environ.get('TMPDIR')
+    stream = io.StringIO()
+    start = time.perf_counter()
+    try:
+        os.chdir(sandbox)
+        tempfile.tempdir = os.environ['TMPDIR'] = os.path.join(sandbox, 'tmp')
+        suite = unittest.defaultTestLoader.loadTestsFromName(name)
+        result = unittest.TextTestRunner(stream=stream, verbosity=verbosity).run(suite)
+    finally:
+        os.chdir(cwd)
+        tempfile.tempdir = saved_tempdir
+        if saved_env is None:
+            os.environ.pop('TMPDIR', None)
+        else:
+            os.environ['TMPDIR'] = saved_env
+        shutil.rmtree(sandbox, ignore_errors=True)
+
+    return {
+        'module': name,
+        'tests_run': result.testsRun,
+        'failures': [(str(test), trace) for test, trace in result.failures],
+        'errors': [(str(test), trace) for test, trace in result.errors],
+        'skipped': [(str(test), reason) for test, reason in result.skipped],
+        'seconds': time.perf_counter() - start,
+        'output': stream.getvalue(),
+    }
+
+
+def run_parallel(suite='all', jobs=None, verbosity=2):
+    """
+    Shard a suite's test modules across worker processes and aggregate the results.
+
+    Each module runs in its own sandbox (see run_module_isolated); workers
+    take the next module as soon as they are free.
+
+    Args:
+        suite: Suite name ('all', 'unit', 'integration' or 'e2e')
+        jobs: Worker processes (default: CPU count)
+        verbosity: Per-module output verbosity; module output is printed
+            when the module finishes, failing modules always in full
+
+    Returns:
+        ParallelResult
+    """
+    modules = discover_modules(suite)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(modules) or 1))
+    result = ParallelResult()
+    start = time.perf_counter()
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        futures = {pool.submit(run_module_isolated, name, verbosity): name for name in modules}
+        for future in as_completed(futures):
+            try:
+                shard = future.result()
+            except Exception as e:
+                # The worker died (e.g. a crash at import); count it as an error
+                shard = {
+                    'module': futures[future], 'tests_run': 0, 'failures': [],
+                    'errors': [(futures[future], f"Worker failed: {e!r}")], 'skipped': [],
+                    'seconds': 0.0, 'output': '',
+                }
+            result.add(shard)
+            ok = not shard['failures'] and not shard['errors']
+            print(f"[{'OK' if ok else 'FAIL'}] {shard['module']} "
+                  f"({shard['tests_run']} tests, {shard['seconds']:.1f}s)")
+            if shard['output'] and (verbosity > 1 or not ok):
+                print(shard['output'])
+
+    print(f"Ran {len(modules)} modules on {jobs} workers in {time.perf_counter() - start:.1f}s")
+    return result
+
+
 def main():
     """Main entry point."""
     import argparse
@@ -64,9 +241,20 @@ def main():
     parser = argparse.ArgumentParser(description='Run Thursian orchestrator tests')
     parser.add_argument(
         '--suite',
-        choices=['all', 'unit', 'integration', 'e2e'],
+        choices=['all', 'unit', 'integration', 'e2e', 'perf'],
         default='all',
-        help='Test suite to run (default: all)'
+        help='Test suite to run (default: all; perf only runs when named)'
+    )
+    parser.add_argument(
+        '--update-baselines',
+        action='store_true',
+        help='With --suite perf, store the measurements as the new baselines'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Run test modules in N parallel worker processes, each in its own sandbox'
     )
     parser.add_argument(
         '--verbosity',
@@ -77,13 +265,20 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.jobs is not None and args.suite == 'perf':
+        parser.error('--jobs does not apply to --suite perf (timings need a quiet machine)')
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
 
     print("="*70)
     print("THURSIAN ORCHESTRATOR TEST SUITE")
     print("="*70)
     print()
 
-    if args.suite == 'all':
+    if args.jobs is not None:
+        print(f"Running: {args.suite} tests on {args.jobs} workers")
+        result = run_parallel(args.suite, args.jobs, args.verbosity)
+    elif args.suite == 'all':
         print("Running: All Tests")
         result = run_test_suite(args.verbosity)
     elif args.suite == 'unit':
@@ -95,6 +290,9 @@ def main():
     elif args.suite == 'e2e':
         print("Running: End-to-End Tests Only")
         result = run_e2e_tests(args.verbosity)
+    elif args.suite == 'perf':
+        print("Running: Performance Regression Tests")
+        result = run_perf_tests(args.verbosity, args.update_baselines)
 
     print()
     print("="*70)
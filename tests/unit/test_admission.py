@@ -0,0 +1,124 @@
+"""Unit tests for admission control and commit batching."""
+
+import unittest
+import tempfile
+import os
+import json
+from unittest.mock import patch
+from orchestrator.state import WorkflowPhase, AgentRole
+from orchestrator.helpers import create_initial_state
+from orchestrator.admission import AdmissionController, parse_role_limits
+from orchestrator.git_manager import CommitQueue
+
+
+def _in_flight(phase, count):
+    """Build in-flight workflow states sitting in one phase."""
+    states = []
+    for i in range(count):
+        state = create_initial_state('.thursian', f'wf_{phase.value}_{i}')
+        state['current_phase'] = phase
+        state['primary_agent'] = AgentRole.CODING_AGENT
+        state['validator_agent'] = AgentRole.REVIEW_AGENT
+        states.append(state)
+    return states
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Test AdmissionController limits."""
+
+    def test_global_cap(self):
+        """Test free slots are bounded by max_in_flight."""
+        controller = AdmissionController(max_in_flight=3)
+        self.assertEqual(controller.available_slots(_in_flight(WorkflowPhase.EXECUTION, 1)),
+                         (2, 'max_in_flight'))
+        self.assertEqual(controller.available_slots(_in_flight(WorkflowPhase.EXECUTION, 3))[0], 0)
+
+    def test_intake_role_cap(self):
+        """Test the coding agent cap bounds intake below the global cap."""
+        controller = AdmissionController(
+            max_in_flight=10,
+            role_limits={AgentRole.CODING_AGENT: 2}
+        )
+        slots, reason = controller.available_slots(_in_flight(WorkflowPhase.EXECUTION, 1))
+        self.assertEqual((slots, reason), (1, 'role_limit:coding_agent'))
+
+    def test_saturated_reviewers_stop_intake(self):
+        """Test a full downstream role stops intake entirely."""
+        controller = AdmissionController(
+            max_in_flight=10,
+            role_limits={AgentRole.REVIEW_AGENT: 2}
+        )
+        slots, reason = controller.available_slots(_in_flight(WorkflowPhase.VALIDATION, 2))
+        self.assertEqual((slots, reason), (0, 'role_limit:review_agent'))
+
+    def test_backlog_thresholds(self):
+        """Test validation and commit backlogs throttle intake."""
+        controller = AdmissionController(
+            max_in_flight=10,
+            max_validation_backlog=1,
+            max_commit_backlog=5
+        )
+        self.assertEqual(controller.available_slots(_in_flight(WorkflowPhase.VALIDATION, 2)),
+                         (0, 'validation_backlog'))
+        self.assertEqual(controller.available_slots([], commit_backlog=6), (0, 'commit_backlog'))
+        self.assertEqual(controller.available_slots([], commit_backlog=5)[0], 10)
+
+    def test_metrics_snapshot(self):
+        """Test wait times and rejection counts are exported."""
+        controller = AdmissionController(max_in_flight=1)
+        admitted = _in_flight(WorkflowPhase.ASSIGNMENT, 2)
+        admitted[0]['queue_wait_seconds'] = 2.0
+        admitted[1]['queue_wait_seconds'] = 4.0
+
+        controller.record_pass(ready=2, admitted=admitted, reason='max_in_flight')
+        controller.record_pass(ready=3, admitted=[], reason='commit_backlog')
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller.write_snapshot(tmpdir, admitted, commit_backlog=7)
+            with open(os.path.join(tmpdir, 'admission.json')) as f:
+                snapshot = json.load(f)
+
+        self.assertEqual(snapshot['admitted'], 2)
+        self.assertEqual(snapshot['rejections'], {'commit_backlog': 1})
+        self.assertEqual(snapshot['queue_wait_seconds']['mean'], 3.0)
+        self.assertEqual(snapshot['queue_wait_seconds']['max'], 4.0)
+        self.assertEqual(snapshot['commit_backlog'], 7)
+        self.assertEqual(snapshot['throttled_by'], 'commit_backlog')
+
+    def test_parse_role_limits(self):
+        """Test role=N parsing."""
+        self.assertEqual(parse_role_limits(['review_agent=2']), {AgentRole.REVIEW_AGENT: 2})
+        for spec in ('review_agent', 'reviewer=2', 'review_agent=two'):
+            with self.assertRaises(ValueError):
+                parse_role_limits([spec])
+
+
+class TestCommitQueue(unittest.TestCase):
+    """Test CommitQueue batching."""
+
+    def test_batch_flush(self):
+        """Test pending transitions are committed together."""
+        commits = CommitQueue()
+        commits.enqueue('assignment', 'task_1')
+        commits.enqueue('execution', 'task_2')
+
+        with patch('orchestrator.git_manager.commit_phase', return_value=True) as commit:
+            self.assertTrue(commits.flush())
+
+        commit.assert_called_once()
+        self.assertIn('execution (task_2)', commit.call_args.kwargs['details'])
+        self.assertEqual(commits.backlog, 0)
+
+    def test_failed_flush_keeps_backlog(self):
+        """Test failed commits stay queued and count as backlog."""
+        commits = CommitQueue()
+        commits.enqueue('assignment', 'task_1')
+
+        with patch('orchestrator.git_manager.commit_phase', return_value=False):
+            self.assertFalse(commits.flush())
+
+        self.assertEqual(commits.backlog, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Unit tests for the agent pool registry."""
+
+import unittest
+import tempfile
+import os
+import json
+import time
+from orchestrator.state import AgentRole
+from orchestrator.agent_pool import AgentPool
+
+
+class TestAgentPool(unittest.TestCase):
+    """Test AgentPool leasing, strategies and heartbeats."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _configure(self, **config):
+        with open(os.path.join(self.tmpdir, 'agents.json'), 'w') as f:
+            json.dump(config, f)
+        return AgentPool(self.tmpdir)
+
+    def test_default_pool_is_one_unlimited_instance_per_role(self):
+        """Test the pool without config keeps fixed role assignment."""
+        pool = AgentPool(self.tmpdir)
+
+        for i in range(10):
+            self.assertEqual(pool.acquire(AgentRole.CODING_AGENT, f'task_{i}'), 'coding_agent')
+        self.assertEqual(pool.acquire(AgentRole.REVIEW_AGENT, 'task_0'), 'review_agent')
+        self.assertIsNone(pool.free_slots(AgentRole.CODING_AGENT))
+
+    def test_least_loaded_spreads_work_and_respects_slots(self):
+        """Test leases go to the least-loaded instance until slots run out."""
+        pool = self._configure(agents=[
+            {'name': 'alice', 'role': 'coding_agent', 'slots': 2},
+            {'name': 'bob', 'role': 'coding_agent', 'slots': 1},
+        ])
+
+        assigned = [pool.acquire(AgentRole.CODING_AGENT, f'task_{i}') for i in range(4)]
+
+        self.assertEqual(sorted(assigned[:3]), ['alice', 'alice', 'bob'])
+        self.assertIsNone(assigned[3])
+        self.assertEqual(pool.free_slots(AgentRole.CODING_AGENT), 0)
+
+        pool.release('task_0')
+        self.assertEqual(pool.free_slots(AgentRole.CODING_AGENT), 1)
+        self.assertIsNotNone(pool.acquire(AgentRole.CODING_AGENT, 'task_4'))
+
+    def test_weighted_strategy(self):
+        """Test heavier instances receive proportionally more work."""
+        pool = self._configure(strategy='weighted', agents=[
+            {'name': 'fast', 'role': 'review_agent', 'slots': 10, 'weight': 3},
+            {'name': 'slow', 'role': 'review_agent', 'slots': 10, 'weight': 1},
+        ])
+
+        assigned = [pool.acquire(AgentRole.REVIEW_AGENT, f'task_{i}') for i in range(8)]
+
+        self.assertEqual(assigned.count('fast'), 6)
+        self.assertEqual(assigned.count('slow'), 2)
+
+    def test_stale_heartbeat_excludes_instance(self):
+        """Test instances without a recent heartbeat get no new work."""
+        pool = self._configure(heartbeat_timeout=60, agents=[
+            {'name': 'alice', 'role': 'coding_agent'},
+            {'name': 'bob', 'role': 'coding_agent'},
+        ])
+        self.assertIsNone(pool.acquire(AgentRole.CODING_AGENT, 'task_0'))
+
+        pool.heartbeat('alice')
+        pool.heartbeat('bob')
+        stale = time.time() - 120
+        os.utime(os.path.join(pool.heartbeat_dir, 'bob'), (stale, stale))
+
+        self.assertEqual(pool.acquire(AgentRole.CODING_AGENT, 'task_0'), 'alice')
+        self.assertIsNone(pool.acquire(AgentRole.CODING_AGENT, 'task_1'))
+
+    def test_release_single_instance(self):
+        """Test releasing one lease keeps the task's other leases."""
+        pool = self._configure(agents=[
+            {'name': 'alice', 'role': 'coding_agent'},
+            {'name': 'rita', 'role': 'review_agent'},
+        ])
+        pool.acquire(AgentRole.CODING_AGENT, 'task_0')
+        pool.acquire(AgentRole.REVIEW_AGENT, 'task_0')
+
+        pool.release('task_0', 'rita')
+
+        self.assertEqual(pool.free_slots(AgentRole.REVIEW_AGENT), 1)
+        self.assertEqual(pool.free_slots(AgentRole.CODING_AGENT), 0)
+
+    def test_invalid_config(self):
+        """Test duplicate names and unknown strategies are rejected."""
+        with self.assertRaises(ValueError):
+            self._configure(agents=[
+                {'name': 'alice', 'role': 'coding_agent'},
+                {'name': 'alice', 'role': 'review_agent'},
+            ])
+        with self.assertRaises(ValueError):
+            self._configure(strategy='random', agents=[])
+
+
+if __name__ == '__main__':
+    unittest.main()
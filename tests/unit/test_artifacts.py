@@ -0,0 +1,158 @@
+"""Unit tests for the content-addressed artifact store."""
+
+import unittest
+import tempfile
+import json
+import os
+from orchestrator.artifacts import (
+    ArtifactStore, CorruptArtifactError, artifact_digest, get_artifact_store, forget_artifact_store, record_path
+)
+from orchestrator.helpers import create_initial_state, archive_revision_files, read_archived, render_archived
+from orchestrator.state import WorkflowPhase
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Test blob storage, dedup, packing and integrity checks."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, 'artifacts')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_identical_content_stored_once(self):
+        """Test putting the same content twice returns one digest and stores one blob."""
+        store = ArtifactStore(self.root)
+        first = store.put("**Status: NEEDS_REVISION**\n")
+        second = store.put("**Status: NEEDS_REVISION**\n".encode('utf-8'))
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, artifact_digest("**Status: NEEDS_REVISION**\n"))
+        self.assertEqual(store.get_text(first), "**Status: NEEDS_REVISION**\n")
+        stats = store.snapshot()
+        self.assertEqual((stats['blobs'], stats['stores'], stats['deduplicated']), (1, 1, 1))
+
+    def test_small_blobs_packed_large_blobs_loose(self):
+        """Test the small blobs of one batch share a pack and large ones get their own object."""
+        store = ArtifactStore(self.root, pack_threshold=1024)
+        small = store.put_many([f"round {i}\n" for i in range(10)])
+        large = store.put("x" * 4096)
+
+        stats = store.snapshot()
+        self.assertEqual((stats['packed'], stats['packs'], stats['loose']), (10, 1, 1))
+        self.assertEqual(len(os.listdir(os.path.join(self.root, 'packs'))), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'objects', large[:2], large)))
+        self.assertEqual([store.get_text(digest) for digest in small], [f"round {i}\n" for i in range(10)])
+        self.assertEqual(store.get_text(large), "x" * 4096)
+
+    def test_existing_files_never_rewritten(self):
+        """Test later batches add new packs instead of modifying earlier ones."""
+        store = ArtifactStore(self.root)
+        store.put_many(["output\n", "review\n"])
+        packs_dir = os.path.join(self.root, 'packs')
+        first = {name: os.path.getmtime(os.path.join(packs_dir, name)) for name in os.listdir(packs_dir)}
+
+        store.put_many(["output\n", "revised output\n"])
+
+        self.assertEqual(len(os.listdir(packs_dir)), 2)
+        for name, mtime in first.items():
+            self.assertEqual(os.path.getmtime(os.path.join(packs_dir, name)), mtime)
+        self.assertEqual(store.snapshot()['deduplicated'], 1)
+
+    def test_index_rebuilt_on_reload(self):
+        """Test a new store instance finds packed and loose blobs on disk."""
+        store = ArtifactStore(self.root, pack_threshold=32)
+        digests = store.put_many(["short\n", "a blob long enough to be stored loose\n"])
+
+        reloaded = ArtifactStore(self.root, pack_threshold=32)
+        self.assertEqual(len(reloaded), 2)
+        self.assertEqual([reloaded.get_text(digest) for digest in digests],
+                         ["short\n", "a blob long enough to be stored loose\n"])
+        self.assertEqual(reloaded.snapshot()['packs'], 1)
+
+    def test_damaged_blob_detected(self):
+        """Test reads and verify() catch a blob that no longer matches its digest."""
+        store = ArtifactStore(self.root, pack_threshold=16)
+        good = store.put("short\n")
+        bad = store.put("a loose blob that will be damaged\n")
+        with open(os.path.join(self.root, 'objects', bad[:2], bad), 'wb') as f:
+            f.write(b"garbage")
+
+        with self.assertRaises(CorruptArtifactError):
+            store.get(bad)
+        self.assertEqual(store.verify(), [bad])
+        self.assertEqual(store.get_text(good), "short\n")
+
+    def test_disabled_without_config(self):
+        """Test get_artifact_store returns None unless artifacts.json enables it."""
+        thursian_dir = self._tmp.name
+        self.assertIsNone(get_artifact_store(thursian_dir))
+        forget_artifact_store(thursian_dir)
+
+        with open(os.path.join(thursian_dir, 'artifacts.json'), 'w') as f:
+            json.dump({'pack_threshold': 64}, f)
+        try:
+            store = get_artifact_store(thursian_dir)
+            self.assertEqual(store.pack_threshold, 64)
+            self.assertIs(get_artifact_store(thursian_dir), store)
+        finally:
+            forget_artifact_store(thursian_dir)
+
+
+class TestArchivedRounds(unittest.TestCase):
+    """Test revision rounds are archived into the artifact store."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.thursian_dir = self._tmp.name
+        with open(os.path.join(self.thursian_dir, 'artifacts.json'), 'w') as f:
+            json.dump({}, f)
+        os.makedirs(os.path.join(self.thursian_dir, 'output'))
+        self.state = {**create_initial_state(self.thursian_dir), 'current_task_id': 'task_1'}
+
+    def tearDown(self):
+        forget_artifact_store(self.thursian_dir)
+        self._tmp.cleanup()
+
+    def _round(self, output: str, review: str) -> list:
+        for name, content in (('task_1_output.md', output), ('task_1_validation.md', review)):
+            with open(os.path.join(self.thursian_dir, 'output', name), 'w') as f:
+                f.write(content)
+        self.state['phase_history'] = self.state['phase_history'] + [WorkflowPhase.VALIDATION]
+        return archive_revision_files(self.state)
+
+    def test_rounds_recorded_and_deduplicated(self):
+        """Test archived files become blobs referenced from the task record."""
+        first = self._round("def f(): pass\n", "**Status: NEEDS_REVISION**\nAdd tests\n")
+        second = self._round("def f(): pass\n", "**Status: NEEDS_REVISION**\nStill no tests\n")
+
+        self.assertEqual([os.path.basename(path) for path in first + second],
+                         ['task_1_output_r1.md', 'task_1_validation_r1.md',
+                          'task_1_output_r2.md', 'task_1_validation_r2.md'])
+        for path in first + second:
+            self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(os.path.join(self.thursian_dir, 'output', 'task_1_output.md')))
+
+        with open(record_path(self.thursian_dir, 'task_1')) as f:
+            record = json.load(f)
+        outputs = [record['artifacts'][f'output/task_1_output_r{n}.md']['digest'] for n in (1, 2)]
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(len(get_artifact_store(self.thursian_dir)), 3)
+
+        self.assertEqual(read_archived(self.state, second[1]), "**Status: NEEDS_REVISION**\nStill no tests\n")
+
+    def test_render_archived(self):
+        """Test a task's archived rounds can be written back out as files."""
+        archived = self._round("output\n", "review\n")
+        target = os.path.join(self.thursian_dir, 'review')
+
+        written = render_archived(self.thursian_dir, 'task_1', target)
+        self.assertEqual(sorted(os.path.basename(path) for path in written),
+                         sorted(os.path.basename(path) for path in archived))
+        with open(os.path.join(target, 'output', 'task_1_validation_r1.md')) as f:
+            self.assertEqual(f.read(), "review\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Unit tests for the cancellation control channel."""
+
+import unittest
+import tempfile
+import os
+from orchestrator.control import send_command, drain_commands, cancel_workflow
+from orchestrator.helpers import create_initial_state
+from orchestrator.state import WorkflowPhase
+from orchestrator.task_queue import get_task_queue
+
+
+class TestControlFile(unittest.TestCase):
+    """Test sending and draining control commands."""
+
+    def test_drain_empties_file_and_skips_bad_lines(self):
+        """Test commands are taken once and malformed lines are ignored."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            send_command(tmpdir, 'cancel', 'task_1', reason='Not needed')
+            with open(os.path.join(tmpdir, 'control.jsonl'), 'a') as f:
+                f.write('not json\n{"op": "pause", "task": "task_2"}\n')
+                f.write('{"op": "preempt", "task": "api", "priority": "high"}\n')
+
+            commands = drain_commands(tmpdir)
+
+            self.assertEqual([(c['op'], c['task']) for c in commands], [('cancel', 'task_1'), ('preempt', 'api')])
+            self.assertEqual(commands[0]['reason'], 'Not needed')
+            self.assertEqual(commands[1]['priority'], 1)
+            self.assertEqual(drain_commands(tmpdir), [])
+
+            with self.assertRaises(ValueError):
+                send_command(tmpdir, 'pause', 'task_1')
+
+
+class TestCancelWorkflow(unittest.TestCase):
+    """Test cancel_workflow."""
+
+    def test_cancel_and_requeue(self):
+        """Test cancelling moves to CANCELLED and re-queues with the original metadata."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state = create_initial_state(tmpdir)
+            state.update({
+                'current_phase': WorkflowPhase.EXECUTION,
+                'current_task_id': 'task_1',
+                'task_description': 'Build the API',
+                'task_key': 'api',
+                'task_priority': 2,
+                'task_tags': ['backend'],
+            })
+
+            cancelled = cancel_workflow(state, requeue=True)
+
+            self.assertEqual(cancelled['current_phase'], WorkflowPhase.CANCELLED)
+            self.assertIn(WorkflowPhase.CANCELLED, cancelled['phase_history'])
+            self.assertEqual(cancelled['decision_logs'][-1]['tool_used'], 'cancellation')
+            self.assertFalse(cancelled['waiting_for_human'])
+
+            queue = get_task_queue(tmpdir)
+            task = queue.pop()
+            self.assertEqual((task['key'], task['priority'], task['tags']), ('api', 2, ['backend']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Unit tests for task decomposition."""
+
+import unittest
+from orchestrator.decomposition import split_task, merge_outputs, MAX_SUBTASKS
+
+
+class TestSplitTask(unittest.TestCase):
+    """Test split_task."""
+
+    def test_requires_split_tag(self):
+        """Test only tagged tasks with several parts are split."""
+        self.assertEqual(split_task("Add model; Add API", []), [])
+        self.assertEqual(split_task("Add model", ['split']), [])
+        self.assertEqual(split_task("Add model;  ; Add API ", ['split']), ['Add model', 'Add API'])
+
+    def test_caps_subtask_count(self):
+        """Test parts beyond the limit fold into the last subtask."""
+        parts = split_task("; ".join(f"part {n}" for n in range(MAX_SUBTASKS + 2)), ['split'])
+        self.assertEqual(len(parts), MAX_SUBTASKS)
+        self.assertEqual(parts[-1], f"part {MAX_SUBTASKS - 1}; part {MAX_SUBTASKS}; part {MAX_SUBTASKS + 1}")
+
+
+class TestMergeOutputs(unittest.TestCase):
+    """Test merge_outputs."""
+
+    def test_merge_in_slot_order_with_single_marker(self):
+        """Test parts are merged in order and status lines collapse into one."""
+        subtasks = {
+            str(n): {'description': f'Part {n} work', 'instance': 'coding_agent', 'leased': False,
+                     'task_file': '', 'output_file': '', 'status': 'complete'}
+            for n in (1, 2, 10)
+        }
+        outputs = {slot: f"Body {slot}\n\n**Status: COMPLETE**\n" for slot in subtasks}
+
+        merged = merge_outputs('task_1', subtasks, outputs)
+
+        self.assertLess(merged.index('Body 2'), merged.index('Body 10'))
+        self.assertIn('## Part 1: Part 1 work', merged)
+        self.assertEqual(merged.count('Status: COMPLETE'), 1)
+        self.assertTrue(merged.rstrip().endswith('**Status: COMPLETE**'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""Unit tests for the AI agent executor."""
+
+import unittest
+import tempfile
+import os
+import asyncio
+import time
+import threading
+from orchestrator.state import AgentRole
+from orchestrator.storage import MemoryStorage
+from orchestrator.executor import (
+    AgentExecutor,
+    AgentBackend,
+    RetryableError,
+    TokenBucket,
+    register_backend,
+    STREAMING_MARKER,
+    build_request
+)
+
+
+class FlakyBackend(AgentBackend):
+    """Fails the first `failures` calls, tracks peak concurrency."""
+
+    def __init__(self, name, options):
+        super().__init__(name, options)
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def complete(self, connection, request):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if self.calls <= self.options.get('failures', 0):
+                raise RetryableError("overloaded")
+            return f"done {request['task_id']}\n\n**Status: COMPLETE**\n"
+        finally:
+            self.active -= 1
+
+
+register_backend('flaky', FlakyBackend)
+
+
+class StallingBackend(AgentBackend):
+    """Streams one chunk, then blocks the event loop before sending the next."""
+
+    def __init__(self, name, options):
+        super().__init__(name, options)
+        self.streaming = threading.Event()
+        self.stopped = threading.Event()
+
+    async def stream(self, connection, request):
+        try:
+            yield "first chunk\n"
+            self.streaming.set()
+            time.sleep(0.2)  # The caller cancels while the loop thread is busy
+            yield "second chunk\n"
+            await asyncio.sleep(5)
+        finally:
+            self.stopped.set()
+
+
+register_backend('stalling', StallingBackend)
+
+
+def _request(task_id='task_1', role=AgentRole.CODING_AGENT):
+    return build_request(task_id, role, 'guidelines', 'Do the thing')
+
+
+class TestAgentExecutor(unittest.TestCase):
+    """Test AgentExecutor concurrency, retries and output hand-off."""
+
+    def _executor(self, provider, storage=None, **retry):
+        executor = AgentExecutor({
+            'roles': {'coding_agent': 'main', 'review_agent': 'main'},
+            'providers': {'main': provider},
+            'retry': {'base_delay': 0.001, **retry},
+        }, storage=storage)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def test_stub_backend_responses(self):
+        """Test the stub backend completes work and approves reviews."""
+        executor = self._executor({'backend': 'stub'})
+
+        self.assertIn('**Status: COMPLETE**', executor.run(_request(), timeout=5))
+        self.assertIn('**Status: APPROVED**',
+                      executor.run(_request(role=AgentRole.REVIEW_AGENT), timeout=5))
+        self.assertFalse(AgentExecutor({}).handles(AgentRole.CODING_AGENT))
+
+    def test_retries_transient_failures(self):
+        """Test retryable errors are retried up to max_attempts."""
+        executor = self._executor({'backend': 'flaky', 'failures': 2}, max_attempts=3)
+
+        self.assertIn('done', executor.run(_request(), timeout=5))
+        self.assertEqual(executor.snapshot()['providers']['main']['retries'], 2)
+
+        failing = self._executor({'backend': 'flaky', 'failures': 5}, max_attempts=2)
+        with self.assertRaises(RetryableError):
+            failing.run(_request(), timeout=5)
+        self.assertEqual(failing.snapshot()['providers']['main']['failures'], 1)
+
+    def test_concurrency_cap_and_connection_reuse(self):
+        """Test per-provider concurrency is bounded and connections are pooled."""
+        executor = self._executor({'backend': 'flaky', 'max_concurrency': 3})
+
+        futures = [executor.submit(_request(f'task_{i}')) for i in range(12)]
+        for future in futures:
+            future.result(timeout=5)
+
+        provider = executor.providers['main']
+        self.assertEqual(provider.backend.peak, 3)
+        self.assertEqual(provider.pool.created, 3)
+
+    def test_ensure_output_writes_once(self):
+        """Test responses are written to the output file and not resubmitted."""
+        executor = self._executor({'backend': 'stub'})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'output', 'task_1_output.md')
+
+            self.assertTrue(executor.ensure_output(_request(), path))
+            self.assertFalse(executor.ensure_output(_request(), path))
+
+            deadline = time.time() + 5
+            while not os.path.exists(path) and time.time() < deadline:
+                time.sleep(0.01)
+            with open(path) as f:
+                self.assertIn('**Status: COMPLETE**', f.read())
+
+            executor.forget(path)
+            executor.output_ready.clear()
+            self.assertTrue(executor.ensure_output(_request(), path))
+            self.assertTrue(executor.output_ready.wait(5))
+
+    def test_streaming_output(self):
+        """Test chunks appear in the output file before the final response replaces it."""
+        executor = self._executor({'backend': 'stub', 'stream': True, 'latency': 0.2, 'chunk_size': 8})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'output', 'task_1_output.md')
+            executor.ensure_output(_request(), path)
+
+            deadline = time.time() + 5
+            partial = ''
+            while time.time() < deadline and STREAMING_MARKER not in partial:
+                if os.path.exists(path):
+                    with open(path) as f:
+                        partial = f.read()
+                time.sleep(0.01)
+            self.assertTrue(partial.startswith(STREAMING_MARKER))
+
+            self.assertTrue(executor.output_ready.wait(5))
+            with open(path) as f:
+                final = f.read()
+            self.assertFalse(final.startswith(STREAMING_MARKER))
+            self.assertIn('**Status: COMPLETE**', final)
+
+    def test_cancel_removes_partial_stream(self):
+        """Test a stream cancelled mid-write leaves no partial document behind."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = MemoryStorage(tmpdir)
+            executor = self._executor({'backend': 'stalling', 'stream': True}, storage=storage)
+            backend = executor.providers['main'].backend
+            path = os.path.join(tmpdir, 'output', 'task_1_output.md')
+            executor.ensure_output(_request(), path)
+
+            self.assertTrue(backend.streaming.wait(5))
+            self.assertTrue(executor.cancel(path))
+            self.assertTrue(backend.stopped.wait(5))
+
+            deadline = time.time() + 5
+            while storage.exists(path) and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertFalse(storage.exists(path))
+            self.assertTrue(executor.is_submitted(path))
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test TokenBucket rate limiting."""
+
+    def test_bucket_limits_rate_after_burst(self):
+        """Test calls beyond the burst wait for refill."""
+        async def take(n):
+            bucket = TokenBucket(rate=100, capacity=5)
+            start = time.monotonic()
+            for _ in range(n):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        self.assertLess(asyncio.run(take(5)), 0.02)
+        self.assertGreaterEqual(asyncio.run(take(15)), 0.09)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Unit tests for bulk task ingestion."""
+
+import unittest
+import tempfile
+import os
+import json
+from orchestrator.ingest import (
+    enqueue_file,
+    content_hash,
+    normalize_record,
+    ContentHashIndex
+)
+from orchestrator.task_queue import TaskQueue
+
+
+class TestNormalizeRecord(unittest.TestCase):
+    """Test normalize_record."""
+
+    def test_fields_and_aliases(self):
+        """Test task alias, priority names and comma-separated lists."""
+        fields = normalize_record({
+            'task': 'Build  API',
+            'priority': 'high',
+            'tags': 'api, backend',
+            'id': 'api',
+            'depends': 'schema'
+        })
+        self.assertEqual(fields['description'], 'Build API')
+        self.assertEqual(fields['priority'], 1)
+        self.assertEqual(fields['tags'], ['api', 'backend'])
+        self.assertEqual(fields['key'], 'api')
+        self.assertEqual(fields['depends_on'], ['schema'])
+
+    def test_missing_description(self):
+        """Test records without a description are rejected."""
+        with self.assertRaises(ValueError):
+            normalize_record({'priority': 'high'})
+
+    def test_content_hash_ignores_case_and_spacing(self):
+        """Test trivially different descriptions hash the same."""
+        self.assertEqual(content_hash("Write  docs"), content_hash("write docs "))
+
+
+class TestEnqueueFile(unittest.TestCase):
+    """Test enqueue_file streaming import."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_jsonl_import_drops_duplicates(self):
+        """Test JSONL import in batches with duplicate dropping."""
+        records = [{'description': f'Task {i % 3}'} for i in range(7)]
+        path = self._write('tasks.jsonl', ''.join(json.dumps(r) + '\n' for r in records))
+
+        stats = enqueue_file(self.tmpdir, path, batch_size=2)
+
+        self.assertEqual(stats['read'], 7)
+        self.assertEqual(stats['enqueued'], 3)
+        self.assertEqual(stats['dropped'], 4)
+        self.assertEqual(len(TaskQueue(self.tmpdir)), 3)
+
+    def test_bad_lines_counted_invalid(self):
+        """Test malformed and non-object JSONL lines are skipped without aborting the import."""
+        path = self._write('tasks.jsonl', "\n".join([
+            json.dumps({'description': 'First'}),
+            '{"description": "Broken",',
+            '[1, 2]',
+            '"x"',
+            json.dumps({'description': 'Last'}),
+        ]) + "\n")
+
+        with self.assertLogs('orchestrator.ingest', level='WARNING') as logs:
+            stats = enqueue_file(self.tmpdir, path, batch_size=1)
+
+        self.assertEqual((stats['read'], stats['enqueued'], stats['invalid']), (5, 2, 3))
+        self.assertEqual([task['description'] for task in TaskQueue(self.tmpdir).pending()], ['First', 'Last'])
+        self.assertTrue(any('line 2 ' in line for line in logs.output))
+        self.assertTrue(any('line 3 ' in line for line in logs.output))
+
+    def test_csv_import_merges_into_pending(self):
+        """Test CSV duplicates merge priority and tags into the pending task."""
+        first = self._write('a.csv', "description,priority,tags\nFix login,normal,auth\n")
+        second = self._write('b.csv', "description,priority,tags\nfix  LOGIN,critical,prod\n")
+
+        enqueue_file(self.tmpdir, first)
+        stats = enqueue_file(self.tmpdir, second, on_duplicate='merge')
+
+        self.assertEqual(stats['merged'], 1)
+        queue = TaskQueue(self.tmpdir)
+        self.assertEqual(len(queue), 1)
+        task = queue.pop()
+        self.assertEqual(task['priority'], 0)
+        self.assertEqual(task['tags'], ['auth', 'prod'])
+
+    def test_hash_index_is_persistent(self):
+        """Test duplicates of already-claimed tasks are dropped on later imports."""
+        path = self._write('tasks.jsonl', json.dumps({'description': 'Once'}) + '\n')
+        enqueue_file(self.tmpdir, path)
+        TaskQueue(self.tmpdir).pop()
+
+        stats = enqueue_file(self.tmpdir, path, on_duplicate='merge')
+
+        self.assertEqual(stats['dropped'], 1)
+        self.assertIn(content_hash('Once'), ContentHashIndex(self.tmpdir))
+
+
+if __name__ == '__main__':
+    unittest.main()
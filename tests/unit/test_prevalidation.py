@@ -0,0 +1,77 @@
+"""Unit tests for automated pre-validation."""
+
+import unittest
+from orchestrator.prevalidation import PreValidator, extract_code_blocks, format_report, is_test_code
+
+OUTPUT = '''# Task Output
+
+```python
+def add(a, b):
+    return a + b
+```
+
+```python
+def test_add():
+    assert add(2, 3) == {expected}
+```
+
+```json
+{json}
+```
+
+**Status: COMPLETE**
+'''
+
+
+class TestExtractCodeBlocks(unittest.TestCase):
+    """Test code block extraction."""
+
+    def test_blocks_and_languages(self):
+        """Test fenced blocks are found in order with their language."""
+        blocks = extract_code_blocks(OUTPUT.format(expected=5, json='{"a": 1}'))
+        self.assertEqual([b['language'] for b in blocks], ['python', 'python', 'json'])
+        self.assertIn('return a + b', blocks[0]['code'])
+        self.assertFalse(is_test_code(blocks[0]['code']))
+        self.assertTrue(is_test_code(blocks[1]['code']))
+
+
+class TestPreValidator(unittest.TestCase):
+    """Test sandboxed checks."""
+
+    def _validator(self, **config):
+        validator = PreValidator({'linters': ['no_such_linter'], 'timeout': 5, **config})
+        self.addCleanup(validator.shutdown)
+        return validator
+
+    def test_passing_output(self):
+        """Test tests run against the output's implementation blocks."""
+        blocks, results = self._validator().check(OUTPUT.format(expected=5, json='{"a": 1}'))
+
+        self.assertTrue(all(r['passed'] for r in results), results)
+        self.assertIn('tests', [r['check'] for r in results])
+        self.assertTrue(any(r['skipped'] for r in results))  # linter not installed
+        self.assertIn('**Status: PASSED**', format_report('task_1', blocks, results))
+
+    def test_failures_are_reported(self):
+        """Test failing tests, bad syntax and bad JSON fail the output."""
+        text = OUTPUT.format(expected=6, json='{"a": }') + "\n```python\ndef broken(:\n```\n"
+        blocks, results = self._validator().check(text)
+
+        failed = {(r['block'], r['check']) for r in results if not r['passed']}
+        self.assertEqual(failed, {(2, 'tests'), (3, 'syntax'), (4, 'syntax')})
+        report = format_report('task_1', blocks, results)
+        self.assertIn('**Status: NEEDS_REVISION**', report)
+        self.assertIn('Block 4 syntax failed', report)
+
+    def test_timeout_kills_check(self):
+        """Test a hanging test is stopped at the time limit."""
+        text = "```python\ndef test_hang():\n    while True:\n        pass\n```\n"
+        _, results = self._validator(timeout=1).check(text)
+
+        tests = [r for r in results if r['check'] == 'tests'][0]
+        self.assertFalse(tests['passed'])
+        self.assertLess(tests['duration'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
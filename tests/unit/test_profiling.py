@@ -0,0 +1,73 @@
+"""Unit tests for the profiling mode."""
+
+import unittest
+import tempfile
+import os
+import pstats
+import threading
+import time
+from unittest.mock import patch
+from orchestrator.profiling import profiled, start_profiling, stop_profiling
+from orchestrator.state import WorkflowPhase
+
+
+def _busy_node(state):
+    return {'values': [str(n) for n in range(1000)]}
+
+
+class TestProfiling(unittest.TestCase):
+    """Test per-phase profile dumps and the allocation report."""
+
+    def tearDown(self):
+        stop_profiling()
+
+    def test_dumps_per_phase_and_allocations(self):
+        """Test node calls are grouped by phase and dumps are written on stop."""
+        node = profiled('busy', _busy_node)
+        self.assertEqual(len(node({})['values']), 1000)   # Pass-through while off
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = start_profiling(tmpdir, interval=3600)
+            node({'current_phase': WorkflowPhase.EXECUTION})
+            node({'current_phase': WorkflowPhase.EXECUTION})
+            node({'payload': True})
+
+            self.assertEqual(stop_profiling(), output_dir)
+            self.assertEqual(sorted(os.listdir(output_dir)),
+                             ['allocations.txt', 'busy.prof', 'busy.txt', 'execution.prof', 'execution.txt'])
+
+            stats = pstats.Stats(os.path.join(output_dir, 'execution.prof'))
+            calls = {func[2]: stat[0] for func, stat in stats.stats.items()}
+            self.assertEqual(calls['_busy_node'], 2)
+            with open(os.path.join(output_dir, 'execution.txt')) as f:
+                self.assertIn('2 node call(s)', f.readline())
+            with open(os.path.join(output_dir, 'allocations.txt')) as f:
+                self.assertIn('growth since profiling started', f.read())
+
+    def test_single_profiler_serializes_calls(self):
+        """Test concurrent node calls run one at a time where only one profiler may be active."""
+        running = []
+        overlap = []
+
+        def slow_node(state):
+            running.append(1)
+            overlap.append(len(running))
+            time.sleep(0.02)
+            running.pop()
+            return {}
+
+        node = profiled('slow', slow_node)
+        with tempfile.TemporaryDirectory() as tmpdir, patch('orchestrator.profiling.EXCLUSIVE_PROFILER', True):
+            start_profiling(tmpdir, interval=3600)
+            threads = [threading.Thread(target=node, args=({},)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stop_profiling()
+
+        self.assertEqual(overlap, [1, 1, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Unit tests for review quorum policies."""
+
+import unittest
+import tempfile
+import os
+import json
+from orchestrator.quorum import load_validation_config, required_approvals, quorum_decision
+from orchestrator.state import merge_slots
+
+
+def _verdicts(*statuses):
+    return {
+        str(n): {'instance': f'review_{n}', 'task_file': '', 'validation_file': '', 'status': status}
+        for n, status in enumerate(statuses, start=1)
+    }
+
+
+class TestQuorumDecision(unittest.TestCase):
+    """Test quorum policies."""
+
+    def test_required_approvals(self):
+        """Test approvals needed per policy."""
+        self.assertEqual(required_approvals('first_approve', 3), 1)
+        self.assertEqual(required_approvals('majority', 3), 2)
+        self.assertEqual(required_approvals('majority', 4), 3)
+        self.assertEqual(required_approvals('unanimous', 3), 3)
+
+    def test_first_approve(self):
+        """Test one approval decides, rejections alone wait for the rest."""
+        self.assertEqual(quorum_decision('first_approve', _verdicts('pending', 'approved', 'pending')), 'approved')
+        self.assertIsNone(quorum_decision('first_approve', _verdicts('needs_revision', 'pending')))
+        self.assertEqual(quorum_decision('first_approve', _verdicts('needs_revision', 'needs_revision')),
+                         'needs_revision')
+
+    def test_majority_decides_early(self):
+        """Test majority decides as soon as the outcome can't change."""
+        self.assertIsNone(quorum_decision('majority', _verdicts('approved', 'pending', 'pending')))
+        self.assertEqual(quorum_decision('majority', _verdicts('approved', 'approved', 'pending')), 'approved')
+        self.assertEqual(quorum_decision('majority', _verdicts('needs_revision', 'needs_revision', 'pending')),
+                         'needs_revision')
+
+    def test_unanimous(self):
+        """Test a single rejection fails a unanimous round."""
+        self.assertEqual(quorum_decision('unanimous', _verdicts('approved', 'needs_revision', 'pending')),
+                         'needs_revision')
+        self.assertIsNone(quorum_decision('unanimous', _verdicts('approved', 'pending')))
+        self.assertEqual(quorum_decision('unanimous', _verdicts('approved', 'approved')), 'approved')
+
+
+class TestMergeVerdicts(unittest.TestCase):
+    """Test the per-slot fan-out reducer."""
+
+    def test_merge_and_remove(self):
+        """Test branch updates merge by slot and None removes a slot."""
+        merged = merge_slots(_verdicts('pending', 'pending'), {'2': _verdicts('x', 'approved')['2']})
+        self.assertEqual(merged['1']['status'], 'pending')
+        self.assertEqual(merged['2']['status'], 'approved')
+        self.assertEqual(merge_slots(merged, {'1': None, '2': None}), {})
+
+
+class TestValidationConfig(unittest.TestCase):
+    """Test .thursian/validation.json loading."""
+
+    def test_defaults_and_validation(self):
+        """Test single reviewer default and rejection of unknown policies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertEqual(load_validation_config(tmpdir)[0], 1)
+
+            path = os.path.join(tmpdir, 'validation.json')
+            with open(path, 'w') as f:
+                json.dump({'reviewers': 3, 'quorum': 'unanimous'}, f)
+            self.assertEqual(load_validation_config(tmpdir), (3, 'unanimous'))
+
+            with open(path, 'w') as f:
+                json.dump({'reviewers': 3, 'quorum': 'loudest'}, f)
+            with self.assertRaises(ValueError):
+                load_validation_config(tmpdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Unit tests for the agent response cache."""
+
+import unittest
+import tempfile
+import os
+import time
+from orchestrator.state import AgentRole
+from orchestrator.response_cache import ResponseCache, cache_key
+from orchestrator.executor import AgentExecutor, build_request
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test ResponseCache lookups, expiry and eviction."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self._tmp.name, 'cache')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_hit_and_miss(self):
+        """Test stored responses are returned and counted."""
+        cache = ResponseCache(self.cache_dir)
+        key = cache_key('stub:', 'guidelines', 'Write docs')
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, 'response')
+        self.assertEqual(cache.get(key), 'response')
+
+        stats = cache.snapshot()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores']), (1, 1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+        self.assertNotEqual(key, cache_key('other:', 'guidelines', 'Write docs'))
+
+    def test_ttl_expiry(self):
+        """Test entries older than the TTL are misses and removed."""
+        cache = ResponseCache(self.cache_dir, ttl_seconds=0.05)
+        cache.put('k' * 64, 'response')
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get('k' * 64))
+        self.assertEqual(cache.snapshot()['expired'], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction_survives_restart(self):
+        """Test least recently used entries are evicted, also after reloading."""
+        cache = ResponseCache(self.cache_dir, max_entries=2)
+        cache.put('a' * 64, 'A')
+        cache.put('b' * 64, 'B')
+        past = time.time() - 60
+        os.utime(os.path.join(self.cache_dir, 'aa', 'a' * 64 + '.json'), (past, past))
+        os.utime(os.path.join(self.cache_dir, 'bb', 'b' * 64 + '.json'), (past + 1, past + 1))
+
+        reloaded = ResponseCache(self.cache_dir, max_entries=2)
+        reloaded.get('a' * 64)             # 'b' is now least recently used
+        reloaded.put('c' * 64, 'C')
+
+        self.assertIsNone(reloaded.get('b' * 64))
+        self.assertEqual(reloaded.get('a' * 64), 'A')
+        self.assertEqual(reloaded.snapshot()['evictions'], 1)
+
+    def test_byte_limit(self):
+        """Test the byte limit evicts entries too."""
+        cache = ResponseCache(self.cache_dir, max_bytes=300)
+        for i in range(5):
+            cache.put(f'{i}' * 64, 'x' * 100)
+
+        self.assertLessEqual(cache.snapshot()['bytes'], 300)
+        self.assertLess(len(cache), 5)
+
+
+class TestExecutorCache(unittest.TestCase):
+    """Test the executor answers repeated requests from the cache."""
+
+    def test_cache_hit_and_bypass(self):
+        """Test identical inputs hit the cache unless bypass_cache is set."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = AgentExecutor(
+                {'roles': {'coding_agent': 'stub'}, 'providers': {'stub': {'backend': 'stub'}}},
+                ResponseCache(tmpdir)
+            )
+            try:
+                def request(task_id, bypass=False):
+                    return build_request(task_id, AgentRole.CODING_AGENT, 'guidelines',
+                                         f'{task_id}: Write docs', cache_input='Write docs',
+                                         bypass_cache=bypass)
+
+                first = executor.run(request('task_1'), timeout=5)
+                self.assertEqual(executor.run(request('task_2'), timeout=5), first)
+                executor.run(request('task_3', bypass=True), timeout=5)
+
+                snapshot = executor.snapshot()
+                self.assertEqual(snapshot['providers']['stub']['calls'], 2)
+                self.assertEqual(snapshot['cache']['hits'], 1)
+                self.assertEqual(snapshot['cache']['bypassed'], 1)
+            finally:
+                executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
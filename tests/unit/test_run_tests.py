@@ -0,0 +1,36 @@
+"""Unit tests for the parallel test runner."""
+
+import unittest
+import tempfile
+import os
+from tests.run_tests import discover_modules, run_module_isolated
+
+
+class TestParallelRunner(unittest.TestCase):
+    """Test module sharding and per-module sandboxes."""
+
+    def test_discover_modules(self):
+        """Test suites map to their test modules and never include the perf tier."""
+        unit = discover_modules('unit')
+        self.assertIn('tests.unit.test_state', unit)
+        self.assertTrue(all(name.startswith('tests.unit.') for name in unit))
+
+        everything = discover_modules('all')
+        self.assertIn('tests.e2e.test_workflow', everything)
+        self.assertFalse(any(name.startswith('tests.perf') for name in everything))
+
+    def test_run_module_isolated(self):
+        """Test a module runs in a throwaway sandbox and the caller's cwd is restored."""
+        cwd, tempdir = os.getcwd(), tempfile.tempdir
+        shard = run_module_isolated('tests.unit.test_state', verbosity=0)
+
+        self.assertEqual(shard['module'], 'tests.unit.test_state')
+        self.assertGreater(shard['tests_run'], 0)
+        self.assertEqual(shard['failures'], [])
+        self.assertEqual(shard['errors'], [])
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertEqual(tempfile.tempdir, tempdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,11 +16,12 @@ class TestWorkflowPhase(unittest.TestCase):
         self.assertEqual(WorkflowPhase.EXECUTION.value, "execution")
         self.assertEqual(WorkflowPhase.VALIDATION.value, "validation")
         self.assertEqual(WorkflowPhase.COMPLETED.value, "completed")
+        self.assertEqual(WorkflowPhase.CANCELLED.value, "cancelled")
 
     def test_phase_count(self):
         """Test expected number of phases."""
         phases = list(WorkflowPhase)
-        self.assertEqual(len(phases), 6)
+        self.assertEqual(len(phases), 7)
 
 
 class TestAgentRole(unittest.TestCase):
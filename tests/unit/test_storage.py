@@ -0,0 +1,293 @@
+"""Unit tests for the pluggable document storage backends."""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+from datetime import datetime
+from orchestrator.helpers import create_initial_state
+from orchestrator.state import WorkflowPhase, AgentRole
+from orchestrator.storage import (
+    LocalStorage,
+    MemoryStorage,
+    SQLiteStorage,
+    StorageBackend,
+    close_storage,
+    get_storage,
+    register_storage_backend
+)
+
+MARKERS = ("Status: COMPLETE", "Status: APPROVED")
+
+
+class _BackendContract:
+    """Behaviour every backend must share; mixed into one TestCase per backend."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = self.make_storage(self.test_dir)
+        self.path = os.path.join(self.test_dir, 'output', 'task_1_output.md')
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_write_read_exists(self):
+        """Test writes create the document (and its directory) and replace content."""
+        self.assertFalse(self.storage.exists(self.path))
+        self.storage.write(self.path, "first")
+        self.storage.write(self.path, "second")
+        self.assertTrue(self.storage.exists(self.path))
+        self.assertEqual(self.storage.read(self.path), "second")
+
+    def test_inbox_is_a_file(self):
+        """Test exists() reports the task inbox humans append to on disk."""
+        inbox = os.path.join(self.test_dir, 'task_queue.txt')
+        self.assertFalse(self.storage.exists(inbox))
+        with open(inbox, 'w') as f:
+            f.write("Write a function\n")
+        self.assertTrue(self.storage.exists(inbox))
+
+    def test_read_missing_raises(self):
+        """Test reading a missing document raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            self.storage.read(self.path)
+
+    def test_append(self):
+        """Test append creates and extends a document."""
+        self.storage.append(self.path, "a")
+        self.storage.append(self.path, "b")
+        self.assertEqual(self.storage.read(self.path), "ab")
+
+    def test_move_and_delete(self):
+        """Test move replaces the target and delete tolerates missing documents."""
+        target = os.path.join(self.test_dir, 'output', 'task_1_output_r1.md')
+        self.storage.write(target, "old archive")
+        self.storage.write(self.path, "round 1")
+        self.storage.move(self.path, target)
+        self.assertFalse(self.storage.exists(self.path))
+        self.assertEqual(self.storage.read(target), "round 1")
+
+        self.storage.delete(target)
+        self.storage.delete(target)
+        self.assertFalse(self.storage.exists(target))
+        with self.assertRaises(FileNotFoundError):
+            self.storage.move(self.path, target)
+
+    def test_find_markers_and_digest(self):
+        """Test marker checks follow appends and digests follow content."""
+        self.storage.write(self.path, "# Output\n")
+        self.assertEqual(self.storage.find_markers(self.path, MARKERS), frozenset())
+        before = self.storage.digest(self.path)
+
+        self.storage.append(self.path, "**Status: COMPLETE**\n")
+        self.assertEqual(self.storage.find_markers(self.path, MARKERS), frozenset({"Status: COMPLETE"}))
+        self.assertNotEqual(self.storage.digest(self.path), before)
+
+    def test_appender(self):
+        """Test streamed chunks are visible as they are appended."""
+        with self.storage.appender(self.path) as append:
+            append("partial ")
+            self.assertEqual(self.storage.read(self.path), "partial ")
+            append("done")
+        self.assertEqual(self.storage.read(self.path), "partial done")
+
+
+class TestLocalStorage(_BackendContract, unittest.TestCase):
+    make_storage = staticmethod(LocalStorage)
+
+    def test_documents_are_plain_files(self):
+        """Test documents land at their paths, with no temp files left behind."""
+        self.storage.write(self.path, "content")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['task_1_output.md'])
+
+
+class TestMemoryStorage(_BackendContract, unittest.TestCase):
+    make_storage = staticmethod(MemoryStorage)
+
+    def test_nothing_touches_disk(self):
+        """Test the memory backend writes no files."""
+        self.storage.write(self.path, "content")
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_paths_are_normalized(self):
+        """Test relative and absolute spellings of a path name the same document."""
+        cwd = os.getcwd()
+        try:
+            os.chdir(self.test_dir)
+            self.storage.write(os.path.join('.', 'output', 'task_1_output.md'), "content")
+        finally:
+            os.chdir(cwd)
+        self.assertTrue(self.storage.exists(self.path))
+
+
+class TestSQLiteStorage(_BackendContract, unittest.TestCase):
+    make_storage = staticmethod(SQLiteStorage)
+
+    def test_persists_in_one_file(self):
+        """Test documents survive a reopen and live in a single WAL database."""
+        self.storage.write(self.path, "content")
+        self.storage.close()
+        self.storage = SQLiteStorage(self.test_dir)
+        self.assertEqual(self.storage.read(self.path), "content")
+        self.assertFalse(os.path.exists(os.path.dirname(self.path)))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'storage.db')))
+
+
+class TestSQLiteRecords(unittest.TestCase):
+    """Test the SQLite backend's transactions, record tables, checkpoints and rendering."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.storage = SQLiteStorage(self.test_dir)
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _state(self, phase=WorkflowPhase.EXECUTION, **fields):
+        state = create_initial_state(self.test_dir, 'workflow_1')
+        return {**state, 'current_phase': phase, 'current_task_id': 'task_1',
+                'phase_history': [WorkflowPhase.ASSIGNMENT, phase], 'primary_agent': AgentRole.CODING_AGENT,
+                **fields}
+
+    def test_transaction_commits_together_or_not_at_all(self):
+        """Test a failed block leaves none of its writes and nested blocks join the outer one."""
+        path = os.path.join(self.test_dir, 'tasks', 'task_1.md')
+        with self.assertRaises(RuntimeError):
+            with self.storage.transaction():
+                self.storage.write(path, "task")
+                with self.storage.transaction():
+                    self.storage.write_decision(os.path.join(self.test_dir, 'decisions', 'd.json'),
+                                                {'task_id': 'task_1', 'phase': 'execution'})
+                raise RuntimeError("node failed")
+        self.assertFalse(self.storage.exists(path))
+        self.assertFalse(self.storage.exists(os.path.join(self.test_dir, 'decisions', 'd.json')))
+
+        with self.storage.transaction():
+            self.storage.write(path, "task")
+            self.storage.append(path, " more")
+        self.assertEqual(self.storage.read(path), "task more")
+
+    def test_decisions_and_status_are_rows(self):
+        """Test decision logs and status are records that read back as their JSON documents."""
+        decision = os.path.join(self.test_dir, 'decisions', '2026-10-18T10-00-00_execution.json')
+        self.storage.write_decision(decision, {'task_id': 'task_1', 'phase': 'execution', 'outcome': 'ok'})
+        self.storage.write_status(os.path.join(self.test_dir, 'status.json'),
+                                  {'workflow_id': 'workflow_1', 'current_phase': 'execution'})
+        self.storage.write_status(os.path.join(self.test_dir, 'status.json'),
+                                  {'workflow_id': 'workflow_2', 'current_phase': 'validation'})
+
+        self.assertEqual(json.loads(self.storage.read(decision))['outcome'], 'ok')
+        status = json.loads(self.storage.read(os.path.join(self.test_dir, 'status.json')))
+        self.assertEqual(status['workflow_id'], 'workflow_2')
+        rows = self.storage.connection().execute("SELECT workflow_id FROM status ORDER BY workflow_id").fetchall()
+        self.assertEqual(rows, [('workflow_1',), ('workflow_2',)])
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'decisions')))
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'status.json')))
+
+    def test_checkpoints_resume_unfinished_workflows(self):
+        """Test checkpoints round-trip the state and skip finished or failed workflows."""
+        self.storage.save_checkpoint(self._state())
+        self.storage.save_checkpoint({**self._state(), 'workflow_id': 'workflow_2', 'errors': ['boom']})
+        self.storage.save_checkpoint({**self._state(WorkflowPhase.COMPLETED), 'workflow_id': 'workflow_3'})
+
+        [state] = self.storage.load_checkpoints()
+        self.assertEqual(state['workflow_id'], 'workflow_1')
+        self.assertEqual(state['current_phase'], WorkflowPhase.EXECUTION)
+        self.assertEqual(state['phase_history'], [WorkflowPhase.ASSIGNMENT, WorkflowPhase.EXECUTION])
+        self.assertEqual(state['primary_agent'], AgentRole.CODING_AGENT)
+        self.assertIsInstance(state['created_at'], datetime)
+
+        self.storage.save_checkpoint(self._state(WorkflowPhase.CANCELLED))
+        self.assertEqual(self.storage.load_checkpoints(), [])
+
+    def test_render(self):
+        """Test documents and decision logs are written out as files on demand."""
+        self.storage.write(os.path.join(self.test_dir, 'tasks', 'task_1.md'), "# Task 1")
+        self.storage.write(os.path.join(self.test_dir, 'output', 'task_2_output.md'), "other task")
+        self.storage.write_decision(os.path.join(self.test_dir, 'decisions', 'd.json'),
+                                    {'task_id': 'task_1', 'phase': 'execution'})
+        target = os.path.join(self.test_dir, 'rendered')
+
+        written = self.storage.render(target, task_id='task_1')
+
+        self.assertEqual(sorted(os.path.relpath(path, target) for path in written),
+                         [os.path.join('decisions', 'd.json'), os.path.join('tasks', 'task_1.md')])
+        with open(os.path.join(target, 'tasks', 'task_1.md')) as f:
+            self.assertEqual(f.read(), "# Task 1")
+        self.assertEqual(len(self.storage.render(target)), 3)
+
+    def test_human_protocol(self):
+        """Test task documents are rendered as files and human-written files are read back."""
+        self.storage.close()
+        self.storage = SQLiteStorage(self.test_dir, human_protocol=True)
+        task = os.path.join(self.test_dir, 'tasks', 'task_1.md')
+        output = os.path.join(self.test_dir, 'output', 'task_1_output.md')
+
+        self.storage.write(task, "# Task 1\n")
+        self.storage.append(task, "\n## Cancelled\n")
+        with open(task) as f:
+            self.assertEqual(f.read(), "# Task 1\n\n## Cancelled\n")
+
+        os.makedirs(os.path.dirname(output))
+        with open(output, 'w') as f:
+            f.write("done\n**Status: COMPLETE**\n")
+        self.assertTrue(self.storage.exists(output))
+        self.assertEqual(self.storage.find_markers(output, MARKERS), {"Status: COMPLETE"})
+        self.assertEqual(self.storage.read(output), "done\n**Status: COMPLETE**\n")
+
+        archive = os.path.join(self.test_dir, 'output', 'task_1_output_r1.md')
+        self.storage.move(output, archive)
+        self.assertFalse(os.path.exists(output))
+        self.assertTrue(os.path.exists(archive))
+        self.assertFalse(self.storage.exists(output))
+
+
+class TestGetStorage(unittest.TestCase):
+    """Test backend selection from .thursian/storage.json."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        close_storage(self.test_dir)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _configure(self, config):
+        with open(os.path.join(self.test_dir, 'storage.json'), 'w') as f:
+            json.dump(config, f)
+
+    def test_defaults_to_local_files(self):
+        """Test no config means plain files, cached per directory."""
+        storage = get_storage(self.test_dir)
+        self.assertIsInstance(storage, LocalStorage)
+        self.assertIs(get_storage(self.test_dir), storage)
+
+    def test_backend_from_config(self):
+        """Test the config picks the backend and passes its options."""
+        self._configure({'backend': 'sqlite', 'path': 'docs.db'})
+        storage = get_storage(self.test_dir)
+        self.assertIsInstance(storage, SQLiteStorage)
+        self.assertEqual(storage.path, os.path.join(self.test_dir, 'docs.db'))
+
+    def test_unknown_backend(self):
+        """Test an unknown backend name is rejected."""
+        self._configure({'backend': 'tape'})
+        with self.assertRaises(ValueError):
+            get_storage(self.test_dir)
+
+    def test_registered_backend(self):
+        """Test custom backends can be registered by name."""
+        class ReadOnlyMemory(MemoryStorage):
+            name = 'readonly'
+
+        register_storage_backend('readonly', ReadOnlyMemory)
+        self._configure({'backend': 'readonly'})
+        self.assertIsInstance(get_storage(self.test_dir), StorageBackend)
+        self.assertIsInstance(get_storage(self.test_dir), ReadOnlyMemory)
+
+
+if __name__ == '__main__':
+    unittest.main()
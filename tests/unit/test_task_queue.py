@@ -0,0 +1,319 @@
+"""Unit tests for the priority task queue."""
+
+import unittest
+import tempfile
+import os
+from datetime import datetime, timedelta
+from orchestrator import task_queue as task_queue_module
+from orchestrator.storage import SQLiteStorage, close_storage
+from orchestrator.task_queue import (
+    TaskQueue,
+    SQLiteTaskQueue,
+    get_task_queue,
+    DependencyTracker,
+    parse_task_line,
+    explain_selection,
+    DEFAULT_PRIORITY
+)
+
+
+class TestParseTaskLine(unittest.TestCase):
+    """Test parse_task_line."""
+
+    def test_plain_line(self):
+        """Test plain line gets default metadata."""
+        fields = parse_task_line("Write a factorial function\n")
+        self.assertEqual(fields['description'], 'Write a factorial function')
+        self.assertEqual(fields['priority'], DEFAULT_PRIORITY)
+        self.assertEqual(fields['tags'], [])
+        self.assertIsNone(fields['not_before'])
+
+    def test_metadata_block(self):
+        """Test priority, tags and not_before are parsed."""
+        fields = parse_task_line(
+            "[priority=high tags=api,auth not_before=2026-10-20T09:00] Fix login"
+        )
+        self.assertEqual(fields['description'], 'Fix login')
+        self.assertEqual(fields['priority'], 1)
+        self.assertEqual(fields['tags'], ['api', 'auth'])
+        self.assertEqual(fields['not_before'], '2026-10-20T09:00:00')
+
+    def test_blank_and_comment_lines(self):
+        """Test blank lines and comments are skipped."""
+        self.assertIsNone(parse_task_line("   \n"))
+        self.assertIsNone(parse_task_line("# backlog notes"))
+
+    def test_dependency_metadata(self):
+        """Test id and depends are parsed."""
+        fields = parse_task_line("[id=api depends=schema,auth] Build the API")
+        self.assertEqual(fields['key'], 'api')
+        self.assertEqual(fields['depends_on'], ['schema', 'auth'])
+        with self.assertRaises(ValueError):
+            parse_task_line("[id=api depends=api] Build the API")
+
+    def test_malformed_metadata(self):
+        """Test malformed metadata raises ValueError."""
+        with self.assertRaises(ValueError):
+            parse_task_line("[priority=urgent] Fix login")
+        with self.assertRaises(ValueError):
+            parse_task_line("[owner=me] Fix login")
+
+
+class TestDependencyTracker(unittest.TestCase):
+    """Test DependencyTracker in-degree bookkeeping."""
+
+    def test_unlock_after_all_dependencies(self):
+        """Test a task is released only when every dependency completes."""
+        tracker = DependencyTracker()
+        self.assertTrue(tracker.add(1, []))
+        self.assertFalse(tracker.add(2, ['a', 'b']))
+        self.assertFalse(tracker.add(3, ['a']))
+
+        self.assertEqual(tracker.complete('a'), [3])
+        self.assertTrue(tracker.is_blocked(2))
+        self.assertEqual(tracker.complete('b'), [2])
+        self.assertEqual(tracker.blocked_count(), 0)
+
+    def test_completed_dependency_is_satisfied(self):
+        """Test dependencies already completed do not block."""
+        tracker = DependencyTracker({'a'})
+        self.assertTrue(tracker.add(1, ['a']))
+        self.assertEqual(tracker.complete('a'), [])
+
+
+class TestTaskQueue(unittest.TestCase):
+    """Test TaskQueue ordering and persistence."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_inbox(self, *lines):
+        with open(os.path.join(self.tmpdir, 'task_queue.txt'), 'a') as f:
+            for line in lines:
+                f.write(line + "\n")
+
+    def test_priority_then_fifo(self):
+        """Test urgent tasks jump ahead and equal priorities stay FIFO."""
+        self._write_inbox(
+            "first normal",
+            "[priority=low] background",
+            "second normal",
+            "[priority=critical] outage",
+        )
+        queue = TaskQueue(self.tmpdir)
+
+        order = []
+        while True:
+            task = queue.pop()
+            if task is None:
+                break
+            order.append(task['description'])
+
+        self.assertEqual(order, ['outage', 'first normal', 'second normal', 'background'])
+
+    def test_not_before_defers_task(self):
+        """Test tasks are held until their not_before time."""
+        later = (datetime.now() + timedelta(hours=1)).isoformat(timespec='seconds')
+        self._write_inbox(f"[priority=critical not_before={later}] deploy")
+        queue = TaskQueue(self.tmpdir)
+
+        self.assertIsNone(queue.pop())
+        self.assertEqual(queue.deferred_count(), 1)
+
+        task = queue.pop(now=datetime.now() + timedelta(hours=2))
+        self.assertEqual(task['description'], 'deploy')
+
+    def test_pop_respects_earlier_now(self):
+        """Test an explicit now is the only clock, even after a pass with a later one."""
+        earlier = (datetime.now() - timedelta(hours=1)).isoformat(timespec='seconds')
+        later = (datetime.now() + timedelta(hours=1)).isoformat(timespec='seconds')
+        self._write_inbox(f"[not_before={earlier}] overdue", f"[not_before={later}] first",
+                          f"[not_before={later}] second")
+        queue = TaskQueue(self.tmpdir)
+        queue.sync()
+
+        self.assertIsNone(queue.pop(now=datetime.now() - timedelta(hours=2)))
+        self.assertEqual(queue.ready_count(), 1)
+        self.assertEqual(queue.pop()['description'], 'overdue')
+
+        self.assertEqual(queue.pop(now=datetime.now() + timedelta(hours=2))['description'], 'first')
+        self.assertIsNone(queue.pop())  # 'second' was promoted by the later clock
+        self.assertEqual(queue.deferred_count(), 1)
+        self.assertEqual(queue.next_eligible_at(), later)
+
+    def test_index_survives_restart(self):
+        """Test pending tasks are restored from the persisted index."""
+        self._write_inbox("one", "[priority=high] two", "three")
+        queue = TaskQueue(self.tmpdir)
+        self.assertEqual(queue.pop()['description'], 'two')
+
+        reloaded = TaskQueue(self.tmpdir)
+        self.assertEqual([t['description'] for t in reloaded.pending()], ['one', 'three'])
+        self.assertEqual(reloaded.pop()['seq'], 1)
+
+    def test_compaction_keeps_sequence(self):
+        """Test journal compaction drops dead records without reusing seqs."""
+        original = task_queue_module.COMPACTION_MIN_DEAD
+        task_queue_module.COMPACTION_MIN_DEAD = 2
+        try:
+            queue = TaskQueue(self.tmpdir)
+            for i in range(5):
+                queue.push(f"task {i}")
+            for _ in range(5):
+                queue.pop()
+
+            with open(queue.index_file, 'r') as f:
+                self.assertEqual(len(f.readlines()), 1)
+
+            reloaded = TaskQueue(self.tmpdir)
+            self.assertEqual(reloaded.push("next")['seq'], 6)
+        finally:
+            task_queue_module.COMPACTION_MIN_DEAD = original
+
+    def test_dependencies_gate_selection(self):
+        """Test dependents are held until completion unlocks them."""
+        self._write_inbox(
+            "[id=api depends=schema priority=critical] build api",
+            "[id=schema] design schema",
+        )
+        queue = TaskQueue(self.tmpdir)
+
+        self.assertEqual(queue.pop()['description'], 'design schema')
+        self.assertIsNone(queue.pop())
+        self.assertEqual(queue.blocked_count(), 1)
+
+        unlocked = queue.complete('schema')
+        self.assertEqual([t['key'] for t in unlocked], ['api'])
+        self.assertEqual(queue.pop()['description'], 'build api')
+
+    def test_completion_survives_restart(self):
+        """Test done records are replayed so late dependents are ready."""
+        queue = TaskQueue(self.tmpdir)
+        queue.push("design schema", key='schema')
+        queue.pop()
+        queue.complete('schema')
+
+        reloaded = TaskQueue(self.tmpdir)
+        reloaded.push("build api", key='api', depends_on=['schema'])
+        self.assertEqual(reloaded.ready_count(), 1)
+
+    def test_pop_many_single_pass(self):
+        """Test a batch claim respects priority and writes one journal append."""
+        self._write_inbox("a", "[priority=high] b", "c", "d")
+        queue = TaskQueue(self.tmpdir)
+        queue.sync()
+        with open(queue.index_file) as f:
+            lines_before = len(f.readlines())
+
+        claimed = queue.pop_many(3)
+
+        self.assertEqual([t['description'] for t in claimed], ['b', 'a', 'c'])
+        with open(queue.index_file) as f:
+            self.assertEqual(len(f.readlines()), lines_before + 3)
+        self.assertEqual([t['description'] for t in queue.pop_many(10)], ['d'])
+        self.assertEqual(queue.pop_many(10), [])
+
+    def test_other_process_writes_are_picked_up(self):
+        """Test a second queue instance never reuses sequence numbers."""
+        first = TaskQueue(self.tmpdir)
+        second = TaskQueue(self.tmpdir)
+        first.push("from first")
+        task = second.push("from second")
+
+        self.assertEqual(task['seq'], 2)
+        self.assertEqual(len(first.pop_many(5)), 2)
+
+    def test_explain_selection(self):
+        """Test decision-log reasoning mentions priority and tags."""
+        queue = TaskQueue(self.tmpdir)
+        task = queue.push("fix", priority=1, tags=['api'])
+        reason = explain_selection(task, ready_count=3, deferred_count=2)
+        self.assertIn('priority=high', reason)
+        self.assertIn('tags=api', reason)
+        self.assertIn('2 deferred', reason)
+
+
+
+class TestSQLiteTaskQueue(unittest.TestCase):
+    """Test the queue kept in SQLite storage."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmp.name
+        self.storage = SQLiteStorage(self.tmpdir)
+        self.queue = SQLiteTaskQueue(self.storage)
+
+    def tearDown(self):
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def test_priority_fifo_and_inbox(self):
+        """Test inbox lines are ingested and claimed by priority, FIFO within one."""
+        with open(os.path.join(self.tmpdir, 'task_queue.txt'), 'w') as f:
+            f.write("first normal\n[priority=low] background\nsecond normal\n[priority=critical] outage\n")
+
+        claimed = self.queue.pop_many(3)
+
+        self.assertEqual([t['description'] for t in claimed], ['outage', 'first normal', 'second normal'])
+        self.assertEqual(os.path.getsize(os.path.join(self.tmpdir, 'task_queue.txt')), 0)
+        self.assertEqual(self.queue.pop()['description'], 'background')
+        self.assertIsNone(self.queue.pop())
+
+    def test_not_before_and_dependencies(self):
+        """Test deferred and blocked tasks are held until eligible."""
+        later = (datetime.now() + timedelta(hours=1)).isoformat(timespec='seconds')
+        self.queue.push("deploy", not_before=later)
+        self.queue.push("build api", key='api', depends_on=['schema'])
+        self.queue.push("design schema", key='schema')
+
+        self.assertEqual((self.queue.ready_count(), self.queue.deferred_count(), self.queue.blocked_count()),
+                         (1, 1, 1))
+        self.assertEqual(self.queue.next_eligible_at(), later)
+        self.assertEqual(self.queue.pop()['key'], 'schema')
+        self.assertIsNone(self.queue.pop())
+
+        self.assertEqual([t['key'] for t in self.queue.complete('schema')], ['api'])
+        self.assertEqual(self.queue.complete('schema'), [])
+        self.assertEqual(self.queue.pop()['key'], 'api')
+        self.assertEqual(self.queue.pop(now=datetime.now() + timedelta(hours=2))['description'], 'deploy')
+
+    def test_survives_restart(self):
+        """Test pending tasks, completed keys and sequence numbers persist in the database."""
+        self.queue.push("one")
+        self.queue.push("two", priority=1, tags=['api'])
+        self.queue.push("schema", key='schema')
+        self.queue.complete('schema')
+        self.assertTrue(self.queue.merge('1', 0, ['urgent']))
+        self.storage.close()
+
+        self.storage = SQLiteStorage(self.tmpdir)
+        reloaded = SQLiteTaskQueue(self.storage)
+        self.assertEqual([t['description'] for t in reloaded.pending()], ['one', 'two', 'schema'])
+        self.assertEqual(reloaded.pending()[0]['tags'], ['urgent'])
+        self.assertEqual(reloaded.push("api", depends_on=['schema'])['seq'], 4)
+        self.assertEqual(reloaded.blocked_count(), 0)
+
+    def test_claim_uses_ready_index(self):
+        """Test the claim query is served by the partial index, not a table scan."""
+        plan = self.storage.connection().execute(
+            "EXPLAIN QUERY PLAN SELECT seq FROM tasks WHERE state = 'pending' AND unmet = 0 "
+            "AND (eligible_at IS NULL OR eligible_at <= ?) ORDER BY priority, seq LIMIT ?", (0, 1)
+        ).fetchall()
+        self.assertIn('tasks_ready', ' '.join(row[-1] for row in plan))
+
+    def test_get_task_queue_follows_storage(self):
+        """Test SQLite storage selects the SQLite queue."""
+        with open(os.path.join(self.tmpdir, 'storage.json'), 'w') as f:
+            f.write('{"backend": "sqlite"}')
+        try:
+            self.assertIsInstance(get_task_queue(self.tmpdir), SQLiteTaskQueue)
+        finally:
+            close_storage(self.tmpdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
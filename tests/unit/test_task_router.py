@@ -0,0 +1,120 @@
+"""Unit tests for rule-based task routing."""
+
+import unittest
+import tempfile
+import os
+import json
+from orchestrator.state import AgentRole
+from orchestrator.task_router import (
+    TaskRouter,
+    KeywordMatcher,
+    parse_rule,
+    get_task_router,
+    DEFAULT_REASONING
+)
+
+
+def _router(*entries):
+    return TaskRouter([parse_rule(entry, i) for i, entry in enumerate(entries)])
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Test the Aho-Corasick keyword matcher."""
+
+    def test_overlapping_keywords_and_word_boundaries(self):
+        """Test all overlapping keywords are found, but only as whole words."""
+        matcher = KeywordMatcher([('api gateway', 1), ('api', 2), ('doc', 0)])
+
+        self.assertEqual(matcher.best_match("Deploy the API gateway"), 1)
+        self.assertEqual(matcher.best_match("Rate limit the api"), 2)
+        self.assertIsNone(matcher.best_match("Write documentation for rapid apis"))
+
+
+class TestTaskRouter(unittest.TestCase):
+    """Test TaskRouter rule selection."""
+
+    def test_default_route(self):
+        """Test tasks matching no rule go to the coding agent."""
+        route = _router().route("Implement login")
+
+        self.assertIsNone(route['rule'])
+        self.assertEqual(route['primary_agent'], AgentRole.CODING_AGENT)
+        self.assertEqual(route['validator_agent'], AgentRole.REVIEW_AGENT)
+        self.assertEqual(route['doc_reference'], 'docs/agents/CODING_AGENT.md')
+        self.assertEqual(route['reasoning'], DEFAULT_REASONING)
+
+    def test_keyword_regex_and_tag_rules(self):
+        """Test each matcher type selects its rule."""
+        router = _router(
+            {'name': 'audit', 'keywords': ['security audit'], 'primary_agent': 'review_agent'},
+            {'name': 'ticket', 'regex': r'\bJIRA-\d+\b'},
+            {'name': 'docs', 'tags': ['docs']},
+        )
+
+        audit = router.route("Run a Security Audit of auth")
+        self.assertEqual(audit['rule'], 'audit')
+        self.assertEqual(audit['primary_agent'], AgentRole.REVIEW_AGENT)
+        self.assertEqual(audit['doc_reference'], 'docs/agents/REVIEW_AGENT.md')
+
+        self.assertEqual(router.route("Fix jira-42 crash")['rule'], 'ticket')
+        self.assertEqual(router.route("Update guide", tags=['Docs'])['rule'], 'docs')
+
+    def test_first_matching_rule_wins(self):
+        """Test rule order decides between several matching rules."""
+        router = _router(
+            {'name': 'first', 'regex': r'(?P<word>schema)'},
+            {'name': 'second', 'keywords': ['migration']},
+            {'name': 'third', 'regex': r'migration'},
+        )
+
+        self.assertEqual(router.route("Write migration for the schema")['rule'], 'first')
+        self.assertEqual(router.route("Write migration")['rule'], 'second')
+
+    def test_inline_flag_and_backreference_rules(self):
+        """Test regexes that only work on their own don't break the other rules."""
+        router = _router(
+            {'name': 'ticket', 'regex': r'\bJIRA-\d+\b'},
+            {'name': 'flagged', 'regex': r'(?i)hotfix'},
+            {'name': 'repeated', 'regex': r'\b(\w+) \1\b'},
+            {'name': 'named', 'regex': r'(?P<word>\w+)-(?P=word)'},
+            {'name': 'docs', 'regex': r'readme'},
+        )
+
+        self.assertEqual(router.route("Ship HOTFIX for login")['rule'], 'flagged')
+        self.assertEqual(router.route("Remove the the duplicate word")['rule'], 'repeated')
+        self.assertEqual(router.route("Rename ab-ab module")['rule'], 'named')
+        self.assertEqual(router.route("JIRA-7: hotfix readme")['rule'], 'ticket')
+        self.assertEqual(router.route("Update readme")['rule'], 'docs')
+        self.assertIsNone(router.route("Remove the duplicate word")['rule'])
+
+    def test_large_rule_set(self):
+        """Test thousands of rules compile into one router."""
+        router = _router(*(
+            {'name': f'r{i}', 'keywords': [f'component{i}'], 'regex': rf'\bTICKET-{i}\b'}
+            for i in range(3000)
+        ))
+
+        self.assertEqual(router.route("Refactor component2999")['rule'], 'r2999')
+        self.assertEqual(router.route("Close ticket-1500")['rule'], 'r1500')
+
+    def test_invalid_rules(self):
+        """Test rules without matchers or with bad regexes are rejected."""
+        with self.assertRaises(ValueError):
+            parse_rule({'name': 'empty'}, 0)
+        with self.assertRaises(ValueError):
+            parse_rule({'name': 'bad', 'regex': '('}, 0)
+
+    def test_rules_reload_when_file_changes(self):
+        """Test get_task_router recompiles after routing_rules.json changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'routing_rules.json')
+            self.assertIsNone(get_task_router(tmpdir).route("Write docs")['rule'])
+
+            with open(path, 'w') as f:
+                json.dump({'rules': [{'name': 'docs', 'keywords': ['docs']}]}, f)
+
+            self.assertEqual(get_task_router(tmpdir).route("Write docs")['rule'], 'docs')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Unit tests for the template and guideline registry."""
+
+import unittest
+import tempfile
+import os
+import time
+from orchestrator.template_registry import CompiledTemplate, TemplateRegistry
+
+
+class TestCompiledTemplate(unittest.TestCase):
+    """Test CompiledTemplate rendering."""
+
+    def test_render_fields_and_literal_braces(self):
+        """Test fields are substituted verbatim and {{ }} stay literal."""
+        template = CompiledTemplate("# {title}\n{{not a field}} {body}")
+
+        self.assertEqual(template.fields, {'title', 'body'})
+        self.assertEqual(template.render(title='T', body='uses {braces}'),
+                         "# T\n{not a field} uses {braces}")
+
+    def test_missing_and_unsupported_fields(self):
+        """Test missing values and format specs are rejected."""
+        with self.assertRaises(KeyError):
+            CompiledTemplate("{a} {b}").render(a=1)
+        with self.assertRaises(ValueError):
+            CompiledTemplate("{a:>10}")
+
+
+class TestTemplateRegistry(unittest.TestCase):
+    """Test TemplateRegistry caching and hot reload."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, path, content, mtime=None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_builtin_templates_render(self):
+        """Test the shipped task and validation templates."""
+        registry = TemplateRegistry(self.tmpdir)
+        content = registry.render(
+            'task', task_id='task_1', task_description='Do it', primary_agent='coding_agent',
+            assigned_to='alice', guidelines='docs/agents/CODING_AGENT.md',
+            workflow_id='wf', created='now'
+        )
+
+        self.assertIn('# Task: task_1', content)
+        self.assertIn('**Assigned To**: alice', content)
+        self.assertIn('validator_agent', registry.template('validation').fields)
+
+    def test_cached_until_mtime_changes(self):
+        """Test files are read once and reloaded after they change."""
+        registry = TemplateRegistry(self.tmpdir, check_interval=0)
+        guide = os.path.join(self.tmpdir, 'GUIDE.md')
+        self._write(guide, 'v1', mtime=time.time() - 10)
+
+        self.assertEqual(registry.guideline(guide), 'v1')
+        self.assertEqual(registry.guideline(guide), 'v1')
+        self.assertEqual(registry.loads, 1)
+
+        self._write(guide, 'v2')
+        self.assertEqual(registry.guideline(guide), 'v2')
+        self.assertEqual(registry.loads, 2)
+        self.assertIsNone(registry.guideline(os.path.join(self.tmpdir, 'missing.md')))
+
+    def test_project_override(self):
+        """Test .thursian/templates overrides the built-in template."""
+        registry = TemplateRegistry(self.tmpdir, check_interval=0)
+        registry.template('task')
+
+        self._write(os.path.join(self.tmpdir, 'templates', 'task.md'), "Custom {task_id}")
+
+        self.assertEqual(registry.render('task', task_id='t1'), "Custom t1")
+
+    def test_check_interval_throttles_reloads(self):
+        """Test changes are not noticed until the check interval passes."""
+        registry = TemplateRegistry(self.tmpdir, check_interval=60)
+        guide = os.path.join(self.tmpdir, 'GUIDE.md')
+        self._write(guide, 'v1', mtime=time.time() - 10)
+        registry.guideline(guide)
+
+        self._write(guide, 'v2')
+
+        self.assertEqual(registry.guideline(guide), 'v1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Unit tests for node timing histograms."""
+
+import unittest
+import tempfile
+import os
+import json
+from orchestrator.timing import (
+    LatencyHistogram,
+    bucket_index,
+    bucket_upper_bound,
+    enable_timing,
+    get_histogram,
+    reset_timings,
+    snapshot_timings,
+    timed,
+    write_timings
+)
+
+
+@timed
+def _sample_step(value):
+    return value * 2
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test log-bucketed latency histograms."""
+
+    def test_buckets_are_contiguous_and_tight(self):
+        """Test every value falls in a bucket whose bound is within 12.5% above it."""
+        for ns in list(range(0, 5000)) + [10 ** 6, 10 ** 9 + 7, 3600 * 10 ** 9]:
+            index = bucket_index(ns)
+            upper = bucket_upper_bound(index)
+            self.assertGreaterEqual(upper, ns)
+            self.assertLessEqual(upper - ns, ns / 8)
+            if ns:
+                self.assertIn(bucket_index(ns - 1), (index, index - 1))
+
+    def test_percentiles(self):
+        """Test percentiles land in the right bucket and never exceed the max."""
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms * 1_000_000)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 100)
+        self.assertAlmostEqual(snapshot['mean'], 0.0505)
+        self.assertAlmostEqual(snapshot['p50'], 0.050, delta=0.050 / 8)
+        self.assertAlmostEqual(snapshot['p99'], 0.099, delta=0.099 / 8)
+        self.assertLessEqual(snapshot['p99'], snapshot['max'])
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+
+class TestTimed(unittest.TestCase):
+    """Test the timed decorator and export."""
+
+    def tearDown(self):
+        enable_timing(False)
+        reset_timings()
+
+    def test_records_only_when_enabled(self):
+        """Test calls are recorded under the function name while timing is on."""
+        reset_timings()
+        self.assertEqual(_sample_step(2), 4)
+        self.assertEqual(get_histogram('_sample_step').count, 0)
+
+        enable_timing()
+        _sample_step(1)
+        _sample_step(2)
+        self.assertEqual(snapshot_timings()['_sample_step']['count'], 2)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(write_timings(tmpdir)) as f:
+                self.assertEqual(json.load(f)['_sample_step']['count'], 2)
+            self.assertFalse(os.path.exists(os.path.join(tmpdir, 'timings.json.tmp')))
+
+
+if __name__ == '__main__':
+    unittest.main()
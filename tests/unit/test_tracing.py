@@ -0,0 +1,77 @@
+"""Unit tests for per-task trace spans."""
+
+import unittest
+import tempfile
+import os
+import json
+from orchestrator.tracing import TraceRecorder, start_tracing, stop_tracing, task_context, span
+from orchestrator.timing import timed
+from orchestrator.helpers import create_initial_state
+from orchestrator.state import WorkflowPhase
+
+
+@timed
+def _traced_step(state):
+    with span('inner', detail='x'):
+        return state
+
+
+def _events(path):
+    with open(path) as f:
+        events = json.load(f)
+    processes = {e['pid']: e['args']['name'] for e in events if e['ph'] == 'M'}
+    return [(processes[e['pid']], e['name'], e) for e in events if e['ph'] == 'X']
+
+
+class TestTracing(unittest.TestCase):
+    """Test span recording and Chrome trace export."""
+
+    def tearDown(self):
+        stop_tracing()
+
+    def test_spans_grouped_by_task(self):
+        """Test timed calls and spans land in their task's trace.
+
+        A timed call takes its task from a state argument; spans inside it
+        need the task context the scheduler sets around each invoke.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = start_tracing(tmpdir)
+            state = {**create_initial_state(tmpdir), 'current_task_id': 'task_1'}
+
+            _traced_step(state)
+            with task_context('task_2'):
+                _traced_step({})
+            with span('git_commit'):
+                pass
+
+            self.assertEqual(stop_tracing(), path)
+            spans = [(task, name) for task, name, _ in _events(path)]
+            self.assertEqual(spans, [
+                ('orchestrator', 'inner'), ('task_1', '_traced_step'),
+                ('task_2', 'inner'), ('task_2', '_traced_step'),
+                ('orchestrator', 'git_commit'),
+            ])
+            self.assertEqual(_events(path)[0][2]['args'], {'detail': 'x'})
+
+    def test_phase_spans_and_buffered_flush(self):
+        """Test phase changes close spans and buffered spans reach the file on flush."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            recorder = TraceRecorder(os.path.join(tmpdir, 'traces', 'trace.json'), flush_interval=60)
+            state = {**create_initial_state(tmpdir), 'current_task_id': 'task_1'}
+
+            for phase in (WorkflowPhase.EXECUTION, WorkflowPhase.EXECUTION,
+                          WorkflowPhase.VALIDATION, WorkflowPhase.COMPLETED):
+                recorder.record_phase({**state, 'current_phase': phase})
+            self.assertEqual(recorder.recorded, 0)
+
+            recorder.flush()
+            self.assertEqual(recorder.recorded, 3)
+            recorder.close()
+
+            names = [name for _, name, _ in _events(recorder.path)]
+            self.assertEqual(names, ['phase:execution', 'phase:validation', 'phase:completed'])
+
+
+if __name__ == '__main__':
+    unittest.main()